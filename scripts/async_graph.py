@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Asyncio Facade for the SQLite Graph Tier
+
+AsyncSQLiteGraph exposes the SQLiteGraph API as coroutines for the
+asyncio-based retrieval service:
+
+- Reads run on a bounded thread pool, each worker using its own pooled
+  read-only connection (SQLiteGraph production profile).
+- Writes are serialized on a single writer thread.
+- Semaphores bound the number of queued reads, writes and concurrent path
+  searches, so slow path queries cannot occupy every read worker and
+  starve breadcrumb lookups.
+- Cancelling an awaiting task interrupts the SQLite statement and stops
+  path searches between expansion steps.
+"""
+
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from sqlite_graph import SQLiteGraph
+
+logger = logging.getLogger(__name__)
+
+# Defaults sized for one retrieval service process
+DEFAULT_READ_WORKERS = 4
+DEFAULT_MAX_CONCURRENT_PATHS = 2
+DEFAULT_MAX_PENDING_READS = 64
+DEFAULT_MAX_PENDING_WRITES = 256
+
+
+class AsyncSQLiteGraph:
+    """
+    Coroutine API over a pooled SQLiteGraph.
+
+    Example:
+        async with AsyncSQLiteGraph("pdca_timeline.db") as graph:
+            breadcrumb = await graph.get_breadcrumb_navigation(pdca_id)
+    """
+
+    def __init__(self, graph: Union[SQLiteGraph, str] = "pdca_timeline.db",
+                 read_workers: int = DEFAULT_READ_WORKERS,
+                 max_concurrent_paths: int = DEFAULT_MAX_CONCURRENT_PATHS,
+                 max_pending_reads: int = DEFAULT_MAX_PENDING_READS,
+                 max_pending_writes: int = DEFAULT_MAX_PENDING_WRITES,
+                 queue_timeout: Optional[float] = None):
+        """
+        Initialize the async facade.
+
+        Args:
+            graph: SQLiteGraph with a read pool, or a database path (opened
+                with the production profile)
+            read_workers: Threads serving read queries
+            max_concurrent_paths: Path searches allowed to run at once; keep
+                below read_workers so other reads always have a worker
+            max_pending_reads: Reads admitted (running or queued) before
+                callers wait
+            max_pending_writes: Writes admitted before callers wait
+            queue_timeout: Seconds to wait for admission before raising
+                asyncio.TimeoutError (None waits indefinitely)
+        """
+        if isinstance(graph, str):
+            graph = SQLiteGraph(graph, production=True)
+            self._owns_graph = True
+        else:
+            self._owns_graph = False
+        if graph._pool is None:
+            raise ValueError("AsyncSQLiteGraph needs a SQLiteGraph with a read pool "
+                             "(production=True or read_pool=True, not ':memory:')")
+        if max_concurrent_paths >= read_workers:
+            logger.warning("max_concurrent_paths >= read_workers: path searches can "
+                           "occupy every read worker")
+
+        self.graph = graph
+        self.queue_timeout = queue_timeout
+        self._read_executor = ThreadPoolExecutor(max_workers=read_workers,
+                                                 thread_name_prefix="graph-read")
+        self._write_executor = ThreadPoolExecutor(max_workers=1,
+                                                  thread_name_prefix="graph-write")
+        self._read_slots = asyncio.Semaphore(max_pending_reads)
+        self._path_slots = asyncio.Semaphore(max_concurrent_paths)
+        self._write_slots = asyncio.Semaphore(max_pending_writes)
+
+    async def __aenter__(self) -> 'AsyncSQLiteGraph':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _acquire(self, slots: asyncio.Semaphore):
+        """Wait for a slot, honoring queue_timeout."""
+        if self.queue_timeout is None:
+            await slots.acquire()
+        else:
+            await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+
+    async def _run(self, executor: ThreadPoolExecutor, slots: List[asyncio.Semaphore],
+                   fn: Callable, *args, stoppable: bool = False, **kwargs) -> Any:
+        """
+        Run ``fn`` on ``executor`` once a slot is free in every semaphore.
+
+        Slots are released when the worker thread finishes, not when the
+        awaiting task is cancelled, so the limits reflect real work in
+        flight. On cancellation the worker's connection is interrupted and,
+        for ``stoppable`` calls, a should_stop callback starts returning True.
+        The interrupt is only sent while ``fn`` is still running, so it
+        cannot reach the next query on the same worker's connection.
+        """
+        acquired = []
+        try:
+            for slot in slots:
+                await self._acquire(slot)
+                acquired.append(slot)
+        except BaseException:
+            for slot in acquired:
+                slot.release()
+            raise
+
+        cancelled = threading.Event()
+        worker = {}
+        worker_lock = threading.Lock()
+
+        def call():
+            if cancelled.is_set():
+                return None  # cancelled while queued
+            if executor is self._read_executor:
+                with worker_lock:
+                    worker['conn'] = self.graph._read_conn()
+            if stoppable:
+                kwargs['should_stop'] = cancelled.is_set
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with worker_lock:
+                    worker.pop('conn', None)
+
+        def release(_):
+            for slot in acquired:
+                slot.release()
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, call)
+        future.add_done_callback(release)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            with worker_lock:
+                conn = worker.get('conn')
+                if conn is not None:
+                    conn.interrupt()
+            # Retrieve the worker's outcome later so it is never reported as unhandled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise
+
+    async def _read(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self._run(self._read_executor, [self._read_slots], fn, *args, **kwargs)
+
+    async def _path_read(self, fn: Callable, *args, **kwargs) -> Any:
+        # Path slot first: searches queued behind max_concurrent_paths must not
+        # hold read admission slots that other reads are waiting for
+        return await self._run(self._read_executor, [self._path_slots, self._read_slots],
+                               fn, *args, stoppable=True, **kwargs)
+
+    async def _write(self, fn: Callable, *args, **kwargs) -> Any:
+        return await self._run(self._write_executor, [self._write_slots], fn, *args, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get_successors(self, pdca_id: str, relationship_type: str = "PRECEDES",
+                             **kwargs) -> List[Dict]:
+        """Async SQLiteGraph.get_successors()."""
+        return await self._read(self.graph.get_successors, pdca_id, relationship_type, **kwargs)
+
+    async def get_predecessors(self, pdca_id: str, relationship_type: str = "PRECEDES",
+                               **kwargs) -> List[Dict]:
+        """Async SQLiteGraph.get_predecessors()."""
+        return await self._read(self.graph.get_predecessors, pdca_id, relationship_type, **kwargs)
+
+    async def get_neighbors_many(self, pdca_ids: Iterable[str], **kwargs) -> Dict[str, List[Dict]]:
+        """Async SQLiteGraph.get_neighbors_many()."""
+        return await self._read(self.graph.get_neighbors_many, list(pdca_ids), **kwargs)
+
+    async def extract_subgraph(self, seed_ids: Iterable[str], **kwargs) -> Dict:
+        """Async SQLiteGraph.extract_subgraph()."""
+        return await self._read(self.graph.extract_subgraph, list(seed_ids), **kwargs)
+
+    async def get_breadcrumb_navigation(self, pdca_id: str, **kwargs) -> Dict:
+        """Async SQLiteGraph.get_breadcrumb_navigation()."""
+        return await self._read(self.graph.get_breadcrumb_navigation, pdca_id, **kwargs)
+
+    async def get_graph_stats(self) -> Dict:
+        """Async SQLiteGraph.get_graph_stats()."""
+        return await self._read(self.graph.get_graph_stats)
+
+    async def get_node_degree(self, pdca_id: str, relationship_type: Optional[str] = None) -> Dict:
+        """Async SQLiteGraph.get_node_degree()."""
+        return await self._read(self.graph.get_node_degree, pdca_id, relationship_type)
+
+    async def find_path(self, start_pdca_id: str, end_pdca_id: str, **kwargs) -> List[Dict]:
+        """Async SQLiteGraph.find_path(); limited by max_concurrent_paths."""
+        return await self._path_read(self.graph.find_path, start_pdca_id, end_pdca_id, **kwargs)
+
+    async def shortest_path(self, start_pdca_id: str, end_pdca_id: str, **kwargs) -> Dict:
+        """Async SQLiteGraph.shortest_path(); limited by max_concurrent_paths."""
+        return await self._path_read(self.graph.shortest_path, start_pdca_id, end_pdca_id, **kwargs)
+
+    async def is_ancestor(self, ancestor_id: str, descendant_id: str, **kwargs) -> bool:
+        """Async SQLiteGraph.is_ancestor()."""
+        return await self._read(self.graph.is_ancestor, ancestor_id, descendant_id, **kwargs)
+
+    async def ancestors(self, pdca_id: str, **kwargs) -> List[Any]:
+        """Async SQLiteGraph.ancestors()."""
+        return await self._read(self.graph.ancestors, pdca_id, **kwargs)
+
+    async def descendants(self, pdca_id: str, **kwargs) -> List[Any]:
+        """Async SQLiteGraph.descendants()."""
+        return await self._read(self.graph.descendants, pdca_id, **kwargs)
+
+    async def common_ancestors(self, pdca_ids: Iterable[str], **kwargs) -> List[Any]:
+        """Async SQLiteGraph.common_ancestors()."""
+        return await self._read(self.graph.common_ancestors, list(pdca_ids), **kwargs)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    async def add_pdca_node(self, pdca_data: Dict) -> bool:
+        """Async SQLiteGraph.add_pdca_node()."""
+        return await self._write(self.graph.add_pdca_node, pdca_data)
+
+    async def add_relationship(self, from_pdca_id: str, to_pdca_id: str, **kwargs) -> bool:
+        """Async SQLiteGraph.add_relationship()."""
+        return await self._write(self.graph.add_relationship, from_pdca_id, to_pdca_id, **kwargs)
+
+    async def add_pdca_nodes_bulk(self, pdcas: Iterable[Dict], **kwargs) -> Dict:
+        """Async SQLiteGraph.add_pdca_nodes_bulk()."""
+        return await self._write(self.graph.add_pdca_nodes_bulk, pdcas, **kwargs)
+
+    async def add_relationships_bulk(self, relationships: Iterable[Any], **kwargs) -> Dict:
+        """Async SQLiteGraph.add_relationships_bulk()."""
+        return await self._write(self.graph.add_relationships_bulk, relationships, **kwargs)
+
+    async def add_batch(self, pdcas: Iterable[Dict] = (), relationships: Iterable[Any] = (),
+                        **kwargs) -> Dict:
+        """Async SQLiteGraph.add_batch()."""
+        return await self._write(self.graph.add_batch, pdcas, relationships, **kwargs)
+
+    async def close(self):
+        """Wait for in-flight work, stop the executors and close an owned graph."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._read_executor.shutdown, True)
+        await loop.run_in_executor(None, self._write_executor.shutdown, True)
+        if self._owns_graph:
+            self.graph.close()
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Synthetic-Scale Benchmark Suite for SQLiteGraph
+
+Generates a seeded synthetic PDCA journal and times the graph and temporal
+tiers at several scales:
+
+- ingestion (bulk nodes and relationships, rows/s)
+- successor / predecessor lookups
+- find_path along real breadcrumb chains
+- breadcrumb navigation
+- graph statistics
+- temporal queries (time range, agent timeline, after PDCA X)
+
+Each operation is reported as p50/p95/p99 latency in milliseconds plus
+rows/s. Results are written as JSON and can be compared against a stored
+baseline; any operation slower than the baseline by more than the
+threshold is a regression and the run exits with status 1.
+
+Usage:
+    python benchmark_sqlite_graph.py --tiers small medium --output bench.json
+    python benchmark_sqlite_graph.py --tiers small --baseline bench.json --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from temporal_index import TemporalIndex
+
+logger = logging.getLogger(__name__)
+
+# Number of PDCAs per scale tier
+SCALE_TIERS = {
+    'tiny': 2000,
+    'small': 10000,
+    'medium': 100000,
+    'large': 1000000
+}
+
+# Timed calls per read operation
+DEFAULT_QUERIES = 200
+
+# Allowed slowdown versus the baseline before an operation counts as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.20
+
+AGENTS = [
+    ('SaveRestartAgent', 'ProcessOrchestration'),
+    ('BuilderAgent', 'ComponentDevelopment'),
+    ('TesterAgent', 'QualityAssurance'),
+    ('RefinerAgent', 'ProcessOptimization'),
+    ('ReviewerAgent', 'CodeReview'),
+    ('DocAgent', 'Documentation'),
+    ('OpsAgent', 'Deployment'),
+    ('ResearchAgent', 'Exploration')
+]
+TASK_TYPES = ['feature', 'bugfix', 'refactor', 'research', 'documentation', 'release']
+JOURNAL_START = 1640995200  # 2022-01-01 00:00 UTC
+JOURNAL_YEARS = 3
+
+
+class SyntheticJournal:
+    """
+    Seeded generator for a realistic PDCA journal.
+
+    - PDCAs are spread over JOURNAL_YEARS with strictly increasing timestamps
+      and IDs following the YYYYMMDD-HHMMSS-Agent.Role filename pattern.
+    - Each agent works in sessions; consecutive PDCAs of a session form a
+      PRECEDES breadcrumb chain, and some sessions start with a hand-off
+      from another agent's latest PDCA.
+    - A few hub PDCAs (sprint kickoffs, architecture decisions) attract
+      REFERENCES links with a Zipf-like popularity.
+    - DERIVED_FROM links point back to a recent PDCA of any agent.
+    """
+
+    def __init__(self, node_count: int, seed: int = 42):
+        self.node_count = node_count
+        self.seed = seed
+        self.hub_count = max(1, node_count // 1000)
+        self.ids = []
+        self.agents = []
+        self.timestamps = []
+        self.chains = []  # lists of indexes forming PRECEDES chains
+        self._generate_nodes()
+
+    def _generate_nodes(self):
+        """Assign timestamps, agents and session chains (held as indexes)."""
+        rng = random.Random(self.seed)
+        mean_gap = JOURNAL_YEARS * 365 * 86400 / self.node_count
+        timestamp = JOURNAL_START
+        open_chains = {}
+        for index in range(self.node_count):
+            timestamp += 1 + int(rng.expovariate(1 / max(mean_gap - 1, 1)))
+            agent = rng.randrange(len(AGENTS))
+            agent_name, agent_role = AGENTS[agent]
+            stamp = datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y%m%d-%H%M%S")
+            self.ids.append(f"{stamp}-{agent_name}.{agent_role}")
+            self.agents.append(agent)
+            self.timestamps.append(timestamp)
+
+            chain = open_chains.get(agent)
+            if chain is None or rng.random() < 0.05:  # new session
+                chain = [index]
+                self.chains.append(chain)
+                open_chains[agent] = chain
+            else:
+                chain.append(index)
+
+    def nodes(self) -> Iterator[Dict]:
+        """Yield PDCA dictionaries for add_pdca_nodes_bulk()."""
+        rng = random.Random(self.seed + 1)
+        for index, pdca_id in enumerate(self.ids):
+            agent_name, agent_role = AGENTS[self.agents[index]]
+            timestamp = self.timestamps[index]
+            yield {
+                'id': pdca_id,
+                'agent_name': agent_name,
+                'agent_role': agent_role,
+                'date': datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d"),
+                'timestamp': timestamp,
+                'session_id': f"session-{index // 50}",
+                'branch': f"dev/{agent_name.lower()}",
+                'sprint': f"sprint-{(timestamp - JOURNAL_START) // (14 * 86400)}",
+                'cmm_level': rng.randint(1, 5),
+                'task_type': rng.choice(TASK_TYPES),
+                'objective': f"{rng.choice(TASK_TYPES).title()} work item {index} for {agent_role}",
+                'quality_score': round(rng.random(), 3),
+                'verification_status': rng.choice(['verified', 'pending', 'failed']),
+                'file_path': f"scrum.pmo/agents/{agent_name}/{pdca_id}.pdca.md"
+            }
+
+    def relationships(self) -> Iterator[tuple]:
+        """Yield (from, to, type, weight, metadata) tuples for add_relationships_bulk()."""
+        rng = random.Random(self.seed + 2)
+        hubs = sorted(rng.sample(range(self.node_count), self.hub_count))
+        latest_by_agent = {}
+        for chain in self.chains:
+            head = chain[0]
+            # Hand-off from the latest PDCA of another agent before this session
+            previous = [i for a, i in latest_by_agent.items() if a != self.agents[head] and i < head]
+            if previous and rng.random() < 0.3:
+                yield (self.ids[max(previous)], self.ids[head], 'PRECEDES', 1.0,
+                       {'handoff': True})
+            latest_by_agent[self.agents[chain[-1]]] = chain[-1]
+            for a, b in zip(chain, chain[1:]):
+                yield (self.ids[a], self.ids[b], 'PRECEDES', 1.0, None)
+
+        for index in range(self.node_count):
+            if rng.random() < 0.3:
+                # Zipf-like hub popularity: low hub ranks are referenced most
+                hub = hubs[min(int(rng.paretovariate(1.2)) - 1, len(hubs) - 1)]
+                if hub != index:
+                    yield (self.ids[index], self.ids[hub], 'REFERENCES',
+                           round(rng.uniform(0.5, 1.0), 3), None)
+            if index and rng.random() < 0.2:
+                source = max(0, index - rng.randint(1, 500))
+                yield (self.ids[index], self.ids[source], 'DERIVED_FROM',
+                       round(rng.random(), 3), None)
+
+    def path_pairs(self, count: int, rng: random.Random, max_hops: int = 8) -> List[tuple]:
+        """Pairs (start, end) that are connected along a PRECEDES chain."""
+        long_chains = [chain for chain in self.chains if len(chain) > 1]
+        pairs = []
+        for _ in range(count):
+            chain = rng.choice(long_chains)
+            start = rng.randrange(len(chain) - 1)
+            end = min(len(chain) - 1, start + rng.randint(1, max_hops))
+            pairs.append((self.ids[chain[start]], self.ids[chain[end]]))
+        return pairs
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], rows: int) -> Dict:
+    """Latency percentiles (ms) and throughput for one operation."""
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        'calls': len(ordered),
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p95_ms': percentile(ordered, 0.95) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'mean_ms': total / len(ordered) * 1000 if ordered else 0.0,
+        'rows': rows,
+        'rows_per_s': rows / total if total else 0.0
+    }
+
+
+def _row_count(result) -> int:
+    """Rows returned by a graph or temporal API call."""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict) and 'pdcas' in result:
+        return len(result['pdcas'])
+    if isinstance(result, dict) and 'current_pdca' in result:
+        return len(result['predecessors']) + len(result['successors'])
+    return 1
+
+
+def time_calls(calls: List[Callable[[], object]]) -> Dict:
+    """Time each call and count the rows it returned."""
+    latencies = []
+    rows = 0
+    for call in calls:
+        started = time.perf_counter()
+        result = call()
+        latencies.append(time.perf_counter() - started)
+        rows += _row_count(result)
+    return summarize(latencies, rows)
+
+
+def run_tier(node_count: int, seed: int = 42, queries: int = DEFAULT_QUERIES,
+             db_dir: Optional[str] = None, production: bool = False) -> Dict:
+    """
+    Build a synthetic journal of ``node_count`` PDCAs and benchmark it.
+
+    Args:
+        node_count: Number of PDCAs
+        seed: Random seed for the journal and the query sample
+        queries: Timed calls per read operation
+        db_dir: Directory for the benchmark database (default: a temp dir)
+        production: Open the graph with the production profile
+
+    Returns:
+        Dictionary of operation name to summary
+    """
+    work_dir = tempfile.mkdtemp(dir=db_dir)
+    results = {}
+    try:
+        journal = SyntheticJournal(node_count, seed)
+        # The read cache is disabled so every call measures SQLite
+        graph = SQLiteGraph(os.path.join(work_dir, 'benchmark.db'), production=production,
+                            cache_entries=0)
+        temporal = TemporalIndex(graph)
+
+        started = time.perf_counter()
+        written = graph.add_pdca_nodes_bulk(journal.nodes())
+        results['ingest_nodes'] = summarize([time.perf_counter() - started], written['inserted'])
+        started = time.perf_counter()
+        written = graph.add_relationships_bulk(journal.relationships())
+        results['ingest_relationships'] = summarize([time.perf_counter() - started],
+                                                    written['inserted'] + written['replaced'])
+
+        rng = random.Random(seed + 3)
+        sample = [journal.ids[rng.randrange(node_count)] for _ in range(queries)]
+        results['get_successors'] = time_calls([lambda i=i: graph.get_successors(i) for i in sample])
+        results['get_predecessors'] = time_calls([lambda i=i: graph.get_predecessors(i) for i in sample])
+        results['get_breadcrumb_navigation'] = time_calls(
+            [lambda i=i: graph.get_breadcrumb_navigation(i) for i in sample])
+        results['find_path'] = time_calls(
+            [lambda a=a, b=b: graph.find_path(a, b) for a, b in journal.path_pairs(queries, rng)])
+        results['get_graph_stats'] = time_calls([graph.get_graph_stats] * max(1, queries // 10))
+
+        def time_range():
+            start = rng.randrange(journal.timestamps[0], journal.timestamps[-1])
+            return lambda: temporal.timeline(start, start + 7 * 86400)
+
+        results['temporal_range'] = time_calls([time_range() for _ in range(queries)])
+        results['temporal_agent'] = time_calls(
+            [lambda a=rng.choice(AGENTS)[0]: temporal.agent_timeline(a, descending=True)
+             for _ in range(queries)])
+        results['temporal_after_pdca'] = time_calls(
+            [lambda i=i: temporal.after_pdca(i) for i in sample])
+
+        graph.close()
+        results['database_bytes'] = os.path.getsize(os.path.join(work_dir, 'benchmark.db'))
+        return results
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    Find operations that regressed against a baseline run.
+
+    Latency regresses when p95 exceeds the baseline by more than
+    ``threshold``; ingestion regresses when rows/s drops by more than it.
+
+    Returns:
+        List of {'tier', 'operation', 'metric', 'baseline', 'current', 'change'}
+    """
+    regressions = []
+    for tier, operations in results['tiers'].items():
+        for operation, current in operations.items():
+            previous = baseline.get('tiers', {}).get(tier, {}).get(operation)
+            if not isinstance(current, dict) or not isinstance(previous, dict):
+                continue
+            if operation.startswith('ingest_'):
+                metric, worse = 'rows_per_s', -1
+            else:
+                metric, worse = 'p95_ms', 1
+            if not previous.get(metric):
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            if change * worse > threshold:
+                regressions.append({
+                    'tier': tier,
+                    'operation': operation,
+                    'metric': metric,
+                    'baseline': previous[metric],
+                    'current': current[metric],
+                    'change': change
+                })
+    return regressions
+
+
+def print_report(results: Dict):
+    """Print a table of all tiers and operations."""
+    for tier, operations in results['tiers'].items():
+        print(f"\n{tier} ({results['node_counts'][tier]} PDCAs)")
+        print(f"  {'operation':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rows/s':>14}")
+        for operation, summary in operations.items():
+            if isinstance(summary, dict):
+                print(f"  {operation:<28}{summary['p50_ms']:>10.3f}{summary['p95_ms']:>10.3f}"
+                      f"{summary['p99_ms']:>10.3f}{summary['rows_per_s']:>14.0f}")
+        print(f"  database size: {operations['database_bytes'] / 1e6:.1f} MB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SQLiteGraph on synthetic journals")
+    parser.add_argument('--tiers', nargs='+', default=['small'],
+                        help=f"Scale tiers ({', '.join(SCALE_TIERS)}) or PDCA counts")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES,
+                        help="Timed calls per read operation")
+    parser.add_argument('--production', action='store_true',
+                        help="Use the production profile (WAL, mmap, read pool)")
+    parser.add_argument('--db-dir', help="Directory for benchmark databases")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Allowed slowdown versus the baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    logging.getLogger('sqlite_graph').setLevel(logging.WARNING)
+
+    results = {
+        'meta': {
+            'seed': args.seed,
+            'queries': args.queries,
+            'production': args.production,
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'created_at': datetime.now(timezone.utc).isoformat()
+        },
+        'node_counts': {},
+        'tiers': {}
+    }
+    for tier in args.tiers:
+        node_count = SCALE_TIERS[tier] if tier in SCALE_TIERS else int(tier)
+        print(f"Benchmarking {tier}: {node_count} PDCAs...")
+        results['node_counts'][tier] = node_count
+        results['tiers'][tier] = run_tier(node_count, args.seed, args.queries,
+                                          args.db_dir, args.production)
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"  {r['tier']}/{r['operation']} {r['metric']}: "
+                      f"{r['baseline']:.3f} -> {r['current']:.3f} ({r['change']:+.0%})")
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,887 @@
+#!/usr/bin/env python3
+"""
+Compact Integer-Keyed Storage for the SQLite Graph Tier
+
+SQLiteGraph keys everything by the PDCA id string (about 55 characters,
+e.g. ``20241027-100000-BuilderAgent.ComponentDevelopment``). The string is
+repeated in the pdcas primary key, in both endpoint columns of
+pdca_relationships and in every index over them, and agent names, roles
+and relationship types are stored as free text on every row.
+CompactSQLiteGraph stores the same graph with integer keys:
+
+- ``pdca_keys`` maps each PDCA id string to an integer node id; it is the
+  only place the string is stored
+- ``pdca_agents``, ``pdca_roles`` and ``pdca_relationship_types`` intern
+  the repeated names
+- ``pdca_nodes`` holds the node columns with integer agent and role ids
+- ``pdca_edges`` is a WITHOUT ROWID table keyed by
+  (from_node, type_id, to_node), so successor lookups are one clustered
+  range scan and joins compare integers
+- creation times are Unix seconds; reads return them in SQLite's
+  ``YYYY-MM-DD HH:MM:SS`` form, like SQLiteGraph
+
+The public API takes and returns string ids. The views
+``pdca_node_view`` and ``pdca_edge_view`` show the familiar string
+columns for ad-hoc SQL. migrate_to_compact() (or ``python
+compact_graph.py SOURCE TARGET``) copies an existing SQLiteGraph
+database in one pass.
+
+CompactSQLiteGraph offers the write and traversal subset of SQLiteGraph:
+node and relationship writes (single and bulk), get_pdca_node,
+get_successors, get_predecessors, get_neighbors_many, find_path,
+shortest_path and get_graph_stats. Caching, statistics triggers,
+metadata and reachability indexes and the change log stay with
+SQLiteGraph.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from graph_algorithms import DEFAULT_MAX_VISITS, bidirectional_bfs, dijkstra
+from graph_connections import apply_pragmas, production_pragmas, read_only_uri
+from graph_rows import build_rows, check_row_format, select_list
+from sqlite_graph import DEFAULT_BULK_CHUNK_SIZE, _bulk_write_chunks, _pdca_row, _relationship_row
+
+logger = logging.getLogger(__name__)
+
+# Interned dimension -> (table, id column)
+_DIMENSIONS = {
+    'agent': ('pdca_agents', 'agent_id'),
+    'role': ('pdca_roles', 'role_id'),
+    'relationship_type': ('pdca_relationship_types', 'type_id')
+}
+
+_NODE_INSERT_SQL = """
+    INSERT OR REPLACE INTO pdca_nodes (
+        node_id, agent_id, role_id, date, timestamp,
+        session_id, branch, sprint, cmm_level, task_type,
+        objective, quality_score, verification_status, file_path
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_EDGE_INSERT_SQL = """
+    INSERT OR REPLACE INTO pdca_edges (from_node, type_id, to_node, weight, metadata)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Edge columns of get_successors()/get_predecessors() rows (see graph_rows)
+_ADJACENT_EDGE_EXPRESSIONS = {
+    'weight': 'e.weight',
+    'metadata': 'e.metadata',
+    'relationship_created': "datetime(e.created_at, 'unixepoch')"
+}
+
+# Edge columns of get_neighbors_many() rows
+_NEIGHBOR_EDGE_EXPRESSIONS = {
+    'weight': 'r.weight',
+    'metadata': 'r.metadata',
+    'relationship_created': "datetime(r.created_at, 'unixepoch')",
+    'relationship_type': 't.name',
+    'direction': 'r.direction'
+}
+
+
+def _database_bytes(conn: sqlite3.Connection, schema: str = 'main') -> int:
+    """Size of a database in bytes (page_count * page_size)."""
+    page_count = conn.execute(f"PRAGMA {schema}.page_count").fetchone()[0]
+    page_size = conn.execute(f"PRAGMA {schema}.page_size").fetchone()[0]
+    return page_count * page_size
+
+
+class CompactSQLiteGraph:
+    """
+    PDCA graph stored with integer node ids and interned names.
+
+    Example:
+        graph = CompactSQLiteGraph("pdca_compact.db")
+        graph.import_sqlite_graph("pdca_timeline.db")
+        graph.get_successors("20241027-100000-BuilderAgent.ComponentDevelopment")
+    """
+
+    def __init__(self, db_path: str = "pdca_compact.db", production: bool = False,
+                 pragmas: Optional[Dict] = None):
+        """
+        Open (or create) a compact graph database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            production: Use the production pragma profile (see graph_connections)
+            pragmas: Explicit pragma dictionary
+        """
+        self.db_path = db_path
+        self.pragmas = pragmas if pragmas is not None else (
+            production_pragmas() if production else {})
+        # uri=True lets import_sqlite_graph() attach its source read-only
+        self.conn = sqlite3.connect(db_path, uri=True, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        apply_pragmas(self.conn, self.pragmas)
+        # One connection shared by all threads; every statement runs under the lock
+        self._lock = threading.RLock()
+        self._create_schema()
+        logger.info("Compact SQLite graph database initialized at %s", db_path)
+
+    def _create_schema(self):
+        """Create the compact tables, indexes and string-keyed views."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_keys (
+                node_id INTEGER PRIMARY KEY,
+                pdca_id TEXT NOT NULL UNIQUE
+            )
+        """)
+
+        for table, id_column in _DIMENSIONS.values():
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {id_column} INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                )
+            """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_nodes (
+                node_id INTEGER PRIMARY KEY REFERENCES pdca_keys(node_id),
+                agent_id INTEGER NOT NULL REFERENCES pdca_agents(agent_id),
+                role_id INTEGER NOT NULL REFERENCES pdca_roles(role_id),
+                date TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                session_id TEXT,
+                branch TEXT,
+                sprint TEXT,
+                cmm_level INTEGER,
+                task_type TEXT,
+                objective TEXT,
+                quality_score REAL,
+                verification_status TEXT,
+                file_path TEXT,
+                created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+            )
+        """)
+
+        # Relationships to PDCAs that are not stored yet are kept, as in SQLiteGraph
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_edges (
+                from_node INTEGER NOT NULL,
+                type_id INTEGER NOT NULL,
+                to_node INTEGER NOT NULL,
+                weight REAL DEFAULT 1.0,
+                metadata TEXT,
+                created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                PRIMARY KEY (from_node, type_id, to_node)
+            ) WITHOUT ROWID
+        """)
+
+        # Index entries of a WITHOUT ROWID table end with the rest of the key (from_node)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_edges_to
+            ON pdca_edges(to_node, type_id)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_nodes_timestamp
+            ON pdca_nodes(timestamp)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_nodes_agent_timestamp
+            ON pdca_nodes(agent_id, timestamp)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_nodes_role_timestamp
+            ON pdca_nodes(role_id, timestamp)
+        """)
+
+        # The pdcas and pdca_relationships columns, for queries and ad-hoc SQL. Every
+        # node has its key, agent and role; LEFT JOINs let SQLite skip the lookups
+        # for columns a query does not select
+        cursor.execute("""
+            CREATE VIEW IF NOT EXISTS pdca_node_view AS
+            SELECT n.node_id, k.pdca_id AS id, a.name AS agent_name, r.name AS agent_role,
+                   n.date, n.timestamp, n.session_id, n.branch, n.sprint, n.cmm_level,
+                   n.task_type, n.objective, n.quality_score, n.verification_status,
+                   n.file_path, datetime(n.created_at, 'unixepoch') AS created_at
+            FROM pdca_nodes n
+            LEFT JOIN pdca_keys k ON k.node_id = n.node_id
+            LEFT JOIN pdca_agents a ON a.agent_id = n.agent_id
+            LEFT JOIN pdca_roles r ON r.role_id = n.role_id
+        """)
+
+        cursor.execute("""
+            CREATE VIEW IF NOT EXISTS pdca_edge_view AS
+            SELECT fk.pdca_id AS from_pdca_id, tk.pdca_id AS to_pdca_id,
+                   t.name AS relationship_type, e.weight, e.metadata,
+                   datetime(e.created_at, 'unixepoch') AS created_at
+            FROM pdca_edges e
+            JOIN pdca_keys fk ON fk.node_id = e.from_node
+            JOIN pdca_keys tk ON tk.node_id = e.to_node
+            JOIN pdca_relationship_types t ON t.type_id = e.type_id
+        """)
+
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Key and name interning
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _intern(cursor: sqlite3.Cursor, table: str, id_column: str, key_column: str,
+                values: Iterable[Optional[str]]) -> Dict[str, int]:
+        """
+        Map strings to their integer ids, assigning ids to new strings.
+
+        None values are skipped, so the NOT NULL column they feed rejects
+        the row.
+        """
+        values = json.dumps(list({value for value in values if value is not None}))
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {table} ({key_column})
+            SELECT value FROM json_each(?)
+        """, (values,))
+        cursor.execute(f"""
+            SELECT {key_column}, {id_column} FROM {table}
+            WHERE {key_column} IN (SELECT value FROM json_each(?))
+        """, (values,))
+        return {key: key_id for key, key_id in cursor.fetchall()}
+
+    def _intern_nodes(self, cursor: sqlite3.Cursor, pdca_ids: Iterable[str]) -> Dict[str, int]:
+        return self._intern(cursor, 'pdca_keys', 'node_id', 'pdca_id', pdca_ids)
+
+    def _intern_names(self, cursor: sqlite3.Cursor, dimension: str,
+                      names: Iterable[str]) -> Dict[str, int]:
+        table, id_column = _DIMENSIONS[dimension]
+        return self._intern(cursor, table, id_column, 'name', names)
+
+    def _lookup(self, cursor: sqlite3.Cursor, table: str, id_column: str, key_column: str,
+                values: Iterable[str]) -> Dict[str, int]:
+        """Map existing strings to their ids without assigning new ones."""
+        cursor.execute(f"""
+            SELECT {key_column}, {id_column} FROM {table}
+            WHERE {key_column} IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(values)),))
+        return {key: key_id for key, key_id in cursor.fetchall()}
+
+    def _node_ids(self, cursor: sqlite3.Cursor, pdca_ids: Iterable[str]) -> Dict[str, int]:
+        return self._lookup(cursor, 'pdca_keys', 'node_id', 'pdca_id', pdca_ids)
+
+    def _type_id(self, cursor: sqlite3.Cursor, relationship_type: str) -> Optional[int]:
+        return self._lookup(cursor, 'pdca_relationship_types', 'type_id', 'name',
+                            [relationship_type]).get(relationship_type)
+
+    def _pdca_ids(self, cursor: sqlite3.Cursor, node_ids: Iterable[int]) -> Dict[int, str]:
+        cursor.execute("""
+            SELECT node_id, pdca_id FROM pdca_keys
+            WHERE node_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(node_ids)),))
+        return {node_id: pdca_id for node_id, pdca_id in cursor.fetchall()}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_pdca_node(self, pdca_data: Dict) -> bool:
+        """
+        Add a PDCA node to the graph (replacing a node with the same id).
+
+        Args:
+            pdca_data: Dictionary containing PDCA information
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        result = self.add_pdca_nodes_bulk([pdca_data])
+        return result['failed'] == 0 and 'error' not in result
+
+    def add_relationship(self, from_pdca_id: str, to_pdca_id: str,
+                         relationship_type: str = "PRECEDES",
+                         weight: float = 1.0, metadata: Optional[Dict] = None) -> bool:
+        """
+        Add a relationship between two PDCAs.
+
+        Args:
+            from_pdca_id: Source PDCA ID
+            to_pdca_id: Target PDCA ID
+            relationship_type: Type of relationship (default: PRECEDES)
+            weight: Relationship weight (default: 1.0)
+            metadata: Additional metadata as dictionary
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        result = self.add_relationships_bulk(
+            [(from_pdca_id, to_pdca_id, relationship_type, weight, metadata)])
+        return result['failed'] == 0 and 'error' not in result
+
+    def add_pdca_nodes_bulk(self, pdcas: Iterable[Dict],
+                            chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Dict:
+        """
+        Add many PDCA nodes in a single transaction.
+
+        Args:
+            pdcas: Iterable (or generator) of PDCA dictionaries
+            chunk_size: Number of rows per executemany() call
+
+        Returns:
+            Dictionary with inserted, replaced and failed counts plus a list
+            of per-row errors ({'index', 'id', 'error'})
+        """
+        def to_params(cursor, rows):
+            rows = [_pdca_row(pdca_data) for pdca_data in rows]
+            if any(row[0] is None for row in rows):
+                # A NULL INTEGER PRIMARY KEY would be assigned a fresh node id
+                raise ValueError("PDCA id is required")
+            nodes = self._intern_nodes(cursor, (row[0] for row in rows))
+            agents = self._intern_names(cursor, 'agent', (row[1] for row in rows))
+            roles = self._intern_names(cursor, 'role', (row[2] for row in rows))
+            return [(nodes.get(row[0]), agents.get(row[1]), roles.get(row[2])) + row[3:]
+                    for row in rows]
+
+        def existing_keys(cursor, params):
+            cursor.execute("""
+                SELECT node_id FROM pdca_nodes
+                WHERE node_id IN (SELECT value FROM json_each(?))
+            """, (json.dumps([row[0] for row in params]),))
+            return {row[0] for row in cursor.fetchall()}
+
+        return self._bulk_write(pdcas, chunk_size, _NODE_INSERT_SQL, to_params,
+                                lambda params: params[0], existing_keys,
+                                lambda pdca_data: pdca_data.get('id'), "PDCA nodes")
+
+    def add_relationships_bulk(self, relationships: Iterable[Any],
+                               chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Dict:
+        """
+        Add many relationships in a single transaction.
+
+        Items use the same formats as SQLiteGraph.add_relationships_bulk():
+        a dictionary with the add_relationship() keyword names or a tuple of
+        (from_pdca_id, to_pdca_id[, relationship_type[, weight[, metadata]]]).
+
+        Args:
+            relationships: Iterable (or generator) of relationships
+            chunk_size: Number of rows per executemany() call
+
+        Returns:
+            Dictionary with inserted, replaced and failed counts plus a list
+            of per-row errors ({'index', 'id', 'error'})
+        """
+        def to_params(cursor, rows):
+            rows = [_relationship_row(relationship) for relationship in rows]
+            nodes = self._intern_nodes(cursor, (pdca_id for row in rows for pdca_id in row[:2]))
+            types = self._intern_names(cursor, 'relationship_type', (row[2] for row in rows))
+            return [(nodes.get(row[0]), types.get(row[2]), nodes.get(row[1]), row[3], row[4])
+                    for row in rows]
+
+        def existing_keys(cursor, params):
+            cursor.execute("""
+                SELECT e.from_node, e.type_id, e.to_node
+                FROM json_each(?) k
+                JOIN pdca_edges e
+                  ON e.from_node = json_extract(k.value, '$[0]')
+                 AND e.type_id = json_extract(k.value, '$[1]')
+                 AND e.to_node = json_extract(k.value, '$[2]')
+            """, (json.dumps([row[:3] for row in params]),))
+            return {tuple(row) for row in cursor.fetchall()}
+
+        def row_key(relationship):
+            if isinstance(relationship, dict):
+                return (relationship.get('from_pdca_id'), relationship.get('to_pdca_id'))
+            return tuple(relationship[:2])
+
+        return self._bulk_write(relationships, chunk_size, _EDGE_INSERT_SQL, to_params,
+                                lambda params: params[:3], existing_keys, row_key,
+                                "relationships")
+
+    def _bulk_write(self, rows: Iterable[Any], chunk_size: int, sql: str,
+                    to_params: Callable, params_key: Callable, existing_keys: Callable,
+                    row_key: Callable, label: str) -> Dict:
+        """
+        Run sqlite_graph._bulk_write_chunks() in one transaction.
+
+        ``to_params(cursor, chunk)`` interns the ids and names of a whole
+        chunk at once.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        result = {'inserted': 0, 'replaced': 0, 'failed': 0, 'errors': []}
+
+        with self._lock:
+            cursor = self.conn.cursor()
+            try:
+                if not self.conn.in_transaction:
+                    cursor.execute("BEGIN")
+                _bulk_write_chunks(cursor, rows, chunk_size, sql, to_params,
+                                   params_key, existing_keys, row_key, result)
+                self.conn.commit()
+                logger.info("Compact bulk added %s: %d inserted, %d replaced, %d failed",
+                            label, result['inserted'], result['replaced'], result['failed'])
+
+            except Exception as e:
+                self.conn.rollback()
+                logger.error("Error bulk adding %s: %s", label, e)
+                result['inserted'] = 0
+                result['replaced'] = 0
+                result['error'] = str(e)
+
+        return result
+
+    def import_sqlite_graph(self, source_path: str) -> Dict:
+        """
+        Copy every node and relationship of a SQLiteGraph database.
+
+        The source is attached read-only and copied with INSERT ... SELECT
+        in one transaction, keeping creation times. Node ids are assigned
+        in (timestamp, id) order, so a time range of nodes is stored
+        contiguously. Rows already in this graph are replaced. A NULL
+        relationship_type is stored as ''.
+
+        Args:
+            source_path: Path of the SQLiteGraph database
+
+        Returns:
+            Dictionary with nodes and relationships copied, plus
+            source_bytes and target_bytes database sizes
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("ATTACH DATABASE ? AS source", (read_only_uri(source_path),))
+            try:
+                cursor.execute("BEGIN")
+                cursor.execute("""
+                    INSERT OR IGNORE INTO pdca_agents (name)
+                    SELECT DISTINCT agent_name FROM source.pdcas
+                """)
+                cursor.execute("""
+                    INSERT OR IGNORE INTO pdca_roles (name)
+                    SELECT DISTINCT agent_role FROM source.pdcas
+                """)
+                cursor.execute("""
+                    INSERT OR IGNORE INTO pdca_relationship_types (name)
+                    SELECT DISTINCT COALESCE(relationship_type, '') FROM source.pdca_relationships
+                """)
+                cursor.execute("""
+                    INSERT OR IGNORE INTO pdca_keys (pdca_id)
+                    SELECT id FROM source.pdcas ORDER BY timestamp, id
+                """)
+                cursor.execute("""
+                    INSERT OR IGNORE INTO pdca_keys (pdca_id)
+                    SELECT from_pdca_id FROM source.pdca_relationships
+                    UNION SELECT to_pdca_id FROM source.pdca_relationships
+                """)
+
+                cursor.execute("""
+                    INSERT OR REPLACE INTO pdca_nodes (
+                        node_id, agent_id, role_id, date, timestamp,
+                        session_id, branch, sprint, cmm_level, task_type,
+                        objective, quality_score, verification_status, file_path, created_at
+                    )
+                    SELECT k.node_id, a.agent_id, r.role_id, p.date, p.timestamp,
+                           p.session_id, p.branch, p.sprint, p.cmm_level, p.task_type,
+                           p.objective, p.quality_score, p.verification_status, p.file_path,
+                           CAST(strftime('%s', p.created_at) AS INTEGER)
+                    FROM source.pdcas p
+                    JOIN pdca_keys k ON k.pdca_id = p.id
+                    JOIN pdca_agents a ON a.name = p.agent_name
+                    JOIN pdca_roles r ON r.name = p.agent_role
+                """)
+                nodes = cursor.rowcount
+
+                cursor.execute("""
+                    INSERT OR REPLACE INTO pdca_edges (
+                        from_node, type_id, to_node, weight, metadata, created_at
+                    )
+                    SELECT fk.node_id, t.type_id, tk.node_id, pr.weight, pr.metadata,
+                           CAST(strftime('%s', pr.created_at) AS INTEGER)
+                    FROM source.pdca_relationships pr
+                    JOIN pdca_keys fk ON fk.pdca_id = pr.from_pdca_id
+                    JOIN pdca_keys tk ON tk.pdca_id = pr.to_pdca_id
+                    JOIN pdca_relationship_types t
+                      ON t.name = COALESCE(pr.relationship_type, '')
+                    ORDER BY pr.id
+                """)
+                relationships = cursor.rowcount
+                self.conn.commit()
+
+                report = {
+                    'nodes': nodes,
+                    'relationships': relationships,
+                    'source_bytes': _database_bytes(self.conn, 'source'),
+                    'target_bytes': _database_bytes(self.conn)
+                }
+                logger.info("Imported %d nodes and %d relationships from %s",
+                            nodes, relationships, source_path)
+                return report
+
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                cursor.execute("DETACH DATABASE source")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_pdca_node(self, pdca_id: str) -> Optional[Dict]:
+        """
+        Get a single PDCA node.
+
+        Args:
+            pdca_id: PDCA ID
+
+        Returns:
+            PDCA dictionary (the pdcas columns), or None if it does not exist
+        """
+        columns, select_sql = select_list(None, 'v', {})
+        try:
+            with self._lock:
+                row = self.conn.execute(f"""
+                    SELECT {select_sql} FROM pdca_node_view v
+                    WHERE v.node_id = (SELECT node_id FROM pdca_keys WHERE pdca_id = ?)
+                """, (pdca_id,)).fetchone()
+            return dict(zip(columns, row)) if row else None
+
+        except Exception as e:
+            logger.error("Error getting PDCA node: %s", e)
+            return None
+
+    def get_predecessors(self, pdca_id: str, relationship_type: str = "PRECEDES",
+                         columns: Optional[Sequence[str]] = None,
+                         row_format: str = 'dict') -> List[Any]:
+        """
+        Get all PDCAs that precede the given PDCA.
+
+        Returns:
+            Rows as from SQLiteGraph.get_predecessors(), newest link first
+        """
+        return self._adjacent(pdca_id, 'in', relationship_type, columns, row_format)
+
+    def get_successors(self, pdca_id: str, relationship_type: str = "PRECEDES",
+                       columns: Optional[Sequence[str]] = None,
+                       row_format: str = 'dict') -> List[Any]:
+        """
+        Get all PDCAs that follow the given PDCA.
+
+        Returns:
+            Rows as from SQLiteGraph.get_successors(), newest link first
+        """
+        return self._adjacent(pdca_id, 'out', relationship_type, columns, row_format)
+
+    def _adjacent(self, pdca_id: str, direction: str, relationship_type: str,
+                  columns: Optional[Sequence[str]], row_format: str) -> List[Any]:
+        """One-hop neighbors of a PDCA, newest link first."""
+        if direction == 'out':
+            seed_column, neighbor_column = 'from_node', 'to_node'
+        else:
+            seed_column, neighbor_column = 'to_node', 'from_node'
+        check_row_format(row_format)
+        columns, select_sql = select_list(columns, 'v', _ADJACENT_EDGE_EXPRESSIONS)
+
+        try:
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.row_factory = None
+                cursor.execute(f"""
+                    SELECT {select_sql}
+                    FROM pdca_edges e
+                    JOIN pdca_node_view v ON v.node_id = e.{neighbor_column}
+                    WHERE e.{seed_column} = (SELECT node_id FROM pdca_keys WHERE pdca_id = ?)
+                      AND e.type_id = (SELECT type_id FROM pdca_relationship_types WHERE name = ?)
+                    ORDER BY e.created_at DESC
+                """, (pdca_id, relationship_type))
+                return build_rows(cursor.fetchall(), columns, row_format)
+
+        except Exception as e:
+            logger.error("Error getting %s: %s",
+                         'successors' if direction == 'out' else 'predecessors', e)
+            return []
+
+    def get_neighbors_many(self, pdca_ids: Iterable[str], direction: str = 'out',
+                           relationship_types: Optional[List[str]] = None,
+                           limit_per_seed: Optional[int] = None,
+                           order_by: str = 'weight',
+                           columns: Optional[Sequence[str]] = None,
+                           row_format: str = 'dict') -> Dict[str, List[Any]]:
+        """
+        Get the neighbors of many PDCAs in a single query.
+
+        Same arguments and results as SQLiteGraph.get_neighbors_many()
+        (without metadata_filter).
+
+        Returns:
+            Dictionary mapping every seed ID to its list of neighbor PDCAs
+        """
+        seeds = list(dict.fromkeys(pdca_ids))
+        results = {pdca_id: [] for pdca_id in seeds}
+        if not seeds:
+            return results
+
+        if direction not in ('out', 'in', 'both'):
+            raise ValueError(f"Unknown direction: {direction}")
+        if order_by == 'weight':
+            order_sql = "e.weight DESC, e.created_at DESC, e.neighbor_node DESC"
+        elif order_by == 'recency':
+            order_sql = "e.created_at DESC, e.neighbor_node DESC"
+        else:
+            raise ValueError(f"Unknown order_by: {order_by}")
+        check_row_format(row_format)
+        columns, select_sql = select_list(columns, 'v', _NEIGHBOR_EDGE_EXPRESSIONS)
+
+        edge_scans = []
+        for edge_direction, seed_column, neighbor_column in (('out', 'from_node', 'to_node'),
+                                                             ('in', 'to_node', 'from_node')):
+            if direction not in (edge_direction, 'both'):
+                continue
+            edge_scans.append(f"""
+                SELECT s.seed, e.{neighbor_column} AS neighbor_node,
+                       '{edge_direction}' AS direction, e.type_id, e.weight, e.metadata,
+                       e.created_at
+                FROM seeds s
+                CROSS JOIN pdca_edges e ON e.{seed_column} = s.node_id
+                WHERE e.type_id IN (SELECT type_id FROM types)
+            """)
+
+        try:
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.row_factory = None
+                cursor.execute(f"""
+                    WITH seeds AS (
+                        SELECT k.pdca_id AS seed, k.node_id
+                        FROM json_each(:seeds) s
+                        JOIN pdca_keys k ON k.pdca_id = s.value
+                    ),
+                    types AS (
+                        SELECT type_id FROM pdca_relationship_types
+                        WHERE :types IS NULL OR name IN (SELECT value FROM json_each(:types))
+                    ),
+                    edges AS ({' UNION ALL '.join(edge_scans)}),
+                    ranked AS (
+                        SELECT e.*, ROW_NUMBER() OVER (
+                            PARTITION BY e.seed ORDER BY {order_sql}
+                        ) AS neighbor_rank
+                        FROM edges e
+                        JOIN pdca_nodes n ON n.node_id = e.neighbor_node
+                    )
+                    SELECT r.seed, {select_sql}
+                    FROM ranked r
+                    JOIN pdca_node_view v ON v.node_id = r.neighbor_node
+                    JOIN pdca_relationship_types t ON t.type_id = r.type_id
+                    WHERE :limit IS NULL OR r.neighbor_rank <= :limit
+                    ORDER BY r.seed, r.neighbor_rank
+                """, {
+                    'seeds': json.dumps(seeds),
+                    'types': json.dumps(list(relationship_types)) if relationship_types else None,
+                    'limit': limit_per_seed
+                })
+                rows = cursor.fetchall()
+
+            for seed, row in zip((row[0] for row in rows),
+                                 build_rows((row[1:] for row in rows), columns, row_format)):
+                results[seed].append(row)
+            return results
+
+        except Exception as e:
+            logger.error("Error getting neighbors for many PDCAs: %s", e)
+            return results
+
+    def find_path(self, start_pdca_id: str, end_pdca_id: str,
+                  relationship_type: str = "PRECEDES", max_depth: int = 10,
+                  weighted: bool = False,
+                  max_visits: int = DEFAULT_MAX_VISITS,
+                  should_stop: Optional[Callable[[], bool]] = None) -> List[Dict]:
+        """
+        Find the shortest path between two PDCAs.
+
+        Returns:
+            List of PDCAs forming the path in order (each with its 'depth'),
+            or empty list if no path found
+        """
+        try:
+            result = self.shortest_path(start_pdca_id, end_pdca_id, relationship_type,
+                                        max_depth=max_depth, weighted=weighted,
+                                        max_visits=max_visits, should_stop=should_stop)
+            if not result['found']:
+                return []
+
+            columns, select_sql = select_list(None, 'v', {})
+            with self._lock:
+                rows = self.conn.execute(f"""
+                    SELECT {select_sql} FROM pdca_node_view v
+                    WHERE v.id IN (SELECT value FROM json_each(?))
+                """, (json.dumps(result['path']),)).fetchall()
+            nodes = {row[0]: dict(zip(columns, row)) for row in rows}
+            return [dict(nodes.get(pdca_id) or {'id': pdca_id}, depth=depth)
+                    for depth, pdca_id in enumerate(result['path'])]
+
+        except Exception as e:
+            logger.error("Error finding path: %s", e)
+            return []
+
+    def shortest_path(self, start_pdca_id: str, end_pdca_id: str,
+                      relationship_type: str = "PRECEDES", max_depth: int = 10,
+                      weighted: bool = False,
+                      max_visits: int = DEFAULT_MAX_VISITS,
+                      should_stop: Optional[Callable[[], bool]] = None) -> Dict:
+        """
+        Run the path engine over integer node ids.
+
+        Same search and result as SQLiteGraph.shortest_path(); the path
+        is translated back to PDCA ids once at the end.
+
+        Returns:
+            Dictionary with found, path (ordered PDCA IDs), cost, hops,
+            visited and budget_exhausted
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            nodes = self._node_ids(cursor, [start_pdca_id, end_pdca_id])
+            type_id = self._type_id(cursor, relationship_type)
+        start = nodes.get(start_pdca_id, -1)
+        end = nodes.get(end_pdca_id, -2)
+
+        def expand_out(node_ids):
+            return self._expand_frontier(node_ids, 'out', type_id)
+
+        def expand_in(node_ids):
+            return self._expand_frontier(node_ids, 'in', type_id)
+
+        if weighted:
+            result = dijkstra(start, end, expand_out, max_depth=max_depth,
+                              max_visits=max_visits, should_stop=should_stop)
+        else:
+            result = bidirectional_bfs(start, end, expand_out, expand_in,
+                                       max_depth=max_depth, max_visits=max_visits,
+                                       should_stop=should_stop)
+        if result['path']:
+            with self._lock:
+                names = self._pdca_ids(self.conn.cursor(), result['path'])
+            result['path'] = [names[node_id] for node_id in result['path']]
+        return result
+
+    def _expand_frontier(self, node_ids: List[int], direction: str,
+                         type_id: Optional[int]) -> Dict[int, List[Tuple[int, float]]]:
+        """Neighbors (node_id, weight) of a whole frontier in one query."""
+        if type_id is None:
+            return {}
+        if direction == 'out':
+            seed_column, neighbor_column = 'from_node', 'to_node'
+        else:
+            seed_column, neighbor_column = 'to_node', 'from_node'
+
+        with self._lock:
+            rows = self.conn.execute(f"""
+                SELECT e.{seed_column}, e.{neighbor_column}, e.weight
+                FROM json_each(?) s
+                CROSS JOIN pdca_edges e ON e.{seed_column} = s.value AND e.type_id = ?
+            """, (json.dumps(list(node_ids)), type_id)).fetchall()
+
+        neighbors = {}
+        for seed, neighbor, weight in rows:
+            neighbors.setdefault(seed, []).append((neighbor, weight))
+        return neighbors
+
+    def get_graph_stats(self) -> Dict:
+        """
+        Get graph statistics.
+
+        Same keys as SQLiteGraph.get_graph_stats(). There are no
+        statistics triggers here, so the counts scan the integer tables.
+
+        Returns:
+            Dictionary with graph statistics
+        """
+        try:
+            with self._lock:
+                cursor = self.conn.cursor()
+                node_count = cursor.execute("SELECT COUNT(*) FROM pdca_nodes").fetchone()[0]
+                cursor.execute("""
+                    SELECT t.name, COUNT(*)
+                    FROM pdca_edges e
+                    JOIN pdca_relationship_types t ON t.type_id = e.type_id
+                    GROUP BY e.type_id
+                """)
+                relationship_types = dict(cursor.fetchall())
+                cursor.execute("""
+                    SELECT k.pdca_id, SUM(c.count) AS connection_count
+                    FROM (
+                        SELECT from_node AS node_id, COUNT(*) AS count
+                        FROM pdca_edges GROUP BY from_node
+                        UNION ALL
+                        SELECT to_node, COUNT(*) FROM pdca_edges GROUP BY to_node
+                    ) c
+                    JOIN pdca_keys k ON k.node_id = c.node_id
+                    GROUP BY c.node_id
+                    ORDER BY connection_count DESC, k.pdca_id
+                    LIMIT 10
+                """)
+                most_connected = [{'pdca_id': pdca_id, 'connection_count': count}
+                                  for pdca_id, count in cursor.fetchall()]
+
+            edge_count = sum(relationship_types.values())
+            return {
+                'node_count': node_count,
+                'edge_count': edge_count,
+                'relationship_types': relationship_types,
+                'most_connected_nodes': most_connected,
+                'density': edge_count / (node_count * (node_count - 1)) if node_count > 1 else 0
+            }
+
+        except Exception as e:
+            logger.error("Error getting graph stats: %s", e)
+            return {}
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+
+def migrate_to_compact(source_path: str, target_path: str, **graph_kwargs) -> Dict:
+    """
+    Copy a SQLiteGraph database into a compact database.
+
+    Args:
+        source_path: Existing SQLiteGraph database
+        target_path: Compact database to create (or update)
+        **graph_kwargs: Passed to CompactSQLiteGraph
+
+    Returns:
+        Dictionary from CompactSQLiteGraph.import_sqlite_graph()
+    """
+    graph = CompactSQLiteGraph(target_path, **graph_kwargs)
+    try:
+        return graph.import_sqlite_graph(source_path)
+    finally:
+        graph.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Copy a PDCA graph database to the compact schema")
+    parser.add_argument('source', help="SQLiteGraph database")
+    parser.add_argument('target', help="Compact database to create")
+    parser.add_argument('--vacuum', action='store_true', help="VACUUM the target afterwards")
+    args = parser.parse_args(argv)
+
+    report = migrate_to_compact(args.source, args.target)
+    if args.vacuum:
+        conn = sqlite3.connect(args.target)
+        conn.execute("VACUUM")
+        report['target_bytes'] = _database_bytes(conn)
+        conn.close()
+
+    print(f"Copied {report['nodes']} nodes and {report['relationships']} relationships: "
+          f"{report['source_bytes'] / 1e6:.1f} MB -> {report['target_bytes'] / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
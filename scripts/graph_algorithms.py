@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Graph Algorithms for PDCA Relationship Traversal
+
+Storage-independent shortest-path search and budgeted neighborhood
+expansion used by the SQLite graph tier.
+The algorithms only see the graph through an ``expand`` callback, so the
+same code runs against SQL queries (SQLiteGraph) and in-memory adjacency
+snapshots.
+
+An expand callback takes a list of node IDs and returns a dictionary that
+maps each of them to a list of ``(neighbor_id, weight)`` tuples. A None
+weight (a NULL column) costs DEFAULT_EDGE_WEIGHT in every path search.
+"""
+
+import heapq
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+# Default cap on the number of distinct nodes a single path search may visit
+DEFAULT_MAX_VISITS = 100000
+
+# Cost of an edge without a weight, matching the weight column DEFAULT
+DEFAULT_EDGE_WEIGHT = 1.0
+
+# Nodes expanded together by best_first_expand(): the node being expanded
+# plus the best queued candidates that would be expanded next
+DEFAULT_EXPAND_BATCH = 32
+
+ExpandFn = Callable[[List[Hashable]], Dict[Hashable, List[Tuple[Hashable, float]]]]
+
+
+def _path_result(path: List[Hashable], cost: float, visited: int,
+                 budget_exhausted: bool = False) -> Dict:
+    """Build the result dictionary shared by all path searches."""
+    return {
+        'found': bool(path),
+        'path': path,
+        'cost': cost,
+        'hops': max(len(path) - 1, 0),
+        'visited': visited,
+        'budget_exhausted': budget_exhausted
+    }
+
+
+def bidirectional_bfs(start: Hashable, target: Hashable,
+                      expand_out: ExpandFn, expand_in: ExpandFn,
+                      max_depth: int = 10,
+                      max_visits: int = DEFAULT_MAX_VISITS,
+                      should_stop: Optional[Callable[[], bool]] = None) -> Dict:
+    """
+    Unweighted shortest path using bidirectional breadth-first search.
+
+    Both searches expand one full level at a time, always growing the
+    smaller frontier, so every level costs a single expand call. The search
+    stops as soon as the frontiers meet, when ``max_depth`` hops have been
+    explored, or when more than ``max_visits`` nodes have been seen.
+
+    Args:
+        start: Source node ID
+        target: Target node ID
+        expand_out: Callback returning outgoing neighbors
+        expand_in: Callback returning incoming neighbors
+        max_depth: Maximum path length in hops
+        max_visits: Node-visit budget
+        should_stop: Optional callback polled between levels for cancellation
+
+    Returns:
+        Dictionary with found, path (ordered node IDs), cost (summed edge
+        weights), hops, visited and budget_exhausted
+    """
+    if start == target:
+        return _path_result([start], 0.0, 1)
+
+    # parent maps: node -> (previous node towards the search origin, edge weight)
+    forward_parents = {start: (None, 0.0)}
+    backward_parents = {target: (None, 0.0)}
+    forward_frontier = [start]
+    backward_frontier = [target]
+    depth = 0
+
+    while forward_frontier and backward_frontier and depth < max_depth:
+        if should_stop is not None and should_stop():
+            break
+
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            frontier, parents, others, expand = (
+                forward_frontier, forward_parents, backward_parents, expand_out)
+        else:
+            frontier, parents, others, expand = (
+                backward_frontier, backward_parents, forward_parents, expand_in)
+
+        neighbors = expand(frontier)
+        next_frontier = []
+        meeting = []
+        for node in frontier:
+            for neighbor, weight in neighbors.get(node, ()):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = (node, DEFAULT_EDGE_WEIGHT if weight is None else weight)
+                next_frontier.append(neighbor)
+                if neighbor in others:
+                    meeting.append(neighbor)
+        depth += 1
+
+        if meeting:
+            best = min(meeting, key=lambda node: _hops(forward_parents, node) +
+                       _hops(backward_parents, node))
+            path, cost = _join_paths(forward_parents, backward_parents, best)
+            return _path_result(path, cost, len(forward_parents) + len(backward_parents))
+
+        if len(forward_parents) + len(backward_parents) > max_visits:
+            return _path_result([], 0.0, len(forward_parents) + len(backward_parents),
+                                budget_exhausted=True)
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    return _path_result([], 0.0, len(forward_parents) + len(backward_parents))
+
+
+def dijkstra(start: Hashable, target: Hashable, expand_out: ExpandFn,
+             max_depth: Optional[int] = None,
+             max_visits: int = DEFAULT_MAX_VISITS,
+             should_stop: Optional[Callable[[], bool]] = None) -> Dict:
+    """
+    Weighted shortest path using Dijkstra's algorithm.
+
+    Edge weights are treated as non-negative costs; negative weights are
+    rejected. The search returns as soon as the target is settled.
+
+    Without ``max_depth`` each node is settled at most once. With it, the
+    search runs over (node, hops) states, so a node reached cheaply over
+    too many hops does not hide a costlier path within the limit: a node
+    is settled again whenever it is reached with fewer hops than before.
+    Its neighbors are fetched once and reused.
+
+    Args:
+        start: Source node ID
+        target: Target node ID
+        expand_out: Callback returning outgoing neighbors with weights
+        max_depth: Optional maximum path length in hops
+        max_visits: Node-visit budget (distinct settled nodes)
+        should_stop: Optional callback polled between expansions for cancellation
+
+    Returns:
+        Dictionary with found, path (ordered node IDs), cost (summed edge
+        weights), hops, visited and budget_exhausted
+    """
+    limited = max_depth is not None
+    # States are (node, hops) when hop-limited and (node, 0) otherwise
+    start_state = (start, 0)
+    distances = {start_state: 0.0}
+    parents = {start_state: (None, 0.0)}
+    settled_hops = {}  # node -> fewest hops it has been settled with
+    adjacency = {}  # node -> neighbors, cached when nodes can be settled again
+    heap = [(0.0, 0, start_state)]
+    counter = 1  # tie-breaker so node IDs never need to be comparable
+
+    while heap:
+        if should_stop is not None and should_stop():
+            break
+
+        cost, _, state = heapq.heappop(heap)
+        node, hops = state
+        previous_hops = settled_hops.get(node)
+        if previous_hops is not None and (not limited or previous_hops <= hops):
+            continue
+        settled_hops[node] = hops
+
+        if node == target:
+            path, path_cost = _state_path(parents, state)
+            return _path_result(path, path_cost, len(settled_hops))
+
+        if len(settled_hops) > max_visits:
+            return _path_result([], 0.0, len(settled_hops), budget_exhausted=True)
+
+        if limited and hops >= max_depth:
+            continue
+
+        if node in adjacency:
+            neighbors = adjacency[node]
+        else:
+            neighbors = expand_out([node]).get(node, ())
+            if limited:
+                adjacency[node] = neighbors
+        next_hops = hops + 1 if limited else 0
+        for neighbor, weight in neighbors:
+            if weight is None:
+                weight = DEFAULT_EDGE_WEIGHT
+            if weight < 0:
+                raise ValueError(f"Negative edge weight {weight} from {node} to {neighbor}")
+            neighbor_hops = settled_hops.get(neighbor)
+            if neighbor_hops is not None and (not limited or neighbor_hops <= next_hops):
+                continue
+            neighbor_state = (neighbor, next_hops)
+            new_cost = cost + weight
+            if new_cost < distances.get(neighbor_state, float('inf')):
+                distances[neighbor_state] = new_cost
+                parents[neighbor_state] = (state, weight)
+                heapq.heappush(heap, (new_cost, counter, neighbor_state))
+                counter += 1
+
+    return _path_result([], 0.0, len(settled_hops))
+
+
+def best_first_expand(seeds: List[Hashable], expand: ExpandFn, max_hops: int = 2,
+                      node_budget: Optional[int] = None,
+                      cost: Optional[Callable[[Hashable], float]] = None,
+                      cost_budget: Optional[float] = None,
+                      expand_batch: int = DEFAULT_EXPAND_BATCH,
+                      should_stop: Optional[Callable[[], bool]] = None) -> Dict:
+    """
+    Collect the best-scoring neighborhood of several seeds within budgets.
+
+    Seeds score 1.0; a neighbor scores its parent's score times the edge
+    score returned by ``expand`` (higher is better, negative counts as 0).
+    Nodes are taken in score order, each at most once, until
+    ``node_budget`` nodes are taken or the queue is empty. A node whose
+    cost does not fit the remaining ``cost_budget`` is skipped, so cheaper
+    nodes further down the queue can still fill the budget.
+
+    A taken node is expanded together with the best queued candidates
+    that have not been expanded yet, so one expand call usually serves
+    several of the following steps; the order stays strictly best-first.
+
+    Args:
+        seeds: Start node IDs (duplicates are ignored)
+        expand: Callback returning ``(neighbor_id, edge_score)`` tuples
+        max_hops: Maximum distance from the nearest seed
+        node_budget: Maximum number of nodes taken (None for no limit)
+        cost: Callback returning the cost of a node (default 0)
+        cost_budget: Maximum summed cost of the taken nodes (None for no limit)
+        expand_batch: Maximum nodes per expand call
+        should_stop: Optional callback polled between expansions for cancellation
+
+    Returns:
+        Dictionary with nodes (list of ``(node_id, score, hops, via)`` in
+        the order taken, ``via`` being the parent or None for seeds), cost,
+        truncated (True if a budget left reachable nodes out) and expansions
+        (number of expand calls)
+    """
+    heap = []
+    counter = 0  # tie-breaker: seed order first, then discovery order
+    for seed in dict.fromkeys(seeds):
+        heap.append((-1.0, counter, seed, 0, None))
+        counter += 1
+
+    taken = {}
+    order = []
+    expanded = {}
+    total_cost = 0.0
+    truncated = False
+    expansions = 0
+
+    while heap:
+        if node_budget is not None and len(order) >= node_budget:
+            truncated = any(entry[2] not in taken for entry in heap)
+            break
+        if should_stop is not None and should_stop():
+            break
+
+        negative_score, _, node, hops, via = heapq.heappop(heap)
+        if node in taken:
+            continue
+        node_cost = cost(node) if cost is not None else 0.0
+        if cost_budget is not None and total_cost + node_cost > cost_budget:
+            truncated = True
+            continue
+        taken[node] = hops
+        order.append((node, -negative_score, hops, via))
+        total_cost += node_cost
+
+        if hops >= max_hops:
+            continue
+        if node not in expanded:
+            batch = [node] + [entry[2] for entry in heapq.nsmallest(expand_batch, heap)
+                              if entry[3] < max_hops and entry[2] not in taken
+                              and entry[2] not in expanded]
+            batch = list(dict.fromkeys(batch))[:expand_batch]
+            neighbors = expand(batch)
+            expansions += 1
+            for pending in batch:
+                expanded[pending] = neighbors.get(pending, [])
+
+        for neighbor, edge_score in expanded.pop(node):
+            if neighbor in taken:
+                continue
+            score = -negative_score * max(edge_score or 0.0, 0.0)
+            heapq.heappush(heap, (-score, counter, neighbor, hops + 1, node))
+            counter += 1
+
+    return {
+        'nodes': order,
+        'cost': total_cost,
+        'truncated': truncated,
+        'expansions': expansions
+    }
+
+
+def _hops(parents: Dict, node: Hashable) -> int:
+    """Count the hops from ``node`` back to the search origin."""
+    count = 0
+    while parents[node][0] is not None:
+        node = parents[node][0]
+        count += 1
+    return count
+
+
+def _state_path(parents: Dict, state: Tuple) -> Tuple[List[Hashable], float]:
+    """Follow dijkstra()'s (node, hops) parent chain back to the start."""
+    path = []
+    cost = 0.0
+    while state is not None:
+        path.append(state[0])
+        state, weight = parents[state]
+        cost += weight
+    path.reverse()
+    return path, cost
+
+
+def _join_paths(forward_parents: Dict, backward_parents: Dict,
+                meeting: Hashable) -> Tuple[List[Hashable], float]:
+    """Stitch the forward and backward parent chains at ``meeting``."""
+    path = []
+    cost = 0.0
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node, weight = forward_parents[node]
+        cost += weight
+    path.reverse()
+
+    node, weight = backward_parents[meeting]
+    cost += weight
+    while node is not None:
+        path.append(node)
+        node, weight = backward_parents[node]
+        cost += weight
+
+    return path, cost
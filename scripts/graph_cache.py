@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Result Cache for SQLite Graph Reads
+
+A bounded LRU cache with an optional TTL for hot read queries
+(successors, predecessors, breadcrumbs, paths and node lookups). Agents
+revisit the same few hundred PDCAs all day, so repeated lookups are served
+from memory instead of re-querying SQLite and re-parsing metadata JSON.
+
+Invalidation uses SQLiteGraph._change_token(): the cache is dropped as soon
+as this instance commits a write or another connection commits to the
+database. Entries are keyed by the query arguments, bounded by entry count
+and by an estimated memory size, and returned as copies so callers can
+modify results freely.
+"""
+
+import copy
+import sys
+import threading
+import time
+import logging
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_ENTRIES = 1024
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a query result in bytes."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU/TTL cache invalidated by a change token.
+
+    Counters:
+        hits, misses, evictions (LRU or memory cap), expirations (TTL),
+        invalidations (whole-cache drops after a database change)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum estimated size of all cached results
+            ttl: Seconds an entry stays valid (None for no expiry)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._token = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, token: Any):
+        """
+        Look up ``key`` under change token ``token``.
+
+        Returns:
+            Tuple of (found, copy of the cached value)
+        """
+        with self._lock:
+            self._check_token(token)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any, token: Any):
+        """
+        Store ``value`` if ``token`` is still current.
+
+        ``token`` must be taken before the query ran, so a result that may
+        predate a concurrent commit is never stored under the newer token.
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        value = copy.deepcopy(value)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._check_token(token)
+            if token != self._token:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _check_token(self, token: Any):
+        """Drop every entry when the database changed (caller holds the lock)."""
+        if token == self._token:
+            return
+        if self._entries:
+            self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+        self._token = token
+
+    def _remove(self, key: Hashable):
+        value, size, expires_at = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of an argument (dicts and lists become sorted/plain tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def cached_read(name: str) -> Callable:
+    """
+    Decorator caching a SQLiteGraph read method in ``self._cache``.
+
+    Results are keyed by method name and arguments. Empty results are not
+    cached, because the read methods also return them after a logged error.
+    Calls with a should_stop callback bypass the cache.
+    """
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self._cache
+            if cache is None or kwargs.get('should_stop') is not None:
+                return method(self, *args, **kwargs)
+            key = (name, _freeze(args), _freeze(kwargs))
+            try:
+                hash(key)
+            except TypeError:
+                return method(self, *args, **kwargs)
+
+            token = self._change_token()
+            found, value = cache.get(key, token)
+            if found:
+                return value
+            value = method(self, *args, **kwargs)
+            if value:
+                cache.put(key, value, token)
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Connection Management for the SQLite Graph Tier
+
+Pragma profiles and a per-thread read connection pool for SQLiteGraph.
+In the production profile the database runs in WAL mode, so any number of
+reader connections can query while a single writer connection (owned by
+SQLiteGraph) commits, including writers in other processes such as the
+nightly indexer.
+"""
+
+import sqlite3
+import threading
+import weakref
+import logging
+from itertools import count
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default page cache per connection, in KiB (negative cache_size = KiB)
+DEFAULT_CACHE_SIZE_KIB = 65536
+
+# Opt-in profile for concurrent serving and indexing
+PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 268435456,
+    'cache_size': -DEFAULT_CACHE_SIZE_KIB,
+    'temp_store': 'MEMORY'
+}
+
+# Pragmas that only make sense on the connection that writes
+_WRITER_ONLY_PRAGMAS = ('journal_mode', 'synchronous')
+
+
+def production_pragmas(cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+                       **overrides) -> Dict:
+    """
+    Build the production pragma profile.
+
+    Args:
+        cache_size_kib: Page cache size per connection in KiB
+        **overrides: Any pragma to override or add (e.g. mmap_size=0)
+
+    Returns:
+        Dictionary of pragma name to value
+    """
+    pragmas = dict(PRODUCTION_PRAGMAS, cache_size=-cache_size_kib)
+    pragmas.update(overrides)
+    return pragmas
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Dict, writer: bool = True):
+    """
+    Apply pragmas to a connection.
+
+    Args:
+        conn: SQLite connection
+        pragmas: Dictionary of pragma name to value
+        writer: False to skip pragmas that only apply to the writer
+    """
+    for name, value in pragmas.items():
+        if not writer and name in _WRITER_ONLY_PRAGMAS:
+            continue
+        result = conn.execute(f"PRAGMA {name} = {value}").fetchone()
+        if name == 'journal_mode' and result and str(result[0]).upper() != str(value).upper():
+            logger.warning("journal_mode %s not available, using %s", value, result[0])
+
+
+def read_only_uri(db_path: str) -> str:
+    """
+    URI opening a database read-only.
+
+    ``db_path`` may itself be a ``file:`` URI (e.g. an ``immutable=1`` serving
+    snapshot or a ``vfs=memdb`` in-memory one); ``mode=ro`` is added to it.
+    """
+    if not db_path.startswith('file:'):
+        return f"file:{db_path}?mode=ro"
+    if 'mode=' in db_path:
+        return db_path
+    return db_path + ('&' if '?' in db_path else '?') + 'mode=ro'
+
+
+class _Reader:
+    """A thread's pooled connection, held in the pool's thread-local slot."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+class ConnectionPool:
+    """
+    Per-thread read-only connections to one SQLite database.
+
+    Every thread that calls reader() gets its own connection, opened lazily
+    with ``mode=ro`` and ``query_only``; connections are never shared
+    between threads. A connection is closed when its thread ends (its
+    thread-local slot is freed), so short-lived threads such as per-request
+    socket handlers do not leave readers open. Writes must go through the
+    single writer connection owned by SQLiteGraph.
+    """
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict] = None):
+        self.db_path = db_path
+        self.pragmas = pragmas or {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Token -> connection; tokens are never reused, unlike thread idents
+        self._connections = {}
+        self._tokens = count()
+
+    def reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read-only connection."""
+        slot = getattr(self._local, 'reader', None)
+        if slot is None:
+            slot = _Reader(self._connect())
+            token = next(self._tokens)
+            with self._lock:
+                self._connections[token] = slot.conn
+            weakref.finalize(slot, self._release, token)
+            self._local.reader = slot
+        return slot.conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read-only connection with the pool's pragmas."""
+        conn = sqlite3.connect(read_only_uri(self.db_path), uri=True,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn, self.pragmas, writer=False)
+        conn.execute("PRAGMA query_only = ON")
+        logger.debug("Opened read connection to %s", self.db_path)
+        return conn
+
+    def _release(self, token: int):
+        """Close the connection of a thread that has ended."""
+        with self._lock:
+            conn = self._connections.pop(token, None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Error closing read connection: %s", e)
+            logger.debug("Closed read connection of a finished thread")
+
+    @property
+    def size(self) -> int:
+        """Number of open reader connections."""
+        with self._lock:
+            return len(self._connections)
+
+    def close_all(self):
+        """Close every reader connection in the pool."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Error closing read connection: %s", e)
+        self._local = threading.local()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Streaming Graph Export for the Training Pipeline
+
+Writes the PDCA graph to disk in constant memory using
+SQLiteGraph.iter_nodes() / iter_edges():
+
+- JSONL: one JSON object per node or relationship
+- columnar: gzip-compressed row groups, one JSON line per row group
+  holding one list per column (``{"count": n, "columns": {...}}``);
+  read back with iter_columnar()
+
+Every export keeps a ``<path>.checkpoint.json`` sidecar with the resume
+cursor and the byte offset of the last complete batch. An interrupted
+export is resumed by truncating the file to that offset and continuing
+from the cursor; re-running a finished export appends only the rows
+written since. Cursors are write-ordered (pdcas rowid, relationship id),
+so nodes indexed late with an older timestamp and rows rewritten by
+INSERT OR REPLACE are appended too; consumers keep the last row per key.
+
+Usage:
+    python graph_export.py nodes.jsonl --db pdca_timeline.db --kind nodes
+    python graph_export.py edges.cols.gz --kind edges --format columnar --type PRECEDES
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import logging
+from typing import Dict, Iterator, List, Optional, Sequence
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import DEFAULT_EXPORT_BATCH_SIZE, SQLiteGraph
+
+logger = logging.getLogger(__name__)
+
+EXPORT_KINDS = ('nodes', 'edges')
+EXPORT_FORMATS = ('jsonl', 'columnar')
+
+# Node filters accepted by both iter_nodes() and iter_edges()
+_NODE_FILTERS = ('start_timestamp', 'end_timestamp', 'agent_name', 'verification_status')
+
+
+def checkpoint_path(path: str) -> str:
+    """Sidecar file holding the resume state of an export."""
+    return path + '.checkpoint.json'
+
+
+def export_jsonl(graph: SQLiteGraph, path: str, kind: str = 'nodes',
+                 batch_size: int = DEFAULT_EXPORT_BATCH_SIZE, resume: bool = True,
+                 columns: Optional[Sequence[str]] = None, **filters) -> Dict:
+    """
+    Export nodes or relationships as JSON Lines.
+
+    Args:
+        graph: SQLiteGraph to read
+        path: Output file
+        kind: 'nodes' or 'edges'
+        batch_size: Rows per fetch, write and checkpoint
+        resume: Continue from the checkpoint sidecar if there is one
+            (False starts over)
+        columns: Columns to export (None for all)
+        **filters: start_timestamp, end_timestamp, agent_name,
+            verification_status and, for edges, relationship_types
+
+    Returns:
+        Export report (see _export())
+    """
+    def encode(rows: List[Dict]) -> bytes:
+        return ''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in rows).encode('utf-8')
+
+    return _export(graph, path, kind, 'jsonl', encode, batch_size, resume, columns, filters)
+
+
+def export_columnar(graph: SQLiteGraph, path: str, kind: str = 'nodes',
+                    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE, resume: bool = True,
+                    columns: Optional[Sequence[str]] = None, **filters) -> Dict:
+    """
+    Export nodes or relationships as gzip-compressed columnar row groups.
+
+    Each batch becomes one row group and one gzip member, so the file can
+    be appended to and truncated at row-group boundaries.
+
+    Args:
+        graph: SQLiteGraph to read
+        path: Output file
+        kind: 'nodes' or 'edges'
+        batch_size: Rows per row group
+        resume: Continue from the checkpoint sidecar if there is one
+            (False starts over)
+        columns: Columns to export (None for all)
+        **filters: Same filters as export_jsonl()
+
+    Returns:
+        Export report (see _export())
+    """
+    def encode(rows: List[Dict]) -> bytes:
+        group = {
+            'count': len(rows),
+            'columns': {name: [row[name] for row in rows] for name in rows[0]}
+        }
+        return gzip.compress((json.dumps(group, separators=(',', ':')) + '\n').encode('utf-8'))
+
+    return _export(graph, path, kind, 'columnar', encode, batch_size, resume, columns, filters)
+
+
+def iter_columnar(path: str) -> Iterator[Dict[str, List]]:
+    """
+    Read a columnar export one row group at a time.
+
+    Args:
+        path: File written by export_columnar()
+
+    Yields:
+        Dictionary mapping column name to the row group's values
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)['columns']
+
+
+def _export(graph: SQLiteGraph, path: str, kind: str, fmt: str, encode, batch_size: int,
+            resume: bool, columns: Optional[Sequence[str]], filters: Dict) -> Dict:
+    """
+    Stream rows into ``path`` batch by batch, checkpointing after each batch.
+
+    Returns:
+        Dictionary with path, kind, format, rows (written by this run),
+        batches, total_rows (all runs), after (resume cursor), resumed and
+        elapsed seconds
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Unknown export kind: {kind}")
+    allowed = _NODE_FILTERS + (('relationship_types',) if kind == 'edges' else ())
+    unknown = set(filters) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown {kind} filters: {sorted(unknown)}")
+
+    started = time.time()
+    settings = {
+        'kind': kind,
+        'format': fmt,
+        'cursor': 'rowid' if kind == 'nodes' else 'id',
+        'columns': list(columns) if columns is not None else None,
+        'filters': {name: value for name, value in filters.items() if value is not None}
+    }
+    state = _load_checkpoint(path) if resume else None
+    if state is not None and any(state.get(name) != value for name, value in settings.items()):
+        raise ValueError(f"Checkpoint for {path} was written with different settings; "
+                         f"pass resume=False to start over")
+    if state is None:
+        state = dict(settings, after=None, offset=0, rows=0)
+
+    iterate = graph.iter_nodes if kind == 'nodes' else graph.iter_edges
+    progress = {}
+    rows = iterate(after=state['after'], batch_size=batch_size, columns=columns,
+                   checkpoint=progress, **filters)
+
+    report = {'path': path, 'kind': kind, 'format': fmt, 'rows': 0, 'batches': 0,
+              'resumed': state['offset'] > 0}
+    with open(path, 'ab') as f:
+        # Drop a partial batch written after the last checkpoint
+        f.truncate(state['offset'])
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _write_batch(f, path, state, progress, encode, batch, report)
+                batch = []
+        if batch:
+            _write_batch(f, path, state, progress, encode, batch, report)
+
+    report['total_rows'] = state['rows']
+    report['after'] = state['after']
+    report['elapsed'] = time.time() - started
+    logger.info("Exported %d %s to %s (%d total) in %.2fs",
+                report['rows'], kind, path, state['rows'], report['elapsed'])
+    return report
+
+
+def _write_batch(f, path: str, state: Dict, progress: Dict, encode, batch: List[Dict],
+                 report: Dict):
+    """Append one encoded batch, make it durable and move the checkpoint past it."""
+    f.write(encode(batch))
+    f.flush()
+    os.fsync(f.fileno())
+    state['after'] = progress['after']
+    state['offset'] = f.tell()
+    state['rows'] += len(batch)
+    _save_checkpoint(path, state)
+    report['rows'] += len(batch)
+    report['batches'] += 1
+
+
+def _load_checkpoint(path: str) -> Optional[Dict]:
+    """Resume state of a previous export, or None."""
+    try:
+        with open(checkpoint_path(path)) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable export checkpoint for %s: %s", path, e)
+        return None
+    if not os.path.exists(path) or os.path.getsize(path) < state.get('offset', 0):
+        logger.warning("Export %s is shorter than its checkpoint, starting over", path)
+        return None
+    return state
+
+
+def _save_checkpoint(path: str, state: Dict):
+    """Atomically replace the checkpoint sidecar."""
+    target = checkpoint_path(path)
+    tmp_path = target + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, target)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream the PDCA graph to JSONL or columnar files")
+    parser.add_argument('path', help="Output file")
+    parser.add_argument('--db', default="pdca_timeline.db", help="Graph database path")
+    parser.add_argument('--kind', choices=EXPORT_KINDS, default='nodes')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='jsonl')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_EXPORT_BATCH_SIZE)
+    parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+    parser.add_argument('--start-timestamp', type=int)
+    parser.add_argument('--end-timestamp', type=int)
+    parser.add_argument('--agent', dest='agent_name')
+    parser.add_argument('--status', dest='verification_status')
+    parser.add_argument('--type', dest='relationship_types', action='append',
+                        help="Relationship type (edges only, repeatable)")
+    args = parser.parse_args(argv)
+
+    filters = {name: getattr(args, name) for name in _NODE_FILTERS}
+    if args.kind == 'edges':
+        filters['relationship_types'] = args.relationship_types
+    export = export_jsonl if args.format == 'jsonl' else export_columnar
+
+    graph = SQLiteGraph(args.db, production=True)
+    try:
+        report = export(graph, args.path, args.kind, args.batch_size,
+                        resume=not args.restart, **filters)
+    finally:
+        graph.close()
+
+    print(f"Exported {report['rows']} {report['kind']} in {report['batches']} batches "
+          f"({report['total_rows']} total) to {report['path']} in {report['elapsed']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
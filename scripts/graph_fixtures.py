@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Shared Test Data for the SQLite Graph Tier
+
+Small builders for PDCA rows and PRECEDES chains used by the test_*.py
+files, so each test only spells out the fields it cares about.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlite_graph import SQLiteGraph
+
+BASE_TIMESTAMP = 1730023200  # 2024-10-27 10:00 UTC
+ID_FORMAT = 'pdca-{i}'
+
+
+def _field(value: Any, i: int) -> Any:
+    return value(i) if callable(value) else value
+
+
+def make_pdca(pdca_id: str, i: int = 0, spacing: int = 60, **fields) -> Dict:
+    """
+    A valid PDCA row: BuilderAgent / ComponentDevelopment on 2024-10-27,
+    ``i * spacing`` seconds after BASE_TIMESTAMP, objective "Objective {i}".
+
+    Args:
+        pdca_id: PDCA ID
+        i: Position used for the timestamp and objective
+        spacing: Seconds between consecutive positions
+        **fields: Overrides and extra columns (a callable gets ``i``)
+    """
+    pdca = {
+        'id': pdca_id,
+        'agent_name': 'BuilderAgent',
+        'agent_role': 'ComponentDevelopment',
+        'date': '2024-10-27',
+        'timestamp': BASE_TIMESTAMP + i * spacing,
+        'objective': f'Objective {i}'
+    }
+    pdca.update((name, _field(value, i)) for name, value in fields.items())
+    return pdca
+
+
+def make_pdcas(start: int, stop: Optional[int] = None, id_format: str = ID_FORMAT,
+               spacing: int = 60, **fields) -> List[Dict]:
+    """
+    make_pdca() rows for positions [start, stop) (or [0, start)).
+
+    Args:
+        start: First position, or the count when ``stop`` is omitted
+        stop: Position after the last one
+        id_format: str.format() pattern for the ID, given ``i``
+        spacing: Seconds between consecutive positions
+        **fields: As for make_pdca(); callables get the position
+    """
+    if stop is None:
+        start, stop = 0, start
+    return [make_pdca(id_format.format(i=i), i, spacing, **fields) for i in range(start, stop)]
+
+
+def chain_links(start: int, stop: Optional[int] = None, id_format: str = ID_FORMAT,
+                relationship_type: Any = 'PRECEDES', weight: Any = 1.0,
+                metadata: Any = None) -> List[tuple]:
+    """
+    Relationships linking position i to i + 1 for i in [start, stop - 1).
+
+    Args:
+        start: First position, or the count when ``stop`` is omitted
+        stop: Position after the last one
+        id_format: str.format() pattern for the ID, given ``i``
+        relationship_type: Type, or a callable of the source position
+        weight: Weight, or a callable of the source position
+        metadata: Metadata dictionary, or a callable of the source position
+    """
+    if stop is None:
+        start, stop = 0, start
+    return [(id_format.format(i=i), id_format.format(i=i + 1), _field(relationship_type, i),
+             _field(weight, i), _field(metadata, i))
+            for i in range(start, stop - 1)]
+
+
+def build_chain(db_path: str, count: int, id_format: str = ID_FORMAT,
+                metadata: Any = None, **graph_kwargs) -> SQLiteGraph:
+    """
+    Open a SQLiteGraph holding a PRECEDES chain of ``count`` PDCAs one minute apart.
+
+    Args:
+        db_path: Database path
+        count: Number of PDCAs
+        id_format: str.format() pattern for the ID, given ``i``
+        metadata: Relationship metadata, or a callable of the source position
+        **graph_kwargs: Passed to SQLiteGraph()
+    """
+    graph = SQLiteGraph(db_path, **graph_kwargs)
+    graph.add_pdca_nodes_bulk(make_pdcas(count, id_format=id_format))
+    graph.add_relationships_bulk(chain_links(count, id_format=id_format, metadata=metadata))
+    return graph
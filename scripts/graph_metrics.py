@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for the SQLite Graph Tier
+
+Opt-in metrics for SQLiteGraph hot paths:
+
+- per-method call counts, error counts and rows returned
+- latency histograms with fixed millisecond buckets
+- a slow-query log: for every call slower than the threshold, the SQL
+  statements it ran (with parameters inlined by SQLite), the call
+  arguments and the EXPLAIN QUERY PLAN output of each statement
+- an optional profiling hook called with one event per method call
+
+When instrumentation is disabled the only cost per call is one attribute
+check in the ``instrumented`` decorator.
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+DEFAULT_SLOW_LOG_SIZE = 100
+
+# Statements worth explaining in the slow-query log
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# Longest argument repr kept in a slow-query entry
+_MAX_ARGS_REPR = 500
+
+# Statements kept per call (bulk writes trace one statement per row)
+_MAX_STATEMENTS = 50
+
+
+def count_rows(result: Any) -> int:
+    """Number of rows in a SQLiteGraph API result."""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        if 'current_pdca' in result:
+            return len(result.get('predecessors', [])) + len(result.get('successors', []))
+        if 'path' in result:
+            return len(result['path'])
+        if 'inserted' in result:
+            return result['inserted'] + result.get('replaced', 0)
+        if result and all(isinstance(value, list) for value in result.values()):
+            return sum(len(value) for value in result.values())
+        return 1 if result else 0
+    if isinstance(result, bool):
+        return int(result)
+    return 0 if result is None else 1
+
+
+class _MethodStats:
+    """Counters and histogram for one method."""
+
+    __slots__ = ('calls', 'errors', 'rows', 'total_seconds', 'max_seconds', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, seconds: float, rows: int):
+        self.calls += 1
+        self.rows += rows
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        elapsed_ms = seconds * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def snapshot(self) -> Dict:
+        histogram = {f"le_{bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)}
+        histogram['inf'] = self.buckets[-1]
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total_ms': self.total_seconds * 1000,
+            'mean_ms': self.total_seconds / self.calls * 1000 if self.calls else 0.0,
+            'max_ms': self.max_seconds * 1000,
+            'histogram': histogram
+        }
+
+
+class GraphMetrics:
+    """Thread-safe metrics registry for one SQLiteGraph."""
+
+    def __init__(self, slow_query_ms: Optional[float] = None,
+                 slow_log_size: int = DEFAULT_SLOW_LOG_SIZE,
+                 profile_hook: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            slow_query_ms: Calls slower than this are added to the slow-query
+                log (None disables the log)
+            slow_log_size: Number of slow-query entries kept
+            profile_hook: Called with {'method', 'elapsed_ms', 'rows', 'error'}
+                after every instrumented call
+        """
+        self.slow_query_ms = slow_query_ms
+        self.profile_hook = profile_hook
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self._methods = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Call tracking (used by the instrumented decorator)
+    # ------------------------------------------------------------------
+
+    def _frames(self) -> List[Dict]:
+        frames = getattr(self._local, 'frames', None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    def begin(self, method: str) -> Dict:
+        """Open a call frame; SQL traced on this thread is attached to it."""
+        frame = {'method': method, 'statements': [], 'dropped': 0, 'error': False}
+        self._frames().append(frame)
+        return frame
+
+    def trace(self, sql: str):
+        """sqlite3 trace callback: remember the statement for the current call."""
+        frames = getattr(self._local, 'frames', None)
+        if not frames or self.slow_query_ms is None or sql.startswith('EXPLAIN'):
+            return
+        frame = frames[-1]
+        statements = frame['statements']
+        # SQLite reports trigger programs with the triggering statement's text
+        if statements and statements[-1] == sql:
+            return
+        if len(statements) < _MAX_STATEMENTS:
+            statements.append(sql)
+        else:
+            frame['dropped'] += 1
+
+    def record_error(self):
+        """Mark the current call as failed (called from SQLiteGraph error handlers)."""
+        frames = getattr(self._local, 'frames', None)
+        if frames:
+            frames[-1]['error'] = True
+
+    def end(self, frame: Dict, seconds: float, rows: int, args: tuple, kwargs: Dict,
+            explain: Optional[Callable[[str], List[str]]] = None):
+        """Close a call frame and record it."""
+        frames = self._frames()
+        frames.pop()
+        if frames:
+            parent = frames[-1]
+            room = _MAX_STATEMENTS - len(parent['statements'])
+            parent['statements'].extend(frame['statements'][:room])
+            parent['dropped'] += frame['dropped'] + max(0, len(frame['statements']) - room)
+
+        with self._lock:
+            stats = self._methods.get(frame['method'])
+            if stats is None:
+                stats = self._methods[frame['method']] = _MethodStats()
+            stats.record(seconds, rows)
+            if frame['error']:
+                stats.errors += 1
+
+        elapsed_ms = seconds * 1000
+        if self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms:
+            self._log_slow(frame, elapsed_ms, rows, args, kwargs, explain)
+        if self.profile_hook is not None:
+            try:
+                self.profile_hook({
+                    'method': frame['method'],
+                    'elapsed_ms': elapsed_ms,
+                    'rows': rows,
+                    'error': frame['error']
+                })
+            except Exception as e:
+                logger.warning("Profiling hook failed: %s", e)
+
+    def _log_slow(self, frame: Dict, elapsed_ms: float, rows: int, args: tuple,
+                  kwargs: Dict, explain: Optional[Callable[[str], List[str]]]):
+        statements = []
+        for sql in frame['statements']:
+            entry = {'sql': sql}
+            if explain is not None and sql.lstrip().upper().startswith(_EXPLAINABLE):
+                try:
+                    entry['plan'] = explain(sql)
+                except Exception as e:
+                    entry['plan'] = [f"EXPLAIN failed: {e}"]
+            statements.append(entry)
+        arguments = repr((args, kwargs))
+        if len(arguments) > _MAX_ARGS_REPR:
+            arguments = arguments[:_MAX_ARGS_REPR] + '...'
+
+        self.slow_queries.append({
+            'method': frame['method'],
+            'elapsed_ms': elapsed_ms,
+            'rows': rows,
+            'arguments': arguments,
+            'statements': statements,
+            'statements_dropped': frame['dropped'],
+            'at': time.time()
+        })
+        logger.warning("Slow graph call %s: %.1f ms, %d rows, %d statements",
+                       frame['method'], elapsed_ms, rows, len(statements))
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict:
+        """Current counters, histograms and slow-query log."""
+        with self._lock:
+            methods = {name: stats.snapshot() for name, stats in sorted(self._methods.items())}
+        return {
+            'methods': methods,
+            'slow_query_ms': self.slow_query_ms,
+            'slow_queries': list(self.slow_queries)
+        }
+
+    def reset(self):
+        """Clear all counters and the slow-query log."""
+        with self._lock:
+            self._methods.clear()
+            self.slow_queries.clear()
+
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording a SQLiteGraph method in ``self._metrics``.
+
+    A no-op apart from one attribute check while instrumentation is off.
+    """
+    def decorator(method: Callable) -> Callable:
+        method_name = name or method.__name__
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self._metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+
+            self._install_trace()
+            frame = metrics.begin(method_name)
+            started = time.perf_counter()
+            result = None
+            try:
+                result = method(self, *args, **kwargs)
+                return result
+            except BaseException:
+                frame['error'] = True
+                raise
+            finally:
+                metrics.end(frame, time.perf_counter() - started, count_rows(result),
+                            args, kwargs, self._explain)
+        return wrapper
+    return decorator
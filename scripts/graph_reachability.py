@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Chain-Labeled Reachability Index for the SQLite Graph Tier
+
+A closure table answers "does A reach B?" with one lookup, but a single
+long PRECEDES chain of n PDCAs needs n * (n - 1) / 2 closure rows. This
+index stores far less and keeps the same lookups:
+
+- The graph of one relationship type is covered by disjoint chains.
+  Every node gets a slot ``(chain_id, position)``, and consecutive
+  positions on a chain are joined by an edge. The journal timeline is
+  mostly a few long chains, so there are few chains.
+- Every node has an out-label: for each chain it reaches, the lowest
+  position it reaches (in one or more hops). Every later position on
+  that chain is reachable as well. In-labels are the mirror image: the
+  highest position on each chain that reaches the node.
+
+Then A reaches B iff ``out_label(A)[chain(B)] <= position(B)``, which is
+one primary-key lookup. The descendants of A are one range scan per
+chain in its out-label. Labels take one row per (node, chain reached)
+instead of one row per reachable node.
+
+This module holds the storage-independent parts: the chain
+decomposition and the bulk label computation. SQLiteGraph stores the
+results in ``pdca_reach_slots`` and ``pdca_reach_labels`` and updates
+them incrementally.
+"""
+
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+
+Slot = Tuple[int, int]
+Label = Dict[int, int]
+
+
+def decompose_chains(order: Iterable[Hashable],
+                     predecessors: Dict[Hashable, List[Hashable]]) -> Dict[Hashable, Slot]:
+    """
+    Cover a graph with few disjoint chains.
+
+    Every node is linked to at most one predecessor and one successor so
+    that as many nodes as possible are linked (a maximum matching; on a
+    DAG this is a minimum path cover). Nodes are first linked greedily in
+    ``order`` to their most recently visited free predecessor, then
+    augmenting paths re-link predecessors a greedy choice took away
+    (e.g. from an agent's own timeline by a cross-link).
+
+    Args:
+        order: Every node, in visiting order (oldest first for the timeline)
+        predecessors: Node -> nodes with an edge into it
+
+    Returns:
+        Dictionary mapping each node to its (chain_id, position) slot
+    """
+    order = list(order)
+    rank = {node: number for number, node in enumerate(order)}
+    linked_next = {}
+    linked_prev = {}
+
+    for node in order:
+        best = None
+        for predecessor in predecessors.get(node, ()):
+            if predecessor != node and predecessor not in linked_next and (
+                    best is None or rank[predecessor] > rank[best]):
+                best = predecessor
+        if best is not None:
+            linked_next[best] = node
+            linked_prev[node] = best
+
+    # Kuhn's augmenting paths; nodes that failed stay failed until a link changes
+    visited = set()
+    for node in order:
+        if node in linked_prev:
+            continue
+        # Frames of [node, remaining predecessors, predecessor tried]
+        stack = [[node, iter(predecessors.get(node, ())), None]]
+        while stack:
+            frame = stack[-1]
+            for predecessor in frame[1]:
+                if predecessor in visited or predecessor == frame[0]:
+                    continue
+                visited.add(predecessor)
+                frame[2] = predecessor
+                taken_by = linked_next.get(predecessor)
+                if taken_by is None:
+                    for waiting, _, chosen in stack:
+                        linked_next[chosen] = waiting
+                        linked_prev[waiting] = chosen
+                    stack = []
+                    visited = set()
+                else:
+                    stack.append([taken_by, iter(predecessors.get(taken_by, ())), None])
+                break
+            else:
+                stack.pop()
+
+    slots = {}
+    heads = [node for node in order if node not in linked_prev]
+    # Nodes left over are linked in cycles; each cycle is cut at its first node
+    heads += [node for node in order if node in linked_prev and node not in slots]
+    chain_id = 0
+    for head in heads:
+        if head in slots:
+            continue
+        node, position = head, 0
+        while node is not None and node not in slots:
+            slots[node] = (chain_id, position)
+            node = linked_next.get(node)
+            position += 1
+        chain_id += 1
+    return slots
+
+
+def strongly_connected_components(nodes: Iterable[Hashable],
+                                  successors: Dict[Hashable, List[Hashable]]) -> List[List[Hashable]]:
+    """
+    Tarjan's algorithm without recursion.
+
+    Returns:
+        Components in reverse topological order: every component comes
+        after all components it has edges into
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors.get(root, ())))]
+
+        while work:
+            node, children = work[-1]
+            descended = False
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors.get(child, ()))))
+                    descended = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def chain_labels(components: List[List[Hashable]], neighbors: Dict[Hashable, List[Hashable]],
+                 slots: Dict[Hashable, Slot], better: Callable[[int, int], int]) -> Dict[Hashable, Label]:
+    """
+    Compute the reachability label of every node.
+
+    Out-labels use successors, components in reverse topological order and
+    ``better=min``. In-labels use predecessors, components in topological
+    order and ``better=max``. Nodes of one component share one label dict.
+
+    Args:
+        components: Strongly connected components, every component after
+            the components its neighbors belong to
+        neighbors: Node -> nodes in the labeled direction
+        slots: Chain slot of every node
+        better: min (out-labels) or max (in-labels)
+
+    Returns:
+        Dictionary mapping each node to its label {chain_id: position}
+    """
+    component_of = {}
+    for number, component in enumerate(components):
+        for node in component:
+            component_of[node] = number
+
+    labels = {}
+    for number, component in enumerate(components):
+        label = {}
+        cyclic = len(component) > 1
+        for node in component:
+            for neighbor in neighbors.get(node, ()):
+                if component_of[neighbor] == number:
+                    continue
+                merge_label(label, labels[neighbor], better)
+                merge_label(label, (slots[neighbor],), better)
+        if cyclic:
+            # Every member reaches every member, itself included
+            merge_label(label, [slots[node] for node in component], better)
+        for node in component:
+            labels[node] = label
+    return labels
+
+
+def merge_label(label: Label, entries, better: Callable[[int, int], int]) -> Label:
+    """
+    Merge chain positions into ``label`` in place.
+
+    Args:
+        label: Label to update
+        entries: Another label dict, or an iterable of (chain_id, position)
+        better: min or max
+
+    Returns:
+        Dictionary of the entries that changed ``label``
+    """
+    changed = {}
+    for chain_id, position in (entries.items() if isinstance(entries, dict) else entries):
+        current = label.get(chain_id)
+        if current is None or better(position, current) != current:
+            label[chain_id] = changed[chain_id] = position
+    return changed
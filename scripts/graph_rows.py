@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Compact Row Formats for SQLite Graph Reads
+
+By default SQLiteGraph reads return one dict per row with every pdcas
+column and eagerly decoded edge metadata. For wide graph expansions the
+callers can instead pick:
+
+- ``columns``: only the named columns are selected in SQL
+- ``row_format='record'``: namedtuple records with ``__slots__ = ()``;
+  edge metadata stays a JSON string until ``record.metadata`` is read
+- ``row_format='tuple'``: plain tuples in column order, metadata as the
+  raw JSON string
+
+Example:
+    graph.get_successors(pdca_id, columns=('id', 'timestamp', 'weight'),
+                         row_format='tuple')
+"""
+
+import json
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+ROW_FORMATS = ('dict', 'record', 'tuple')
+
+# Columns of the pdcas table, in schema order
+PDCA_COLUMNS = (
+    'id', 'agent_name', 'agent_role', 'date', 'timestamp',
+    'session_id', 'branch', 'sprint', 'cmm_level', 'task_type',
+    'objective', 'quality_score', 'verification_status', 'file_path', 'created_at'
+)
+
+# Columns of the pdca_relationships table, in schema order
+RELATIONSHIP_COLUMNS = (
+    'id', 'from_pdca_id', 'to_pdca_id', 'relationship_type', 'weight', 'metadata', 'created_at'
+)
+
+# Columns of the pdca_changes log, in schema order
+CHANGE_COLUMNS = (
+    'seq', 'entity', 'operation', 'pdca_id', 'to_pdca_id', 'relationship_type', 'changed_at'
+)
+
+# Relationship columns available on neighbor rows
+EDGE_COLUMNS = ('weight', 'metadata', 'relationship_created', 'relationship_type', 'direction')
+
+
+def select_list(columns: Optional[Sequence[str]], pdca_alias: str,
+                edge_expressions: Dict[str, str],
+                base_columns: Tuple[str, ...] = PDCA_COLUMNS) -> Tuple[Tuple[str, ...], str]:
+    """
+    Build the SELECT list for a projection.
+
+    Args:
+        columns: Requested column names (None for every base column plus
+            every available edge column)
+        pdca_alias: Table alias of the base table in the query
+        edge_expressions: Edge column name -> SQL expression in the query
+        base_columns: Columns of the base table (pdcas, or
+            RELATIONSHIP_COLUMNS for pdca_relationships)
+
+    Returns:
+        Tuple of (column names, SQL select list)
+    """
+    if columns is None:
+        columns = base_columns + tuple(name for name in EDGE_COLUMNS if name in edge_expressions)
+    columns = tuple(columns)
+    expressions = []
+    for name in columns:
+        if name in base_columns:
+            expressions.append(f"{pdca_alias}.{name}")
+        elif name in edge_expressions:
+            expressions.append(f"{edge_expressions[name]} AS {name}")
+        else:
+            raise ValueError(f"Unknown column: {name}")
+    return columns, ', '.join(expressions)
+
+
+@lru_cache(maxsize=64)
+def record_class(columns: Tuple[str, ...]) -> type:
+    """
+    Namedtuple record type for a projection.
+
+    A ``metadata`` column is stored as ``metadata_json`` and decoded by the
+    ``metadata`` property each time it is read.
+    """
+    fields = [name if name != 'metadata' else 'metadata_json' for name in columns]
+    base = namedtuple('PDCARecord', fields)
+    if 'metadata' not in columns:
+        return base
+
+    class PDCARecord(base):
+        __slots__ = ()
+
+        @property
+        def metadata(self):
+            return json.loads(self.metadata_json) if self.metadata_json else None
+
+    return PDCARecord
+
+
+def check_row_format(row_format: str):
+    """Reject unknown row formats before running a query."""
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Unknown row_format: {row_format}")
+
+
+def build_rows(rows: Iterable[Sequence], columns: Tuple[str, ...], row_format: str) -> List:
+    """
+    Convert fetched rows (values in ``columns`` order) to the requested format.
+
+    'dict' rows decode metadata eagerly, matching the default read results.
+    """
+    if row_format == 'tuple':
+        return [tuple(row) for row in rows]
+    if row_format == 'record':
+        make = record_class(columns)._make
+        return [make(row) for row in rows]
+
+    decode = 'metadata' in columns
+    results = []
+    for row in rows:
+        row_dict = dict(zip(columns, row))
+        if decode and row_dict['metadata']:
+            row_dict['metadata'] = json.loads(row_dict['metadata'])
+        results.append(row_dict)
+    return results
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Immutable Serving Snapshots for the SQLite Graph Tier
+
+Query workers should not read the database the nightly loop is rewriting.
+Instead the writer publishes read-only copies and workers serve from them:
+
+- publish_snapshot() copies the live database with the SQLite backup API
+  into ``pdca-snapshot-NNNNNN.db`` in a snapshot directory. It then
+  switches the copy to a rollback journal, fsyncs it, and atomically
+  replaces the ``CURRENT`` pointer file. Older versions beyond ``keep``
+  are deleted.
+- ServingGraph opens the version named by ``CURRENT``. File snapshots are
+  opened with ``immutable=1`` (no locking, no change detection) and a
+  large ``mmap_size``, and are read once up front so the OS page cache
+  is warm. In-memory snapshots are copied into a shared ``memdb`` database.
+  The first call after reload_interval starts a background thread that
+  loads a newly published version and swaps it in atomically; calls
+  never wait for it and keep using the current snapshot meanwhile. Calls
+  already running finish on the old snapshot, which is closed when its
+  last user releases it.
+
+Usage:
+    publish_snapshot(graph, "/var/lib/pdca/serving")        # nightly writer
+    serving = ServingGraph("/var/lib/pdca/serving")          # query worker
+    serving.get_successors(pdca_id)
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from urllib.parse import quote
+
+from sqlite_graph import SQLiteGraph
+
+logger = logging.getLogger(__name__)
+
+# Snapshot versions kept on disk (older ones may still be open in slow workers)
+DEFAULT_SNAPSHOT_KEEP = 3
+
+# mmap window for file snapshots; covers the whole file for typical graphs
+DEFAULT_SERVING_MMAP_SIZE = 1 << 30
+
+# Seconds between checks of the CURRENT pointer
+DEFAULT_RELOAD_INTERVAL = 1.0
+
+POINTER_FILE = 'CURRENT'
+
+_SNAPSHOT_PATTERN = re.compile(r'^pdca-snapshot-(\d+)\.db$')
+
+# Read size used to pull a snapshot file into the page cache
+_WARM_CHUNK = 1 << 20
+
+
+def snapshot_filename(version: int) -> str:
+    """File name of a snapshot version."""
+    return f"pdca-snapshot-{version:06d}.db"
+
+
+def read_pointer(directory: str) -> Optional[Dict]:
+    """
+    Read the CURRENT pointer of a snapshot directory.
+
+    Returns:
+        Dictionary with version, file, published_at and bytes, or None if
+        nothing has been published yet
+    """
+    try:
+        with open(os.path.join(directory, POINTER_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error("Unreadable snapshot pointer in %s: %s", directory, e)
+        return None
+
+
+def publish_snapshot(graph: SQLiteGraph, directory: str,
+                     keep: int = DEFAULT_SNAPSHOT_KEEP) -> Dict:
+    """
+    Publish an immutable serving snapshot of a graph.
+
+    The copy is made from a read connection in one backup step, so it is a
+    consistent snapshot. In production mode the writer keeps committing
+    while the copy is made.
+
+    Args:
+        graph: SQLiteGraph to copy
+        directory: Snapshot directory (created if missing)
+        keep: Snapshot versions to keep on disk, including the new one
+
+    Returns:
+        The new pointer (version, file, published_at, bytes)
+    """
+    os.makedirs(directory, exist_ok=True)
+    started = time.time()
+    pointer = read_pointer(directory) or {}
+    versions = [int(match.group(1)) for match in map(_SNAPSHOT_PATTERN.match, os.listdir(directory))
+                if match]
+    version = max(versions + [pointer.get('version', 0)]) + 1
+    filename = snapshot_filename(version)
+    path = os.path.join(directory, filename)
+    tmp_path = path + '.tmp'
+
+    target = sqlite3.connect(tmp_path)
+    try:
+        if graph._pool is None:
+            # Reads share the writer connection; keep our own writes out of the copy
+            with graph._write_lock:
+                graph._read_conn().backup(target)
+        else:
+            graph._read_conn().backup(target)
+        # immutable=1 readers never look for a WAL file
+        target.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        target.close()
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    pointer = {
+        'version': version,
+        'file': filename,
+        'published_at': time.time(),
+        'bytes': os.path.getsize(path)
+    }
+    _write_pointer(directory, pointer)
+    _prune(directory, keep)
+    logger.info("Published serving snapshot %d (%d bytes) in %.2fs",
+                version, pointer['bytes'], time.time() - started)
+    return pointer
+
+
+def _write_pointer(directory: str, pointer: Dict):
+    """Atomically replace the CURRENT pointer."""
+    target = os.path.join(directory, POINTER_FILE)
+    tmp_path = target + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(pointer, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, target)
+
+
+def _prune(directory: str, keep: int):
+    """Delete all but the newest ``keep`` snapshot versions."""
+    snapshots = sorted((int(match.group(1)), match.group(0))
+                       for match in map(_SNAPSHOT_PATTERN.match, os.listdir(directory)) if match)
+    for _, filename in snapshots[:-keep] if keep > 0 else []:
+        try:
+            os.remove(os.path.join(directory, filename))
+        except OSError as e:
+            logger.warning("Could not remove old snapshot %s: %s", filename, e)
+
+
+def _warm_file(path: str):
+    """Read a file once so its pages are in the OS page cache."""
+    with open(path, 'rb', buffering=0) as f:
+        while f.read(_WARM_CHUNK):
+            pass
+
+
+class _Snapshot:
+    """One opened snapshot version and the number of calls using it."""
+
+    __slots__ = ('version', 'graph', 'loader', 'refs', 'retired')
+
+    def __init__(self, version: int, graph: SQLiteGraph, loader: Optional[sqlite3.Connection]):
+        self.version = version
+        self.graph = graph
+        # Keeps a memdb database alive; None for file snapshots
+        self.loader = loader
+        self.refs = 0
+        self.retired = False
+
+    def close(self):
+        self.graph.close()
+        if self.loader is not None:
+            self.loader.close()
+
+
+class ServingGraph:
+    """
+    Read-only SQLiteGraph over the latest published snapshot, with hot reload.
+
+    Public SQLiteGraph read methods can be called directly on a
+    ServingGraph. Each call runs on the snapshot that is current when the
+    call starts. Use acquire() to run several reads, or to consume a
+    streaming iterator, on one snapshot.
+
+    Example:
+        serving = ServingGraph("/var/lib/pdca/serving", in_memory=True)
+        serving.get_breadcrumb_navigation(pdca_id)
+        with serving.acquire() as graph:
+            for row in graph.iter_nodes():
+                ...
+    """
+
+    def __init__(self, directory: str, in_memory: bool = False,
+                 mmap_size: int = DEFAULT_SERVING_MMAP_SIZE,
+                 reload_interval: float = DEFAULT_RELOAD_INTERVAL,
+                 warm: bool = True, **graph_kwargs):
+        """
+        Open the current snapshot of a snapshot directory.
+
+        Args:
+            directory: Directory written by publish_snapshot()
+            in_memory: Copy each snapshot into memory instead of mmapping the file
+            mmap_size: mmap window for file snapshots
+            reload_interval: Seconds between background checks for a newer
+                snapshot (0 starts a check on every call unless one is running)
+            warm: Read file snapshots once before serving them
+            **graph_kwargs: Passed to SQLiteGraph (e.g. cache_entries, instrument)
+
+        Raises:
+            FileNotFoundError: If no snapshot has been published yet
+        """
+        self.directory = directory
+        self.in_memory = in_memory
+        self.mmap_size = mmap_size
+        self.reload_interval = reload_interval
+        self.warm = warm
+        self.graph_kwargs = graph_kwargs
+        self._current = None
+        self._checked_at = 0.0
+        self._closed = False
+        self._reloader = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self.reload()
+        if self._current is None:
+            raise FileNotFoundError(f"No serving snapshot published in {directory}")
+
+    @property
+    def version(self) -> Optional[int]:
+        """Version of the snapshot new calls are served from."""
+        current = self._current
+        return current.version if current is not None else None
+
+    @contextmanager
+    def acquire(self) -> Iterator[SQLiteGraph]:
+        """Pin the current snapshot for the duration of the block."""
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            self._reload_in_background()
+        with self._lock:
+            snapshot = self._current
+            if snapshot is None:
+                raise RuntimeError("ServingGraph is closed")
+            snapshot.refs += 1
+        try:
+            yield snapshot.graph
+        finally:
+            with self._lock:
+                snapshot.refs -= 1
+                done = snapshot.retired and snapshot.refs == 0
+            if done:
+                snapshot.close()
+
+    def _reload_in_background(self):
+        """Start a reload thread unless one is already running."""
+        with self._lock:
+            if self._closed or (self._reloader is not None and self._reloader.is_alive()):
+                return
+            self._checked_at = time.monotonic()
+            self._reloader = threading.Thread(target=self.reload, name="serving-reload",
+                                              daemon=True)
+            self._reloader.start()
+
+    def wait_for_reload(self, timeout: Optional[float] = None):
+        """Wait for a background reload started by a call to finish."""
+        reloader = self._reloader
+        if reloader is not None:
+            reloader.join(timeout)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Swap to the published snapshot if it is newer than the served one.
+
+        Calls start this in a background thread; it can also be called
+        directly. The new snapshot is opened (and warmed) before the swap,
+        so calls never wait for loading. Only one thread loads at a time;
+        others keep serving the current snapshot.
+
+        Args:
+            force: Reopen even if the version has not changed
+
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked_at = time.monotonic()
+            pointer = read_pointer(self.directory)
+            current = self._current
+            if pointer is None or (current is not None and not force
+                                   and pointer['version'] == current.version):
+                return False
+            try:
+                snapshot = self._open(pointer)
+            except Exception as e:
+                logger.error("Error opening serving snapshot %s: %s", pointer.get('file'), e)
+                return False
+
+            with self._lock:
+                if self._closed:
+                    old, done = snapshot, True  # closed while loading
+                else:
+                    old, self._current = self._current, snapshot
+                    done = False
+                    if old is not None:
+                        old.retired = True
+                        done = old.refs == 0
+            if done:
+                old.close()
+            if old is snapshot:
+                return False
+            logger.info("Serving graph snapshot %d", snapshot.version)
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def _open(self, pointer: Dict) -> _Snapshot:
+        """Open one snapshot version as a read-only SQLiteGraph."""
+        path = os.path.abspath(os.path.join(self.directory, pointer['file']))
+        file_uri = f"file:{quote(path)}?immutable=1"
+        loader = None
+        if self.in_memory:
+            db_path = f"file:/pdca-serving-{os.getpid()}-{id(self)}-{pointer['version']}?vfs=memdb"
+            loader = sqlite3.connect(db_path, uri=True, check_same_thread=False)
+            source = sqlite3.connect(f"{file_uri}&mode=ro", uri=True)
+            try:
+                source.backup(loader)
+            finally:
+                source.close()
+            pragmas = {}
+        else:
+            if self.warm:
+                _warm_file(path)
+            db_path = file_uri
+            pragmas = {'mmap_size': self.mmap_size}
+
+        try:
+            graph = SQLiteGraph(db_path, read_only=True, read_pool=True, pragmas=pragmas,
+                                **self.graph_kwargs)
+        except Exception:
+            if loader is not None:
+                loader.close()
+            raise
+        return _Snapshot(pointer['version'], graph, loader)
+
+    def __getattr__(self, name: str):
+        method = getattr(SQLiteGraph, name, None)
+        if name.startswith('_') or not callable(method):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            with self.acquire() as graph:
+                return getattr(graph, name)(*args, **kwargs)
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
+
+    def close(self):
+        """Stop serving; the last snapshot closes once in-flight calls finish."""
+        with self._lock:
+            self._closed = True
+            reloader = self._reloader
+        if reloader is not None:
+            reloader.join()
+        with self._lock:
+            snapshot, self._current = self._current, None
+            done = False
+            if snapshot is not None:
+                snapshot.retired = True
+                done = snapshot.refs == 0
+        if done:
+            snapshot.close()
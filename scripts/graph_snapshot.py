@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+In-Memory CSR Adjacency Snapshot for the SQLite Graph Tier
+
+Builds a compact, array-backed copy of ``pdca_relationships`` so that
+multi-hop traversal runs against NumPy arrays instead of one SQL JOIN per
+node. PDCA IDs are mapped to dense integer node indexes, and every
+relationship type gets its own CSR (compressed sparse row) structure in
+both directions:
+
+    out_offsets[i] .. out_offsets[i + 1]  -> slice of out_targets / out_weights
+    in_offsets[i]  .. in_offsets[i + 1]   -> slice of in_sources  / in_weights
+
+Snapshots are refreshed incrementally from the database (append-only
+changes are merged without re-reading existing edges) and can be saved
+to / loaded from ``.npz`` files so query workers start warm.
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from graph_algorithms import DEFAULT_MAX_VISITS, bidirectional_bfs, dijkstra
+
+logger = logging.getLogger(__name__)
+
+# Bump when the .npz layout changes so stale snapshot files are rebuilt
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class _TypeAdjacency:
+    """CSR adjacency (both directions) for a single relationship type."""
+
+    __slots__ = ('sources', 'targets', 'weights', 'out_offsets', 'out_targets',
+                 'out_weights', 'in_offsets', 'in_sources', 'in_weights')
+
+    def __init__(self, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+                 node_count: int):
+        # Edge list (COO) is kept so appends can be merged without a database read
+        self.sources = sources
+        self.targets = targets
+        self.weights = weights
+        self._build_csr(node_count)
+
+    def _build_csr(self, node_count: int):
+        """(Re)build both CSR directions from the edge list."""
+        self.out_offsets, order = _csr_offsets(self.sources, node_count)
+        self.out_targets = self.targets[order]
+        self.out_weights = self.weights[order]
+
+        self.in_offsets, order = _csr_offsets(self.targets, node_count)
+        self.in_sources = self.sources[order]
+        self.in_weights = self.weights[order]
+
+    def append(self, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+               node_count: int):
+        """Merge new edges and rebuild the CSR arrays."""
+        self.sources = np.concatenate([self.sources, sources])
+        self.targets = np.concatenate([self.targets, targets])
+        self.weights = np.concatenate([self.weights, weights])
+        self._build_csr(node_count)
+
+    def csr(self, direction: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (offsets, neighbors, weights) for 'out' or 'in'."""
+        if direction == 'out':
+            return self.out_offsets, self.out_targets, self.out_weights
+        if direction == 'in':
+            return self.in_offsets, self.in_sources, self.in_weights
+        raise ValueError(f"Unknown direction: {direction}")
+
+
+def _csr_offsets(keys: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute CSR offsets and the stable sort order for ``keys``."""
+    counts = np.bincount(keys, minlength=node_count)
+    offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    order = np.argsort(keys, kind='stable')
+    return offsets, order
+
+
+def _gather(offsets: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gather the CSR slices of ``nodes`` in one vectorized step.
+
+    Returns:
+        (owner, positions) where ``positions`` index the CSR value arrays and
+        ``owner`` is the index into ``nodes`` each neighbor belongs to
+    """
+    starts = offsets[nodes]
+    lengths = offsets[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    owner = np.repeat(np.arange(len(nodes)), lengths)
+    run_starts = np.cumsum(lengths) - lengths
+    positions = np.arange(total) - np.repeat(run_starts, lengths) + np.repeat(starts, lengths)
+    return owner, positions
+
+
+class GraphSnapshot:
+    """
+    Immutable-between-refreshes, array-backed view of the PDCA graph.
+
+    Use SQLiteGraph.load_snapshot() to obtain one; it keeps the snapshot in
+    sync with the database's write generation.
+    """
+
+    def __init__(self, node_ids: List[str], adjacency: Dict[str, _TypeAdjacency],
+                 state: Dict):
+        self.node_ids = list(node_ids)
+        self.node_index = {pdca_id: i for i, pdca_id in enumerate(self.node_ids)}
+        self.adjacency = adjacency
+        # Database position the snapshot reflects (see SQLiteGraph._graph_signature)
+        self.state = state
+
+    # ------------------------------------------------------------------
+    # Construction and refresh
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, graph) -> 'GraphSnapshot':
+        """Build a snapshot by reading all nodes and edges from ``graph``."""
+        snapshot = cls([], {}, {})
+        snapshot._load_all(graph)
+        return snapshot
+
+    def _load_all(self, graph):
+        """Replace the snapshot contents with a full read of the database."""
+        token = graph._change_token()
+        signature = graph._graph_signature()
+        cursor = graph._read_conn().cursor()
+
+        cursor.execute("SELECT id FROM pdcas ORDER BY rowid")
+        self.node_ids = [row[0] for row in cursor.fetchall()]
+        self.node_index = {pdca_id: i for i, pdca_id in enumerate(self.node_ids)}
+
+        cursor.execute("""
+            SELECT from_pdca_id, to_pdca_id, relationship_type, weight
+            FROM pdca_relationships ORDER BY id
+        """)
+        edges = cursor.fetchall()
+        self.adjacency = {}
+        self._add_edges(edges)
+
+        self.state = dict(signature, change_token=list(token))
+        logger.info("Built graph snapshot: %d nodes, %d edges",
+                    len(self.node_ids), signature['edge_count'])
+
+    def refresh(self, graph) -> bool:
+        """
+        Bring the snapshot up to date with ``graph``.
+
+        Does nothing while the graph's write generation is unchanged.
+        Append-only changes (new nodes and new edges) are merged in place;
+        anything else (replaced or deleted edges) triggers a full rebuild.
+
+        Returns:
+            bool: True if the snapshot changed
+        """
+        token = graph._change_token()
+        if list(token) == self.state.get('change_token'):
+            return False
+
+        signature = graph._graph_signature()
+        if all(self.state.get(key) == value for key, value in signature.items()):
+            self.state['change_token'] = list(token)
+            return False
+
+        cursor = graph._read_conn().cursor()
+        cursor.execute("""
+            SELECT from_pdca_id, to_pdca_id, relationship_type, weight
+            FROM pdca_relationships WHERE id > ? ORDER BY id
+        """, (self.state.get('edge_max_id', 0),))
+        new_edges = cursor.fetchall()
+
+        append_only = (
+            self.state.get('edge_count', 0) + len(new_edges) == signature['edge_count'] and
+            signature['node_count'] >= self.state.get('node_count', 0)
+        )
+        if not append_only:
+            self._load_all(graph)
+            return True
+
+        cursor.execute("SELECT id FROM pdcas WHERE rowid > ? ORDER BY rowid",
+                       (self.state.get('node_max_rowid', 0),))
+        for (pdca_id,) in cursor.fetchall():
+            self._intern(pdca_id)
+        self._add_edges(new_edges)
+
+        self.state = dict(signature, change_token=list(token))
+        logger.debug("Refreshed graph snapshot with %d new edges", len(new_edges))
+        return True
+
+    def _intern(self, pdca_id: str) -> int:
+        """Return the integer index of ``pdca_id``, adding it if needed."""
+        index = self.node_index.get(pdca_id)
+        if index is None:
+            index = len(self.node_ids)
+            self.node_ids.append(pdca_id)
+            self.node_index[pdca_id] = index
+        return index
+
+    def _add_edges(self, edges: Iterable[Tuple]):
+        """Group ``(from, to, type, weight)`` rows by type and merge them."""
+        grouped = {}
+        for from_id, to_id, relationship_type, weight in edges:
+            sources, targets, weights = grouped.setdefault(relationship_type, ([], [], []))
+            sources.append(self._intern(from_id))
+            targets.append(self._intern(to_id))
+            weights.append(1.0 if weight is None else weight)
+
+        node_count = len(self.node_ids)
+        for relationship_type, (sources, targets, weights) in grouped.items():
+            arrays = (np.asarray(sources, dtype=np.int32),
+                      np.asarray(targets, dtype=np.int32),
+                      np.asarray(weights, dtype=np.float32))
+            existing = self.adjacency.get(relationship_type)
+            if existing is None:
+                self.adjacency[relationship_type] = _TypeAdjacency(*arrays, node_count)
+            else:
+                existing.append(*arrays, node_count)
+
+        # New nodes extend every offsets array, including untouched types
+        for relationship_type, adjacency in self.adjacency.items():
+            if relationship_type not in grouped and len(adjacency.out_offsets) != node_count + 1:
+                adjacency._build_csr(node_count)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """Save the snapshot as a compressed ``.npz`` file."""
+        arrays = {
+            'format_version': np.array(SNAPSHOT_FORMAT_VERSION),
+            'node_ids': np.array(self.node_ids, dtype=str),
+            'relationship_types': np.array(list(self.adjacency), dtype=str),
+            'state': np.array(json.dumps(self.state))
+        }
+        for i, adjacency in enumerate(self.adjacency.values()):
+            arrays[f'sources_{i}'] = adjacency.sources
+            arrays[f'targets_{i}'] = adjacency.targets
+            arrays[f'weights_{i}'] = adjacency.weights
+        np.savez_compressed(path, **arrays)
+        logger.info("Saved graph snapshot to %s", path)
+
+    @classmethod
+    def load(cls, path: str) -> 'GraphSnapshot':
+        """Load a snapshot written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['format_version'])
+            if version != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot format version: {version}")
+            node_ids = data['node_ids'].tolist()
+            state = json.loads(str(data['state']))
+            adjacency = {}
+            for i, relationship_type in enumerate(data['relationship_types'].tolist()):
+                adjacency[relationship_type] = _TypeAdjacency(
+                    data[f'sources_{i}'], data[f'targets_{i}'], data[f'weights_{i}'],
+                    len(node_ids))
+        # A loaded snapshot never matches the live process's write generation
+        state['change_token'] = None
+        logger.info("Loaded graph snapshot from %s", path)
+        return cls(node_ids, adjacency, state)
+
+    # ------------------------------------------------------------------
+    # Traversal
+    # ------------------------------------------------------------------
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(adjacency.sources) for adjacency in self.adjacency.values())
+
+    def _types(self, relationship_type: Optional[str]) -> List[_TypeAdjacency]:
+        """Adjacency structures for one relationship type, or all of them."""
+        if relationship_type is None:
+            return list(self.adjacency.values())
+        adjacency = self.adjacency.get(relationship_type)
+        return [adjacency] if adjacency is not None else []
+
+    def _indexes(self, pdca_ids: Iterable[str]) -> np.ndarray:
+        """Map PDCA IDs to node indexes, dropping unknown IDs."""
+        return np.array([self.node_index[pdca_id] for pdca_id in pdca_ids
+                         if pdca_id in self.node_index], dtype=np.int64)
+
+    def neighbors(self, pdca_id: str, relationship_type: Optional[str] = "PRECEDES",
+                  direction: str = 'out') -> List[Tuple[str, float]]:
+        """
+        Get the direct neighbors of a PDCA.
+
+        Args:
+            pdca_id: PDCA ID
+            relationship_type: Type of relationship to follow (None for all)
+            direction: 'out' for successors, 'in' for predecessors
+
+        Returns:
+            List of (neighbor_id, weight) tuples
+        """
+        index = self.node_index.get(pdca_id)
+        if index is None:
+            return []
+        results = []
+        for adjacency in self._types(relationship_type):
+            offsets, neighbors, weights = adjacency.csr(direction)
+            start, end = offsets[index], offsets[index + 1]
+            results.extend(zip((self.node_ids[i] for i in neighbors[start:end]),
+                               weights[start:end].tolist()))
+        return results
+
+    def successors(self, pdca_id: str, relationship_type: Optional[str] = "PRECEDES") -> List[str]:
+        """Get the IDs of PDCAs that follow ``pdca_id``."""
+        return [neighbor for neighbor, _ in self.neighbors(pdca_id, relationship_type, 'out')]
+
+    def predecessors(self, pdca_id: str, relationship_type: Optional[str] = "PRECEDES") -> List[str]:
+        """Get the IDs of PDCAs that precede ``pdca_id``."""
+        return [neighbor for neighbor, _ in self.neighbors(pdca_id, relationship_type, 'in')]
+
+    def degree(self, pdca_id: str, relationship_type: Optional[str] = None,
+               direction: str = 'both') -> int:
+        """
+        Get the degree of a PDCA.
+
+        Args:
+            pdca_id: PDCA ID
+            relationship_type: Type of relationship to count (None for all)
+            direction: 'out', 'in' or 'both'
+
+        Returns:
+            Number of incident edges
+        """
+        index = self.node_index.get(pdca_id)
+        if index is None:
+            return 0
+        directions = ('out', 'in') if direction == 'both' else (direction,)
+        total = 0
+        for adjacency in self._types(relationship_type):
+            for d in directions:
+                offsets = adjacency.csr(d)[0]
+                total += int(offsets[index + 1] - offsets[index])
+        return total
+
+    def k_hop(self, pdca_ids: Iterable[str], k: int,
+              relationship_type: Optional[str] = "PRECEDES",
+              direction: str = 'out') -> Dict[str, int]:
+        """
+        Get every PDCA within ``k`` hops of the seeds.
+
+        Each hop is a single vectorized gather over the CSR arrays.
+
+        Args:
+            pdca_ids: Seed PDCA IDs
+            k: Maximum number of hops
+            relationship_type: Type of relationship to follow (None for all)
+            direction: 'out', 'in' or 'both'
+
+        Returns:
+            Dictionary mapping reached PDCA IDs to their hop distance
+            (seeds have distance 0)
+        """
+        frontier = np.unique(self._indexes(pdca_ids))
+        distances = np.full(self.node_count, -1, dtype=np.int32)
+        distances[frontier] = 0
+        directions = ('out', 'in') if direction == 'both' else (direction,)
+
+        for hop in range(1, k + 1):
+            if len(frontier) == 0:
+                break
+            reached = []
+            for adjacency in self._types(relationship_type):
+                for d in directions:
+                    offsets, neighbors, _ = adjacency.csr(d)
+                    _, positions = _gather(offsets, frontier)
+                    reached.append(neighbors[positions])
+            if not reached:
+                break
+            candidates = np.unique(np.concatenate(reached))
+            frontier = candidates[distances[candidates] < 0]
+            distances[frontier] = hop
+
+        found = np.nonzero(distances >= 0)[0]
+        return {self.node_ids[i]: int(distances[i]) for i in found}
+
+    def bfs(self, start_pdca_id: str, relationship_type: Optional[str] = "PRECEDES",
+            max_depth: Optional[int] = None, direction: str = 'out') -> List[Tuple[str, int]]:
+        """
+        Breadth-first traversal from a PDCA.
+
+        Args:
+            start_pdca_id: Starting PDCA ID
+            relationship_type: Type of relationship to follow (None for all)
+            max_depth: Maximum depth (None for unbounded)
+            direction: 'out', 'in' or 'both'
+
+        Returns:
+            List of (pdca_id, depth) in visit order
+        """
+        depth_limit = self.node_count if max_depth is None else max_depth
+        distances = self.k_hop([start_pdca_id], depth_limit, relationship_type, direction)
+        return sorted(distances.items(), key=lambda item: (item[1], self.node_index[item[0]]))
+
+    def shortest_path(self, start_pdca_id: str, end_pdca_id: str,
+                      relationship_type: str = "PRECEDES", max_depth: int = 10,
+                      weighted: bool = False,
+                      max_visits: int = DEFAULT_MAX_VISITS) -> Dict:
+        """Same contract as SQLiteGraph.shortest_path(), served from memory."""
+        def expand(direction):
+            def expand_fn(pdca_ids):
+                return {pdca_id: self.neighbors(pdca_id, relationship_type, direction)
+                        for pdca_id in pdca_ids}
+            return expand_fn
+
+        if weighted:
+            return dijkstra(start_pdca_id, end_pdca_id, expand('out'),
+                            max_depth=max_depth, max_visits=max_visits)
+        return bidirectional_bfs(start_pdca_id, end_pdca_id, expand('out'), expand('in'),
+                                 max_depth=max_depth, max_visits=max_visits)
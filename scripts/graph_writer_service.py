@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Single-Writer Group Commit Service for the SQLite Graph Tier
+
+Several producers write to ``pdca_timeline.db`` (the journal indexer, the
+nightly loop, feedback collection, agents adding links). When each opens
+its own connection and commits per row, they queue on SQLite's single
+write lock, and under load some fail with ``database is locked``.
+
+GraphWriterService owns the only writer connection and takes writes from
+any number of producers:
+
+- In-process producers call add_pdca_node() / add_relationship() from any
+  thread and get a concurrent.futures.Future back.
+- Other processes connect to a Unix socket (serve()) with
+  GraphWriterClient, which has the same methods.
+
+One writer thread drains the queue into group commits. A batch closes when
+it holds ``max_batch`` writes or ``max_latency`` seconds after its first
+write, whichever comes first, and is written with SQLiteGraph.add_batch()
+in one transaction. Each future then resolves to True (committed) or
+False (the row was rejected or the batch failed). A rejected row does not
+affect the others in its batch. A future cancelled before its batch is
+taken drops the write; an unexpected error in the writer thread fails
+that batch's futures with the exception and the thread keeps running. Writes are committed in submission order
+per kind. Nodes and relationships in the same batch are independent rows,
+so their relative order does not matter.
+
+flush() is a barrier: it returns once every write submitted before it is
+committed. flush(durable=True) also fsyncs the database and its WAL,
+because the production profile (synchronous=NORMAL) does not sync the WAL
+on every commit.
+
+Wire protocol (one JSON object per line, replies may come out of order):
+    {"id": 1, "op": "node", "pdca": {...}}
+    {"id": 2, "op": "relationship", "from_pdca_id": "...", "to_pdca_id": "...",
+     "relationship_type": "PRECEDES", "weight": 1.0, "metadata": {...}}
+    {"id": 3, "op": "flush", "durable": false}
+    -> {"id": 1, "ok": true}
+"""
+
+import argparse
+import itertools
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Union
+
+from sqlite_graph import DEFAULT_BULK_CHUNK_SIZE, SQLiteGraph
+
+logger = logging.getLogger(__name__)
+
+# Largest group commit, in writes
+DEFAULT_MAX_BATCH = 1000
+# Longest a write waits for more writes to join its batch, in seconds. By
+# default batches form from writes that queue up while the previous batch
+# commits, so a producer that waits on each write never sits out a window.
+DEFAULT_MAX_LATENCY = 0.0
+# Writes queued before producers block
+DEFAULT_MAX_PENDING = 10000
+
+_NODE = 'node'
+_RELATIONSHIP = 'relationship'
+_FLUSH = 'flush'
+_STOP = 'stop'
+
+
+class _Write:
+    """One queued write or barrier and the future that acknowledges it."""
+
+    __slots__ = ('kind', 'payload', 'future')
+
+    def __init__(self, kind: str, payload: Any = None):
+        self.kind = kind
+        self.payload = payload
+        self.future = Future()
+
+
+class GraphWriterService:
+    """
+    Serializes writes from many producers into group commits.
+
+    Example:
+        with GraphWriterService("pdca_timeline.db") as writer:
+            futures = [writer.add_pdca_node(pdca) for pdca in pdcas]
+            writer.flush()
+    """
+
+    def __init__(self, graph: Union[SQLiteGraph, str] = "pdca_timeline.db",
+                 max_batch: int = DEFAULT_MAX_BATCH,
+                 max_latency: float = DEFAULT_MAX_LATENCY,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 chunk_size: int = DEFAULT_BULK_CHUNK_SIZE):
+        """
+        Start the writer thread.
+
+        Args:
+            graph: SQLiteGraph usable from another thread (production=True or
+                read_pool=True), or a database path (opened with the
+                production profile)
+            max_batch: Most writes committed in one transaction
+            max_latency: Seconds a batch stays open for more writes after its
+                first one (0 commits whatever is already queued)
+            max_pending: Queued writes before add_*() calls block
+            chunk_size: executemany() chunk size passed to add_batch()
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if isinstance(graph, str):
+            graph = SQLiteGraph(graph, production=True)
+            self._owns_graph = True
+        else:
+            self._owns_graph = False
+        if graph._pool is None:
+            raise ValueError("GraphWriterService needs a SQLiteGraph opened with "
+                             "production=True or read_pool=True (its writer connection "
+                             "is used from the service thread)")
+
+        self.graph = graph
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.chunk_size = chunk_size
+        self._queue = queue.Queue(max_pending)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._server = None
+        self._server_thread = None
+        self._socket_path = None
+        self._stats = {'written': 0, 'rejected': 0, 'cancelled': 0, 'batches': 0,
+                       'largest_batch': 0, 'flushes': 0}
+        self._writer = threading.Thread(target=self._run, name="graph-writer", daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> 'GraphWriterService':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def add_pdca_node(self, pdca_data: Dict) -> Future:
+        """
+        Queue a PDCA node write.
+
+        Args:
+            pdca_data: Dictionary as for SQLiteGraph.add_pdca_node()
+
+        Returns:
+            Future resolving to True once committed, False if rejected
+        """
+        return self._submit(_Write(_NODE, pdca_data))
+
+    def add_relationship(self, from_pdca_id: str, to_pdca_id: str,
+                         relationship_type: str = "PRECEDES",
+                         weight: float = 1.0, metadata: Dict = None) -> Future:
+        """
+        Queue a relationship write.
+
+        Args:
+            from_pdca_id: Source PDCA ID
+            to_pdca_id: Target PDCA ID
+            relationship_type: Type of relationship (default: PRECEDES)
+            weight: Relationship weight (default: 1.0)
+            metadata: Additional metadata as dictionary
+
+        Returns:
+            Future resolving to True once committed, False if rejected
+        """
+        return self._submit(_Write(_RELATIONSHIP, (from_pdca_id, to_pdca_id,
+                                                   relationship_type, weight, metadata)))
+
+    def flush(self, durable: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every write submitted before this call is committed.
+
+        Args:
+            durable: Also fsync the database and WAL files
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: True if the barrier was reached (and synced, if durable)
+        """
+        return self.flush_async(durable).result(timeout)
+
+    def flush_async(self, durable: bool = False) -> Future:
+        """flush() returning the barrier's Future instead of waiting."""
+        return self._submit(_Write(_FLUSH, durable))
+
+    def stats(self) -> Dict:
+        """Counts of committed, rejected and cancelled writes, batches and flushes."""
+        stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize()
+        stats['average_batch'] = ((stats['written'] + stats['rejected']) / stats['batches']
+                                  if stats['batches'] else 0.0)
+        return stats
+
+    def _submit(self, write: _Write) -> Future:
+        # Under the lock so that nothing is queued behind close()'s stop marker
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("GraphWriterService is closed")
+            self._queue.put(write)
+        return write.future
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        """Collect batches, commit them and resolve their futures."""
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_latency
+            # A barrier or stop closes the batch so that it covers every earlier write
+            while len(batch) < self.max_batch and batch[-1].kind in (_NODE, _RELATIONSHIP):
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Cancelled writes are dropped; the rest can no longer be cancelled
+            taken = [write for write in batch if write.future.set_running_or_notify_cancel()]
+            self._stats['cancelled'] += len(batch) - len(taken)
+            try:
+                writes = [write for write in taken if write.kind in (_NODE, _RELATIONSHIP)]
+                if writes:
+                    self._commit(writes)
+                for write in taken:
+                    if write.kind == _FLUSH:
+                        self._stats['flushes'] += 1
+                        write.future.set_result(self._sync() if write.payload else True)
+            except Exception as e:
+                logger.error("Error in writer batch of %d writes: %s", len(taken), e)
+                for write in taken:
+                    if write.kind != _STOP and not write.future.done():
+                        write.future.set_exception(e)
+            for write in taken:
+                if write.kind == _STOP:
+                    stopping = True
+                    write.future.set_result(True)
+
+    def _commit(self, writes: List[_Write]):
+        """Write one batch with a single commit and acknowledge each write."""
+        nodes = [write for write in writes if write.kind == _NODE]
+        links = [write for write in writes if write.kind == _RELATIONSHIP]
+        try:
+            result = self.graph.add_batch([write.payload for write in nodes],
+                                          [write.payload for write in links],
+                                          self.chunk_size)
+        except Exception as e:
+            logger.error("Error committing batch of %d writes: %s", len(writes), e)
+            result = {'nodes': {'error': str(e)}, 'relationships': {'error': str(e)}}
+
+        for group, group_result in ((nodes, result['nodes']), (links, result['relationships'])):
+            if 'error' in group_result:
+                rejected = set(range(len(group)))
+            else:
+                rejected = {error['index'] for error in group_result['errors']}
+            for index, write in enumerate(group):
+                write.future.set_result(index not in rejected)
+            self._stats['rejected'] += len(rejected)
+            self._stats['written'] += len(group) - len(rejected)
+
+        self._stats['batches'] += 1
+        self._stats['largest_batch'] = max(self._stats['largest_batch'], len(writes))
+        logger.debug("Group commit of %d writes (%d nodes, %d relationships)",
+                     len(writes), len(nodes), len(links))
+
+    def _sync(self) -> bool:
+        """fsync the database and WAL files so committed writes survive power loss."""
+        if self.graph.db_path == ':memory:':
+            return True
+        try:
+            for path in (self.graph.db_path, self.graph.db_path + '-wal'):
+                if not os.path.exists(path):
+                    continue
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            return True
+        except OSError as e:
+            logger.error("Error syncing %s: %s", self.graph.db_path, e)
+            return False
+
+    # ------------------------------------------------------------------
+    # Unix socket
+    # ------------------------------------------------------------------
+
+    def serve(self, socket_path: str):
+        """
+        Accept writes from other processes on a Unix socket.
+
+        Each connection is served by its own thread. Requests on a
+        connection are pipelined: a client may send many before reading
+        replies, and the service stops reading while its queue is full.
+
+        Args:
+            socket_path: Filesystem path of the socket (replaced if stale)
+        """
+        if self._server is not None:
+            raise RuntimeError(f"Already serving on {self._socket_path}")
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = socketserver.ThreadingUnixStreamServer(socket_path, _WriterRequestHandler)
+        server.daemon_threads = True
+        server.service = self
+        self._server = server
+        self._socket_path = socket_path
+        self._server_thread = threading.Thread(target=server.serve_forever,
+                                               name="graph-writer-socket", daemon=True)
+        self._server_thread.start()
+        logger.info("Graph writer serving on %s", socket_path)
+
+    def _handle_request(self, request: Dict) -> Future:
+        """Submit one wire request and return its future."""
+        op = request.get('op')
+        if op == _NODE:
+            return self.add_pdca_node(request['pdca'])
+        if op == _RELATIONSHIP:
+            return self.add_relationship(request['from_pdca_id'], request['to_pdca_id'],
+                                         request.get('relationship_type', "PRECEDES"),
+                                         request.get('weight', 1.0), request.get('metadata'))
+        if op == _FLUSH:
+            return self.flush_async(bool(request.get('durable')))
+        raise ValueError(f"Unknown op: {op!r}")
+
+    def _stop_serving(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server_thread.join()
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        self._server = None
+
+    def close(self):
+        """Stop accepting writes, commit everything queued and stop the writer."""
+        self._stop_serving()
+        stop = _Write(_STOP)
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(stop)
+        stop.future.result()
+        self._writer.join()
+        if self._owns_graph:
+            self.graph.close()
+
+
+class _WriterRequestHandler(socketserver.StreamRequestHandler):
+    """Reads JSON-line requests from one client and writes replies as they commit."""
+
+    def handle(self):
+        service = self.server.service
+        replies = queue.Queue()
+        sender = threading.Thread(target=self._send_replies, args=(replies,), daemon=True)
+        sender.start()
+        # Accepted requests not yet replied to
+        in_flight = [0]
+        replied = threading.Condition()
+
+        def reply_when_done(request_id, future):
+            try:
+                replies.put({'id': request_id, 'ok': future.result()})
+            except Exception as e:
+                replies.put({'id': request_id, 'ok': False, 'error': str(e)})
+            finally:
+                with replied:
+                    in_flight[0] -= 1
+                    replied.notify_all()
+
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get('id')
+                    future = service._handle_request(request)
+                except Exception as e:
+                    replies.put({'id': request_id, 'ok': False, 'error': str(e)})
+                    continue
+                with replied:
+                    in_flight[0] += 1
+                future.add_done_callback(
+                    lambda done, request_id=request_id: reply_when_done(request_id, done))
+        except OSError as e:
+            logger.debug("Writer client disconnected: %s", e)
+        finally:
+            # Reply to everything already accepted before closing the connection
+            with replied:
+                replied.wait_for(lambda: in_flight[0] == 0)
+            replies.put(None)
+            sender.join()
+
+    def _send_replies(self, replies: queue.Queue):
+        while True:
+            reply = replies.get()
+            if reply is None:
+                return
+            batch = [reply]
+            # Send every ready reply with one write
+            while True:
+                try:
+                    batch.append(replies.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            data = b''.join(json.dumps(item).encode() + b'\n' for item in batch if item is not None)
+            try:
+                self.wfile.write(data)
+                self.wfile.flush()
+            except OSError:
+                return
+            if stop:
+                return
+
+
+class GraphWriterClient:
+    """
+    Producer side of GraphWriterService.serve() for other processes.
+
+    Example:
+        client = GraphWriterClient("/run/pdca/graph-writer.sock")
+        client.add_relationship(from_id, to_id, "REFERENCES")
+        client.flush()
+    """
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        """
+        Connect to a serving GraphWriterService.
+
+        Args:
+            socket_path: Path passed to GraphWriterService.serve()
+            timeout: Seconds to wait for the connection (None waits indefinitely)
+        """
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(socket_path)
+        self._sock.settimeout(None)
+        self._send_lock = threading.Lock()
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_replies,
+                                        name="graph-writer-client", daemon=True)
+        self._reader.start()
+
+    def __enter__(self) -> 'GraphWriterClient':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_pdca_node(self, pdca_data: Dict) -> Future:
+        """GraphWriterService.add_pdca_node() over the socket."""
+        return self._request({'op': _NODE, 'pdca': pdca_data})
+
+    def add_relationship(self, from_pdca_id: str, to_pdca_id: str,
+                         relationship_type: str = "PRECEDES",
+                         weight: float = 1.0, metadata: Dict = None) -> Future:
+        """GraphWriterService.add_relationship() over the socket."""
+        return self._request({'op': _RELATIONSHIP, 'from_pdca_id': from_pdca_id,
+                              'to_pdca_id': to_pdca_id, 'relationship_type': relationship_type,
+                              'weight': weight, 'metadata': metadata})
+
+    def flush(self, durable: bool = False, timeout: Optional[float] = None) -> bool:
+        """GraphWriterService.flush() over the socket."""
+        return self._request({'op': _FLUSH, 'durable': durable}).result(timeout)
+
+    def _request(self, message: Dict) -> Future:
+        future = Future()
+        with self._send_lock:
+            if self._closed:
+                raise RuntimeError("GraphWriterClient is closed")
+            message['id'] = next(self._ids)
+            self._pending[message['id']] = future
+            try:
+                self._sock.sendall(json.dumps(message).encode() + b'\n')
+            except OSError:
+                del self._pending[message['id']]
+                raise
+        return future
+
+    def _read_replies(self):
+        """Resolve futures from replies; fail the rest when the connection ends."""
+        try:
+            with self._sock.makefile('rb') as replies:
+                for line in replies:
+                    reply = json.loads(line)
+                    with self._send_lock:
+                        future = self._pending.pop(reply.get('id'), None)
+                    if 'error' in reply:
+                        logger.warning("Graph writer rejected request %s: %s",
+                                       reply.get('id'), reply['error'])
+                    # A future the caller cancelled is not resolved
+                    if future is not None and future.set_running_or_notify_cancel():
+                        future.set_result(bool(reply['ok']))
+        except (OSError, ValueError) as e:
+            logger.debug("Graph writer connection closed: %s", e)
+        finally:
+            with self._send_lock:
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(ConnectionError("Graph writer connection closed"))
+
+    def close(self):
+        """Wait for replies to everything sent, then disconnect."""
+        with self._send_lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+        self._reader.join()
+        self._sock.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve group-committed graph writes on a Unix socket")
+    parser.add_argument('socket', help="Unix socket path")
+    parser.add_argument('--db', default="pdca_timeline.db", help="Graph database path")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--max-latency-ms', type=float, default=DEFAULT_MAX_LATENCY * 1000)
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    service = GraphWriterService(args.db, max_batch=args.max_batch,
+                                 max_latency=args.max_latency_ms / 1000,
+                                 max_pending=args.max_pending)
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+    try:
+        service.serve(args.socket)
+        while not stopped.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+    stats = service.stats()
+    print(f"Committed {stats['written']} writes ({stats['rejected']} rejected) in "
+          f"{stats['batches']} batches, average {stats['average_batch']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Incremental Journal Indexer for the SQLite Graph Tier
+
+Walks a PDCA journal tree, parses every ``*.pdca.md`` file and streams the
+results into SQLiteGraph:
+
+- PDCA metadata comes from the ``YYYYMMDD-HHMMSS-AgentName.RoleName.pdca.md``
+  filename plus ``**Field:** value`` lines and the Objective section.
+- Breadcrumb links ``[YYYYMMDD-HHMMSS-AgentName.RoleName.pdca.md]`` become
+  PRECEDES relationships; a link marked as next/successor (PRECEDES) points
+  forward, one marked as previous/predecessor (FOLLOWS) points back, and
+  unmarked links are oriented by timestamp.
+- Deleting a journal file removes its PDCA node and relationships.
+- Files are parsed in a process pool and written with the bulk APIs in
+  batches.
+- A ``journal_manifest`` table keeps path, mtime, size and content hash, so
+  a re-run only reads new or changed files; unchanged files cost one stat().
+
+Usage:
+    python journal_indexer.py /path/to/Web4Articles --db pdca_timeline.db
+    python journal_indexer.py /path/to/Web4Articles --publish /var/lib/pdca/serving
+"""
+
+import argparse
+import calendar
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_serving import publish_snapshot
+
+logger = logging.getLogger(__name__)
+
+PDCA_SUFFIX = '.pdca.md'
+
+FILENAME_PATTERN = re.compile(r'^(\d{8})-(\d{6})-([^.]+)\.([^.]+)\.pdca\.md$')
+
+BREADCRUMB_PATTERN = re.compile(r'\[?(\d{8}-\d{6}-[^.\s\[\]()/]+\.[^.\s\[\]()/]+)\.pdca\.md\]?')
+
+# **Field:** value lines mapped to pdcas columns
+FIELD_PATTERN = re.compile(r'^\s*[-*]*\s*\*\*([A-Za-z][A-Za-z _]*?):?\*\*:?\s*(.+?)\s*$', re.MULTILINE)
+FIELD_COLUMNS = {
+    'session': 'session_id',
+    'session id': 'session_id',
+    'branch': 'branch',
+    'sprint': 'sprint',
+    'cmm level': 'cmm_level',
+    'task type': 'task_type',
+    'quality score': 'quality_score',
+    'verification': 'verification_status',
+    'verification status': 'verification_status',
+    'objective': 'objective'
+}
+
+OBJECTIVE_HEADING = re.compile(r'^#+\s*.*objective.*$\n+(.+)$', re.IGNORECASE | re.MULTILINE)
+
+# Whole words on a breadcrumb line that say which way the link points
+_FORWARD_WORDS = re.compile(r'\b(next|successor|precedes|followed by)\b', re.IGNORECASE)
+_BACKWARD_WORDS = re.compile(r'\b(previous|prev|predecessor|follows|back)\b', re.IGNORECASE)
+
+# Files below this count are parsed in-process (pool start-up costs more)
+_MIN_FILES_FOR_POOL = 32
+
+DEFAULT_INDEX_BATCH_SIZE = 500
+
+
+def parse_filename(filename: str, mtime: float) -> Dict:
+    """
+    Extract PDCA metadata from a journal filename.
+
+    Falls back to 'Unknown' agent/role and the file mtime when the name does
+    not follow the YYYYMMDD-HHMMSS-AgentName.RoleName.pdca.md pattern.
+    """
+    pdca_id = filename[:-len(PDCA_SUFFIX)] if filename.endswith(PDCA_SUFFIX) else filename
+    match = FILENAME_PATTERN.match(filename)
+    if match:
+        day, clock, agent_name, agent_role = match.groups()
+        try:
+            moment = datetime.strptime(day + clock, "%Y%m%d%H%M%S")
+            return {
+                'id': pdca_id,
+                'agent_name': agent_name,
+                'agent_role': agent_role,
+                'date': moment.strftime("%Y-%m-%d"),
+                'timestamp': calendar.timegm(moment.timetuple())
+            }
+        except ValueError:
+            pass  # e.g. month 13: treat like an unmatched name
+
+    moment = datetime.fromtimestamp(mtime, tz=timezone.utc)
+    return {
+        'id': pdca_id,
+        'agent_name': 'Unknown',
+        'agent_role': 'Unknown',
+        'date': moment.strftime("%Y-%m-%d"),
+        'timestamp': int(mtime)
+    }
+
+
+def parse_content_fields(content: str) -> Dict:
+    """Extract pdcas columns from **Field:** lines and the Objective section."""
+    fields = {}
+    for name, value in FIELD_PATTERN.findall(content):
+        column = FIELD_COLUMNS.get(name.strip().lower())
+        if column and column not in fields:
+            fields[column] = value.strip()
+    if 'objective' not in fields:
+        match = OBJECTIVE_HEADING.search(content)
+        if match:
+            fields['objective'] = match.group(1).strip()
+
+    for column, cast in (('cmm_level', int), ('quality_score', float)):
+        if column in fields:
+            number = re.search(r'\d+(\.\d+)?', fields[column])
+            fields[column] = cast(float(number.group())) if number else None
+    return fields
+
+
+def parse_breadcrumbs(pdca_id: str, content: str) -> List[Tuple]:
+    """
+    Turn breadcrumb links into PRECEDES relationship tuples.
+
+    Returns:
+        List of (from_pdca_id, to_pdca_id, 'PRECEDES', 1.0, metadata) tuples;
+        metadata records the file the link was found in
+    """
+    links = {}
+    for line in content.splitlines():
+        matches = BREADCRUMB_PATTERN.findall(line)
+        if not matches:
+            continue
+        # Agent and role names in the links themselves say nothing about direction
+        words = BREADCRUMB_PATTERN.sub(' ', line)
+        if _BACKWARD_WORDS.search(words):
+            marked = 'backward'
+        elif _FORWARD_WORDS.search(words):
+            marked = 'forward'
+        else:
+            marked = None
+        for target in matches:
+            if target == pdca_id:
+                continue
+            orientation = marked
+            if orientation is None:
+                # Unmarked link: the older PDCA precedes the newer one
+                orientation = 'backward' if target < pdca_id else 'forward'
+            pair = (target, pdca_id) if orientation == 'backward' else (pdca_id, target)
+            links.setdefault(pair, {'source': 'breadcrumb', 'from_file': pdca_id})
+    return [(a, b, 'PRECEDES', 1.0, metadata) for (a, b), metadata in links.items()]
+
+
+def parse_pdca_file(path: str) -> Dict:
+    """
+    Parse one journal file (runs in a worker process).
+
+    Returns:
+        Dictionary with path, mtime, size, content_hash, pdca and links, or
+        path and error if the file could not be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        stat = os.stat(path)
+        content = raw.decode('utf-8', errors='replace')
+
+        pdca = parse_filename(os.path.basename(path), stat.st_mtime)
+        pdca.update(parse_content_fields(content))
+        pdca['file_path'] = path
+        return {
+            'path': path,
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'content_hash': hashlib.sha256(raw).hexdigest(),
+            'pdca': pdca,
+            'links': parse_breadcrumbs(pdca['id'], content)
+        }
+    except Exception as e:
+        return {'path': path, 'error': str(e)}
+
+
+class JournalIndexer:
+    """
+    Incremental, parallel indexer from a journal tree into SQLiteGraph.
+
+    Example:
+        indexer = JournalIndexer(SQLiteGraph("pdca_timeline.db"), "Web4Articles")
+        report = indexer.run()
+    """
+
+    def __init__(self, graph: SQLiteGraph, root: str, workers: Optional[int] = None,
+                 batch_size: int = DEFAULT_INDEX_BATCH_SIZE):
+        """
+        Initialize the indexer.
+
+        Args:
+            graph: Target SQLiteGraph
+            root: Journal directory to walk
+            workers: Parser processes (default: CPU count)
+            batch_size: Parsed files per bulk write
+        """
+        self.graph = graph
+        self.root = os.path.abspath(root)
+        self.workers = workers
+        self.batch_size = batch_size
+        self._create_manifest()
+
+    def _create_manifest(self):
+        """Create the journal_manifest table."""
+        with self.graph._write_lock:
+            self.graph.conn.execute("""
+                CREATE TABLE IF NOT EXISTS journal_manifest (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    pdca_id TEXT NOT NULL,
+                    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            self.graph.conn.commit()
+
+    def scan(self) -> Iterator[Tuple[str, float, int]]:
+        """Yield (path, mtime, size) for every journal file under root."""
+        for directory, subdirectories, filenames in os.walk(self.root):
+            subdirectories[:] = [d for d in subdirectories if not d.startswith('.')]
+            for filename in filenames:
+                if filename.endswith(PDCA_SUFFIX):
+                    path = os.path.join(directory, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # removed while walking
+                    yield path, stat.st_mtime, stat.st_size
+
+    def _load_manifest(self) -> Dict[str, Tuple[float, int, str]]:
+        cursor = self.graph.conn.execute(
+            "SELECT path, mtime, size, content_hash FROM journal_manifest")
+        return {row[0]: (row[1], row[2], row[3]) for row in cursor}
+
+    def run(self, full: bool = False) -> Dict:
+        """
+        Index new and changed files.
+
+        Args:
+            full: Reparse every file regardless of the manifest
+
+        Returns:
+            Dictionary with scanned, unchanged, parsed, indexed, touched
+            (content unchanged), failed, relationships, missing (in the
+            manifest but no longer on disk), removed (PDCA nodes of missing
+            files deleted from the graph), errors and elapsed seconds
+        """
+        started = time.perf_counter()
+        manifest = self._load_manifest()
+        report = {'scanned': 0, 'unchanged': 0, 'parsed': 0, 'indexed': 0, 'touched': 0,
+                  'failed': 0, 'relationships': 0, 'missing': 0, 'removed': 0, 'errors': []}
+
+        changed = []
+        seen = set()
+        for path, mtime, size in self.scan():
+            report['scanned'] += 1
+            seen.add(path)
+            known = manifest.get(path)
+            if not full and known is not None and known[0] == mtime and known[1] == size:
+                report['unchanged'] += 1
+            else:
+                changed.append(path)
+
+        missing = [path for path in manifest if path not in seen]
+        if missing:
+            # A file moved to another directory keeps its PDCA
+            present = {parse_filename(os.path.basename(path), 0)['id'] for path in seen}
+            report['removed'] = self._forget(missing, present)
+            report['missing'] = len(missing)
+
+        batch = []
+        for parsed in self._parse_all(changed):
+            report['parsed'] += 1
+            if 'error' in parsed:
+                report['failed'] += 1
+                report['errors'].append({'path': parsed['path'], 'error': parsed['error']})
+                continue
+            known = manifest.get(parsed['path'])
+            parsed['known'] = known is not None
+            if not full and known is not None and known[2] == parsed['content_hash']:
+                parsed['touched'] = True  # only the mtime moved
+            batch.append(parsed)
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch, report)
+                batch = []
+        if batch:
+            self._write_batch(batch, report)
+
+        report['elapsed'] = time.perf_counter() - started
+        logger.info("Indexed journal %s: %d scanned, %d unchanged, %d indexed, %d failed in %.2fs",
+                    self.root, report['scanned'], report['unchanged'], report['indexed'],
+                    report['failed'], report['elapsed'])
+        return report
+
+    def _parse_all(self, paths: List[str]) -> Iterator[Dict]:
+        """Parse files in a process pool, in-process for small change sets."""
+        if len(paths) < _MIN_FILES_FOR_POOL or self.workers == 1:
+            for path in paths:
+                yield parse_pdca_file(path)
+            return
+        workers = self.workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(parse_pdca_file, paths,
+                                chunksize=max(1, len(paths) // (workers * 4)))
+
+    def _write_batch(self, batch: List[Dict], report: Dict):
+        """Write one batch of parsed files to the graph and the manifest."""
+        content_changed = [parsed for parsed in batch if not parsed.get('touched')]
+        report['touched'] += len(batch) - len(content_changed)
+
+        # Links found in a changed file are re-derived from its new content
+        reindexed = [parsed['pdca']['id'] for parsed in content_changed if parsed['known']]
+        if reindexed:
+            self._drop_links(reindexed)
+
+        failed = set()
+        if content_changed:
+            nodes = self.graph.add_pdca_nodes_bulk(parsed['pdca'] for parsed in content_changed)
+            links = self.graph.add_relationships_bulk(
+                link for parsed in content_changed for link in parsed['links'])
+            report['indexed'] += nodes['inserted'] + nodes['replaced']
+            report['relationships'] += links['inserted'] + links['replaced']
+            for error in nodes['errors']:
+                path = content_changed[error['index']]['path']
+                failed.add(path)
+                report['errors'].append({'path': path, 'error': error['error']})
+            report['failed'] += nodes['failed']
+
+        # Files whose node failed stay out of the manifest so the next run retries them
+
+        with self.graph._write_lock:
+            self.graph.conn.executemany("""
+                INSERT OR REPLACE INTO journal_manifest (path, mtime, size, content_hash, pdca_id)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(parsed['path'], parsed['mtime'], parsed['size'], parsed['content_hash'],
+                   parsed['pdca']['id']) for parsed in batch if parsed['path'] not in failed])
+            self.graph.conn.commit()
+
+    def _drop_links(self, pdca_ids: List[str]):
+        """Delete breadcrumb relationships previously extracted from these files."""
+        with self.graph._write_lock:
+            try:
+                self.graph.conn.execute("""
+                    DELETE FROM pdca_relationships
+                    WHERE (from_pdca_id IN (SELECT value FROM json_each(:ids))
+                           OR to_pdca_id IN (SELECT value FROM json_each(:ids)))
+                      AND json_extract(metadata, '$.from_file') IN (SELECT value FROM json_each(:ids))
+                """, {'ids': json.dumps(pdca_ids)})
+                self.graph.conn.commit()
+                self.graph.write_generation += 1
+
+            except Exception as e:
+                self.graph.conn.rollback()
+                logger.error("Error dropping stale breadcrumb links: %s", e)
+
+    def _forget(self, paths: List[str], keep_ids: Iterable[str] = ()) -> int:
+        """
+        Remove files that no longer exist from the manifest and the graph.
+
+        Args:
+            paths: Manifest paths missing on disk
+            keep_ids: PDCA IDs still present under another path
+
+        Returns:
+            Number of PDCA nodes deleted
+        """
+        with self.graph._write_lock:
+            try:
+                params = {'paths': json.dumps(paths), 'keep': json.dumps(sorted(set(keep_ids)))}
+                stale = """
+                    SELECT pdca_id FROM journal_manifest
+                    WHERE path IN (SELECT value FROM json_each(:paths))
+                      AND pdca_id NOT IN (SELECT value FROM json_each(:keep))
+                """
+                self.graph.conn.execute(f"""
+                    DELETE FROM pdca_relationships
+                    WHERE from_pdca_id IN ({stale}) OR to_pdca_id IN ({stale})
+                """, params)
+                removed = self.graph.conn.execute(
+                    f"DELETE FROM pdcas WHERE id IN ({stale})", params).rowcount
+                self.graph.conn.execute(
+                    "DELETE FROM journal_manifest WHERE path IN (SELECT value FROM json_each(:paths))",
+                    params)
+                self.graph.conn.commit()
+                self.graph.write_generation += 1
+                return removed
+
+            except Exception as e:
+                self.graph.conn.rollback()
+                logger.error("Error removing deleted journal files: %s", e)
+                return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Index a PDCA journal into SQLiteGraph")
+    parser.add_argument('root', help="Journal directory (e.g. a Web4Articles checkout)")
+    parser.add_argument('--db', default="pdca_timeline.db", help="Graph database path")
+    parser.add_argument('--workers', type=int, help="Parser processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_INDEX_BATCH_SIZE)
+    parser.add_argument('--full', action='store_true', help="Reparse every file")
+    parser.add_argument('--publish', metavar='DIR',
+                        help="Publish a serving snapshot to DIR after indexing")
+    args = parser.parse_args(argv)
+
+    graph = SQLiteGraph(args.db, production=True)
+    try:
+        report = JournalIndexer(graph, args.root, args.workers, args.batch_size).run(args.full)
+        if args.publish:
+            pointer = publish_snapshot(graph, args.publish)
+            print(f"Published serving snapshot {pointer['version']} to {args.publish}")
+    finally:
+        graph.close()
+
+    print(f"Scanned {report['scanned']} files in {report['elapsed']:.2f}s: "
+          f"{report['unchanged']} unchanged, {report['indexed']} indexed, "
+          f"{report['touched']} touched, {report['failed']} failed, "
+          f"{report['relationships']} relationships, {report['missing']} missing, "
+          f"{report['removed']} removed")
+    for error in report['errors'][:20]:
+        print(f"  {error['path']}: {error['error']}")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
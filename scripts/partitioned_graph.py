@@ -0,0 +1,798 @@
+#!/usr/bin/env python3
+"""
+Date-Partitioned Storage for the SQLite Graph Tier
+
+PartitionedGraph keeps one SQLiteGraph database per UTC month
+(``pdcas-YYYY-MM.db``) under a single logical graph:
+
+- a node lives in the partition of its timestamp
+- a relationship lives in the partition of its source node
+- the catalog database (``catalog.db``) holds the partition list, an
+  id -> partition routing table, and an index of cross-partition
+  relationships (source and target in different months), so predecessor
+  and successor lookups only open the partitions involved
+- timeline queries prune partitions by their timestamp range and read
+  the remaining ones ATTACHed to the catalog connection. At most
+  SQLITE_LIMIT_ATTACHED partitions are attached at a time, least
+  recently used first out.
+
+Dropping a month deletes its file. Rebuilding a month writes a fresh file
+next to the old one and swaps it in with os.replace(). Neither touches
+the other partitions, and both leave the caches of the other partitions
+valid.
+
+Writes to a partition and to the catalog are separate transactions. If a
+batch is interrupted between the two, re-running it repairs the routing.
+"""
+
+import calendar
+import json
+import os
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlite_graph import DEFAULT_BULK_CHUNK_SIZE, SQLiteGraph, _record_bulk_error, _relationship_row
+from temporal_index import DEFAULT_TIMELINE_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = 'catalog.db'
+
+# Partition graphs kept open at once (least recently used are closed)
+DEFAULT_MAX_OPEN_PARTITIONS = 12
+
+# Files SQLite may keep next to a partition database
+_SIDECAR_SUFFIXES = ('', '-wal', '-shm', '-journal')
+
+
+def partition_name(timestamp: int) -> str:
+    """Name (YYYY-MM, UTC) of the partition holding a timestamp."""
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc).strftime('%Y-%m')
+
+
+def partition_bounds(name: str) -> Tuple[int, int]:
+    """[start, end) Unix timestamp range of a YYYY-MM partition."""
+    month = datetime.strptime(name, '%Y-%m')
+    start = calendar.timegm(month.timetuple())
+    if month.month == 12:
+        month = month.replace(year=month.year + 1, month=1)
+    else:
+        month = month.replace(month=month.month + 1)
+    return start, calendar.timegm(month.timetuple())
+
+
+def _alias(name: str) -> str:
+    """Schema name of an attached partition."""
+    return 'p_' + name.replace('-', '_')
+
+
+class PartitionedGraph:
+    """
+    Monthly partitioned PDCA graph.
+
+    Offers the write and lookup subset of SQLiteGraph (bulk writes,
+    get_pdca_node, get_successors, get_predecessors) plus partition-pruned
+    timeline() and count() queries, and partition maintenance.
+
+    Example:
+        graph = PartitionedGraph("/var/lib/pdca/partitions")
+        graph.add_pdca_nodes_bulk(pdcas)
+        graph.timeline(start_timestamp=week_ago, descending=True)
+        graph.drop_partition('2023-01')
+    """
+
+    def __init__(self, directory: str, max_open: int = DEFAULT_MAX_OPEN_PARTITIONS,
+                 max_attached: Optional[int] = None, **graph_kwargs):
+        """
+        Open (or create) a partitioned graph.
+
+        Args:
+            directory: Directory holding catalog.db and the monthly databases
+            max_open: Partition graphs kept open at once
+            max_attached: Partitions attached at once for timeline queries
+                (capped at SQLite's attach limit)
+            **graph_kwargs: Passed to every partition's SQLiteGraph
+                (e.g. production=True)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_open = max_open
+        self.graph_kwargs = graph_kwargs
+        self.conn = sqlite3.connect(os.path.join(directory, CATALOG_FILE), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        limit = self.conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        self.max_attached = max(1, min(max_attached or limit, limit))
+        # Catalog connection, open partition graphs and attachments are shared state
+        self._lock = threading.RLock()
+        self._graphs = OrderedDict()
+        self._attached = OrderedDict()
+        self._create_catalog()
+
+    def _create_catalog(self):
+        """Create the catalog tables."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_partitions (
+                name TEXT PRIMARY KEY,
+                start_timestamp INTEGER NOT NULL,
+                end_timestamp INTEGER NOT NULL,
+                file TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_node_partitions (
+                id TEXT PRIMARY KEY,
+                partition TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_node_partitions_partition
+            ON pdca_node_partitions(partition)
+        """)
+        # Relationships whose target is in another (or no known) partition
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_cross_edges (
+                from_pdca_id TEXT NOT NULL,
+                to_pdca_id TEXT NOT NULL,
+                relationship_type TEXT NOT NULL,
+                from_partition TEXT NOT NULL,
+                to_partition TEXT,
+                PRIMARY KEY (from_pdca_id, to_pdca_id, relationship_type)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_cross_edges_to
+            ON pdca_cross_edges(to_pdca_id, relationship_type)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_cross_edges_from_partition
+            ON pdca_cross_edges(from_partition)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_cross_edges_to_partition
+            ON pdca_cross_edges(to_partition)
+        """)
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Partitions
+    # ------------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"pdcas-{name}.db")
+
+    def _partition(self, name: str, create: bool = False) -> Optional[SQLiteGraph]:
+        """Open partition graph (least recently used ones are closed), or None."""
+        with self._lock:
+            graph = self._graphs.get(name)
+            if graph is not None:
+                self._graphs.move_to_end(name)
+                return graph
+            if create:
+                start, end = partition_bounds(name)
+                self.conn.execute("""
+                    INSERT OR IGNORE INTO pdca_partitions (name, start_timestamp, end_timestamp, file)
+                    VALUES (?, ?, ?, ?)
+                """, (name, start, end, os.path.basename(self._path(name))))
+                self.conn.commit()
+            elif not os.path.exists(self._path(name)):
+                return None
+            graph = SQLiteGraph(self._path(name), **self.graph_kwargs)
+            self._graphs[name] = graph
+            while len(self._graphs) > self.max_open:
+                _, evicted = self._graphs.popitem(last=False)
+                evicted.close()
+            return graph
+
+    def _attach(self, names: List[str]) -> List[str]:
+        """Attach partitions to the catalog connection; returns their schema names."""
+        for name in names:
+            if name in self._attached:
+                self._attached.move_to_end(name)
+                continue
+            while len(self._attached) >= self.max_attached:
+                self._detach(next(iter(self._attached)))
+            self.conn.execute("ATTACH DATABASE ? AS " + _alias(name), (self._path(name),))
+            self._attached[name] = True
+        return [_alias(name) for name in names]
+
+    def _detach(self, name: str):
+        """Detach a partition from the catalog connection if attached."""
+        if self._attached.pop(name, None):
+            self.conn.execute("DETACH DATABASE " + _alias(name))
+
+    def _close_partition(self, name: str):
+        """Detach and close a partition so its file can be replaced or removed."""
+        self._detach(name)
+        graph = self._graphs.pop(name, None)
+        if graph is not None:
+            graph.close()
+
+    def partitions(self) -> List[Dict]:
+        """
+        List the partitions.
+
+        Returns:
+            One dictionary per partition (name, start_timestamp,
+            end_timestamp, file, created_at, bytes), oldest first
+        """
+        with self._lock:
+            rows = [dict(row) for row in self.conn.execute(
+                "SELECT * FROM pdca_partitions ORDER BY start_timestamp")]
+        for row in rows:
+            path = self._path(row['name'])
+            row['bytes'] = os.path.getsize(path) if os.path.exists(path) else 0
+        return rows
+
+    def _prune(self, start_timestamp: Optional[int], end_timestamp: Optional[int],
+               descending: bool) -> List[str]:
+        """Partitions overlapping [start, end), in timeline order."""
+        direction = 'DESC' if descending else 'ASC'
+        rows = self.conn.execute(f"""
+            SELECT name FROM pdca_partitions
+            WHERE (:start IS NULL OR end_timestamp > :start)
+              AND (:end IS NULL OR start_timestamp < :end)
+            ORDER BY start_timestamp {direction}
+        """, {'start': start_timestamp, 'end': end_timestamp})
+        return [row['name'] for row in rows]
+
+    def _route(self, pdca_ids: Iterable[str]) -> Dict[str, str]:
+        """Partition of each known PDCA ID."""
+        rows = self.conn.execute("""
+            SELECT id, partition FROM pdca_node_partitions
+            WHERE id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(pdca_ids)),))
+        return {row['id']: row['partition'] for row in rows}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_pdca_nodes_bulk(self, pdcas: Iterable[Dict],
+                            chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Dict:
+        """
+        Add many PDCA nodes, each to the partition of its timestamp.
+
+        A node whose timestamp moved to another month is removed from its
+        old partition; its outgoing relationships move with it.
+
+        Args:
+            pdcas: Iterable (or generator) of PDCA dictionaries
+            chunk_size: Rows routed and written per round
+
+        Returns:
+            Dictionary with inserted, replaced and failed counts plus a list
+            of per-row errors ({'index', 'id', 'error'})
+        """
+        result = {'inserted': 0, 'replaced': 0, 'failed': 0, 'errors': []}
+        pdcas = iter(pdcas)
+        index = 0
+        with self._lock:
+            while True:
+                chunk = list(islice(pdcas, chunk_size))
+                if not chunk:
+                    break
+                buckets = {}
+                for offset, pdca_data in enumerate(chunk):
+                    try:
+                        name = partition_name(pdca_data['timestamp'])
+                    except Exception as e:
+                        _record_bulk_error(result, index + offset, pdca_data.get('id'), e)
+                        continue
+                    buckets.setdefault(name, []).append((index + offset, pdca_data))
+                previous = self._route(pdca_data.get('id') for pdca_data in chunk)
+
+                for name, items in buckets.items():
+                    written = self._write(result, self._partition(name, create=True),
+                                          'add_pdca_nodes_bulk', items, chunk_size)
+                    for pdca_data in written:
+                        old = previous.get(pdca_data['id'])
+                        if old is not None and old != name:
+                            self._move_node(old, pdca_data['id'], name)
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO pdca_node_partitions (id, partition) VALUES (?, ?)",
+                        [(pdca_data['id'], name) for pdca_data in written])
+                    # Cross-partition relationships may already point at these nodes
+                    self.conn.execute("""
+                        UPDATE pdca_cross_edges SET to_partition = ?
+                        WHERE to_pdca_id IN (SELECT value FROM json_each(?))
+                    """, (name, json.dumps([pdca_data['id'] for pdca_data in written])))
+                self.conn.commit()
+                index += len(chunk)
+
+        result['errors'].sort(key=lambda error: error['index'])
+        logger.info("Partitioned bulk added PDCA nodes: %d inserted, %d replaced, %d failed",
+                    result['inserted'], result['replaced'], result['failed'])
+        return result
+
+    def add_relationships_bulk(self, relationships: Iterable[Any],
+                               chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Dict:
+        """
+        Add many relationships, each to the partition of its source node.
+
+        Items use the same formats as SQLiteGraph.add_relationships_bulk().
+        Relationships from unknown PDCAs fail; relationships to PDCAs in
+        another (or no known) partition are recorded as cross-partition.
+
+        Args:
+            relationships: Iterable (or generator) of relationships
+            chunk_size: Rows routed and written per round
+
+        Returns:
+            Dictionary with inserted, replaced and failed counts plus a list
+            of per-row errors ({'index', 'id', 'error'})
+        """
+        result = {'inserted': 0, 'replaced': 0, 'failed': 0, 'errors': []}
+        relationships = iter(relationships)
+        index = 0
+        with self._lock:
+            while True:
+                chunk = list(islice(relationships, chunk_size))
+                if not chunk:
+                    break
+                keys = {}
+                for offset, relationship in enumerate(chunk):
+                    try:
+                        keys[index + offset] = _relationship_row(relationship)[:3]
+                    except Exception as e:
+                        _record_bulk_error(result, index + offset, None, e)
+                routes = self._route({pdca_id for key in keys.values() for pdca_id in key[:2]})
+
+                buckets = {}
+                for row_index, key in keys.items():
+                    name = routes.get(key[0])
+                    if name is None:
+                        _record_bulk_error(result, row_index, key[:2],
+                                      ValueError(f"Unknown source PDCA: {key[0]}"))
+                        continue
+                    buckets.setdefault(name, []).append((row_index, chunk[row_index - index]))
+
+                for name, items in buckets.items():
+                    written = self._write(result, self._partition(name, create=True),
+                                          'add_relationships_bulk', items, chunk_size)
+                    cross = []
+                    for relationship in written:
+                        from_pdca_id, to_pdca_id, relationship_type = _relationship_row(relationship)[:3]
+                        if routes.get(to_pdca_id) != name:
+                            cross.append((from_pdca_id, to_pdca_id, relationship_type,
+                                          name, routes.get(to_pdca_id)))
+                    self.conn.executemany("""
+                        INSERT OR REPLACE INTO pdca_cross_edges (
+                            from_pdca_id, to_pdca_id, relationship_type, from_partition, to_partition
+                        ) VALUES (?, ?, ?, ?, ?)
+                    """, cross)
+                self.conn.commit()
+                index += len(chunk)
+
+        result['errors'].sort(key=lambda error: error['index'])
+        logger.info("Partitioned bulk added relationships: %d inserted, %d replaced, %d failed",
+                    result['inserted'], result['replaced'], result['failed'])
+        return result
+
+    @staticmethod
+    def _write(result: Dict, graph: SQLiteGraph, method: str, items: List[Tuple[int, Any]],
+               chunk_size: int) -> List[Any]:
+        """Run one partition's bulk write, merge its result and return the rows written."""
+        part = getattr(graph, method)([item for _, item in items], chunk_size)
+        result['inserted'] += part['inserted']
+        result['replaced'] += part['replaced']
+        result['failed'] += part['failed']
+        failed = set()
+        for error in part['errors']:
+            failed.add(error['index'])
+            result['errors'].append(dict(error, index=items[error['index']][0]))
+        if 'error' in part:
+            result['error'] = part['error']
+            return []
+        return [item for offset, (_, item) in enumerate(items) if offset not in failed]
+
+    def _move_node(self, name: str, pdca_id: str, new_partition: str, copy_edges: bool = True):
+        """
+        Remove a node that moved to ``new_partition`` from partition ``name``.
+
+        With ``copy_edges`` its outgoing relationships (weight, metadata and
+        created_at included) are first copied into ``new_partition`` and
+        indexed there; rebuild_partition() passes False because the rebuilt
+        month brings its own relationships. Only then are they deleted from
+        ``name``. Relationships into it from ``name`` stay and become
+        cross-partition; those from ``new_partition`` no longer are.
+        """
+        graph = self._partition(name)
+        if graph is None:
+            return
+        outgoing = graph.conn.execute("""
+            SELECT to_pdca_id, relationship_type, weight, metadata, created_at
+            FROM pdca_relationships WHERE from_pdca_id = ?
+        """, (pdca_id,)).fetchall()
+        if copy_edges and outgoing:
+            target = self._partition(new_partition, create=True)
+            with target._write_lock:
+                try:
+                    target.conn.executemany("""
+                        INSERT OR REPLACE INTO pdca_relationships (
+                            from_pdca_id, to_pdca_id, relationship_type, weight, metadata, created_at
+                        ) VALUES (?, ?, ?, ?, ?, ?)
+                    """, [(pdca_id,) + tuple(row) for row in outgoing])
+                    target.conn.commit()
+                    target.write_generation += 1
+                except Exception as e:
+                    target.conn.rollback()
+                    logger.error("Error copying relationships of PDCA %s to partition %s: %s",
+                                 pdca_id, new_partition, e)
+                    return
+
+        with graph._write_lock:
+            try:
+                incoming = graph.conn.execute("""
+                    SELECT from_pdca_id, relationship_type FROM pdca_relationships
+                    WHERE to_pdca_id = ?
+                """, (pdca_id,)).fetchall()
+                graph.conn.execute("DELETE FROM pdca_relationships WHERE from_pdca_id = ?", (pdca_id,))
+                graph.conn.execute("DELETE FROM pdcas WHERE id = ?", (pdca_id,))
+                graph.conn.commit()
+                graph.write_generation += 1
+            except Exception as e:
+                graph.conn.rollback()
+                logger.error("Error moving PDCA %s out of partition %s: %s", pdca_id, name, e)
+                return
+        self.conn.execute("DELETE FROM pdca_cross_edges WHERE from_pdca_id = ?", (pdca_id,))
+        if copy_edges:
+            routes = self._route(row['to_pdca_id'] for row in outgoing)
+            routes[pdca_id] = new_partition
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO pdca_cross_edges (
+                    from_pdca_id, to_pdca_id, relationship_type, from_partition, to_partition
+                ) VALUES (?, ?, ?, ?, ?)
+            """, [(pdca_id, row['to_pdca_id'], row['relationship_type'], new_partition,
+                   routes.get(row['to_pdca_id']))
+                  for row in outgoing if routes.get(row['to_pdca_id']) != new_partition])
+        self.conn.execute("DELETE FROM pdca_cross_edges WHERE to_pdca_id = ? AND from_partition = ?",
+                          (pdca_id, new_partition))
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO pdca_cross_edges (
+                from_pdca_id, to_pdca_id, relationship_type, from_partition, to_partition
+            ) VALUES (?, ?, ?, ?, ?)
+        """, [(row['from_pdca_id'], pdca_id, row['relationship_type'], name, new_partition)
+              for row in incoming if row['from_pdca_id'] != pdca_id])
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get_pdca_node(self, pdca_id: str) -> Optional[Dict]:
+        """Get a single PDCA node from its partition."""
+        with self._lock:
+            name = self._route([pdca_id]).get(pdca_id)
+            graph = self._partition(name) if name else None
+            return graph.get_pdca_node(pdca_id) if graph else None
+
+    def get_successors(self, pdca_id: str, relationship_type: str = "PRECEDES") -> List[Dict]:
+        """
+        Get all PDCAs that follow the given PDCA, across partitions.
+
+        Returns:
+            Rows as from SQLiteGraph.get_successors(), newest link first
+        """
+        try:
+            with self._lock:
+                name = self._route([pdca_id]).get(pdca_id)
+                graph = self._partition(name) if name else None
+                if graph is None:
+                    return []
+                results = graph.get_successors(pdca_id, relationship_type)
+
+                targets = [row['to_pdca_id'] for row in self.conn.execute("""
+                    SELECT to_pdca_id FROM pdca_cross_edges
+                    WHERE from_pdca_id = ? AND relationship_type = ?
+                """, (pdca_id, relationship_type))]
+                routes = self._route(targets)
+                by_partition = {}
+                for target in targets:
+                    if routes.get(target) not in (None, name):
+                        by_partition.setdefault(routes[target], []).append(target)
+                if not by_partition:
+                    return results
+
+                edges = {row['to_pdca_id']: row for row in graph._read_conn().execute("""
+                    SELECT to_pdca_id, weight, metadata, created_at FROM pdca_relationships
+                    WHERE from_pdca_id = ? AND relationship_type = ?
+                      AND to_pdca_id IN (SELECT value FROM json_each(?))
+                """, (pdca_id, relationship_type,
+                      json.dumps([t for ids in by_partition.values() for t in ids])))}
+                for target_partition, ids in by_partition.items():
+                    target_graph = self._partition(target_partition)
+                    nodes = target_graph._get_nodes(ids) if target_graph else {}
+                    for target in ids:
+                        if target in nodes and target in edges:
+                            edge = edges[target]
+                            row = dict(nodes[target])
+                            row['weight'] = edge['weight']
+                            row['metadata'] = json.loads(edge['metadata']) if edge['metadata'] else None
+                            row['relationship_created'] = edge['created_at']
+                            results.append(row)
+
+            results.sort(key=lambda row: row['relationship_created'] or '', reverse=True)
+            return results
+
+        except Exception as e:
+            logger.error("Error getting partitioned successors: %s", e)
+            return []
+
+    def get_predecessors(self, pdca_id: str, relationship_type: str = "PRECEDES") -> List[Dict]:
+        """
+        Get all PDCAs that precede the given PDCA, across partitions.
+
+        Returns:
+            Rows as from SQLiteGraph.get_predecessors(), newest link first
+        """
+        try:
+            with self._lock:
+                name = self._route([pdca_id]).get(pdca_id)
+                sources = [name] if name else []
+                sources += [row['from_partition'] for row in self.conn.execute("""
+                    SELECT DISTINCT from_partition FROM pdca_cross_edges
+                    WHERE to_pdca_id = ? AND relationship_type = ?
+                """, (pdca_id, relationship_type)) if row['from_partition'] != name]
+
+                results = []
+                for source in sources:
+                    graph = self._partition(source)
+                    if graph is not None:
+                        results.extend(graph.get_predecessors(pdca_id, relationship_type))
+
+            results.sort(key=lambda row: row['relationship_created'] or '', reverse=True)
+            return results
+
+        except Exception as e:
+            logger.error("Error getting partitioned predecessors: %s", e)
+            return []
+
+    def timeline(self, start_timestamp: Optional[int] = None,
+                 end_timestamp: Optional[int] = None,
+                 agent_name: Optional[str] = None,
+                 page_size: int = DEFAULT_TIMELINE_PAGE_SIZE,
+                 cursor: Optional[List] = None, descending: bool = False) -> Dict:
+        """
+        Get PDCAs in a time range, reading only the partitions it overlaps.
+
+        Partitions are attached in groups of at most ``max_attached`` and
+        each group is read with one UNION ALL query; reading stops as soon
+        as the page is full, so a recent window touches only the newest
+        partitions however much history exists.
+
+        Args:
+            start_timestamp: Inclusive lower bound (None for unbounded)
+            end_timestamp: Exclusive upper bound (None for unbounded)
+            agent_name: Only PDCAs of this agent
+            page_size: Maximum PDCAs per page
+            cursor: next_cursor from the previous page
+            descending: Newest first instead of oldest first
+
+        Returns:
+            Dictionary with pdcas and next_cursor, as TemporalIndex.timeline()
+        """
+        try:
+            conditions, params = self._timeline_conditions(start_timestamp, end_timestamp,
+                                                           agent_name, cursor, descending)
+            lower, upper = start_timestamp, end_timestamp
+            if cursor is not None:
+                if descending:
+                    upper = cursor[0] + 1 if upper is None else min(upper, cursor[0] + 1)
+                else:
+                    lower = cursor[0] if lower is None else max(lower, cursor[0])
+            direction = 'DESC' if descending else 'ASC'
+
+            rows = []
+            with self._lock:
+                names = self._prune(lower, upper, descending)
+                for i in range(0, len(names), self.max_attached):
+                    arms = [f"SELECT p.* FROM {alias}.pdcas p {conditions}"
+                            for alias in self._attach(names[i:i + self.max_attached])]
+                    params['limit'] = page_size + 1 - len(rows)
+                    rows.extend(dict(row) for row in self.conn.execute(
+                        " UNION ALL ".join(arms)
+                        + f" ORDER BY timestamp {direction}, id {direction} LIMIT :limit", params))
+                    if len(rows) > page_size:
+                        break
+
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = [rows[-1]['timestamp'], rows[-1]['id']]
+            return {'pdcas': rows, 'next_cursor': next_cursor}
+
+        except Exception as e:
+            logger.error("Error querying partitioned timeline: %s", e)
+            return {'pdcas': [], 'next_cursor': None}
+
+    def count(self, start_timestamp: Optional[int] = None,
+              end_timestamp: Optional[int] = None,
+              agent_name: Optional[str] = None) -> int:
+        """Count PDCAs in a time range over the partitions it overlaps."""
+        conditions, params = self._timeline_conditions(start_timestamp, end_timestamp,
+                                                       agent_name, None, False)
+        total = 0
+        with self._lock:
+            names = self._prune(start_timestamp, end_timestamp, False)
+            for i in range(0, len(names), self.max_attached):
+                arms = [f"SELECT COUNT(*) AS n FROM {alias}.pdcas p {conditions}"
+                        for alias in self._attach(names[i:i + self.max_attached])]
+                total += self.conn.execute(
+                    f"SELECT SUM(n) FROM ({' UNION ALL '.join(arms)})", params).fetchone()[0]
+        return total
+
+    @staticmethod
+    def _timeline_conditions(start_timestamp: Optional[int], end_timestamp: Optional[int],
+                             agent_name: Optional[str], cursor: Optional[List],
+                             descending: bool) -> Tuple[str, Dict]:
+        """WHERE clause (shared by every UNION ALL arm) and its parameters."""
+        conditions = []
+        params = {}
+        if agent_name is not None:
+            conditions.append("p.agent_name = :agent_name")
+            params['agent_name'] = agent_name
+        if start_timestamp is not None:
+            conditions.append("p.timestamp >= :start")
+            params['start'] = start_timestamp
+        if end_timestamp is not None:
+            conditions.append("p.timestamp < :end")
+            params['end'] = end_timestamp
+        if cursor is not None:
+            comparison = '<' if descending else '>'
+            conditions.append(f"(p.timestamp, p.id) {comparison} (:cursor_timestamp, :cursor_id)")
+            params['cursor_timestamp'], params['cursor_id'] = cursor
+        return ("WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def drop_partition(self, name: str) -> bool:
+        """
+        Drop a month by deleting its database file.
+
+        Relationships from other months into the dropped one stay in their
+        partitions but no longer resolve to a node.
+
+        Returns:
+            True if the partition existed
+        """
+        with self._lock:
+            if self.conn.execute("SELECT 1 FROM pdca_partitions WHERE name = ?",
+                                 (name,)).fetchone() is None:
+                return False
+            self._close_partition(name)
+            for suffix in _SIDECAR_SUFFIXES:
+                if os.path.exists(self._path(name) + suffix):
+                    os.remove(self._path(name) + suffix)
+            self.conn.execute("DELETE FROM pdca_node_partitions WHERE partition = ?", (name,))
+            self.conn.execute("DELETE FROM pdca_cross_edges WHERE from_partition = ?", (name,))
+            self.conn.execute("UPDATE pdca_cross_edges SET to_partition = NULL WHERE to_partition = ?",
+                              (name,))
+            self.conn.execute("DELETE FROM pdca_partitions WHERE name = ?", (name,))
+            self.conn.commit()
+        logger.info("Dropped partition %s", name)
+        return True
+
+    def rebuild_partition(self, name: str, pdcas: Iterable[Dict],
+                          relationships: Iterable[Any] = (),
+                          chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Dict:
+        """
+        Replace a month with freshly indexed data.
+
+        The new database is written next to the live one and swapped in with
+        os.replace(), so readers of other months are never blocked.
+
+        Args:
+            name: Partition (YYYY-MM)
+            pdcas: Every PDCA of the month; nodes outside it fail
+            relationships: Relationships whose source is one of ``pdcas``
+            chunk_size: Rows per executemany() call
+
+        Returns:
+            Dictionary with the 'nodes' and 'relationships' bulk write results
+        """
+        start, end = partition_bounds(name)
+        tmp_path = self._path(name) + '.rebuild'
+        for suffix in _SIDECAR_SUFFIXES:
+            if os.path.exists(tmp_path + suffix):
+                os.remove(tmp_path + suffix)
+
+        accepted = {'nodes': [], 'relationships': []}
+        rejected = {'nodes': [], 'relationships': []}
+
+        def in_month(pdcas):
+            for index, pdca_data in enumerate(pdcas):
+                if start <= pdca_data.get('timestamp', start - 1) < end:
+                    accepted['nodes'].append(index)
+                    yield pdca_data
+                else:
+                    rejected['nodes'].append((index, pdca_data.get('id'),
+                                              f"Timestamp outside partition {name}"))
+
+        def from_month(relationships, pdca_ids):
+            for index, relationship in enumerate(relationships):
+                try:
+                    from_pdca_id = _relationship_row(relationship)[0]
+                except Exception:
+                    from_pdca_id = None  # reported by the bulk write
+                if from_pdca_id is None or from_pdca_id in pdca_ids:
+                    accepted['relationships'].append(index)
+                    yield relationship
+                else:
+                    rejected['relationships'].append((index, from_pdca_id,
+                                                      f"Source PDCA not in partition {name}"))
+
+        graph = SQLiteGraph(tmp_path, cache_entries=0)
+        try:
+            nodes = graph.add_pdca_nodes_bulk(in_month(pdcas), chunk_size)
+            pdca_ids = {row['id'] for row in graph.conn.execute("SELECT id FROM pdcas")}
+            edges = graph.add_relationships_bulk(from_month(relationships, pdca_ids), chunk_size)
+        finally:
+            graph.close()
+        # Report errors against positions in the caller's iterables
+        for result, key in ((nodes, 'nodes'), (edges, 'relationships')):
+            for error in result['errors']:
+                error['index'] = accepted[key][error['index']]
+            for index, row_key, message in rejected[key]:
+                _record_bulk_error(result, index, row_key, ValueError(message))
+            result['errors'].sort(key=lambda error: error['index'])
+
+        with self._lock:
+            self._close_partition(name)
+            os.replace(tmp_path, self._path(name))
+            for suffix in _SIDECAR_SUFFIXES[1:]:
+                if os.path.exists(self._path(name) + suffix):
+                    os.remove(self._path(name) + suffix)
+            self.conn.execute("""
+                INSERT OR IGNORE INTO pdca_partitions (name, start_timestamp, end_timestamp, file)
+                VALUES (?, ?, ?, ?)
+            """, (name, start, end, os.path.basename(self._path(name))))
+
+            alias = self._attach([name])[0]
+            moved = self.conn.execute(f"""
+                SELECT np.id, np.partition FROM {alias}.pdcas p
+                JOIN pdca_node_partitions np ON np.id = p.id
+                WHERE np.partition != ?
+            """, (name,)).fetchall()
+            for row in moved:
+                self._move_node(row['partition'], row['id'], name, copy_edges=False)
+            self.conn.execute("DELETE FROM pdca_node_partitions WHERE partition = ?", (name,))
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO pdca_node_partitions (id, partition)
+                SELECT id, ? FROM {alias}.pdcas
+            """, (name,))
+            self.conn.execute("DELETE FROM pdca_cross_edges WHERE from_partition = ?", (name,))
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO pdca_cross_edges (
+                    from_pdca_id, to_pdca_id, relationship_type, from_partition, to_partition
+                )
+                SELECT pr.from_pdca_id, pr.to_pdca_id, pr.relationship_type, ?, np.partition
+                FROM {alias}.pdca_relationships pr
+                LEFT JOIN pdca_node_partitions np ON np.id = pr.to_pdca_id
+                WHERE np.partition IS NOT ?
+            """, (name, name))
+            self.conn.execute("""
+                UPDATE pdca_cross_edges SET to_partition = ?
+                WHERE to_partition IS NULL
+                  AND to_pdca_id IN (SELECT id FROM pdca_node_partitions WHERE partition = ?)
+            """, (name, name))
+            self.conn.commit()
+
+        logger.info("Rebuilt partition %s: %d nodes, %d relationships",
+                    name, nodes['inserted'] + nodes['replaced'],
+                    edges['inserted'] + edges['replaced'])
+        return {'nodes': nodes, 'relationships': edges}
+
+    def close(self):
+        """Close every partition and the catalog."""
+        with self._lock:
+            for name in list(self._graphs):
+                self._close_partition(name)
+            self.conn.close()
@@ -8,15 +8,270 @@ PDCA relationships using SQLite as the graph database tier.
 """
 
 import sqlite3
+import hashlib
 import json
-from typing import List, Dict, Optional, Tuple
+import os
+import re
+import threading
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
 import logging
 
+from graph_connections import ConnectionPool, apply_pragmas, production_pragmas, read_only_uri
+from graph_algorithms import DEFAULT_MAX_VISITS, best_first_expand, bidirectional_bfs, dijkstra
+from graph_snapshot import GraphSnapshot
+from graph_cache import DEFAULT_CACHE_ENTRIES, DEFAULT_CACHE_MAX_BYTES, ResultCache, cached_read
+from graph_metrics import GraphMetrics, instrumented
+from graph_rows import CHANGE_COLUMNS, RELATIONSHIP_COLUMNS, build_rows, check_row_format, select_list
+from graph_reachability import chain_labels, decompose_chains, merge_label, strongly_connected_components
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default number of rows written per executemany() call in the bulk APIs
+DEFAULT_BULK_CHUNK_SIZE = 500
+
+# Default number of predecessors/successors per breadcrumb page
+DEFAULT_BREADCRUMB_PAGE_SIZE = 20
+
+# Default number of rows fetched per fetchmany() call by iter_nodes()/iter_edges()
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+
+# Declared metadata keys become untyped generated columns, or columns of
+# one of these SQLite types when a value_type is given
+METADATA_INDEX_TYPES = ('TEXT', 'INTEGER', 'REAL', 'NUMERIC')
+
+# Operators accepted in metadata_filter predicates
+METADATA_OPERATORS = ('=', '!=', '<', '<=', '>', '>=', 'in', 'not in')
+
+# extract_subgraph() defaults: neighborhood size and recency decay of edge scores
+DEFAULT_SUBGRAPH_NODES = 50
+DEFAULT_SUBGRAPH_HALF_LIFE = 7 * 86400
+
+# Bulk writes adding at least this many edges of an indexed type rebuild
+# the reachability index instead of updating it edge by edge
+DEFAULT_REACHABILITY_REBUILD_EDGES = 256
+
+# Rough characters per LLM token, used to estimate the prompt cost of a PDCA
+CHARS_PER_TOKEN = 4
+
+_METADATA_KEY_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Edge columns of get_successors()/get_predecessors() rows (see graph_rows)
+_ADJACENT_EDGE_EXPRESSIONS = {
+    'weight': 'pr.weight',
+    'metadata': 'pr.metadata',
+    'relationship_created': 'pr.created_at'
+}
+
+# Edge columns of get_neighbors_many() rows
+_NEIGHBOR_EDGE_EXPRESSIONS = {
+    'weight': 'r.weight',
+    'metadata': 'r.metadata',
+    'relationship_created': 'r.relationship_created',
+    'relationship_type': 'r.relationship_type',
+    'direction': 'r.direction'
+}
+
+_PDCA_INSERT_SQL = """
+    INSERT OR REPLACE INTO pdcas (
+        id, agent_name, agent_role, date, timestamp,
+        session_id, branch, sprint, cmm_level, task_type,
+        objective, quality_score, verification_status, file_path
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_RELATIONSHIP_INSERT_SQL = """
+    INSERT OR REPLACE INTO pdca_relationships (
+        from_pdca_id, to_pdca_id, relationship_type, weight, metadata
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _metadata_column(key: str) -> str:
+    """
+    Generated column name for a metadata key.
+
+    SQLite column names are case-insensitive, so keys with capitals get a
+    short digest suffix keeping 'Source' and 'source' in separate columns.
+    """
+    if key == key.lower():
+        return f"meta_{key}"
+    return f"meta_{key.lower()}_{hashlib.sha1(key.encode()).hexdigest()[:8]}"
+
+
+def _pdca_row(pdca_data: Dict) -> Tuple:
+    """Build the pdcas INSERT parameters from a PDCA dictionary."""
+    return (
+        pdca_data.get('id'),
+        pdca_data.get('agent_name'),
+        pdca_data.get('agent_role'),
+        pdca_data.get('date'),
+        pdca_data.get('timestamp'),
+        pdca_data.get('session_id', ''),
+        pdca_data.get('branch', ''),
+        pdca_data.get('sprint', ''),
+        pdca_data.get('cmm_level', 0),
+        pdca_data.get('task_type', ''),
+        pdca_data.get('objective', ''),
+        pdca_data.get('quality_score', 0.0),
+        pdca_data.get('verification_status', ''),
+        pdca_data.get('file_path', '')
+    )
+
+
+def _relationship_row(relationship: Any) -> Tuple:
+    """
+    Build the pdca_relationships INSERT parameters.
+
+    Accepts either a dictionary with the add_relationship() keyword names
+    or a tuple of (from_pdca_id, to_pdca_id[, relationship_type[, weight[, metadata]]]).
+    """
+    if isinstance(relationship, dict):
+        from_pdca_id = relationship['from_pdca_id']
+        to_pdca_id = relationship['to_pdca_id']
+        relationship_type = relationship.get('relationship_type', 'PRECEDES')
+        weight = relationship.get('weight', 1.0)
+        metadata = relationship.get('metadata')
+    else:
+        from_pdca_id, to_pdca_id, *rest = relationship
+        relationship_type = rest[0] if len(rest) > 0 else 'PRECEDES'
+        weight = rest[1] if len(rest) > 1 else 1.0
+        metadata = rest[2] if len(rest) > 2 else None
+        if len(rest) > 3:
+            raise ValueError(f"Too many relationship fields: {len(rest) + 2}")
+    
+    metadata_json = json.dumps(metadata) if metadata else None
+    return (from_pdca_id, to_pdca_id, relationship_type, weight, metadata_json)
+
+
+def _record_bulk_error(result: Dict, index: int, key: Any, error: Exception):
+    """Record a per-row failure in a bulk write result."""
+    result['failed'] += 1
+    result['errors'].append({'index': index, 'id': key, 'error': str(error)})
+
+
+def _bulk_write_chunks(cursor: sqlite3.Cursor, rows: Iterable[Any], chunk_size: int, sql: str,
+                       to_params: Callable, params_key: Callable, existing_keys: Callable,
+                       row_key: Callable, result: Dict) -> List[Tuple]:
+    """
+    Chunked INSERT OR REPLACE loop shared by the bulk write APIs.
+
+    ``to_params(cursor, rows)`` converts a whole chunk to statement
+    parameters (interning ids where the schema needs it) and
+    ``existing_keys(cursor, params)`` returns the ``params_key`` of the
+    rows already stored. Each chunk runs under its own SAVEPOINT; if
+    conversion or executemany() fails, the chunk is rolled back and
+    replayed row by row so that only the offending rows are dropped and
+    recorded in ``result`` under their ``row_key``. Counts of inserted and
+    replaced rows (including duplicates within a chunk) are added to
+    ``result``. The caller owns the transaction and checks chunk_size.
+
+    Returns:
+        Parameters of every written row
+    """
+    rows = iter(rows)
+    index = 0
+    all_written = []
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+
+        cursor.execute("SAVEPOINT bulk_chunk")
+        try:
+            batch = to_params(cursor, chunk)
+            existing = existing_keys(cursor, batch)
+            cursor.executemany(sql, batch)
+            written = batch
+        except Exception:
+            cursor.execute("ROLLBACK TO bulk_chunk")
+            existing = set()
+            written = []
+            for offset, row in enumerate(chunk):
+                try:
+                    params = to_params(cursor, [row])[0]
+                    existing |= existing_keys(cursor, [params])
+                    cursor.execute(sql, params)
+                    written.append(params)
+                except Exception as e:
+                    try:
+                        key = row_key(row)
+                    except Exception:
+                        key = None
+                    _record_bulk_error(result, index + offset, key, e)
+        cursor.execute("RELEASE bulk_chunk")
+
+        for params in written:
+            key = params_key(params)
+            if key in existing:
+                result['replaced'] += 1
+            else:
+                result['inserted'] += 1
+                existing.add(key)
+        all_written.extend(written)
+        index += len(chunk)
+
+    result['errors'].sort(key=lambda error: error['index'])
+    return all_written
+
+
+def estimate_tokens(objective: Optional[str]) -> int:
+    """Estimated prompt tokens of a PDCA, from the length of its objective."""
+    return max(1, -(-len(objective or '') // CHARS_PER_TOKEN))
+
+
+def _counter_bump_sql(name: str, delta: int) -> str:
+    """Trigger statement adding ``delta`` to a pdca_graph_counters entry."""
+    return f"""
+        INSERT INTO pdca_graph_counters (name, value) VALUES ('{name}', {delta})
+        ON CONFLICT(name) DO UPDATE SET value = value + ({delta});
+    """
+
+
+def _edge_stats_sql(row: str, delta: int) -> str:
+    """
+    Trigger statements applying one edge (``NEW`` or ``OLD``) to the stats tables.
+    
+    An explicit NULL relationship_type is counted under ''.
+    """
+    relationship_type = f"COALESCE({row}.relationship_type, '')"
+    return f"""
+        INSERT INTO pdca_node_degree (pdca_id, relationship_type, in_degree, out_degree)
+        VALUES ({row}.from_pdca_id, {relationship_type}, 0, {delta})
+        ON CONFLICT(pdca_id, relationship_type) DO UPDATE SET out_degree = out_degree + ({delta});
+        INSERT INTO pdca_node_degree (pdca_id, relationship_type, in_degree, out_degree)
+        VALUES ({row}.to_pdca_id, {relationship_type}, {delta}, 0)
+        ON CONFLICT(pdca_id, relationship_type) DO UPDATE SET in_degree = in_degree + ({delta});
+        INSERT INTO pdca_node_connections (pdca_id, connection_count)
+        VALUES ({row}.from_pdca_id, {delta})
+        ON CONFLICT(pdca_id) DO UPDATE SET connection_count = connection_count + ({delta});
+        INSERT INTO pdca_node_connections (pdca_id, connection_count)
+        VALUES ({row}.to_pdca_id, {delta})
+        ON CONFLICT(pdca_id) DO UPDATE SET connection_count = connection_count + ({delta});
+        INSERT INTO pdca_edge_type_counts (relationship_type, edge_count)
+        VALUES ({relationship_type}, {delta})
+        ON CONFLICT(relationship_type) DO UPDATE SET edge_count = edge_count + ({delta});
+    """
+
+
+def _change_sql(entity: str, operation: str, row: str) -> str:
+    """
+    Trigger statement logging a change of a node or edge (``NEW`` or ``OLD``).
+    
+    ``operation`` is an SQL expression, e.g. a quoted literal.
+    """
+    if entity == 'node':
+        key = f"{row}.id, NULL, NULL"
+    else:
+        key = f"{row}.from_pdca_id, {row}.to_pdca_id, {row}.relationship_type"
+    return f"""
+        INSERT INTO pdca_changes (entity, operation, pdca_id, to_pdca_id, relationship_type)
+        VALUES ('{entity}', {operation}, {key});
+    """
+
 
 class SQLiteGraph:
     """
@@ -29,20 +284,86 @@ class SQLiteGraph:
     - Graph queries and analytics
     """
     
-    def __init__(self, db_path: str = "pdca_timeline.db"):
-        """Initialize SQLite graph database."""
+    def __init__(self, db_path: str = "pdca_timeline.db", production: bool = False,
+                 pragmas: Optional[Dict] = None, read_pool: Optional[bool] = None,
+                 cache_entries: int = DEFAULT_CACHE_ENTRIES,
+                 cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 cache_ttl: Optional[float] = None,
+                 instrument: bool = False, slow_query_ms: Optional[float] = None,
+                 profile_hook: Optional[Callable[[Dict], None]] = None,
+                 read_only: bool = False):
+        """
+        Initialize SQLite graph database.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            production: Use the production profile (WAL journaling, busy_timeout,
+                synchronous=NORMAL, mmap and a larger page cache) and serve reads
+                from a per-thread pool of read-only connections
+            pragmas: Explicit pragma dictionary (see graph_connections.production_pragmas)
+            read_pool: Override whether reads use the per-thread connection pool
+            cache_entries: Maximum cached read results (0 disables the cache)
+            cache_max_bytes: Memory cap for cached read results
+            cache_ttl: Seconds a cached result stays valid (None for no expiry)
+            instrument: Record per-method metrics (see get_metrics())
+            slow_query_ms: Log calls slower than this with their SQL and query
+                plans (implies instrument)
+            profile_hook: Callback receiving one event per instrumented call
+                (implies instrument)
+            read_only: Open every connection read-only and skip schema
+                creation (serving snapshots; ``db_path`` may be a ``file:`` URI)
+        """
         self.db_path = db_path
+        self.read_only = read_only
         self.conn = None
+        self.pragmas = pragmas if pragmas is not None else (
+            production_pragmas() if production else {})
+        if read_pool is None:
+            read_pool = production
+        self._pool = (ConnectionPool(db_path, self.pragmas)
+                      if read_pool and db_path != ':memory:' else None)
+        # All writes are serialized on the single writer connection (self.conn)
+        self._write_lock = threading.RLock()
+        # Bumped by every committed write made through this instance
+        self.write_generation = 0
+        self._snapshot = None
+        # Hot read results, dropped whenever the database changes
+        self._cache = (ResultCache(cache_entries, cache_max_bytes, cache_ttl)
+                       if cache_entries > 0 else None)
+        self._metrics = None
+        self._traced = {}
+        # Declared metadata key -> generated column name (see declare_metadata_index())
+        self._metadata_columns = {}
+        # Relationship types with a reachability index (see enable_reachability_index())
+        self._reachability_types = set()
+        # Stale indexes already reported, so falling back is logged once
+        self._stale_reachability = set()
         self._init_database()
+        self._load_metadata_indexes()
+        self._load_reachability_indexes()
+        if instrument or slow_query_ms is not None or profile_hook is not None:
+            self.enable_instrumentation(slow_query_ms, profile_hook)
     
     def _init_database(self):
         """Initialize database schema for graph operations."""
-        self.conn = sqlite3.connect(self.db_path)
+        if self.read_only:
+            # Serving snapshots are never written; self.conn is just another reader
+            self.conn = sqlite3.connect(read_only_uri(self.db_path), uri=True,
+                                        check_same_thread=self._pool is None)
+            self.conn.row_factory = sqlite3.Row
+            apply_pragmas(self.conn, self.pragmas, writer=False)
+            self.conn.execute("PRAGMA query_only = ON")
+            logger.info("SQLite graph database opened read-only at %s", self.db_path)
+            return
+        
+        # The writer connection is shared across threads when a read pool is used
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=self._pool is None)
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
+        apply_pragmas(self.conn, self.pragmas)
         
         # Create tables if they don't exist
         self._create_schema()
-        logger.info(f"SQLite graph database initialized at {self.db_path}")
+        logger.info("SQLite graph database initialized at %s", self.db_path)
     
     def _create_schema(self):
         """Create database schema for graph operations."""
@@ -111,9 +432,304 @@ class SQLiteGraph:
             ON pdcas(agent_name)
         """)
         
+        # Timeline indexes: (filter, timestamp, id) serves ordered keyset scans
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdcas_timestamp
+            ON pdcas(timestamp, id)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdcas_agent_timestamp
+            ON pdcas(agent_name, timestamp, id)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdcas_role_timestamp
+            ON pdcas(agent_role, timestamp, id)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdcas_date_timestamp
+            ON pdcas(date, timestamp, id)
+        """)
+        
+        # Metadata keys exposed as indexed generated columns
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_metadata_indexes (
+                key TEXT PRIMARY KEY,
+                column_name TEXT NOT NULL,
+                value_type TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        self._create_reachability_schema(cursor)
+        
+        self._create_change_log_schema(cursor)
+        
+        self._create_stats_schema(cursor)
+        
         self.conn.commit()
         logger.info("Database schema created/verified")
     
+    def _create_reachability_schema(self, cursor):
+        """
+        Create the tables of the optional reachability indexes.
+        
+        pdca_reachability has one row per indexed relationship type. Any
+        change to relationships of that type bumps its edge_version in a
+        trigger, and index maintenance copies edge_version to
+        indexed_version. When the two differ, a write bypassed the index
+        (another writer, a deleted or updated relationship) and queries
+        fall back to a graph walk until the index is rebuilt. A REPLACE of
+        an existing relationship does not fire the DELETE trigger
+        (recursive_triggers is OFF) and does not change reachability.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_reachability (
+                relationship_type TEXT PRIMARY KEY,
+                chain_count INTEGER NOT NULL DEFAULT 0,
+                edge_version INTEGER NOT NULL DEFAULT 0,
+                indexed_version INTEGER NOT NULL DEFAULT 0,
+                built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+        """)
+        
+        # Chain slot of every node that has a relationship of an indexed type
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_reach_slots (
+                relationship_type TEXT NOT NULL,
+                pdca_id TEXT NOT NULL,
+                chain_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (relationship_type, pdca_id)
+            ) WITHOUT ROWID
+        """)
+        
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_pdca_reach_slots_chain
+            ON pdca_reach_slots(relationship_type, chain_id, position)
+        """)
+        
+        # 'out': lowest position reached on a chain; 'in': highest position reaching the node
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_reach_labels (
+                relationship_type TEXT NOT NULL,
+                direction TEXT NOT NULL,
+                pdca_id TEXT NOT NULL,
+                chain_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (relationship_type, direction, pdca_id, chain_id)
+            ) WITHOUT ROWID
+        """)
+        
+        for event, row in (('INSERT', 'NEW'), ('DELETE', 'OLD')):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_pdca_relationships_reach_{event.lower()}
+                AFTER {event} ON pdca_relationships
+                BEGIN
+                    UPDATE pdca_reachability SET edge_version = edge_version + 1
+                    WHERE relationship_type = {row}.relationship_type;
+                END
+            """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_pdca_relationships_reach_update
+            AFTER UPDATE OF from_pdca_id, to_pdca_id, relationship_type ON pdca_relationships
+            BEGIN
+                UPDATE pdca_reachability SET edge_version = edge_version + 1
+                WHERE relationship_type IN (OLD.relationship_type, NEW.relationship_type);
+            END
+        """)
+    
+    def _create_change_log_schema(self, cursor):
+        """
+        Create the change log and the triggers that fill it.
+        
+        Every insert, replace, update and delete of a node or relationship
+        appends one row to pdca_changes, including writes from other
+        connections. seq is AUTOINCREMENT, so sequence numbers only grow
+        and are never reused after compaction. Like the stats triggers,
+        INSERT OR REPLACE is classified in a BEFORE INSERT trigger (the
+        REPLACE does not fire the DELETE trigger while recursive_triggers
+        is OFF). An INSERT OR IGNORE of an existing row still logs a
+        'replace', so consumers should read the current row rather than
+        trust the operation. A database created before the log starts
+        with an empty log.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                entity TEXT NOT NULL,  -- 'node' or 'edge'
+                operation TEXT NOT NULL,  -- 'insert', 'replace', 'update' or 'delete'
+                pdca_id TEXT NOT NULL,  -- node id, or the edge's from_pdca_id
+                to_pdca_id TEXT,
+                relationship_type TEXT,
+                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Highest seq removed by compact_changes(); older watermarks missed changes
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_changes_compacted (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                through_seq INTEGER NOT NULL
+            )
+        """)
+        
+        tables = {
+            'node': ('pdcas', "id = NEW.id", "OLD.id IS NEW.id"),
+            'edge': ('pdca_relationships',
+                     "from_pdca_id = NEW.from_pdca_id AND to_pdca_id = NEW.to_pdca_id"
+                     " AND relationship_type = NEW.relationship_type",
+                     "OLD.from_pdca_id IS NEW.from_pdca_id AND OLD.to_pdca_id IS NEW.to_pdca_id"
+                     " AND OLD.relationship_type IS NEW.relationship_type")
+        }
+        for entity, (table, existing, same_key) in tables.items():
+            operation = f"CASE WHEN EXISTS (SELECT 1 FROM {table} WHERE {existing}) " \
+                        f"THEN 'replace' ELSE 'insert' END"
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_insert
+                BEFORE INSERT ON {table}
+                BEGIN
+                    {_change_sql(entity, operation, 'NEW')}
+                END
+            """)
+            
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_update
+                AFTER UPDATE ON {table}
+                WHEN {same_key}
+                BEGIN
+                    {_change_sql(entity, "'update'", 'NEW')}
+                END
+            """)
+            
+            # A changed key is logged as a delete of the old key and an insert of the new one
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_rekey
+                AFTER UPDATE ON {table}
+                WHEN NOT ({same_key})
+                BEGIN
+                    {_change_sql(entity, "'delete'", 'OLD')}
+                    {_change_sql(entity, "'insert'", 'NEW')}
+                END
+            """)
+            
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_delete
+                AFTER DELETE ON {table}
+                BEGIN
+                    {_change_sql(entity, "'delete'", 'OLD')}
+                END
+            """)
+    
+    def _create_stats_schema(self, cursor):
+        """
+        Create the incrementally maintained statistics tables and triggers.
+        
+        Triggers keep per-node degrees, per-type edge counts and the node
+        count in step with every write, including writes from other
+        connections. INSERT OR REPLACE is handled in BEFORE INSERT triggers
+        (a replace of an existing key changes no counts), which relies on
+        SQLite's default of recursive_triggers being OFF.
+        """
+        cursor.execute("""
+            SELECT COUNT(*) FROM sqlite_master
+            WHERE type = 'table' AND name = 'pdca_graph_counters'
+        """)
+        stats_existed = cursor.fetchone()[0] > 0
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_node_degree (
+                pdca_id TEXT NOT NULL,
+                relationship_type TEXT NOT NULL,
+                in_degree INTEGER NOT NULL DEFAULT 0,
+                out_degree INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (pdca_id, relationship_type)
+            ) WITHOUT ROWID
+        """)
+        
+        # Total degree across all types, indexed for the top-K lookup
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_node_connections (
+                pdca_id TEXT PRIMARY KEY,
+                connection_count INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pdca_node_connections_count
+            ON pdca_node_connections(connection_count DESC, pdca_id)
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_edge_type_counts (
+                relationship_type TEXT PRIMARY KEY,
+                edge_count INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pdca_graph_counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_pdcas_stats_insert
+            BEFORE INSERT ON pdcas
+            WHEN NOT EXISTS (SELECT 1 FROM pdcas WHERE id = NEW.id)
+            BEGIN
+                {_counter_bump_sql('node_count', 1)}
+            END
+        """)
+        
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_pdcas_stats_delete
+            AFTER DELETE ON pdcas
+            BEGIN
+                {_counter_bump_sql('node_count', -1)}
+            END
+        """)
+        
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_pdca_relationships_stats_insert
+            BEFORE INSERT ON pdca_relationships
+            WHEN NOT EXISTS (
+                SELECT 1 FROM pdca_relationships
+                WHERE from_pdca_id = NEW.from_pdca_id
+                  AND to_pdca_id = NEW.to_pdca_id
+                  AND relationship_type = NEW.relationship_type
+            )
+            BEGIN
+                {_edge_stats_sql('NEW', 1)}
+            END
+        """)
+        
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_pdca_relationships_stats_delete
+            AFTER DELETE ON pdca_relationships
+            BEGIN
+                {_edge_stats_sql('OLD', -1)}
+            END
+        """)
+        
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_pdca_relationships_stats_update
+            AFTER UPDATE OF from_pdca_id, to_pdca_id, relationship_type ON pdca_relationships
+            BEGIN
+                {_edge_stats_sql('OLD', -1)}
+                {_edge_stats_sql('NEW', 1)}
+            END
+        """)
+        
+        if not stats_existed:
+            # Existing database from before the stats tables: backfill once
+            self._rebuild_stats(cursor)
+    
+    @instrumented()
     def add_pdca_node(self, pdca_data: Dict) -> bool:
         """
         Add a PDCA node to the graph.
@@ -124,41 +740,23 @@ class SQLiteGraph:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            cursor = self.conn.cursor()
-            
-            # Insert or update PDCA node
-            cursor.execute("""
-                INSERT OR REPLACE INTO pdcas (
-                    id, agent_name, agent_role, date, timestamp,
-                    session_id, branch, sprint, cmm_level, task_type,
-                    objective, quality_score, verification_status, file_path
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                pdca_data.get('id'),
-                pdca_data.get('agent_name'),
-                pdca_data.get('agent_role'),
-                pdca_data.get('date'),
-                pdca_data.get('timestamp'),
-                pdca_data.get('session_id', ''),
-                pdca_data.get('branch', ''),
-                pdca_data.get('sprint', ''),
-                pdca_data.get('cmm_level', 0),
-                pdca_data.get('task_type', ''),
-                pdca_data.get('objective', ''),
-                pdca_data.get('quality_score', 0.0),
-                pdca_data.get('verification_status', ''),
-                pdca_data.get('file_path', '')
-            ))
-            
-            self.conn.commit()
-            logger.debug(f"Added PDCA node: {pdca_data.get('id')}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error adding PDCA node: {e}")
-            return False
+        with self._write_lock:
+            try:
+                cursor = self.conn.cursor()
+                
+                # Insert or update PDCA node
+                cursor.execute(_PDCA_INSERT_SQL, _pdca_row(pdca_data))
+                
+                self.conn.commit()
+                self.write_generation += 1
+                logger.debug("Added PDCA node: %s", pdca_data.get('id'))
+                return True
+                
+            except Exception as e:
+                self._log_error("Error adding PDCA node: %s", e)
+                return False
     
+    @instrumented()
     def add_relationship(self, from_pdca_id: str, to_pdca_id: str, 
                         relationship_type: str = "PRECEDES", 
                         weight: float = 1.0, metadata: Dict = None) -> bool:
@@ -175,221 +773,1130 @@ class SQLiteGraph:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            cursor = self.conn.cursor()
+        with self._write_lock:
+            try:
+                cursor = self.conn.cursor()
+                
+                metadata_json = json.dumps(metadata) if metadata else None
+                
+                cursor.execute(_RELATIONSHIP_INSERT_SQL,
+                               (from_pdca_id, to_pdca_id, relationship_type, weight, metadata_json))
+                if relationship_type in self._reachability_types:
+                    self._reach_after_write(cursor, [(from_pdca_id, to_pdca_id, relationship_type)])
+                
+                self.conn.commit()
+                self.write_generation += 1
+                logger.debug("Added relationship: %s -> %s", from_pdca_id, to_pdca_id)
+                return True
+                
+            except Exception as e:
+                self._log_error("Error adding relationship: %s", e)
+                return False
+    
+    @instrumented()
+    def add_pdca_nodes_bulk(self, pdcas: Iterable[Dict],
+                            chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                            commit: bool = True) -> Dict:
+        """
+        Add many PDCA nodes in a single transaction.
+        
+        Rows are written with executemany() in chunks of ``chunk_size``.
+        A row that fails (e.g. a missing NOT NULL field) is reported in
+        ``errors`` and skipped; the rest of the batch is still committed.
+        
+        Args:
+            pdcas: Iterable (or generator) of PDCA dictionaries
+            chunk_size: Number of rows per executemany() call
+            commit: False leaves the transaction open for the caller to
+                commit (see add_batch())
             
-            metadata_json = json.dumps(metadata) if metadata else None
+        Returns:
+            Dictionary with inserted, replaced and failed counts plus a list
+            of per-row errors ({'index', 'id', 'error'})
+        """
+        def row_key(pdca_data):
+            return pdca_data.get('id')
+        
+        def to_params(cursor, rows):
+            return [_pdca_row(pdca_data) for pdca_data in rows]
+        
+        def existing_keys(cursor, params):
+            cursor.execute("""
+                SELECT id FROM pdcas
+                WHERE id IN (SELECT value FROM json_each(?))
+            """, (json.dumps([row[0] for row in params]),))
+            return {row['id'] for row in cursor.fetchall()}
+        
+        return self._bulk_write(pdcas, chunk_size, _PDCA_INSERT_SQL, to_params,
+                                lambda params: params[0], existing_keys, row_key,
+                                "PDCA nodes", commit=commit)
+    
+    @instrumented()
+    def add_relationships_bulk(self, relationships: Iterable[Any],
+                               chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                               commit: bool = True) -> Dict:
+        """
+        Add many relationships in a single transaction.
+        
+        Each item is either a dictionary using the add_relationship()
+        keyword names or a tuple of
+        (from_pdca_id, to_pdca_id[, relationship_type[, weight[, metadata]]]).
+        
+        Args:
+            relationships: Iterable (or generator) of relationships
+            chunk_size: Number of rows per executemany() call
+            commit: False leaves the transaction open for the caller to
+                commit (see add_batch())
             
+        Returns:
+            Dictionary with inserted, replaced and failed counts plus a list
+            of per-row errors ({'index', 'id', 'error'})
+        """
+        def row_key(relationship):
+            if isinstance(relationship, dict):
+                return (relationship.get('from_pdca_id'), relationship.get('to_pdca_id'))
+            return tuple(relationship[:2])
+        
+        def to_params(cursor, rows):
+            return [_relationship_row(relationship) for relationship in rows]
+        
+        def existing_keys(cursor, params):
             cursor.execute("""
-                INSERT OR REPLACE INTO pdca_relationships (
-                    from_pdca_id, to_pdca_id, relationship_type, weight, metadata
-                ) VALUES (?, ?, ?, ?, ?)
-            """, (from_pdca_id, to_pdca_id, relationship_type, weight, metadata_json))
+                SELECT pr.from_pdca_id, pr.to_pdca_id, pr.relationship_type
+                FROM json_each(?) k
+                JOIN pdca_relationships pr
+                  ON pr.from_pdca_id = json_extract(k.value, '$[0]')
+                 AND pr.to_pdca_id = json_extract(k.value, '$[1]')
+                 AND pr.relationship_type = json_extract(k.value, '$[2]')
+            """, (json.dumps([row[:3] for row in params]),))
+            return {tuple(row) for row in cursor.fetchall()}
+        
+        return self._bulk_write(relationships, chunk_size, _RELATIONSHIP_INSERT_SQL, to_params,
+                                lambda params: params[:3], existing_keys, row_key,
+                                "relationships",
+                                on_written=self._reach_after_write if self._reachability_types else None,
+                                commit=commit)
+    
+    @instrumented()
+    def add_batch(self, pdcas: Iterable[Dict] = (), relationships: Iterable[Any] = (),
+                  chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Dict:
+        """
+        Add PDCA nodes and relationships in a single transaction.
+        
+        Rows are written as by add_pdca_nodes_bulk() and
+        add_relationships_bulk(), but with one commit for both, which is
+        what a group commit of mixed writes needs. If either part fails as
+        a whole, nothing is committed and both results carry the 'error'.
+        
+        Args:
+            pdcas: Iterable of PDCA dictionaries
+            relationships: Iterable of relationships (add_relationships_bulk() items)
+            chunk_size: Number of rows per executemany() call
+            
+        Returns:
+            Dictionary with the 'nodes' and 'relationships' bulk results
+        """
+        with self._write_lock:
+            nodes = self.add_pdca_nodes_bulk(pdcas, chunk_size, commit=False)
+            if 'error' in nodes:
+                links = {'inserted': 0, 'replaced': 0, 'failed': 0, 'errors': [],
+                         'error': nodes['error']}
+                return {'nodes': nodes, 'relationships': links}
             
-            self.conn.commit()
-            logger.debug(f"Added relationship: {from_pdca_id} -> {to_pdca_id}")
-            return True
+            links = self.add_relationships_bulk(relationships, chunk_size, commit=False)
+            if 'error' in links:
+                # The relationship write already rolled back the node rows
+                nodes.update(inserted=0, replaced=0, error=links['error'])
+                return {'nodes': nodes, 'relationships': links}
             
-        except Exception as e:
-            logger.error(f"Error adding relationship: {e}")
-            return False
+            try:
+                self.conn.commit()
+                self.write_generation += 1
+            except Exception as e:
+                self.conn.rollback()
+                self._log_error("Error committing batch: %s", e)
+                for result in (nodes, links):
+                    result.update(inserted=0, replaced=0, error=str(e))
+            return {'nodes': nodes, 'relationships': links}
+    
+    def _bulk_write(self, rows: Iterable[Any], chunk_size: int, sql: str,
+                    to_params: Callable, params_key: Callable, existing_keys: Callable,
+                    row_key: Callable, label: str, on_written: Optional[Callable] = None,
+                    commit: bool = True) -> Dict:
+        """
+        Run _bulk_write_chunks() in one transaction on the writer connection.
+        
+        ``on_written(cursor, params)`` runs once before the commit with the
+        parameters of every written row. With ``commit=False`` the
+        transaction is left open; a failure still rolls all of it back.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        result = {'inserted': 0, 'replaced': 0, 'failed': 0, 'errors': []}
+        
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            try:
+                if not self.conn.in_transaction:
+                    cursor.execute("BEGIN")
+                written = _bulk_write_chunks(cursor, rows, chunk_size, sql, to_params,
+                                             params_key, existing_keys, row_key, result)
+                if on_written is not None:
+                    on_written(cursor, written)
+                if commit:
+                    self.conn.commit()
+                    self.write_generation += 1
+                # Batches inside a caller's transaction (group commits) are frequent
+                log = logger.info if commit else logger.debug
+                log("Bulk added %s: %d inserted, %d replaced, %d failed",
+                    label, result['inserted'], result['replaced'], result['failed'])
+                
+            except Exception as e:
+                self.conn.rollback()
+                self._log_error("Error bulk adding %s: %s", label, e)
+                result['inserted'] = 0
+                result['replaced'] = 0
+                result['error'] = str(e)
+            
+            return result
     
-    def get_predecessors(self, pdca_id: str, relationship_type: str = "PRECEDES") -> List[Dict]:
+    @instrumented()
+    @cached_read('predecessors')
+    def get_predecessors(self, pdca_id: str, relationship_type: str = "PRECEDES",
+                         columns: Optional[Sequence[str]] = None,
+                         row_format: str = 'dict',
+                         metadata_filter: Optional[Dict] = None) -> List[Any]:
         """
         Get all PDCAs that precede the given PDCA.
         
         Args:
             pdca_id: Target PDCA ID
             relationship_type: Type of relationship to follow
+            columns: pdcas and edge columns to return (None for all; see graph_rows)
+            row_format: 'dict', 'record' (namedtuple, lazy metadata) or 'tuple'
+            metadata_filter: Relationship metadata predicates evaluated in SQL
+                (see _metadata_predicate())
             
         Returns:
             List of predecessor PDCAs with metadata
         """
-        try:
-            cursor = self.conn.cursor()
-            
-            cursor.execute("""
-                SELECT p.*, pr.weight, pr.metadata, pr.created_at as relationship_created
-                FROM pdcas p
-                JOIN pdca_relationships pr ON p.id = pr.from_pdca_id
-                WHERE pr.to_pdca_id = ? AND pr.relationship_type = ?
-                ORDER BY pr.created_at DESC
-            """, (pdca_id, relationship_type))
-            
-            results = []
-            for row in cursor.fetchall():
-                pdca_dict = dict(row)
-                if pdca_dict['metadata']:
-                    pdca_dict['metadata'] = json.loads(pdca_dict['metadata'])
-                results.append(pdca_dict)
-            
-            logger.debug(f"Found {len(results)} predecessors for {pdca_id}")
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error getting predecessors: {e}")
-            return []
+        return self._adjacent(pdca_id, 'in', relationship_type, columns, row_format,
+                              metadata_filter)
     
-    def get_successors(self, pdca_id: str, relationship_type: str = "PRECEDES") -> List[Dict]:
+    @instrumented()
+    @cached_read('successors')
+    def get_successors(self, pdca_id: str, relationship_type: str = "PRECEDES",
+                       columns: Optional[Sequence[str]] = None,
+                       row_format: str = 'dict',
+                       metadata_filter: Optional[Dict] = None) -> List[Any]:
         """
         Get all PDCAs that follow the given PDCA.
         
         Args:
             pdca_id: Source PDCA ID
             relationship_type: Type of relationship to follow
+            columns: pdcas and edge columns to return (None for all; see graph_rows)
+            row_format: 'dict', 'record' (namedtuple, lazy metadata) or 'tuple'
+            metadata_filter: Relationship metadata predicates evaluated in SQL
+                (see _metadata_predicate())
             
         Returns:
             List of successor PDCAs with metadata
         """
+        return self._adjacent(pdca_id, 'out', relationship_type, columns, row_format,
+                              metadata_filter)
+    
+    def _adjacent(self, pdca_id: str, direction: str, relationship_type: str,
+                  columns: Optional[Sequence[str]], row_format: str,
+                  metadata_filter: Optional[Dict] = None) -> List[Any]:
+        """One-hop neighbors of a PDCA, newest link first."""
+        label = 'successors' if direction == 'out' else 'predecessors'
+        if direction == 'out':
+            seed_column, neighbor_column = 'from_pdca_id', 'to_pdca_id'
+        else:
+            seed_column, neighbor_column = 'to_pdca_id', 'from_pdca_id'
+        check_row_format(row_format)
+        columns, select_sql = select_list(columns, 'p', _ADJACENT_EDGE_EXPRESSIONS)
+        metadata_sql, metadata_params = self._metadata_predicate('pr', metadata_filter)
+        
         try:
-            cursor = self.conn.cursor()
+            cursor = self._read_conn().cursor()
+            cursor.row_factory = None
             
-            cursor.execute("""
-                SELECT p.*, pr.weight, pr.metadata, pr.created_at as relationship_created
+            cursor.execute(f"""
+                SELECT {select_sql}
                 FROM pdcas p
-                JOIN pdca_relationships pr ON p.id = pr.to_pdca_id
-                WHERE pr.from_pdca_id = ? AND pr.relationship_type = ?
+                JOIN pdca_relationships pr ON p.id = pr.{neighbor_column}
+                WHERE pr.{seed_column} = ? AND +pr.relationship_type = ?{metadata_sql}
                 ORDER BY pr.created_at DESC
-            """, (pdca_id, relationship_type))
+            """, [pdca_id, relationship_type] + metadata_params)
             
-            results = []
-            for row in cursor.fetchall():
-                pdca_dict = dict(row)
-                if pdca_dict['metadata']:
-                    pdca_dict['metadata'] = json.loads(pdca_dict['metadata'])
-                results.append(pdca_dict)
-            
-            logger.debug(f"Found {len(results)} successors for {pdca_id}")
+            results = build_rows(cursor.fetchall(), columns, row_format)
+            logger.debug("Found %d %s for %s", len(results), label, pdca_id)
             return results
             
         except Exception as e:
-            logger.error(f"Error getting successors: {e}")
+            self._log_error("Error getting %s: %s", label, e)
             return []
     
-    def find_path(self, start_pdca_id: str, end_pdca_id: str, 
-                  relationship_type: str = "PRECEDES", max_depth: int = 10) -> List[Dict]:
+    @instrumented()
+    def get_neighbors_many(self, pdca_ids: Iterable[str], direction: str = 'out',
+                           relationship_types: Optional[List[str]] = None,
+                           limit_per_seed: Optional[int] = None,
+                           order_by: str = 'weight',
+                           columns: Optional[Sequence[str]] = None,
+                           row_format: str = 'dict',
+                           metadata_filter: Optional[Dict] = None) -> Dict[str, List[Any]]:
         """
-        Find a path between two PDCAs using recursive SQL.
+        Get the neighbors of many PDCAs in a single query.
+        
+        All seeds are passed as one JSON array and expanded with json_each,
+        so a retrieval fan-out over N vector hits costs one round trip
+        instead of N. Each seed's neighbors are ranked in SQL and cut to
+        ``limit_per_seed``.
         
         Args:
-            start_pdca_id: Starting PDCA ID
-            end_pdca_id: Target PDCA ID
-            relationship_type: Type of relationship to follow
-            max_depth: Maximum search depth
+            pdca_ids: Seed PDCA IDs
+            direction: 'out' (successors), 'in' (predecessors) or 'both'
+            relationship_types: Relationship types to follow (None for all)
+            limit_per_seed: Maximum neighbors returned per seed (None for all)
+            order_by: 'weight' (highest weight first) or 'recency' (newest link first)
+            columns: pdcas and edge columns to return (None for all; see graph_rows)
+            row_format: 'dict', 'record' (namedtuple, lazy metadata) or 'tuple'
+            metadata_filter: Relationship metadata predicates evaluated in SQL
+                (see _metadata_predicate())
             
         Returns:
-            List of PDCAs forming the path, or empty list if no path found
+            Dictionary mapping every seed ID to its list of neighbor PDCAs
+            (same fields as get_successors() plus relationship_type and direction)
         """
+        seeds = list(dict.fromkeys(pdca_ids))
+        results = {pdca_id: [] for pdca_id in seeds}
+        if not seeds:
+            return results
+        
+        if direction not in ('out', 'in', 'both'):
+            raise ValueError(f"Unknown direction: {direction}")
+        if order_by == 'weight':
+            order_sql = "weight DESC, relationship_created DESC, relationship_id DESC"
+        elif order_by == 'recency':
+            order_sql = "relationship_created DESC, relationship_id DESC"
+        else:
+            raise ValueError(f"Unknown order_by: {order_by}")
+        check_row_format(row_format)
+        columns, select_sql = select_list(columns, 'p', _NEIGHBOR_EDGE_EXPRESSIONS)
+        metadata_sql, metadata_params = self._metadata_predicate('pr', metadata_filter, named=True)
+        
+        # One edge scan per requested direction, driven by the seed set
+        edge_scans = []
+        for edge_direction, seed_column, neighbor_column in (('out', 'from_pdca_id', 'to_pdca_id'),
+                                                             ('in', 'to_pdca_id', 'from_pdca_id')):
+            if direction not in (edge_direction, 'both'):
+                continue
+            edge_scans.append(f"""
+                SELECT s.value AS seed, pr.{neighbor_column} AS neighbor_id,
+                       '{edge_direction}' AS direction, pr.id AS relationship_id,
+                       pr.relationship_type, pr.weight, pr.metadata,
+                       pr.created_at AS relationship_created
+                FROM json_each(:seeds) s
+                CROSS JOIN pdca_relationships pr ON pr.{seed_column} = s.value
+                WHERE (:types IS NULL
+                       OR +pr.relationship_type IN (SELECT value FROM json_each(:types))){metadata_sql}
+            """)
+        
         try:
-            cursor = self.conn.cursor()
-            
-            # Use recursive CTE to find path
-            cursor.execute("""
-                WITH RECURSIVE pdca_path AS (
-                    -- Base case: start node
-                    SELECT p.*, 0 as depth, CAST(p.id AS TEXT) as path
-                    FROM pdcas p
-                    WHERE p.id = ?
-                    
-                    UNION ALL
-                    
-                    -- Recursive case: follow relationships
-                    SELECT p.*, pp.depth + 1, pp.path || ' -> ' || p.id
-                    FROM pdcas p
-                    JOIN pdca_relationships pr ON p.id = pr.to_pdca_id
-                    JOIN pdca_path pp ON pr.from_pdca_id = pp.id
-                    WHERE pp.depth < ? AND pr.relationship_type = ?
+            cursor = self._read_conn().cursor()
+            cursor.row_factory = None
+            cursor.execute(f"""
+                WITH edges AS ({' UNION ALL '.join(edge_scans)}),
+                ranked AS (
+                    SELECT e.*, ROW_NUMBER() OVER (
+                        PARTITION BY e.seed ORDER BY {order_sql}
+                    ) AS neighbor_rank
+                    FROM edges e
+                    JOIN pdcas p ON p.id = e.neighbor_id
                 )
-                SELECT * FROM pdca_path 
-                WHERE id = ? OR depth = ?
-                ORDER BY depth
-            """, (start_pdca_id, max_depth, relationship_type, end_pdca_id, max_depth))
+                SELECT r.seed, {select_sql}
+                FROM ranked r
+                JOIN pdcas p ON p.id = r.neighbor_id
+                WHERE :limit IS NULL OR r.neighbor_rank <= :limit
+                ORDER BY r.seed, r.neighbor_rank
+            """, dict(metadata_params, **{
+                'seeds': json.dumps(seeds),
+                'types': json.dumps(list(relationship_types)) if relationship_types else None,
+                'limit': limit_per_seed
+            }))
             
-            results = []
-            for row in cursor.fetchall():
-                results.append(dict(row))
+            rows = cursor.fetchall()
+            for seed, row in zip((row[0] for row in rows),
+                                 build_rows((row[1:] for row in rows), columns, row_format)):
+                results[seed].append(row)
             
-            logger.debug(f"Found path of length {len(results)} from {start_pdca_id} to {end_pdca_id}")
+            logger.debug("Expanded %d seeds in one query", len(seeds))
             return results
             
         except Exception as e:
-            logger.error(f"Error finding path: {e}")
-            return []
+            self._log_error("Error getting neighbors for many PDCAs: %s", e)
+            return results
     
-    def get_breadcrumb_navigation(self, pdca_id: str, max_depth: int = 5) -> Dict:
+    @instrumented()
+    @cached_read('subgraph')
+    def extract_subgraph(self, seed_ids: Sequence[str], max_hops: int = 2,
+                         relationship_types: Optional[List[str]] = None,
+                         node_budget: Optional[int] = DEFAULT_SUBGRAPH_NODES,
+                         token_budget: Optional[int] = None,
+                         direction: str = 'both',
+                         recency_half_life: float = DEFAULT_SUBGRAPH_HALF_LIFE,
+                         metadata_filter: Optional[Dict] = None) -> Dict:
         """
-        Get breadcrumb navigation for a PDCA (predecessors and successors).
+        Extract the budgeted neighborhood of several PDCAs for prompt assembly.
+        
+        Expansion is best-first across all seeds at once (see
+        graph_algorithms.best_first_expand()). An edge scores its weight
+        times a recency factor that halves every ``recency_half_life``
+        seconds the neighbor is older than the newest seed, so strong links
+        to recent work are taken first. With direction 'both', ancestors,
+        descendants and (at two hops) siblings are all reachable. Nodes are
+        taken once, even when several seeds reach them.
         
         Args:
-            pdca_id: PDCA ID to get navigation for
-            max_depth: Maximum depth to search
+            seed_ids: Seed PDCA IDs (unknown IDs are ignored)
+            max_hops: Maximum distance from the nearest seed
+            relationship_types: Relationship types to follow (None for all)
+            node_budget: Maximum number of PDCAs returned (None for no limit)
+            token_budget: Maximum estimated tokens of the returned PDCAs,
+                from their objectives (see estimate_tokens())
+            direction: 'out', 'in' or 'both'
+            recency_half_life: Seconds after which an edge score halves
+            metadata_filter: Only follow relationships matching these
+                metadata predicates (see _metadata_predicate())
             
         Returns:
-            Dictionary with predecessors, successors, and path information
+            Dictionary with nodes (PDCA rows in the order taken, plus score,
+            hops, via and tokens), edges (all relationships among the nodes,
+            restricted to relationship_types), tokens, truncated (True if a
+            budget left reachable PDCAs out) and expansions (neighbor
+            queries); empty dictionary on error
         """
+        result = {'nodes': [], 'edges': [], 'tokens': 0, 'truncated': False, 'expansions': 0}
+        if direction not in ('out', 'in', 'both'):
+            raise ValueError(f"Unknown direction: {direction}")
+        
         try:
-            predecessors = self.get_predecessors(pdca_id)
-            successors = self.get_successors(pdca_id)
+            seeds = self._get_nodes(list(dict.fromkeys(seed_ids)))
+            if not seeds:
+                return result
+            tokens = {pdca_id: estimate_tokens(row['objective']) for pdca_id, row in seeds.items()}
+            newest = max(row['timestamp'] or 0 for row in seeds.values())
             
-            # Get current PDCA info
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM pdcas WHERE id = ?", (pdca_id,))
-            row = cursor.fetchone()
-            current_pdca = dict(row) if row else None
+            def expand(pdca_ids):
+                neighbors = self.get_neighbors_many(
+                    pdca_ids, direction=direction, relationship_types=relationship_types,
+                    columns=('id', 'timestamp', 'objective', 'weight'), row_format='tuple',
+                    metadata_filter=metadata_filter)
+                edges = {}
+                for pdca_id, rows in neighbors.items():
+                    edges[pdca_id] = []
+                    for neighbor_id, timestamp, objective, weight in rows:
+                        tokens.setdefault(neighbor_id, estimate_tokens(objective))
+                        age = max(newest - (timestamp or 0), 0)
+                        edges[pdca_id].append(
+                            (neighbor_id, (weight or 0.0) * 0.5 ** (age / recency_half_life)))
+                return edges
             
-            return {
-                'current_pdca': current_pdca,
-                'predecessors': predecessors[:max_depth],
-                'successors': successors[:max_depth],
-                'predecessor_count': len(predecessors),
-                'successor_count': len(successors)
-            }
+            expansion = best_first_expand(
+                [pdca_id for pdca_id in seed_ids if pdca_id in seeds], expand,
+                max_hops=max_hops, node_budget=node_budget, cost=tokens.get,
+                cost_budget=token_budget)
+            
+            taken = [entry[0] for entry in expansion['nodes']]
+            rows = self._get_nodes(taken)
+            for pdca_id, score, hops, via in expansion['nodes']:
+                row = rows.get(pdca_id) or {'id': pdca_id}
+                row.update(score=score, hops=hops, via=via, tokens=tokens[pdca_id])
+                result['nodes'].append(row)
+            
+            columns, select_sql = select_list(None, 'pr', {}, base_columns=RELATIONSHIP_COLUMNS)
+            cursor = self._read_conn().cursor()
+            cursor.row_factory = None
+            cursor.execute(f"""
+                SELECT {select_sql}
+                FROM json_each(:nodes) s
+                CROSS JOIN pdca_relationships pr ON pr.from_pdca_id = s.value
+                WHERE pr.to_pdca_id IN (SELECT value FROM json_each(:nodes))
+                  AND (:types IS NULL
+                       OR +pr.relationship_type IN (SELECT value FROM json_each(:types)))
+                ORDER BY pr.id
+            """, {
+                'nodes': json.dumps(taken),
+                'types': json.dumps(list(relationship_types)) if relationship_types else None
+            })
+            result['edges'] = build_rows(cursor.fetchall(), columns, 'dict')
+            result.update(tokens=int(expansion['cost']), truncated=expansion['truncated'],
+                          expansions=expansion['expansions'])
+            
+            logger.debug("Extracted subgraph of %d PDCAs and %d relationships from %d seeds",
+                         len(result['nodes']), len(result['edges']), len(seeds))
+            return result
             
         except Exception as e:
-            logger.error(f"Error getting breadcrumb navigation: {e}")
+            self._log_error("Error extracting subgraph: %s", e)
             return {}
     
-    def get_graph_stats(self) -> Dict:
+    @instrumented()
+    @cached_read('find_path')
+    def find_path(self, start_pdca_id: str, end_pdca_id: str, 
+                  relationship_type: str = "PRECEDES", max_depth: int = 10,
+                  weighted: bool = False,
+                  max_visits: int = DEFAULT_MAX_VISITS,
+                  should_stop: Optional[Callable[[], bool]] = None,
+                  metadata_filter: Optional[Dict] = None) -> List[Dict]:
         """
-        Get graph statistics and analytics.
+        Find the shortest path between two PDCAs.
+        
+        Args:
+            start_pdca_id: Starting PDCA ID
+            end_pdca_id: Target PDCA ID
+            relationship_type: Type of relationship to follow
+            max_depth: Maximum search depth
+            weighted: Use relationship weights as costs (Dijkstra) instead of hop count
+            max_visits: Node-visit budget for the search
+            should_stop: Optional callback polled during the search for cancellation
+            metadata_filter: Only follow relationships matching these metadata
+                predicates (see _metadata_predicate())
+            
+        Returns:
+            List of PDCAs forming the path in order (each with its 'depth'),
+            or empty list if no path found
+        """
+        try:
+            result = self.shortest_path(start_pdca_id, end_pdca_id, relationship_type,
+                                        max_depth=max_depth, weighted=weighted,
+                                        max_visits=max_visits, should_stop=should_stop,
+                                        metadata_filter=metadata_filter)
+            if not result['found']:
+                return []
+            
+            nodes = self._get_nodes(result['path'])
+            path = []
+            for depth, pdca_id in enumerate(result['path']):
+                pdca_dict = dict(nodes.get(pdca_id) or {'id': pdca_id})
+                pdca_dict['depth'] = depth
+                path.append(pdca_dict)
+            
+            logger.debug("Found path of length %d from %s to %s", len(path), start_pdca_id, end_pdca_id)
+            return path
+            
+        except Exception as e:
+            self._log_error("Error finding path: %s", e)
+            return []
+    
+    @instrumented()
+    def shortest_path(self, start_pdca_id: str, end_pdca_id: str,
+                      relationship_type: str = "PRECEDES", max_depth: int = 10,
+                      weighted: bool = False,
+                      max_visits: int = DEFAULT_MAX_VISITS,
+                      should_stop: Optional[Callable[[], bool]] = None,
+                      metadata_filter: Optional[Dict] = None) -> Dict:
+        """
+        Run the path engine and return the bare path with its cost.
+        
+        Unweighted searches use bidirectional BFS (one SQL query per level);
+        weighted searches run Dijkstra over pdca_relationships.weight. Both
+        track visited nodes, stop as soon as the target is reached and give
+        up after ``max_visits`` nodes.
+        
+        Args:
+            start_pdca_id: Starting PDCA ID
+            end_pdca_id: Target PDCA ID
+            relationship_type: Type of relationship to follow
+            max_depth: Maximum path length in hops
+            weighted: Use relationship weights as costs (Dijkstra)
+            max_visits: Node-visit budget for the search
+            should_stop: Optional callback polled during the search for cancellation
+            metadata_filter: Only follow relationships matching these metadata
+                predicates (see _metadata_predicate())
+            
+        Returns:
+            Dictionary with found, path (ordered PDCA IDs), cost, hops,
+            visited and budget_exhausted
+        """
+        def expand_out(pdca_ids):
+            return self._expand_frontier(pdca_ids, 'out', relationship_type, metadata_filter)
+        
+        def expand_in(pdca_ids):
+            return self._expand_frontier(pdca_ids, 'in', relationship_type, metadata_filter)
+        
+        if weighted:
+            return dijkstra(start_pdca_id, end_pdca_id, expand_out,
+                            max_depth=max_depth, max_visits=max_visits,
+                            should_stop=should_stop)
+        return bidirectional_bfs(start_pdca_id, end_pdca_id, expand_out, expand_in,
+                                 max_depth=max_depth, max_visits=max_visits,
+                                 should_stop=should_stop)
+    
+    def _expand_frontier(self, pdca_ids: List[str], direction: str, relationship_type: str,
+                         metadata_filter: Optional[Dict] = None) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Fetch the neighbors of a whole frontier in one query.
+        
+        Args:
+            pdca_ids: Frontier PDCA IDs
+            direction: 'out' for successors, 'in' for predecessors
+            relationship_type: Type of relationship to follow
+            metadata_filter: Relationship metadata predicates
+            
+        Returns:
+            Dictionary mapping each PDCA ID to a list of (neighbor_id, weight)
+        """
+        if direction == 'out':
+            seed_column, neighbor_column = 'from_pdca_id', 'to_pdca_id'
+        elif direction == 'in':
+            seed_column, neighbor_column = 'to_pdca_id', 'from_pdca_id'
+        else:
+            raise ValueError(f"Unknown direction: {direction}")
+        
+        metadata_sql, metadata_params = self._metadata_predicate('pr', metadata_filter)
+        cursor = self._read_conn().cursor()
+        cursor.execute(f"""
+            SELECT pr.{seed_column} AS seed, pr.{neighbor_column} AS neighbor, pr.weight
+            FROM json_each(?) s
+            CROSS JOIN pdca_relationships pr ON pr.{seed_column} = s.value
+            WHERE +pr.relationship_type = ?  -- keep the planner on the endpoint index
+                  {metadata_sql}
+        """, [json.dumps(list(pdca_ids)), relationship_type] + metadata_params)
+        
+        neighbors = {}
+        for seed, neighbor, weight in cursor.fetchall():
+            neighbors.setdefault(seed, []).append((neighbor, weight))
+        return neighbors
+    
+    @instrumented()
+    @cached_read('node')
+    def get_pdca_node(self, pdca_id: str) -> Optional[Dict]:
+        """
+        Get a single PDCA node.
+        
+        Args:
+            pdca_id: PDCA ID
+            
+        Returns:
+            PDCA dictionary, or None if it does not exist
+        """
+        try:
+            cursor = self._read_conn().cursor()
+            cursor.execute("SELECT * FROM pdcas WHERE id = ?", (pdca_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+            
+        except Exception as e:
+            self._log_error("Error getting PDCA node: %s", e)
+            return None
+    
+    def _get_nodes(self, pdca_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch several PDCA nodes in one query, keyed by ID."""
+        cursor = self._read_conn().cursor()
+        cursor.execute("""
+            SELECT p.* FROM pdcas p
+            WHERE p.id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(pdca_ids)),))
+        return {row['id']: dict(row) for row in cursor.fetchall()}
+    
+    def iter_nodes(self, start_timestamp: Optional[int] = None,
+                   end_timestamp: Optional[int] = None,
+                   agent_name: Optional[str] = None,
+                   verification_status: Optional[str] = None,
+                   after: Optional[int] = None,
+                   batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+                   columns: Optional[Sequence[str]] = None,
+                   row_format: str = 'dict',
+                   checkpoint: Optional[Dict] = None) -> Iterator[Any]:
+        """
+        Stream PDCA nodes in write order with constant memory.
+        
+        Rows are read from one open statement with fetchmany(), so the whole
+        stream sees a single read snapshot. The resume cursor of a node is
+        its pdcas rowid; pass a saved cursor as ``after`` to continue where a
+        previous stream stopped. Rowids grow with every write, so a resumed
+        stream also returns nodes indexed later with an older timestamp and
+        nodes rewritten by INSERT OR REPLACE. In-place UPDATEs keep their
+        rowid and are not streamed again; follow changes_since() for those.
+        Database errors are raised rather than logged, since a silently
+        truncated stream looks like a complete one.
+        
+        Args:
+            start_timestamp: Only nodes at or after this Unix timestamp
+            end_timestamp: Only nodes before this Unix timestamp
+            agent_name: Only nodes of this agent
+            verification_status: Only nodes with this verification status
+            after: Resume cursor; only nodes with a larger rowid are returned
+            batch_size: Rows fetched per fetchmany() call
+            columns: pdcas columns to return (None for all; see graph_rows)
+            row_format: 'dict', 'record' or 'tuple'
+            checkpoint: Dictionary whose 'after' key is set to the cursor of
+                each row just before the row is yielded
+            
+        Yields:
+            PDCA rows in the requested format
+        """
+        check_row_format(row_format)
+        columns, select_sql = select_list(columns, 'p', {})
+        clauses, params = self._node_filters('p', start_timestamp, end_timestamp,
+                                             agent_name, verification_status)
+        if after is not None:
+            clauses.append("p.rowid > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        cursor = self._read_conn().cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT p.rowid, {select_sql}
+            FROM pdcas p
+            {where}
+            ORDER BY p.rowid
+        """, params)
+        yield from self._stream(cursor, columns, row_format, batch_size, 1, checkpoint)
+    
+    def iter_edges(self, relationship_types: Optional[Sequence[str]] = None,
+                   start_timestamp: Optional[int] = None,
+                   end_timestamp: Optional[int] = None,
+                   agent_name: Optional[str] = None,
+                   verification_status: Optional[str] = None,
+                   after: Optional[int] = None,
+                   batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+                   columns: Optional[Sequence[str]] = None,
+                   row_format: str = 'dict',
+                   checkpoint: Optional[Dict] = None,
+                   metadata_filter: Optional[Dict] = None) -> Iterator[Any]:
+        """
+        Stream relationships in id order with constant memory.
+        
+        Node filters apply to both endpoints, so filtering iter_nodes() and
+        iter_edges() the same way exports a closed subgraph. The resume
+        cursor of an edge is its relationship id. A relationship rewritten
+        by INSERT OR REPLACE gets a new id and is streamed again.
+        
+        Args:
+            relationship_types: Relationship types to include (None for all)
+            start_timestamp: Both endpoints at or after this Unix timestamp
+            end_timestamp: Both endpoints before this Unix timestamp
+            agent_name: Both endpoints belong to this agent
+            verification_status: Both endpoints have this verification status
+            after: Resume cursor; only relationships with a larger id are returned
+            batch_size: Rows fetched per fetchmany() call
+            columns: pdca_relationships columns to return (None for all)
+            row_format: 'dict', 'record' or 'tuple'
+            checkpoint: Dictionary whose 'after' key is set to the cursor of
+                each row just before the row is yielded
+            metadata_filter: Relationship metadata predicates; declared keys
+                are served by their metadata index
+            
+        Yields:
+            Relationship rows in the requested format (dict rows carry
+            decoded metadata)
+        """
+        check_row_format(row_format)
+        columns, select_sql = select_list(columns, 'pr', {},
+                                          base_columns=RELATIONSHIP_COLUMNS)
+        clauses, params = [], []
+        if relationship_types is not None:
+            clauses.append("pr.relationship_type IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(relationship_types)))
+        joins = ""
+        for alias, column in (('src', 'from_pdca_id'), ('dst', 'to_pdca_id')):
+            node_clauses, node_params = self._node_filters(
+                alias, start_timestamp, end_timestamp, agent_name, verification_status)
+            if node_clauses:
+                joins += f" JOIN pdcas {alias} ON {alias}.id = pr.{column}"
+                clauses.extend(node_clauses)
+                params.extend(node_params)
+        if after is not None:
+            clauses.append("pr.id > ?")
+            params.append(after)
+        metadata_sql, metadata_params = self._metadata_predicate('pr', metadata_filter, indexed=True)
+        if metadata_sql:
+            clauses.append(metadata_sql[len(" AND "):])
+            params.extend(metadata_params)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        cursor = self._read_conn().cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT pr.id, {select_sql}
+            FROM pdca_relationships pr{joins}
+            {where}
+            ORDER BY pr.id
+        """, params)
+        yield from self._stream(cursor, columns, row_format, batch_size, 1, checkpoint)
+    
+    @staticmethod
+    def _node_filters(alias: str, start_timestamp: Optional[int], end_timestamp: Optional[int],
+                      agent_name: Optional[str],
+                      verification_status: Optional[str]) -> Tuple[List[str], List]:
+        """WHERE clauses and parameters for the streaming node filters."""
+        clauses, params = [], []
+        for condition, value in ((f"{alias}.timestamp >= ?", start_timestamp),
+                                 (f"{alias}.timestamp < ?", end_timestamp),
+                                 (f"{alias}.agent_name = ?", agent_name),
+                                 (f"{alias}.verification_status = ?", verification_status)):
+            if value is not None:
+                clauses.append(condition)
+                params.append(value)
+        return clauses, params
+    
+    @staticmethod
+    def _stream(cursor: sqlite3.Cursor, columns: Tuple[str, ...], row_format: str,
+                batch_size: int, key_width: int, checkpoint: Optional[Dict]) -> Iterator[Any]:
+        """
+        Yield converted rows batch by batch; the first ``key_width`` values
+        of every fetched row are its resume cursor.
+        """
+        try:
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                rows = build_rows((row[key_width:] for row in batch), columns, row_format)
+                for key, row in zip(batch, rows):
+                    if checkpoint is not None:
+                        checkpoint['after'] = list(key[:key_width]) if key_width > 1 else key[0]
+                    yield row
+        finally:
+            cursor.close()
+    
+    def changes_since(self, watermark: int = 0, limit: Optional[int] = None,
+                      entity: Optional[str] = None,
+                      batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+                      columns: Optional[Sequence[str]] = None,
+                      row_format: str = 'dict',
+                      checkpoint: Optional[Dict] = None) -> Iterator[Any]:
+        """
+        Stream the logged node and relationship changes after a watermark.
+        
+        A change names the changed row by its key (pdca_id for nodes;
+        pdca_id, to_pdca_id and relationship_type for relationships); read
+        the current row to process it. The watermark of a change is its
+        seq. A consumer keeps the seq of the last change it processed and
+        passes it back on the next run. A new consumer reads
+        change_watermark() first, then scans the graph once (iter_nodes(),
+        iter_edges()) and continues from the saved watermark.
+        
+        Args:
+            watermark: Only changes with a larger seq are returned
+            limit: Maximum number of changes (None for all)
+            entity: Only 'node' or only 'edge' changes (None for both)
+            batch_size: Rows fetched per fetchmany() call
+            columns: pdca_changes columns to return (None for all)
+            row_format: 'dict', 'record' or 'tuple'
+            checkpoint: Dictionary whose 'after' key is set to the seq of
+                each change just before the change is yielded
+            
+        Yields:
+            Changes in seq order
+            
+        Raises:
+            ValueError: If compact_changes() already removed changes after
+                ``watermark``; the consumer has to rescan the graph
+        """
+        check_row_format(row_format)
+        columns, select_sql = select_list(columns, 'c', {}, base_columns=CHANGE_COLUMNS)
+        
+        conn = self._read_conn()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT c.seq, {select_sql}
+            FROM pdca_changes c
+            WHERE c.seq > ? AND (? IS NULL OR c.entity = ?)
+            ORDER BY c.seq
+            LIMIT ?
+        """, (watermark, entity, entity, -1 if limit is None else limit))
+        # Read while the stream's statement is open, so both see the same snapshot
+        row = conn.execute("SELECT through_seq FROM pdca_changes_compacted").fetchone()
+        if row is not None and watermark < row[0]:
+            cursor.close()
+            raise ValueError(f"Changes up to seq {row[0]} were compacted; "
+                             f"watermark {watermark} is too old")
+        yield from self._stream(cursor, columns, row_format, batch_size, 1, checkpoint)
+    
+    def change_watermark(self) -> int:
+        """
+        Get the seq of the latest logged change (0 if nothing was logged).
+        
+        Returns:
+            int: Watermark that makes changes_since() return only later changes
+        """
+        try:
+            cursor = self._read_conn().cursor()
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'pdca_changes'")
+            row = cursor.fetchone()
+            return row[0] if row else 0
+            
+        except Exception as e:
+            self._log_error("Error reading change watermark: %s", e)
+            return 0
+    
+    @instrumented()
+    def compact_changes(self, through_seq: Optional[int] = None,
+                        older_than: Optional[float] = None,
+                        coalesce: bool = False) -> Dict:
+        """
+        Remove old entries from the change log.
+        
+        Pass the lowest watermark of all consumers as ``through_seq``.
+        Consumers whose watermark falls behind the compacted range get a
+        ValueError from changes_since() and have to rescan.
+        
+        Args:
+            through_seq: Remove changes with a seq up to this one
+            older_than: Remove changes logged more than this many seconds ago
+            coalesce: Also remove every remaining change that a later change
+                of the same node or relationship supersedes
+        
+        Returns:
+            Dictionary with removed (changes removed), compacted_through
+            (highest compacted seq) and remaining (changes left in the log)
+        """
+        with self._write_lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute("SELECT through_seq FROM pdca_changes_compacted")
+                row = cursor.fetchone()
+                horizon = row[0] if row else 0
+                if through_seq is not None:
+                    horizon = max(horizon, through_seq)
+                if older_than is not None:
+                    cursor.execute("""
+                        SELECT MAX(seq) FROM pdca_changes
+                        WHERE changed_at < datetime('now', ?)
+                    """, (f"{-float(older_than)} seconds",))
+                    horizon = max(horizon, cursor.fetchone()[0] or 0)
+                
+                cursor.execute("DELETE FROM pdca_changes WHERE seq <= ?", (horizon,))
+                removed = cursor.rowcount
+                if horizon:
+                    cursor.execute("""
+                        INSERT INTO pdca_changes_compacted (id, through_seq) VALUES (1, ?)
+                        ON CONFLICT(id) DO UPDATE SET through_seq = excluded.through_seq
+                    """, (horizon,))
+                if coalesce:
+                    cursor.execute("""
+                        DELETE FROM pdca_changes
+                        WHERE seq NOT IN (
+                            SELECT MAX(seq) FROM pdca_changes
+                            GROUP BY entity, pdca_id, to_pdca_id, relationship_type)
+                    """)
+                    removed += cursor.rowcount
+                cursor.execute("SELECT COUNT(*) FROM pdca_changes")
+                remaining = cursor.fetchone()[0]
+                self.conn.commit()
+                logger.info("Compacted %d changes through seq %d", removed, horizon)
+                return {'removed': removed, 'compacted_through': horizon, 'remaining': remaining}
+                
+            except Exception as e:
+                self.conn.rollback()
+                self._log_error("Error compacting change log: %s", e)
+                return {}
+    
+    @instrumented()
+    @cached_read('breadcrumbs')
+    def get_breadcrumb_navigation(self, pdca_id: str, max_depth: int = 5,
+                                  page_size: int = DEFAULT_BREADCRUMB_PAGE_SIZE,
+                                  predecessor_cursor: Optional[List] = None,
+                                  successor_cursor: Optional[List] = None,
+                                  relationship_type: str = "PRECEDES",
+                                  include_counts: bool = True,
+                                  metadata_filter: Optional[Dict] = None) -> Dict:
+        """
+        Get breadcrumb navigation for a PDCA (predecessors and successors).
+        
+        Walks up to ``max_depth`` levels up and down the relationship chain.
+        Each direction is returned one page at a time, nearest level first
+        and newest first within a level; the page size is applied in SQL.
+        Pass the returned ``next_*_cursor`` back in to fetch the next page.
+        Counts come from a COUNT query, or from the maintained degree
+        counters when ``max_depth`` is 1 and no metadata filter is given.
+        
+        Args:
+            pdca_id: PDCA ID to get navigation for
+            max_depth: Number of levels to walk in each direction
+            page_size: Maximum predecessors/successors returned per page
+            predecessor_cursor: Cursor from a previous page of predecessors
+            successor_cursor: Cursor from a previous page of successors
+            relationship_type: Type of relationship to follow
+            include_counts: Also count all predecessors/successors within max_depth
+            metadata_filter: Only walk relationships matching these metadata
+                predicates (see _metadata_predicate())
+            
+        Returns:
+            Dictionary with current_pdca, predecessors, successors (each row
+            carries its 'depth'), predecessor_count, successor_count and
+            next_predecessor_cursor / next_successor_cursor (None on the last page)
+        """
+        try:
+            cursor = self._read_conn().cursor()
+            
+            # Get current PDCA info
+            cursor.execute("SELECT * FROM pdcas WHERE id = ?", (pdca_id,))
+            row = cursor.fetchone()
+            current_pdca = dict(row) if row else None
+            
+            # One level deep, the maintained degree counters are the counts
+            degree = None
+            if include_counts and max_depth == 1 and not metadata_filter:
+                degree = self.get_node_degree(pdca_id, relationship_type)
+            
+            navigation = {'current_pdca': current_pdca}
+            for direction, key, page_cursor in (('in', 'predecessor', predecessor_cursor),
+                                                ('out', 'successor', successor_cursor)):
+                rows, next_cursor = self._breadcrumb_page(
+                    pdca_id, direction, relationship_type, max_depth, page_size, page_cursor,
+                    metadata_filter)
+                navigation[f'{key}s'] = rows
+                navigation[f'next_{key}_cursor'] = next_cursor
+                if degree is not None:
+                    navigation[f'{key}_count'] = degree[f'{direction}_degree']
+                elif include_counts:
+                    navigation[f'{key}_count'] = self._breadcrumb_count(
+                        pdca_id, direction, relationship_type, max_depth, metadata_filter)
+            
+            return navigation
+            
+        except Exception as e:
+            self._log_error("Error getting breadcrumb navigation: %s", e)
+            return {}
+    
+    @staticmethod
+    def _breadcrumb_walk_sql(direction: str, metadata_sql: str = "") -> str:
+        """
+        Recursive CTE ``reached(id, depth, ...)`` for multi-hop breadcrumbs.
+        
+        UNION (not UNION ALL) drops repeated (node, depth) rows, so cycles
+        cannot blow up the walk; each node keeps its nearest depth.
+        ``metadata_sql`` is an extra " AND ..." condition on ``pr``.
+        """
+        if direction == 'in':
+            seed_column, neighbor_column = 'to_pdca_id', 'from_pdca_id'
+        else:
+            seed_column, neighbor_column = 'from_pdca_id', 'to_pdca_id'
+        
+        return f"""
+            WITH RECURSIVE walk(id, depth, weight, metadata, relationship_created) AS (
+                SELECT :pdca_id, 0, NULL, NULL, NULL
+                UNION
+                SELECT pr.{neighbor_column}, w.depth + 1, pr.weight, pr.metadata, pr.created_at
+                FROM walk w
+                JOIN pdca_relationships pr ON pr.{seed_column} = w.id
+                WHERE w.depth < :max_depth AND +pr.relationship_type = :relationship_type{metadata_sql}
+            ),
+            reached AS (
+                SELECT id, MIN(depth) AS depth, weight, metadata, relationship_created
+                FROM walk
+                WHERE depth > 0 AND id != :pdca_id
+                GROUP BY id
+            )
+        """
+    
+    def _breadcrumb_page(self, pdca_id: str, direction: str, relationship_type: str,
+                         max_depth: int, page_size: int, page_cursor: Optional[List],
+                         metadata_filter: Optional[Dict] = None) -> Tuple[List[Dict], Optional[List]]:
+        """
+        Fetch one keyset page of breadcrumbs in one direction.
+        
+        Rows are ordered by (depth ASC, created_at DESC, id DESC); the cursor
+        is the [depth, created_at, id] of the last row of the previous page.
+        """
+        depth, created_at, last_id = page_cursor if page_cursor else (None, None, None)
+        metadata_sql, metadata_params = self._metadata_predicate('pr', metadata_filter, named=True)
+        
+        cursor = self._read_conn().cursor()
+        cursor.execute(self._breadcrumb_walk_sql(direction, metadata_sql) + """
+            SELECT p.*, r.weight, r.metadata, r.relationship_created, r.depth
+            FROM reached r
+            JOIN pdcas p ON p.id = r.id
+            WHERE :cursor_depth IS NULL
+               OR r.depth > :cursor_depth
+               OR (r.depth = :cursor_depth AND (p.created_at, p.id) < (:cursor_created, :cursor_id))
+            ORDER BY r.depth ASC, p.created_at DESC, p.id DESC
+            LIMIT :limit
+        """, dict(metadata_params, **{
+            'pdca_id': pdca_id,
+            'max_depth': max_depth,
+            'relationship_type': relationship_type,
+            'cursor_depth': depth,
+            'cursor_created': created_at,
+            'cursor_id': last_id,
+            'limit': page_size + 1  # one extra row tells us whether another page exists
+        }))
+        
+        rows = []
+        for row in cursor.fetchmany(page_size + 1):
+            pdca_dict = dict(row)
+            if pdca_dict['metadata']:
+                pdca_dict['metadata'] = json.loads(pdca_dict['metadata'])
+            rows.append(pdca_dict)
+        
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = [last['depth'], last['created_at'], last['id']]
+        return rows, next_cursor
+    
+    def _breadcrumb_count(self, pdca_id: str, direction: str, relationship_type: str,
+                          max_depth: int, metadata_filter: Optional[Dict] = None) -> int:
+        """Count the distinct PDCAs within ``max_depth`` levels in one direction."""
+        metadata_sql, metadata_params = self._metadata_predicate('pr', metadata_filter, named=True)
+        cursor = self._read_conn().cursor()
+        cursor.execute(self._breadcrumb_walk_sql(direction, metadata_sql) + """
+            SELECT COUNT(*) FROM reached r JOIN pdcas p ON p.id = r.id
+        """, dict(metadata_params, **{
+            'pdca_id': pdca_id,
+            'max_depth': max_depth,
+            'relationship_type': relationship_type
+        }))
+        return cursor.fetchone()[0]
+    
+    @instrumented()
+    def get_graph_stats(self) -> Dict:
+        """
+        Get graph statistics and analytics.
+        
+        Reads the trigger-maintained statistics tables, so the cost does not
+        grow with the graph: counters are single-row lookups and the most
+        connected nodes come from an indexed top-10 scan.
         
         Returns:
             Dictionary with graph statistics
         """
         try:
-            cursor = self.conn.cursor()
+            cursor = self._read_conn().cursor()
             
             # Node count
-            cursor.execute("SELECT COUNT(*) as node_count FROM pdcas")
+            cursor.execute("""
+                SELECT COALESCE(MAX(value), 0) AS node_count
+                FROM pdca_graph_counters WHERE name = 'node_count'
+            """)
             node_count = cursor.fetchone()['node_count']
             
-            # Edge count
-            cursor.execute("SELECT COUNT(*) as edge_count FROM pdca_relationships")
-            edge_count = cursor.fetchone()['edge_count']
-            
-            # Relationship types
+            # Relationship types (one row per type) and edge count
             cursor.execute("""
-                SELECT relationship_type, COUNT(*) as count 
-                FROM pdca_relationships 
-                GROUP BY relationship_type
+                SELECT relationship_type, edge_count AS count
+                FROM pdca_edge_type_counts
+                WHERE edge_count > 0
             """)
             relationship_types = {row['relationship_type']: row['count'] 
                                 for row in cursor.fetchall()}
+            edge_count = sum(relationship_types.values())
             
             # Most connected nodes
             cursor.execute("""
                 SELECT pdca_id, connection_count
-                FROM (
-                    SELECT from_pdca_id as pdca_id, COUNT(*) as connection_count
-                    FROM pdca_relationships
-                    GROUP BY from_pdca_id
-                    UNION ALL
-                    SELECT to_pdca_id as pdca_id, COUNT(*) as connection_count
-                    FROM pdca_relationships
-                    GROUP BY to_pdca_id
-                )
-                GROUP BY pdca_id
-                ORDER BY SUM(connection_count) DESC
+                FROM pdca_node_connections
+                WHERE connection_count > 0
+                ORDER BY connection_count DESC, pdca_id
                 LIMIT 10
             """)
             most_connected = [dict(row) for row in cursor.fetchall()]
@@ -403,11 +1910,1014 @@ class SQLiteGraph:
             }
             
         except Exception as e:
-            logger.error(f"Error getting graph stats: {e}")
+            self._log_error("Error getting graph stats: %s", e)
             return {}
     
+    @instrumented()
+    def get_node_degree(self, pdca_id: str, relationship_type: Optional[str] = None) -> Dict:
+        """
+        Get the maintained in/out degree of a PDCA.
+        
+        Args:
+            pdca_id: PDCA ID
+            relationship_type: Type of relationship to count (None for all)
+            
+        Returns:
+            Dictionary with in_degree and out_degree
+        """
+        try:
+            cursor = self._read_conn().cursor()
+            cursor.execute("""
+                SELECT COALESCE(SUM(in_degree), 0) AS in_degree,
+                       COALESCE(SUM(out_degree), 0) AS out_degree
+                FROM pdca_node_degree
+                WHERE pdca_id = ? AND (? IS NULL OR relationship_type = ?)
+            """, (pdca_id, relationship_type, relationship_type))
+            return dict(cursor.fetchone())
+            
+        except Exception as e:
+            self._log_error("Error getting node degree: %s", e)
+            return {'in_degree': 0, 'out_degree': 0}
+    
+    @instrumented()
+    def rebuild_stats(self) -> bool:
+        """
+        Recompute all statistics tables from pdcas and pdca_relationships.
+        
+        Use after bulk loads done with the triggers dropped, after writes
+        from a connection with recursive_triggers enabled, or whenever the
+        counters are suspected to have drifted.
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self._write_lock:
+            try:
+                self._rebuild_stats(self.conn.cursor())
+                self.conn.commit()
+                self.write_generation += 1
+                logger.info("Graph statistics rebuilt")
+                return True
+                
+            except Exception as e:
+                self.conn.rollback()
+                self._log_error("Error rebuilding graph stats: %s", e)
+                return False
+    
+    def _rebuild_stats(self, cursor):
+        """Recompute the statistics tables inside the current transaction."""
+        cursor.execute("DELETE FROM pdca_node_degree")
+        cursor.execute("DELETE FROM pdca_node_connections")
+        cursor.execute("DELETE FROM pdca_edge_type_counts")
+        cursor.execute("DELETE FROM pdca_graph_counters")
+        
+        cursor.execute("""
+            INSERT INTO pdca_node_degree (pdca_id, relationship_type, in_degree, out_degree)
+            SELECT pdca_id, relationship_type, SUM(in_degree), SUM(out_degree)
+            FROM (
+                SELECT from_pdca_id AS pdca_id, COALESCE(relationship_type, '') AS relationship_type,
+                       0 AS in_degree, 1 AS out_degree
+                FROM pdca_relationships
+                UNION ALL
+                SELECT to_pdca_id, COALESCE(relationship_type, ''), 1, 0
+                FROM pdca_relationships
+            )
+            GROUP BY pdca_id, relationship_type
+        """)
+        cursor.execute("""
+            INSERT INTO pdca_node_connections (pdca_id, connection_count)
+            SELECT pdca_id, SUM(in_degree + out_degree)
+            FROM pdca_node_degree
+            GROUP BY pdca_id
+        """)
+        cursor.execute("""
+            INSERT INTO pdca_edge_type_counts (relationship_type, edge_count)
+            SELECT COALESCE(relationship_type, ''), COUNT(*)
+            FROM pdca_relationships
+            GROUP BY 1
+        """)
+        cursor.execute("""
+            INSERT INTO pdca_graph_counters (name, value)
+            SELECT 'node_count', COUNT(*) FROM pdcas
+        """)
+    
+    def declare_metadata_index(self, key: str, value_type: Optional[str] = None) -> bool:
+        """
+        Index a relationship metadata key.
+        
+        Adds a VIRTUAL generated column computed with
+        json_extract(metadata, '$.<key>') plus an index on it. Existing
+        databases are migrated in place (ALTER TABLE and the index build
+        read the existing rows), and the declaration is recorded in
+        pdca_metadata_indexes so every later connection uses the column.
+        
+        By default the column has no type, so filters compare exactly as
+        they do through json_extract(). A value_type gives the column that
+        affinity: a TEXT column compares the number 3 as the text '3',
+        which sorts after every number, so only declare a type that matches
+        the values stored under the key.
+        
+        Args:
+            key: Top-level metadata key (letters, digits and underscores)
+            value_type: Column type: TEXT, INTEGER, REAL or NUMERIC, or None
+                for an untyped column
+            
+        Returns:
+            bool: True if the key is indexed, False otherwise
+            
+        Raises:
+            ValueError: For an invalid key or type, or a type other than
+                the one the key's column already has
+        """
+        if not _METADATA_KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid metadata key: {key}")
+        declared_type = (value_type or '').upper()
+        if declared_type and declared_type not in METADATA_INDEX_TYPES:
+            raise ValueError(f"Unknown metadata index type: {value_type}")
+        
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            column = self._metadata_columns.get(key) or _metadata_column(key)
+            owner = cursor.execute(
+                "SELECT key FROM pdca_metadata_indexes WHERE column_name = ? COLLATE NOCASE",
+                (column,)).fetchone()
+            if owner is not None and owner[0] != key:
+                raise ValueError(f"Metadata key {key} collides with {owner[0]} on column {column}")
+            existing = {row[1].lower(): row[2].upper() for row in cursor.execute(
+                "PRAGMA table_xinfo(pdca_relationships)")}
+            if column.lower() in existing and existing[column.lower()] != declared_type:
+                raise ValueError(f"Metadata key {key} is already indexed as "
+                                 f"{existing[column.lower()] or 'untyped'}, not "
+                                 f"{declared_type or 'untyped'}")
+            try:
+                if column.lower() not in existing:
+                    cursor.execute(f"""
+                        ALTER TABLE pdca_relationships ADD COLUMN {column} {declared_type}
+                        GENERATED ALWAYS AS (json_extract(metadata, '$.{key}')) VIRTUAL
+                    """)
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_pdca_relationships_{column}
+                    ON pdca_relationships({column})
+                """)
+                cursor.execute("""
+                    INSERT OR REPLACE INTO pdca_metadata_indexes (key, column_name, value_type)
+                    VALUES (?, ?, ?)
+                """, (key, column, declared_type))
+                self.conn.commit()
+                self.write_generation += 1
+                self._metadata_columns[key] = column
+                logger.info("Indexed relationship metadata key %s as %s", key, column)
+                return True
+                
+            except Exception as e:
+                self.conn.rollback()
+                self._log_error("Error declaring metadata index %s: %s", key, e)
+                return False
+    
+    def drop_metadata_index(self, key: str) -> bool:
+        """
+        Remove a metadata index and its generated column.
+        
+        Predicates on the key keep working through json_extract().
+        
+        Args:
+            key: Previously declared metadata key
+            
+        Returns:
+            bool: True if the index was dropped, False otherwise
+        """
+        column = self._metadata_columns.get(key)
+        if column is None:
+            return False
+        with self._write_lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute(f"DROP INDEX IF EXISTS idx_pdca_relationships_{column}")
+                cursor.execute(f"ALTER TABLE pdca_relationships DROP COLUMN {column}")
+                cursor.execute("DELETE FROM pdca_metadata_indexes WHERE key = ?", (key,))
+                self.conn.commit()
+                self.write_generation += 1
+                del self._metadata_columns[key]
+                return True
+                
+            except Exception as e:
+                self.conn.rollback()
+                self._log_error("Error dropping metadata index %s: %s", key, e)
+                return False
+    
+    def metadata_indexes(self) -> List[Dict]:
+        """
+        List the declared metadata indexes.
+        
+        Returns:
+            List of dictionaries with key, column_name, value_type (None for
+            untyped columns) and created_at
+        """
+        try:
+            cursor = self._read_conn().cursor()
+            cursor.execute("SELECT * FROM pdca_metadata_indexes ORDER BY key")
+            return [dict(row, value_type=row['value_type'] or None) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            self._log_error("Error listing metadata indexes: %s", e)
+            return []
+    
+    def _load_metadata_indexes(self):
+        """Read the declared metadata columns (absent in databases from older versions)."""
+        try:
+            rows = self.conn.execute("SELECT key, column_name FROM pdca_metadata_indexes").fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        self._metadata_columns = {key: column for key, column in rows}
+    
+    def _metadata_predicate(self, alias: str, metadata_filter: Optional[Dict],
+                            named: bool = False, indexed: bool = False) -> Tuple[str, Any]:
+        """
+        Compile a metadata_filter into SQL on ``alias`` (a pdca_relationships row).
+        
+        ``metadata_filter`` maps keys to a value (equality; None means the
+        key is missing or null) or to an (operator, value) pair, e.g.
+        {'source': 'breadcrumb', 'confidence': ('>=', 0.5)}. Declared keys
+        use their generated column, other keys json_extract().
+        
+        Seed-driven traversals pass ``indexed=False``: the comparison is then
+        written as ``+(column op value)`` so the planner stays on the
+        endpoint index and applies the predicate to the few rows it reaches.
+        The unary plus wraps the whole comparison, not the column, so the
+        column's affinity still applies and both forms return the same rows. Edge scans
+        pass ``indexed=True`` and are served by the metadata index.
+        
+        Returns:
+            Tuple of (" AND ..." SQL, parameters): a list of positional
+            parameters, or a dict of :meta_N parameters when ``named``
+        """
+        if not metadata_filter:
+            return "", {} if named else []
+        
+        clauses = []
+        params = {} if named else []
+        
+        def bind(value):
+            if named:
+                name = f"meta_{len(params)}"
+                params[name] = value
+                return f":{name}"
+            params.append(value)
+            return "?"
+        
+        for key, condition in metadata_filter.items():
+            if not _METADATA_KEY_PATTERN.match(key):
+                raise ValueError(f"Invalid metadata key: {key}")
+            column = self._metadata_columns.get(key)
+            if column:
+                expression = f"{alias}.{column}"
+            else:
+                expression = f"json_extract({alias}.metadata, '$.{key}')"
+            wrap = "+({})" if column and not indexed else "{}"
+            
+            if isinstance(condition, tuple):
+                operator, value = condition
+                operator = operator.lower()
+            else:
+                operator, value = '=', condition
+            if operator not in METADATA_OPERATORS:
+                raise ValueError(f"Unknown metadata operator: {operator}")
+            
+            if operator in ('in', 'not in'):
+                clause = (f"{expression} {operator.upper()} "
+                          f"(SELECT value FROM json_each({bind(json.dumps(list(value)))}))")
+            elif value is None:
+                clause = f"{expression} IS {'NOT ' if operator == '!=' else ''}NULL"
+            else:
+                clause = f"{expression} {operator} {bind(value)}"
+            clauses.append(wrap.format(clause))
+        
+        return "".join(f" AND {clause}" for clause in clauses), params
+    
+    def enable_reachability_index(self, relationship_type: str = "PRECEDES") -> bool:
+        """
+        Build (or rebuild) the reachability index of one relationship type.
+        
+        With the index, is_ancestor() is one index lookup, and ancestors(),
+        descendants() and common_ancestors() are range scans (see
+        graph_reachability). add_relationship() and add_relationships_bulk()
+        keep the index current, including in other SQLiteGraph instances
+        opened on the database later.
+        
+        Args:
+            relationship_type: Relationship type to index
+        
+        Returns:
+            bool: True if the index was built, False otherwise
+        """
+        with self._write_lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute("""
+                    INSERT OR IGNORE INTO pdca_reachability (relationship_type) VALUES (?)
+                """, (relationship_type,))
+                self._reach_build(cursor, relationship_type)
+                self.conn.commit()
+                self.write_generation += 1
+                self._reachability_types.add(relationship_type)
+                self._stale_reachability.discard(relationship_type)
+                return True
+                
+            except Exception as e:
+                self.conn.rollback()
+                self._log_error("Error building reachability index for %s: %s", relationship_type, e)
+                return False
+    
+    def rebuild_reachability_index(self, relationship_type: Optional[str] = None) -> bool:
+        """
+        Rebuild reachability indexes from scratch.
+        
+        Needed after relationships of an indexed type were deleted or
+        changed, or written without SQLiteGraph; until then queries fall
+        back to walking the graph (see reachability_indexes()).
+        
+        Args:
+            relationship_type: Indexed type to rebuild (None for all)
+        
+        Returns:
+            bool: True if every requested index was rebuilt
+        """
+        indexed = [index['relationship_type'] for index in self.reachability_indexes()]
+        types = indexed if relationship_type is None else [relationship_type]
+        ok = True
+        for indexed_type in types:
+            if indexed_type not in indexed:
+                logger.warning("No reachability index for %s", indexed_type)
+                ok = False
+                continue
+            ok = self.enable_reachability_index(indexed_type) and ok
+        return ok
+    
+    def drop_reachability_index(self, relationship_type: str) -> bool:
+        """
+        Remove the reachability index of a relationship type.
+        
+        Args:
+            relationship_type: Indexed relationship type
+        
+        Returns:
+            bool: True if the index was dropped, False otherwise
+        """
+        with self._write_lock:
+            try:
+                cursor = self.conn.cursor()
+                for table in ('pdca_reach_labels', 'pdca_reach_slots', 'pdca_reachability'):
+                    cursor.execute(f"DELETE FROM {table} WHERE relationship_type = ?",
+                                   (relationship_type,))
+                dropped = cursor.rowcount > 0
+                self.conn.commit()
+                self.write_generation += 1
+                self._reachability_types.discard(relationship_type)
+                return dropped
+                
+            except Exception as e:
+                self.conn.rollback()
+                self._log_error("Error dropping reachability index for %s: %s", relationship_type, e)
+                return False
+    
+    def reachability_indexes(self) -> List[Dict]:
+        """
+        List the reachability indexes.
+        
+        Returns:
+            List of dictionaries with relationship_type, nodes, chains,
+            labels, current (False if writes bypassed the index and it needs
+            a rebuild) and built_at
+        """
+        try:
+            cursor = self._read_conn().cursor()
+            cursor.execute("""
+                SELECT r.relationship_type,
+                       (SELECT COUNT(*) FROM pdca_reach_slots s
+                        WHERE s.relationship_type = r.relationship_type) AS nodes,
+                       r.chain_count AS chains,
+                       (SELECT COUNT(*) FROM pdca_reach_labels l
+                        WHERE l.relationship_type = r.relationship_type) AS labels,
+                       r.edge_version = r.indexed_version AS current,
+                       r.built_at
+                FROM pdca_reachability r
+                ORDER BY r.relationship_type
+            """)
+            return [dict(row, current=bool(row['current'])) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            self._log_error("Error listing reachability indexes: %s", e)
+            return []
+    
+    @instrumented()
+    def is_ancestor(self, ancestor_id: str, descendant_id: str,
+                    relationship_type: str = "PRECEDES") -> bool:
+        """
+        Check whether one PDCA leads to another through one relationship type.
+        
+        A single index lookup with a reachability index; otherwise a
+        recursive walk from ``ancestor_id``.
+        
+        Args:
+            ancestor_id: Possible ancestor
+            descendant_id: Possible descendant
+            relationship_type: Relationship type to follow
+        
+        Returns:
+            bool: True if a path of one or more relationships exists
+            (self-relationships do not count)
+        """
+        try:
+            cursor = self._read_conn().cursor()
+            if self._reachability_ready(cursor, relationship_type):
+                cursor.execute("""
+                    SELECT EXISTS (
+                        SELECT 1 FROM pdca_reach_slots d
+                        JOIN pdca_reach_labels l
+                          ON l.relationship_type = d.relationship_type AND l.direction = 'out'
+                         AND l.pdca_id = ? AND l.chain_id = d.chain_id
+                        WHERE d.relationship_type = ? AND d.pdca_id = ? AND l.position <= d.position
+                    )
+                """, (ancestor_id, relationship_type, descendant_id))
+            else:
+                cursor.execute(self._reach_walk_sql('out') + """
+                    SELECT EXISTS (SELECT 1 FROM walk WHERE id = :target)
+                """, {'pdca_id': ancestor_id, 'relationship_type': relationship_type,
+                      'target': descendant_id})
+            return bool(cursor.fetchone()[0])
+            
+        except Exception as e:
+            self._log_error("Error checking ancestry: %s", e)
+            return False
+    
+    @instrumented()
+    @cached_read('ancestors')
+    def ancestors(self, pdca_id: str, relationship_type: str = "PRECEDES",
+                  start_timestamp: Optional[int] = None,
+                  end_timestamp: Optional[int] = None,
+                  limit: Optional[int] = None,
+                  columns: Optional[Sequence[str]] = None,
+                  row_format: str = 'dict') -> List[Any]:
+        """
+        Get every PDCA that leads to a PDCA, at any depth.
+        
+        Args:
+            pdca_id: PDCA ID
+            relationship_type: Relationship type to follow
+            start_timestamp: Only ancestors at or after this Unix timestamp
+            end_timestamp: Only ancestors before this Unix timestamp
+            limit: Maximum number of ancestors (newest first)
+            columns: pdcas columns to return (None for all)
+            row_format: 'dict', 'record' or 'tuple'
+        
+        Returns:
+            Ancestor PDCAs, newest first
+        """
+        return self._lineage(pdca_id, 'in', relationship_type, start_timestamp, end_timestamp,
+                             limit, columns, row_format)
+    
+    @instrumented()
+    @cached_read('descendants')
+    def descendants(self, pdca_id: str, relationship_type: str = "PRECEDES",
+                    start_timestamp: Optional[int] = None,
+                    end_timestamp: Optional[int] = None,
+                    limit: Optional[int] = None,
+                    columns: Optional[Sequence[str]] = None,
+                    row_format: str = 'dict') -> List[Any]:
+        """
+        Get every PDCA a PDCA leads to, at any depth.
+        
+        Args:
+            pdca_id: PDCA ID
+            relationship_type: Relationship type to follow
+            start_timestamp: Only descendants at or after this Unix timestamp
+            end_timestamp: Only descendants before this Unix timestamp
+            limit: Maximum number of descendants (oldest first)
+            columns: pdcas columns to return (None for all)
+            row_format: 'dict', 'record' or 'tuple'
+        
+        Returns:
+            Descendant PDCAs, oldest first
+        """
+        return self._lineage(pdca_id, 'out', relationship_type, start_timestamp, end_timestamp,
+                             limit, columns, row_format)
+    
+    @instrumented()
+    @cached_read('common_ancestors')
+    def common_ancestors(self, pdca_ids: Sequence[str], relationship_type: str = "PRECEDES",
+                         limit: Optional[int] = None,
+                         columns: Optional[Sequence[str]] = None,
+                         row_format: str = 'dict') -> List[Any]:
+        """
+        Get the PDCAs that are ancestors of every given PDCA.
+        
+        In the timestamp-ordered timeline the first result is the nearest
+        common ancestor (e.g. where two sessions branched). A given PDCA is
+        never its own ancestor, so it is not returned even if it precedes
+        the others.
+        
+        Args:
+            pdca_ids: Two or more PDCA IDs
+            relationship_type: Relationship type to follow
+            limit: Maximum number of ancestors (newest first)
+            columns: pdcas columns to return (None for all)
+            row_format: 'dict', 'record' or 'tuple'
+        
+        Returns:
+            Common ancestor PDCAs, newest first
+        """
+        pdca_ids = list(dict.fromkeys(pdca_ids))
+        if not pdca_ids:
+            return []
+        return self._lineage(pdca_ids[0], 'in', relationship_type, None, None,
+                             limit, columns, row_format, others=pdca_ids[1:])
+    
+    def _lineage(self, pdca_id: str, direction: str, relationship_type: str,
+                 start_timestamp: Optional[int], end_timestamp: Optional[int],
+                 limit: Optional[int], columns: Optional[Sequence[str]], row_format: str,
+                 others: Sequence[str] = ()) -> List[Any]:
+        """
+        Ancestors ('in') or descendants ('out') of a PDCA, optionally only
+        those that are also ancestors of every PDCA in ``others``.
+        """
+        check_row_format(row_format)
+        columns, select_sql = select_list(columns, 'p', {})
+        params = {
+            'pdca_id': pdca_id,
+            'relationship_type': relationship_type,
+            'direction': direction,
+            'start': start_timestamp,
+            'end': end_timestamp,
+            'limit': -1 if limit is None else limit
+        }
+        order = 'DESC' if direction == 'in' else 'ASC'
+        tail = f"""
+              AND (:start IS NULL OR p.timestamp >= :start)
+              AND (:end IS NULL OR p.timestamp < :end)
+            ORDER BY p.timestamp {order}, p.id {order}
+            LIMIT :limit
+        """
+        
+        try:
+            cursor = self._read_conn().cursor()
+            if self._reachability_ready(cursor, relationship_type):
+                # One range scan per chain in the label
+                common_sql = ""
+                if others:
+                    params['others'] = json.dumps(list(others))
+                    common_sql = """
+                      AND NOT EXISTS (
+                          SELECT 1 FROM json_each(:others) o
+                          WHERE NOT EXISTS (
+                              SELECT 1 FROM pdca_reach_labels ol
+                              WHERE ol.relationship_type = :relationship_type
+                                AND ol.direction = 'in' AND ol.pdca_id = o.value
+                                AND ol.chain_id = s.chain_id AND ol.position >= s.position))
+                    """
+                sql = f"""
+                    SELECT {select_sql}
+                    FROM pdca_reach_labels l
+                    JOIN pdca_reach_slots s
+                      ON s.relationship_type = l.relationship_type AND s.chain_id = l.chain_id
+                     AND s.position {'<=' if direction == 'in' else '>='} l.position
+                    JOIN pdcas p ON p.id = s.pdca_id
+                    WHERE l.relationship_type = :relationship_type AND l.direction = :direction
+                      AND l.pdca_id = :pdca_id AND s.pdca_id != :pdca_id{common_sql}
+                    {tail}
+                """
+            else:
+                reached = self._reach_walk(cursor, pdca_id, direction, relationship_type)
+                for other in others:
+                    reached &= self._reach_walk(cursor, other, 'in', relationship_type)
+                params['ids'] = json.dumps(sorted(reached))
+                sql = f"""
+                    SELECT {select_sql}
+                    FROM pdcas p
+                    WHERE p.id IN (SELECT value FROM json_each(:ids)) AND p.id != :pdca_id
+                    {tail}
+                """
+            
+            cursor.row_factory = None
+            cursor.execute(sql, params)
+            return build_rows(cursor.fetchall(), columns, row_format)
+            
+        except Exception as e:
+            self._log_error("Error getting lineage of %s: %s", pdca_id, e)
+            return []
+    
+    @staticmethod
+    def _reach_walk_sql(direction: str) -> str:
+        """
+        Recursive CTE ``walk(id)``: every PDCA reached from :pdca_id in one
+        direction. Self-relationships are ignored, as in the index.
+        """
+        this, following = (('from_pdca_id', 'to_pdca_id') if direction == 'out'
+                           else ('to_pdca_id', 'from_pdca_id'))
+        return f"""
+            WITH RECURSIVE walk(id) AS (
+                SELECT pr.{following} FROM pdca_relationships pr
+                WHERE pr.{this} = :pdca_id AND +pr.relationship_type = :relationship_type
+                  AND pr.{following} != pr.{this}
+                UNION
+                SELECT pr.{following}
+                FROM walk w
+                JOIN pdca_relationships pr ON pr.{this} = w.id
+                WHERE +pr.relationship_type = :relationship_type AND pr.{following} != pr.{this}
+            )
+        """
+    
+    def _reach_walk(self, cursor: sqlite3.Cursor, pdca_id: str, direction: str,
+                    relationship_type: str) -> set:
+        """IDs reached from a PDCA without the index."""
+        cursor.execute(self._reach_walk_sql(direction) + "SELECT id FROM walk",
+                       {'pdca_id': pdca_id, 'relationship_type': relationship_type})
+        return {row[0] for row in cursor.fetchall()}
+    
+    def _reachability_ready(self, cursor: sqlite3.Cursor, relationship_type: str) -> bool:
+        """True if the relationship type has a reachability index that is current."""
+        cursor.execute("""
+            SELECT edge_version = indexed_version FROM pdca_reachability
+            WHERE relationship_type = ?
+        """, (relationship_type,))
+        row = cursor.fetchone()
+        if row is None:
+            return False
+        if not row[0]:
+            if relationship_type not in self._stale_reachability:
+                self._stale_reachability.add(relationship_type)
+                logger.warning("Reachability index for %s is out of date; walking the graph "
+                               "until rebuild_reachability_index() runs", relationship_type)
+            return False
+        return True
+    
+    def _load_reachability_indexes(self):
+        """Read the indexed relationship types (absent in databases from older versions)."""
+        try:
+            rows = self.conn.execute("SELECT relationship_type FROM pdca_reachability").fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        self._reachability_types = {row[0] for row in rows}
+    
+    def _reach_after_write(self, cursor: sqlite3.Cursor, rows: Sequence[Tuple]):
+        """Update the reachability indexes for written (from, to, type, ...) rows."""
+        edges = {}
+        for row in rows:
+            if row[2] in self._reachability_types:
+                edges.setdefault(row[2], []).append((row[0], row[1]))
+        for relationship_type, pairs in edges.items():
+            self._reach_add_edges(cursor, relationship_type, pairs)
+    
+    def _reach_add_edges(self, cursor: sqlite3.Cursor, relationship_type: str,
+                         pairs: List[Tuple[str, str]]):
+        """
+        Apply newly written relationships of one indexed type to its index.
+        
+        Runs inside the write transaction under its own savepoint. If the
+        update fails, or the index had already missed other writes, the
+        relationships are still committed and the index is left out of
+        date for a later rebuild.
+        """
+        cursor.execute("SAVEPOINT reachability")
+        try:
+            cursor.execute("""
+                SELECT edge_version, indexed_version FROM pdca_reachability
+                WHERE relationship_type = ?
+            """, (relationship_type,))
+            row = cursor.fetchone()
+            if row is None:
+                # Dropped through another connection
+                self._reachability_types.discard(relationship_type)
+            elif row[0] != row[1] + len(pairs):
+                logger.debug("Reachability index for %s missed other writes", relationship_type)
+            elif len(pairs) >= DEFAULT_REACHABILITY_REBUILD_EDGES:
+                self._reach_build(cursor, relationship_type)
+            else:
+                for from_pdca_id, to_pdca_id in pairs:
+                    if from_pdca_id != to_pdca_id:
+                        self._reach_add_edge(cursor, relationship_type, from_pdca_id, to_pdca_id)
+                cursor.execute("""
+                    UPDATE pdca_reachability
+                    SET indexed_version = edge_version,
+                        chain_count = (SELECT COALESCE(MAX(chain_id), -1) + 1 FROM pdca_reach_slots
+                                       WHERE relationship_type = ?)
+                    WHERE relationship_type = ?
+                """, (relationship_type, relationship_type))
+            cursor.execute("RELEASE reachability")
+            
+        except Exception as e:
+            cursor.execute("ROLLBACK TO reachability")
+            cursor.execute("RELEASE reachability")
+            self._log_error("Error updating reachability index for %s: %s", relationship_type, e)
+    
+    def _reach_add_edge(self, cursor: sqlite3.Cursor, relationship_type: str,
+                        from_pdca_id: str, to_pdca_id: str):
+        """Apply one relationship: place new endpoints on chains, then merge labels."""
+        cursor.execute("""
+            SELECT pdca_id, chain_id, position FROM pdca_reach_slots
+            WHERE relationship_type = ? AND pdca_id IN (?, ?)
+        """, (relationship_type, from_pdca_id, to_pdca_id))
+        slots = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        from_slot, to_slot = slots.get(from_pdca_id), slots.get(to_pdca_id)
+        
+        if from_slot is None or to_slot is None:
+            from_slot, to_slot = self._reach_place(cursor, relationship_type, from_slot, to_slot)
+            cursor.executemany("""
+                INSERT OR IGNORE INTO pdca_reach_slots (relationship_type, pdca_id, chain_id, position)
+                VALUES (?, ?, ?, ?)
+            """, [(relationship_type, from_pdca_id) + from_slot,
+                  (relationship_type, to_pdca_id) + to_slot])
+        
+        # from_pdca_id and its ancestors now reach to_pdca_id and everything it reaches
+        label = {to_slot[0]: to_slot[1]}
+        merge_label(label, self._reach_labels(cursor, relationship_type, 'out', [to_pdca_id])
+                    .get(to_pdca_id, {}), min)
+        self._reach_propagate(cursor, relationship_type, 'out', from_pdca_id, label)
+        
+        # to_pdca_id and its descendants are now reached from from_pdca_id and its ancestors
+        label = {from_slot[0]: from_slot[1]}
+        merge_label(label, self._reach_labels(cursor, relationship_type, 'in', [from_pdca_id])
+                    .get(from_pdca_id, {}), max)
+        self._reach_propagate(cursor, relationship_type, 'in', to_pdca_id, label)
+    
+    @staticmethod
+    def _reach_place(cursor: sqlite3.Cursor, relationship_type: str,
+                     from_slot: Optional[Tuple[int, int]],
+                     to_slot: Optional[Tuple[int, int]]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """
+        Chain slots for the endpoints of a new relationship.
+        
+        A new target extends the source's chain if the source is its tail;
+        a new source is put in front of the target if the target is its
+        head. Otherwise the new node starts a chain of its own.
+        """
+        def free(chain_id, position):
+            cursor.execute("""
+                SELECT 1 FROM pdca_reach_slots
+                WHERE relationship_type = ? AND chain_id = ? AND position = ?
+            """, (relationship_type, chain_id, position))
+            return cursor.fetchone() is None
+        
+        def new_chain():
+            cursor.execute("""
+                SELECT COALESCE(MAX(chain_id), -1) + 1 FROM pdca_reach_slots
+                WHERE relationship_type = ?
+            """, (relationship_type,))
+            return cursor.fetchone()[0]
+        
+        if from_slot is None and to_slot is None:
+            chain_id = new_chain()
+            return (chain_id, 0), (chain_id, 1)
+        if to_slot is None:
+            chain_id, position = from_slot
+            return from_slot, ((chain_id, position + 1) if free(chain_id, position + 1)
+                               else (new_chain(), 0))
+        chain_id, position = to_slot
+        return ((chain_id, position - 1) if free(chain_id, position - 1)
+                else (new_chain(), 0)), to_slot
+    
+    @staticmethod
+    def _reach_labels(cursor: sqlite3.Cursor, relationship_type: str, direction: str,
+                      pdca_ids: List[str]) -> Dict[str, Dict[int, int]]:
+        """Stored labels of several nodes, as {pdca_id: {chain_id: position}}."""
+        cursor.execute("""
+            SELECT pdca_id, chain_id, position FROM pdca_reach_labels
+            WHERE relationship_type = ? AND direction = ?
+              AND pdca_id IN (SELECT value FROM json_each(?))
+        """, (relationship_type, direction, json.dumps(pdca_ids)))
+        labels = {}
+        for pdca_id, chain_id, position in cursor.fetchall():
+            labels.setdefault(pdca_id, {})[chain_id] = position
+        return labels
+    
+    def _reach_propagate(self, cursor: sqlite3.Cursor, relationship_type: str, direction: str,
+                         pdca_id: str, label: Dict[int, int]):
+        """
+        Merge ``label`` into a node's labels and pass the improvements on.
+        
+        Out-labels travel to predecessors, in-labels to successors, one
+        query per level. A node whose label already covers an entry stops
+        it: everything beyond that node was covered before.
+        """
+        better = min if direction == 'out' else max
+        this, following = (('to_pdca_id', 'from_pdca_id') if direction == 'out'
+                           else ('from_pdca_id', 'to_pdca_id'))
+        pending = {pdca_id: label}
+        while pending:
+            current = self._reach_labels(cursor, relationship_type, direction, list(pending))
+            improved = {}
+            for node, incoming in pending.items():
+                changed = merge_label(current.setdefault(node, {}), incoming, better)
+                if changed:
+                    improved[node] = changed
+            if not improved:
+                return
+            
+            cursor.executemany("""
+                INSERT INTO pdca_reach_labels (relationship_type, direction, pdca_id, chain_id, position)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(relationship_type, direction, pdca_id, chain_id)
+                DO UPDATE SET position = excluded.position
+            """, [(relationship_type, direction, node, chain_id, position)
+                  for node, changed in improved.items() for chain_id, position in changed.items()])
+            
+            cursor.execute(f"""
+                SELECT pr.{this}, pr.{following}
+                FROM json_each(?) s
+                CROSS JOIN pdca_relationships pr ON pr.{this} = s.value
+                WHERE +pr.relationship_type = ? AND pr.{following} != pr.{this}
+            """, (json.dumps(list(improved)), relationship_type))
+            pending = {}
+            for node, neighbor in cursor.fetchall():
+                merge_label(pending.setdefault(neighbor, {}), improved[node], better)
+    
+    def _reach_build(self, cursor: sqlite3.Cursor, relationship_type: str):
+        """Recompute the reachability index of one relationship type in bulk."""
+        cursor.execute("""
+            SELECT from_pdca_id, to_pdca_id FROM pdca_relationships
+            WHERE relationship_type = ? AND from_pdca_id != to_pdca_id
+        """, (relationship_type,))
+        successors, predecessors = {}, {}
+        for from_pdca_id, to_pdca_id in cursor.fetchall():
+            successors.setdefault(from_pdca_id, []).append(to_pdca_id)
+            predecessors.setdefault(to_pdca_id, []).append(from_pdca_id)
+        nodes = set(successors) | set(predecessors)
+        
+        # Chains follow the timeline: oldest PDCAs first, unknown nodes last
+        cursor.execute("""
+            SELECT id, timestamp FROM pdcas WHERE id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(nodes)),))
+        timestamps = {row[0]: row[1] for row in cursor.fetchall()}
+        order = sorted(nodes, key=lambda node: (timestamps.get(node) is None,
+                                                timestamps.get(node) or 0, node))
+        
+        slots = decompose_chains(order, predecessors)
+        components = strongly_connected_components(order, successors)
+        labels = {
+            'out': chain_labels(components, successors, slots, min),
+            'in': chain_labels(components[::-1], predecessors, slots, max)
+        }
+        
+        for table in ('pdca_reach_labels', 'pdca_reach_slots'):
+            cursor.execute(f"DELETE FROM {table} WHERE relationship_type = ?", (relationship_type,))
+        cursor.executemany("""
+            INSERT INTO pdca_reach_slots (relationship_type, pdca_id, chain_id, position)
+            VALUES (?, ?, ?, ?)
+        """, [(relationship_type, node) + slots[node] for node in sorted(slots)])
+        cursor.executemany("""
+            INSERT INTO pdca_reach_labels (relationship_type, direction, pdca_id, chain_id, position)
+            VALUES (?, ?, ?, ?, ?)
+        """, ((relationship_type, direction, node, chain_id, position)
+              for direction in sorted(labels)
+              for node in sorted(labels[direction])
+              for chain_id, position in sorted(labels[direction][node].items())))
+        chain_count = max((chain_id for chain_id, _ in slots.values()), default=-1) + 1
+        cursor.execute("""
+            UPDATE pdca_reachability
+            SET chain_count = ?, indexed_version = edge_version, built_at = CURRENT_TIMESTAMP
+            WHERE relationship_type = ?
+        """, (chain_count, relationship_type))
+        logger.info("Built reachability index for %s: %d PDCAs on %d chains",
+                    relationship_type, len(slots), chain_count)
+    
+    def load_snapshot(self, path: Optional[str] = None) -> GraphSnapshot:
+        """
+        Get an in-memory CSR snapshot of the graph for fast traversal.
+        
+        The snapshot is cached on this instance and refreshed incrementally
+        whenever the write generation changes. If ``path`` points to an
+        existing ``.npz`` file written by GraphSnapshot.save(), it is used
+        as the warm starting point and then refreshed against the database.
+        
+        Args:
+            path: Optional .npz file to load the initial snapshot from
+            
+        Returns:
+            GraphSnapshot in sync with the database
+        """
+        if self._snapshot is None:
+            if path and os.path.exists(path):
+                try:
+                    self._snapshot = GraphSnapshot.load(path)
+                except Exception as e:
+                    logger.warning("Ignoring unreadable graph snapshot %s: %s", path, e)
+            if self._snapshot is None:
+                self._snapshot = GraphSnapshot.build(self)
+                return self._snapshot
+        
+        self._snapshot.refresh(self)
+        return self._snapshot
+    
+    def enable_instrumentation(self, slow_query_ms: Optional[float] = None,
+                               profile_hook: Optional[Callable[[Dict], None]] = None):
+        """
+        Start recording per-method metrics.
+        
+        Args:
+            slow_query_ms: Log calls slower than this with their SQL and
+                EXPLAIN QUERY PLAN output (None disables the slow-query log)
+            profile_hook: Callback receiving {'method', 'elapsed_ms', 'rows',
+                'error'} after every instrumented call
+        """
+        self._metrics = GraphMetrics(slow_query_ms=slow_query_ms, profile_hook=profile_hook)
+    
+    def disable_instrumentation(self):
+        """Stop recording metrics and remove SQL trace callbacks."""
+        self._metrics = None
+        for conn in self._traced.values():
+            try:
+                conn.set_trace_callback(None)
+            except sqlite3.Error:
+                pass  # connection already closed
+        self._traced = {}
+    
+    def get_metrics(self) -> Dict:
+        """
+        Get a snapshot of the instrumentation counters.
+        
+        Returns:
+            Dictionary with methods (calls, errors, rows, total/mean/max ms
+            and a latency histogram per method), slow_query_ms, slow_queries
+            and cache (see cache_stats()); empty if instrumentation is off
+        """
+        if self._metrics is None:
+            return {}
+        metrics = self._metrics.snapshot()
+        metrics['cache'] = self.cache_stats()
+        return metrics
+    
+    def _install_trace(self):
+        """Attach the SQL trace callback to the connections this thread uses."""
+        for conn in (self.conn, self._read_conn()):
+            if id(conn) not in self._traced:
+                conn.set_trace_callback(self._metrics.trace)
+                self._traced[id(conn)] = conn
+    
+    def _explain(self, sql: str) -> List[str]:
+        """EXPLAIN QUERY PLAN details for a traced statement (parameters inlined)."""
+        plan = self._read_conn().execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+        return [row[3] for row in plan]
+    
+    def _log_error(self, message: str, *args):
+        """Log a swallowed error and count it against the current instrumented call."""
+        logger.error(message, *args)
+        if self._metrics is not None:
+            self._metrics.record_error()
+    
+    def cache_stats(self) -> Dict:
+        """
+        Get read cache counters.
+        
+        Returns:
+            Dictionary with entries, bytes, hits, misses, hit_rate, evictions,
+            expirations and invalidations (empty if the cache is disabled)
+        """
+        return self._cache.stats() if self._cache is not None else {}
+    
+    def clear_cache(self):
+        """Drop all cached read results."""
+        if self._cache is not None:
+            self._cache.clear()
+    
+    def _change_token(self) -> Tuple[int, int]:
+        """
+        Cheap token that changes whenever the database may have changed.
+        
+        Combines this instance's write generation with SQLite's data_version,
+        which moves when another connection commits. data_version is read on
+        the writer connection: its value is per connection, so pooled readers
+        would each report a different one.
+        """
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return (self.write_generation, data_version)
+    
+    def _graph_signature(self) -> Dict[str, int]:
+        """Row counts and high-water marks used to detect graph changes."""
+        cursor = self._read_conn().cursor()
+        cursor.execute("""
+            SELECT (SELECT COALESCE(MAX(value), 0) FROM pdca_graph_counters
+                    WHERE name = 'node_count'),
+                   (SELECT COALESCE(MAX(rowid), 0) FROM pdcas),
+                   (SELECT COALESCE(SUM(edge_count), 0) FROM pdca_edge_type_counts),
+                   (SELECT COALESCE(MAX(id), 0) FROM pdca_relationships)
+        """)
+        node_count, node_max_rowid, edge_count, edge_max_id = cursor.fetchone()
+        return {
+            'node_count': node_count,
+            'node_max_rowid': node_max_rowid,
+            'edge_count': edge_count,
+            'edge_max_id': edge_max_id
+        }
+    
+    def _read_conn(self) -> sqlite3.Connection:
+        """Connection for read queries: the calling thread's pooled reader, or the writer."""
+        if self._pool is not None:
+            return self._pool.reader()
+        return self.conn
+    
     def close(self):
         """Close database connection."""
+        if self._pool is not None:
+            self._pool.close_all()
         if self.conn:
             self.conn.close()
             logger.info("Database connection closed")
@@ -468,6 +2978,26 @@ def test_sqlite_graph():
         success = graph.add_relationship(from_id, to_id)
         print(f"  {from_id} -> {to_id}: {'✓' if success else '✗'}")
     
+    # Bulk ingestion (single transaction)
+    print("\nBulk adding nodes and relationships...")
+    bulk_nodes = graph.add_pdca_nodes_bulk(pdca for pdca in sample_pdcas + [{
+        'id': '20241027-120000-RefinerAgent.ProcessOptimization',
+        'agent_name': 'RefinerAgent',
+        'agent_role': 'ProcessOptimization',
+        'date': '2024-10-27',
+        'timestamp': 1730034000,
+        'objective': 'Test objective 4'
+    }])
+    print(f"  Nodes: {bulk_nodes['inserted']} inserted, {bulk_nodes['replaced']} replaced, "
+          f"{bulk_nodes['failed']} failed")
+    bulk_edges = graph.add_relationships_bulk([
+        ('20241027-110000-TesterAgent.QualityAssurance',
+         '20241027-120000-RefinerAgent.ProcessOptimization'),
+        ('20241027-110000-TesterAgent.QualityAssurance', None)
+    ])
+    print(f"  Relationships: {bulk_edges['inserted']} inserted, {bulk_edges['replaced']} replaced, "
+          f"{bulk_edges['failed']} failed")
+    
     # Test queries
     print("\nTesting graph queries...")
     
@@ -483,6 +3013,21 @@ def test_sqlite_graph():
     for p in predecessors:
         print(f"  <- {p['id']} ({p['agent_name']})")
     
+    # Find shortest path (unweighted and weighted)
+    path = graph.find_path('20241027-090000-SaveRestartAgent.ProcessOrchestration',
+                           '20241027-120000-RefinerAgent.ProcessOptimization')
+    print(f"Path SaveRestartAgent -> RefinerAgent: {' -> '.join(p['agent_name'] for p in path)}")
+    weighted = graph.shortest_path('20241027-090000-SaveRestartAgent.ProcessOrchestration',
+                                   '20241027-120000-RefinerAgent.ProcessOptimization',
+                                   weighted=True)
+    print(f"  Weighted cost: {weighted['cost']:.1f} over {weighted['hops']} hops")
+    
+    # In-memory CSR snapshot traversal
+    snapshot = graph.load_snapshot()
+    reachable = snapshot.k_hop(['20241027-090000-SaveRestartAgent.ProcessOrchestration'], 2)
+    print(f"Snapshot: {snapshot.node_count} nodes, {snapshot.edge_count} edges, "
+          f"{len(reachable) - 1} PDCAs within 2 hops of SaveRestartAgent")
+    
     # Get breadcrumb navigation
     breadcrumb = graph.get_breadcrumb_navigation('20241027-100000-BuilderAgent.ComponentDevelopment')
     print(f"\nBreadcrumb for BuilderAgent:")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Temporal Query Tier for PDCA Timelines
+
+Tier 3 of the three-tier RAG system: time-range, per-agent and per-role
+timelines over the ``pdcas`` table, plus "everything after PDCA X", and
+the same time bounds applied to a known set of PDCA IDs.
+
+Every query is served by a composite index whose trailing columns are
+(timestamp, id), so SQLite walks the index in timeline order: no full scan,
+no sort, and the page size is applied as a LIMIT. Pages are continued with
+keyset cursors [timestamp, id] rather than OFFSET.
+
+The indexes are created by SQLiteGraph._create_schema():
+
+    idx_pdcas_timestamp        (timestamp, id)
+    idx_pdcas_agent_timestamp  (agent_name, timestamp, id)
+    idx_pdcas_role_timestamp   (agent_role, timestamp, id)
+    idx_pdcas_date_timestamp   (date, timestamp, id)
+"""
+
+import calendar
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default number of PDCAs per timeline page
+DEFAULT_TIMELINE_PAGE_SIZE = 100
+
+# Filter column -> index that orders it by (timestamp, id)
+TIMELINE_INDEXES = {
+    None: 'idx_pdcas_timestamp',
+    'agent_name': 'idx_pdcas_agent_timestamp',
+    'agent_role': 'idx_pdcas_role_timestamp',
+    'date': 'idx_pdcas_date_timestamp'
+}
+
+
+def day_range(date: str) -> Tuple[int, int]:
+    """
+    Convert a YYYY-MM-DD date to a [start, end) Unix timestamp range (UTC).
+
+    Timestamps are UTC, so a UTC calendar day maps to one contiguous
+    timestamp range on idx_pdcas_timestamp. This can differ from the
+    ``date`` column, which holds the PDCA's own (local) date; use on_date()
+    for that.
+    """
+    start = calendar.timegm(datetime.strptime(date, "%Y-%m-%d").timetuple())
+    return start, start + 86400
+
+
+class TemporalIndex:
+    """
+    Indexed timeline queries over a SQLiteGraph's pdcas table.
+
+    All timeline methods return a dictionary with 'pdcas' (one page of
+    PDCA rows in timestamp order) and 'next_cursor' (None on the last page).
+    """
+
+    def __init__(self, graph):
+        """
+        Initialize the temporal tier.
+
+        Args:
+            graph: SQLiteGraph whose database holds the pdcas table
+        """
+        self.graph = graph
+
+    def timeline(self, start_timestamp: Optional[int] = None,
+                 end_timestamp: Optional[int] = None,
+                 page_size: int = DEFAULT_TIMELINE_PAGE_SIZE,
+                 cursor: Optional[List] = None, descending: bool = False) -> Dict:
+        """
+        Get all PDCAs in a time range.
+
+        Args:
+            start_timestamp: Inclusive lower bound (None for unbounded)
+            end_timestamp: Exclusive upper bound (None for unbounded)
+            page_size: Maximum PDCAs per page
+            cursor: next_cursor from the previous page
+            descending: Newest first instead of oldest first
+
+        Returns:
+            Dictionary with pdcas and next_cursor
+        """
+        return self._page(None, None, start_timestamp, end_timestamp,
+                          page_size, cursor, descending)
+
+    def on_date(self, date: str, page_size: int = DEFAULT_TIMELINE_PAGE_SIZE,
+                cursor: Optional[List] = None) -> Dict:
+        """
+        Get the PDCAs whose ``date`` column is ``date`` (YYYY-MM-DD), in order.
+
+        For a UTC calendar day use timeline(*day_range(date)) instead.
+        """
+        return self._page('date', date, None, None, page_size, cursor, False)
+
+    def agent_timeline(self, agent_name: str, start_timestamp: Optional[int] = None,
+                       end_timestamp: Optional[int] = None,
+                       page_size: int = DEFAULT_TIMELINE_PAGE_SIZE,
+                       cursor: Optional[List] = None, descending: bool = False) -> Dict:
+        """
+        Get one agent's PDCAs in a time range.
+
+        Args:
+            agent_name: Agent name (e.g. 'SaveRestartAgent')
+            start_timestamp: Inclusive lower bound (None for unbounded)
+            end_timestamp: Exclusive upper bound (None for unbounded)
+            page_size: Maximum PDCAs per page
+            cursor: next_cursor from the previous page
+            descending: Newest first instead of oldest first
+
+        Returns:
+            Dictionary with pdcas and next_cursor
+        """
+        return self._page('agent_name', agent_name, start_timestamp, end_timestamp,
+                          page_size, cursor, descending)
+
+    def role_timeline(self, agent_role: str, start_timestamp: Optional[int] = None,
+                      end_timestamp: Optional[int] = None,
+                      page_size: int = DEFAULT_TIMELINE_PAGE_SIZE,
+                      cursor: Optional[List] = None, descending: bool = False) -> Dict:
+        """
+        Get one role's PDCAs in a time range.
+
+        Args:
+            agent_role: Agent role (e.g. 'ProcessOrchestration')
+            start_timestamp: Inclusive lower bound (None for unbounded)
+            end_timestamp: Exclusive upper bound (None for unbounded)
+            page_size: Maximum PDCAs per page
+            cursor: next_cursor from the previous page
+            descending: Newest first instead of oldest first
+
+        Returns:
+            Dictionary with pdcas and next_cursor
+        """
+        return self._page('agent_role', agent_role, start_timestamp, end_timestamp,
+                          page_size, cursor, descending)
+
+    def after_pdca(self, pdca_id: str, page_size: int = DEFAULT_TIMELINE_PAGE_SIZE,
+                   cursor: Optional[List] = None, agent_name: Optional[str] = None) -> Dict:
+        """
+        Get everything that happened after a PDCA, in order.
+
+        Args:
+            pdca_id: Reference PDCA ID
+            page_size: Maximum PDCAs per page
+            cursor: next_cursor from the previous page
+            agent_name: Optionally restrict to one agent
+
+        Returns:
+            Dictionary with pdcas and next_cursor (empty if pdca_id is unknown)
+        """
+        if cursor is None:
+            cursor = self._cursor_of(pdca_id)
+            if cursor is None:
+                return {'pdcas': [], 'next_cursor': None}
+        column = 'agent_name' if agent_name is not None else None
+        return self._page(column, agent_name, None, None, page_size, cursor, False)
+
+    def within(self, pdca_ids: List[str], start_timestamp: Optional[int] = None,
+               end_timestamp: Optional[int] = None,
+               after_pdca_id: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Get those of the given PDCAs that fall inside time bounds, in one query.
+
+        Used to filter candidate sets (e.g. retrieval hits) with the same
+        bounds as timeline() and after_pdca().
+
+        Args:
+            pdca_ids: PDCA IDs to look up
+            start_timestamp: Inclusive lower bound (None for unbounded)
+            end_timestamp: Exclusive upper bound (None for unbounded)
+            after_pdca_id: Only PDCAs after this one in (timestamp, id)
+                order (no bound if it is unknown)
+
+        Returns:
+            Dictionary of PDCA ID to row for the PDCAs inside the bounds
+        """
+        try:
+            cursor = self._cursor_of(after_pdca_id) if after_pdca_id is not None else None
+            conditions, params = self._bounds(start_timestamp, end_timestamp, cursor, False)
+            conditions.insert(0, "p.id IN (SELECT value FROM json_each(:ids))")
+            params['ids'] = json.dumps(list(pdca_ids))
+            rows = self.graph._read_conn().execute(
+                "SELECT p.* FROM pdcas p WHERE " + " AND ".join(conditions), params)
+            return {row['id']: dict(row) for row in rows}
+
+        except Exception as e:
+            logger.error("Error filtering PDCAs by time: %s", e)
+            return {}
+
+    def count(self, start_timestamp: Optional[int] = None,
+              end_timestamp: Optional[int] = None,
+              agent_name: Optional[str] = None) -> int:
+        """Count PDCAs in a time range (answered from the index alone)."""
+        column = 'agent_name' if agent_name is not None else None
+        sql, params = self._timeline_sql(column, agent_name, start_timestamp,
+                                         end_timestamp, None, False, select="COUNT(*)")
+        return self.graph._read_conn().execute(sql, params).fetchone()[0]
+
+    def _cursor_of(self, pdca_id: str) -> Optional[List]:
+        """Keyset cursor [timestamp, id] of a PDCA, or None if it is unknown."""
+        row = self.graph._read_conn().execute(
+            "SELECT timestamp, id FROM pdcas WHERE id = ?", (pdca_id,)).fetchone()
+        return [row[0], row[1]] if row is not None else None
+
+    @staticmethod
+    def _bounds(start_timestamp: Optional[int], end_timestamp: Optional[int],
+                cursor: Optional[List], descending: bool) -> Tuple[List[str], Dict]:
+        """SQL conditions and parameters for a time range and keyset cursor on ``p``."""
+        conditions = []
+        params = {}
+        if start_timestamp is not None:
+            conditions.append("p.timestamp >= :start")
+            params['start'] = start_timestamp
+        if end_timestamp is not None:
+            conditions.append("p.timestamp < :end")
+            params['end'] = end_timestamp
+        if cursor is not None:
+            comparison = '<' if descending else '>'
+            conditions.append(f"(p.timestamp, p.id) {comparison} (:cursor_timestamp, :cursor_id)")
+            params['cursor_timestamp'], params['cursor_id'] = cursor
+        return conditions, params
+
+    def _timeline_sql(self, column: Optional[str], value, start_timestamp: Optional[int],
+                      end_timestamp: Optional[int], cursor: Optional[List],
+                      descending: bool, select: str = "p.*",
+                      limit: Optional[int] = None) -> Tuple[str, Dict]:
+        """Build one timeline query pinned to the matching (…, timestamp, id) index."""
+        conditions, params = self._bounds(start_timestamp, end_timestamp, cursor, descending)
+        if column is not None:
+            conditions.insert(0, f"p.{column} = :value")
+            params['value'] = value
+
+        direction = 'DESC' if descending else 'ASC'
+        sql = f"SELECT {select} FROM pdcas p INDEXED BY {TIMELINE_INDEXES[column]}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if select == "p.*":
+            sql += f" ORDER BY p.timestamp {direction}, p.id {direction}"
+        if limit is not None:
+            sql += " LIMIT :limit"
+            params['limit'] = limit
+        return sql, params
+
+    def _page(self, column: Optional[str], value, start_timestamp: Optional[int],
+              end_timestamp: Optional[int], page_size: int, cursor: Optional[List],
+              descending: bool) -> Dict:
+        """Fetch one keyset page."""
+        try:
+            sql, params = self._timeline_sql(column, value, start_timestamp, end_timestamp,
+                                             cursor, descending, limit=page_size + 1)
+            rows = [dict(row) for row in self.graph._read_conn().execute(sql, params)]
+
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = [rows[-1]['timestamp'], rows[-1]['id']]
+            return {'pdcas': rows, 'next_cursor': next_cursor}
+
+        except Exception as e:
+            logger.error("Error querying timeline: %s", e)
+            return {'pdcas': [], 'next_cursor': None}
+
+    def explain(self, column: Optional[str] = None, value=None,
+                start_timestamp: Optional[int] = None, end_timestamp: Optional[int] = None,
+                cursor: Optional[List] = None, descending: bool = False) -> List[str]:
+        """
+        Get the EXPLAIN QUERY PLAN details for a timeline query.
+
+        Args:
+            column: None, 'agent_name', 'agent_role' or 'date'
+            value: Value for the column filter
+            start_timestamp / end_timestamp / cursor / descending: as for timeline()
+
+        Returns:
+            List of plan detail strings
+        """
+        sql, params = self._timeline_sql(column, value, start_timestamp, end_timestamp,
+                                         cursor, descending, limit=DEFAULT_TIMELINE_PAGE_SIZE)
+        plan = self.graph._read_conn().execute("EXPLAIN QUERY PLAN " + sql, params)
+        return [row[3] for row in plan.fetchall()]
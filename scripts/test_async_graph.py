@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test Async Graph Facade
+Checks AsyncSQLiteGraph admission limits, that queued path searches do
+not hold read slots, and that cancellation interrupts only the cancelled
+call and leaves the worker's connection usable.
+"""
+
+import sys
+import os
+import time
+import asyncio
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from async_graph import AsyncSQLiteGraph
+from graph_fixtures import build_chain
+
+# Counts forever; only an interrupt ends it
+ENDLESS_SQL = ("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+               "SELECT COUNT(*) FROM n")
+
+
+async def _wait_for(condition, timeout=5.0):
+    """Poll ``condition`` from the event loop until it holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def _blocking(release, running):
+    """A graph method stand-in that holds its worker until ``release`` is set."""
+    lock = threading.Lock()
+
+    def call(*args, **kwargs):
+        with lock:
+            running['now'] = running.get('now', 0) + 1
+            running['peak'] = max(running.get('peak', 0), running['now'])
+        release.wait(5)
+        with lock:
+            running['now'] -= 1
+        return [args[0]]
+    return call
+
+
+def test_read_admission():
+    """Reads beyond max_pending_reads wait and time out after queue_timeout."""
+    async def scenario(graph):
+        release, running = threading.Event(), {}
+        graph.get_successors = _blocking(release, running)
+        facade = AsyncSQLiteGraph(graph, read_workers=2, max_concurrent_paths=1,
+                                  max_pending_reads=2, queue_timeout=0.2)
+        held = [asyncio.ensure_future(facade.get_successors(f'pdca-{i}')) for i in range(2)]
+        await _wait_for(lambda: running.get('now') == 2)
+        try:
+            await facade.get_successors('pdca-2')
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("expected admission to time out")
+
+        release.set()
+        assert await asyncio.gather(*held) == [['pdca-0'], ['pdca-1']]
+        assert await facade.get_successors('pdca-3') == ['pdca-3']
+        await facade.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_chain(os.path.join(tmp, 'graph.db'), 5, production=True)
+        asyncio.run(scenario(graph))
+        graph.close()
+
+
+def test_path_limit_keeps_reads_flowing():
+    """Queued path searches neither exceed max_concurrent_paths nor block reads."""
+    async def scenario(graph):
+        release, running = threading.Event(), {}
+        graph.find_path = _blocking(release, running)
+        facade = AsyncSQLiteGraph(graph, read_workers=3, max_concurrent_paths=1,
+                                  max_pending_reads=2, queue_timeout=1.0)
+        paths = [asyncio.ensure_future(facade.find_path(f'pdca-{i}', 'pdca-9')) for i in range(5)]
+        await _wait_for(lambda: running.get('now') == 1)
+        await asyncio.sleep(0.05)
+
+        # Only one path runs; the four waiting ones hold no read slots
+        navigation = await facade.get_breadcrumb_navigation('pdca-3', max_depth=1)
+        assert [row['id'] for row in navigation['successors']] == ['pdca-4']
+        assert [row['id'] for row in await facade.get_predecessors('pdca-3')] == ['pdca-2']
+
+        release.set()
+        assert await asyncio.gather(*paths) == [[f'pdca-{i}'] for i in range(5)]
+        assert running['peak'] == 1
+        await facade.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_chain(os.path.join(tmp, 'graph.db'), 10, production=True)
+        asyncio.run(scenario(graph))
+        graph.close()
+
+
+def test_cancellation():
+    """Cancelling interrupts the running statement or stops the path search."""
+    async def scenario(graph):
+        facade = AsyncSQLiteGraph(graph, read_workers=1, max_concurrent_paths=1)
+        started, outcome = threading.Event(), {}
+
+        def endless(pdca_id, relationship_type):
+            started.set()
+            try:
+                return graph._read_conn().execute(ENDLESS_SQL).fetchone()
+            except sqlite3.OperationalError as e:
+                outcome['error'] = str(e)
+                raise
+
+        def search(start, end, should_stop=None):
+            while not should_stop():
+                time.sleep(0.01)
+            outcome['stopped'] = True
+            return []
+
+        graph.get_successors = endless
+        graph.find_path = search
+        task = asyncio.ensure_future(facade.get_successors('pdca-0'))
+        await _wait_for(started.is_set)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await _wait_for(lambda: 'error' in outcome)
+        assert 'interrupt' in outcome['error']
+
+        task = asyncio.ensure_future(facade.find_path('pdca-0', 'pdca-3'))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await _wait_for(lambda: outcome.get('stopped'))
+
+        # The single worker's connection still serves the next queries
+        del graph.get_successors, graph.find_path
+        assert [row['id'] for row in await facade.get_successors('pdca-1')] == ['pdca-2']
+        assert [row['id'] for row in await facade.find_path('pdca-0', 'pdca-2')] == \
+            ['pdca-0', 'pdca-1', 'pdca-2']
+
+        # A call cancelled between statements does not poison the next query
+        release = threading.Event()
+        graph.get_node_degree = lambda pdca_id, relationship_type: release.wait(5)
+        task = asyncio.ensure_future(facade.get_node_degree('pdca-0'))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        follow_up = asyncio.ensure_future(facade.get_graph_stats())
+        release.set()
+        assert (await follow_up)['node_count'] == 4
+        await facade.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_chain(os.path.join(tmp, 'graph.db'), 4, production=True)
+        asyncio.run(scenario(graph))
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_read_admission()
+    test_path_limit_keeps_reads_flowing()
+    test_cancellation()
+    print("✓ Async graph facade tests passed")
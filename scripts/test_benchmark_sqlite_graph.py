@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Smoke Test for the Benchmark Suite
+Runs the smallest possible tier and checks the journal generator and the
+baseline regression check.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_sqlite_graph import SyntheticJournal, compare, run_tier
+
+
+def test_synthetic_journal_is_seeded():
+    """Same seed, same journal; IDs are unique and time-ordered."""
+    first = SyntheticJournal(500, seed=7)
+    second = SyntheticJournal(500, seed=7)
+    assert first.ids == second.ids
+    assert list(first.relationships()) == list(second.relationships())
+    assert len(set(first.ids)) == 500
+    assert first.timestamps == sorted(first.timestamps)
+    types = {rel[2] for rel in first.relationships()}
+    assert types == {'PRECEDES', 'REFERENCES', 'DERIVED_FROM'}
+
+
+def test_run_tier_and_compare():
+    """A tiny run reports every operation, and slowdowns are flagged."""
+    results = run_tier(500, queries=5)
+    for operation in ('ingest_nodes', 'ingest_relationships', 'get_successors',
+                      'find_path', 'get_breadcrumb_navigation', 'temporal_range'):
+        assert results[operation]['calls'] > 0
+    assert results['find_path']['rows'] > 0
+
+    current = {'tiers': {'tiny': results}}
+    assert compare(current, current, 0.2) == []
+    slower = {'tiers': {'tiny': dict(results, find_path=dict(results['find_path'],
+                                                             p95_ms=results['find_path']['p95_ms'] * 2))}}
+    regressions = compare(slower, current, 0.2)
+    assert [r['operation'] for r in regressions] == ['find_path']
+
+
+if __name__ == "__main__":
+    test_synthetic_journal_is_seeded()
+    test_run_tier_and_compare()
+    print("✓ Benchmark smoke tests passed")
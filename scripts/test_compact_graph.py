@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test Compact Graph Storage
+Checks that CompactSQLiteGraph answers like SQLiteGraph after migration,
+direct writes with interning and per-row errors, and path search.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from compact_graph import CompactSQLiteGraph, migrate_to_compact
+from graph_fixtures import BASE_TIMESTAMP, make_pdca
+
+AGENTS = ('BuilderAgent', 'TesterAgent', 'ArchitectAgent')
+
+
+def _pdca_id(i):
+    return f'20241027-{100000 + i}-{AGENTS[i % 3]}.ComponentDevelopment'
+
+
+def _build(graph, count=30):
+    """Three interleaved agent chains plus REFERENCES links with metadata."""
+    graph.add_pdca_nodes_bulk(
+        make_pdca(_pdca_id(i), i, agent_name=AGENTS[i % 3],
+                  agent_role='ComponentDevelopment' if i % 2 else 'Testing',
+                  quality_score=i / 10)
+        for i in range(count))
+    graph.add_relationships_bulk(
+        [(_pdca_id(i), _pdca_id(i + 3)) for i in range(count - 3)] +
+        [(_pdca_id(i), _pdca_id(i + 1), 'REFERENCES', 0.5, {'source': 'breadcrumb'})
+         for i in range(0, count - 1, 4)])
+
+
+def _sorted(rows):
+    return sorted(rows, key=lambda row: row['id'])
+
+
+def test_migration_matches_sqlite_graph():
+    """A migrated graph returns the same rows, neighbors, paths and stats."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = os.path.join(tmp, 'graph.db')
+        graph = SQLiteGraph(source_path)
+        _build(graph)
+
+        report = migrate_to_compact(source_path, os.path.join(tmp, 'compact.db'))
+        assert report['nodes'] == 30 and report['relationships'] == 27 + 8
+        assert report['target_bytes'] < report['source_bytes']
+        compact = CompactSQLiteGraph(os.path.join(tmp, 'compact.db'))
+
+        for i in (0, 4, 13, 29):
+            pdca_id = _pdca_id(i)
+            assert compact.get_pdca_node(pdca_id) == graph.get_pdca_node(pdca_id)
+            for relationship_type in ('PRECEDES', 'REFERENCES'):
+                assert _sorted(compact.get_successors(pdca_id, relationship_type)) == \
+                    _sorted(graph.get_successors(pdca_id, relationship_type))
+                assert _sorted(compact.get_predecessors(pdca_id, relationship_type)) == \
+                    _sorted(graph.get_predecessors(pdca_id, relationship_type))
+
+        seeds = [_pdca_id(i) for i in (4, 5, 6)] + ['missing']
+        expected = graph.get_neighbors_many(seeds, direction='both', columns=['id', 'direction'])
+        actual = compact.get_neighbors_many(seeds, direction='both', columns=['id', 'direction'])
+        assert {seed: _sorted(rows) for seed, rows in actual.items()} == \
+            {seed: _sorted(rows) for seed, rows in expected.items()}
+        limited = compact.get_neighbors_many(seeds[:1], relationship_types=['REFERENCES', 'PRECEDES'],
+                                             limit_per_seed=1, columns=['id', 'relationship_type'],
+                                             row_format='tuple')
+        assert limited[seeds[0]] == [(_pdca_id(7), 'PRECEDES')]
+
+        for weighted in (False, True):
+            expected_path = graph.find_path(_pdca_id(0), _pdca_id(27), weighted=weighted)
+            assert compact.find_path(_pdca_id(0), _pdca_id(27), weighted=weighted) == expected_path
+        assert compact.find_path(_pdca_id(0), _pdca_id(1)) == []
+        assert compact.shortest_path('missing', _pdca_id(1))['found'] is False
+        assert compact.get_graph_stats() == graph.get_graph_stats()
+
+        # The string views show the original columns
+        row = compact.conn.execute("""
+            SELECT from_pdca_id, relationship_type, metadata FROM pdca_edge_view
+            WHERE to_pdca_id = ? AND relationship_type = 'REFERENCES'
+        """, (_pdca_id(1),)).fetchone()
+        assert tuple(row) == (_pdca_id(0), 'REFERENCES', '{"source": "breadcrumb"}')
+        compact.close()
+        graph.close()
+
+
+def test_direct_writes():
+    """Writes intern ids and names once and report bad rows individually."""
+    with tempfile.TemporaryDirectory() as tmp:
+        compact = CompactSQLiteGraph(os.path.join(tmp, 'compact.db'))
+        _build(compact, count=9)
+        assert compact.get_graph_stats()['edge_count'] == 6 + 2
+        counts = [compact.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ('pdca_keys', 'pdca_agents', 'pdca_roles', 'pdca_relationship_types')]
+        assert counts == [9, 3, 2, 2]
+
+        result = compact.add_pdca_nodes_bulk([
+            make_pdca(_pdca_id(0), agent_role='Testing', objective='Rewritten'),
+            {'id': 'no-agent', 'agent_role': 'Testing', 'date': '2024-10-27', 'timestamp': 1},
+            {'agent_name': 'BuilderAgent', 'agent_role': 'Testing', 'date': '2024-10-27',
+             'timestamp': 1},
+            make_pdca('new', agent_name='ReviewerAgent', agent_role='Review',
+                      date='2024-10-28', timestamp=BASE_TIMESTAMP + 86400)
+        ])
+        assert (result['inserted'], result['replaced'], result['failed']) == (1, 1, 2)
+        assert [error['index'] for error in result['errors']] == [1, 2]
+        assert compact.get_pdca_node(_pdca_id(0))['objective'] == 'Rewritten'
+        assert compact.get_pdca_node('new')['agent_name'] == 'ReviewerAgent'
+        assert compact.get_pdca_node('no-agent') is None
+
+        # Relationships may point at PDCAs that are not stored yet
+        assert compact.add_relationship('new', 'future', 'REFERENCES', 0.2, {'source': 'manual'})
+        assert compact.get_successors('new', 'REFERENCES') == []
+        compact.add_pdca_node(make_pdca('future', agent_role='Testing', date='2024-10-29',
+                                        timestamp=BASE_TIMESTAMP + 2 * 86400))
+        successor = compact.get_successors('new', 'REFERENCES')[0]
+        assert successor['id'] == 'future' and successor['metadata'] == {'source': 'manual'}
+        assert successor['weight'] == 0.2 and successor['relationship_created']
+        compact.close()
+
+
+if __name__ == "__main__":
+    test_migration_matches_sqlite_graph()
+    test_direct_writes()
+    print("✓ Compact graph tests passed")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test Path Algorithms
+Checks bidirectional BFS and Dijkstra on in-memory adjacency: shortest
+paths, hop limits, visit budgets, cancellation, and the weighted
+find_path() of SQLiteGraph.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_algorithms import bidirectional_bfs, dijkstra
+from graph_fixtures import make_pdca
+
+# A -> X -> Y -> B is cheap but long; A -> B is expensive but direct
+DETOUR = {'A': [('X', 0.1), ('B', 5.0)], 'X': [('Y', 0.1)], 'Y': [('B', 0.1)], 'B': [('T', 1.0)]}
+
+
+def _expanders(edges):
+    """Outgoing and incoming expand callbacks over an adjacency dictionary."""
+    incoming = {}
+    for node, neighbors in edges.items():
+        for neighbor, weight in neighbors:
+            incoming.setdefault(neighbor, []).append((node, weight))
+    expand_out = lambda nodes: {node: edges.get(node, []) for node in nodes}
+    expand_in = lambda nodes: {node: incoming.get(node, []) for node in nodes}
+    return expand_out, expand_in
+
+
+def _ladder(length):
+    """Two parallel chains a0..aN and b0..bN with rungs a_i -> b_i."""
+    edges = {}
+    for i in range(length):
+        edges[f'a{i}'] = [(f'a{i + 1}', 1.0), (f'b{i}', 1.0)]
+        edges[f'b{i}'] = [(f'b{i + 1}', 1.0)]
+    return edges
+
+
+def test_bidirectional_bfs():
+    """Fewest hops, with the depth and visit limits and cancellation honored."""
+    expand_out, expand_in = _expanders(DETOUR)
+    result = bidirectional_bfs('A', 'T', expand_out, expand_in)
+    assert result['path'] == ['A', 'B', 'T'] and result['hops'] == 2 and result['cost'] == 6.0
+    assert bidirectional_bfs('A', 'A', expand_out, expand_in)['path'] == ['A']
+    assert not bidirectional_bfs('T', 'A', expand_out, expand_in)['found']
+    assert not bidirectional_bfs('A', 'T', expand_out, expand_in, max_depth=1)['found']
+    assert bidirectional_bfs('A', 'T', expand_out, expand_in, max_depth=2)['found']
+
+    expand_out, expand_in = _expanders(_ladder(30))
+    result = bidirectional_bfs('a0', 'b30', expand_out, expand_in, max_depth=40)
+    assert result['hops'] == 31 and result['path'][0] == 'a0' and result['path'][-1] == 'b30'
+    assert all(b in dict(_ladder(30).get(a, [])) for a, b in zip(result['path'], result['path'][1:]))
+
+    limited = bidirectional_bfs('a0', 'b30', expand_out, expand_in, max_depth=40, max_visits=10)
+    assert limited['budget_exhausted'] and not limited['found']
+    assert not bidirectional_bfs('a0', 'b30', expand_out, expand_in, should_stop=lambda: True)['found']
+
+
+def test_dijkstra():
+    """Cheapest path, and the hop limit keeps costlier paths that fit it."""
+    expand_out, _ = _expanders(DETOUR)
+    result = dijkstra('A', 'T', expand_out)
+    assert result['path'] == ['A', 'X', 'Y', 'B', 'T'] and abs(result['cost'] - 1.3) < 1e-9
+
+    # The cheapest way to B takes three hops, so within three hops only A -> B -> T fits
+    result = dijkstra('A', 'T', expand_out, max_depth=3)
+    assert result['path'] == ['A', 'B', 'T'] and result['cost'] == 6.0
+    assert dijkstra('A', 'T', expand_out, max_depth=4)['hops'] == 4
+    assert not dijkstra('A', 'T', expand_out, max_depth=1)['found']
+    assert not dijkstra('T', 'A', expand_out)['found']
+
+    calls = []
+    counting = lambda nodes: calls.append(list(nodes)) or expand_out(nodes)
+    dijkstra('A', 'T', counting, max_depth=3)
+    assert len(calls) == len({node for batch in calls for node in batch})
+
+    # None weights count as 1 in both engines; negative weights are rejected
+    expand_out, expand_in = _expanders({'s': [('m', None)], 'm': [('t', 2.0)]})
+    assert dijkstra('s', 't', expand_out)['cost'] == 3.0
+    assert bidirectional_bfs('s', 't', expand_out, expand_in)['cost'] == 3.0
+    expand_out, _ = _expanders({'s': [('t', -1.0)]})
+    try:
+        dijkstra('s', 't', expand_out)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for a negative weight")
+
+    expand_out, _ = _expanders(_ladder(30))
+    assert dijkstra('a0', 'b30', expand_out, max_visits=5)['budget_exhausted']
+    assert not dijkstra('a0', 'b30', expand_out, should_stop=lambda: True)['found']
+
+
+def test_weighted_find_path():
+    """SQLiteGraph.find_path(weighted=True) respects max_depth the same way."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'graph.db'))
+        graph.add_pdca_nodes_bulk(make_pdca(pdca_id, i) for i, pdca_id in enumerate('AXYBT'))
+        graph.add_relationships_bulk((node, neighbor, 'PRECEDES', weight)
+                                     for node, neighbors in DETOUR.items()
+                                     for neighbor, weight in neighbors)
+        assert [p['id'] for p in graph.find_path('A', 'T', weighted=True)] == ['A', 'X', 'Y', 'B', 'T']
+        path = graph.find_path('A', 'T', weighted=True, max_depth=3)
+        assert [(p['id'], p['depth']) for p in path] == [('A', 0), ('B', 1), ('T', 2)]
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_bidirectional_bfs()
+    test_dijkstra()
+    test_weighted_find_path()
+    print("✓ Path algorithm tests passed")
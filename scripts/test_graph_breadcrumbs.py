@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test Breadcrumb Navigation
+Checks multi-hop breadcrumbs: keyset pages cover every PDCA within
+max_depth exactly once in (depth, newest) order, and counts match.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_fixtures import make_pdcas
+
+
+def _build(db_path):
+    """root -> a0..a4 -> b0..b5 (a0 and a1 share b0), b5 -> c0, b3 -> root (cycle)."""
+    graph = SQLiteGraph(db_path)
+    graph.add_pdca_nodes_bulk(make_pdcas(1, id_format='root') + make_pdcas(5, id_format='a{i}') +
+                              make_pdcas(6, id_format='b{i}') + make_pdcas(1, id_format='c{i}'))
+    graph.add_relationships_bulk([('root', f'a{i}') for i in range(5)] +
+                                 [(f'a{i}', f'b{i}') for i in range(5)] +
+                                 [('a1', 'b0'), ('a4', 'b5'), ('b5', 'c0'), ('b3', 'root')])
+    # Later-created PDCAs come first within a depth
+    for i, pdca_id in enumerate(['a3', 'a1', 'a4', 'a0', 'a2']):
+        graph.conn.execute("UPDATE pdcas SET created_at = ? WHERE id = ?",
+                           (f'2024-11-01 00:00:0{i}', pdca_id))
+    graph.conn.commit()
+    graph.clear_cache()
+    return graph
+
+
+def _pages(graph, pdca_id, key, page_size, **kwargs):
+    """Every page of one direction, following the returned cursors."""
+    pages, page_cursor = [], None
+    while True:
+        navigation = graph.get_breadcrumb_navigation(
+            pdca_id, page_size=page_size, **{f'{key}_cursor': page_cursor}, **kwargs)
+        pages.append([(row['id'], row['depth']) for row in navigation[f'{key}s']])
+        page_cursor = navigation[f'next_{key}_cursor']
+        if page_cursor is None:
+            return pages, navigation[f'{key}_count']
+
+
+def test_pagination_covers_everything_once():
+    """Small pages concatenate to the single-page result."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build(os.path.join(tmp, 'graph.db'))
+        everything, count = _pages(graph, 'root', 'successor', 100, max_depth=3)
+        assert len(everything) == 1 and count == 12
+        rows = everything[0]
+        assert rows[:5] == [('a2', 1), ('a0', 1), ('a4', 1), ('a1', 1), ('a3', 1)]
+        assert [depth for _, depth in rows] == [1] * 5 + [2] * 6 + [3]
+        assert [pdca_id for pdca_id, _ in rows[5:11]] == ['b5', 'b4', 'b3', 'b2', 'b1', 'b0']
+        # The cycle back to root does not list root itself
+        assert 'root' not in [pdca_id for pdca_id, _ in rows]
+
+        for page_size in (1, 2, 5, 11):
+            pages, page_count = _pages(graph, 'root', 'successor', page_size, max_depth=3)
+            assert all(len(page) == page_size for page in pages[:-1])
+            assert [row for page in pages for row in page] == rows and page_count == count
+
+        pages, count = _pages(graph, 'b0', 'predecessor', 2, max_depth=2)
+        assert [row for page in pages for row in page] == \
+            [('a0', 1), ('a1', 1), ('root', 2)] and count == 3
+        graph.close()
+
+
+def test_depth_limit_and_counts():
+    """max_depth bounds rows and counts; depth 1 counts come from the degree counters."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build(os.path.join(tmp, 'graph.db'))
+        navigation = graph.get_breadcrumb_navigation('root', max_depth=1, page_size=2)
+        assert navigation['current_pdca']['id'] == 'root'
+        assert [row['id'] for row in navigation['successors']] == ['a2', 'a0']
+        assert navigation['successor_count'] == 5 and navigation['predecessor_count'] == 1
+        assert navigation['predecessors'][0]['id'] == 'b3'
+        assert navigation['next_predecessor_cursor'] is None
+
+        navigation = graph.get_breadcrumb_navigation('a4', max_depth=2, include_counts=False)
+        assert [(row['id'], row['depth']) for row in navigation['successors']] == \
+            [('b5', 1), ('b4', 1), ('c0', 2)]
+        assert 'successor_count' not in navigation
+        assert graph.get_breadcrumb_navigation('missing')['successors'] == []
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_pagination_covers_everything_once()
+    test_depth_limit_and_counts()
+    print("✓ Breadcrumb navigation tests passed")
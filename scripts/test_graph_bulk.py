@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Bulk Ingestion
+Checks insert/replace counting (including duplicates within a chunk) and
+that a failing row is replayed out of its chunk without losing the others.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_fixtures import make_pdca, make_pdcas
+
+
+def _count(graph, table):
+    return graph.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_insert_and_replace_counts():
+    """Existing keys and repeats within the batch count as replaced."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'graph.db'))
+        result = graph.add_pdca_nodes_bulk(pdca for pdca in make_pdcas(5))
+        assert result == {'inserted': 5, 'replaced': 0, 'failed': 0, 'errors': []}
+
+        # pdca-6 appears twice in the same chunk
+        rows = make_pdcas(3, 7) + [make_pdca('pdca-6', 6, objective='Again')]
+        result = graph.add_pdca_nodes_bulk(rows, chunk_size=10)
+        assert (result['inserted'], result['replaced']) == (2, 3)
+        assert graph.get_pdca_node('pdca-6')['objective'] == 'Again'
+        assert _count(graph, 'pdcas') == 7
+
+        result = graph.add_relationships_bulk([
+            ('pdca-0', 'pdca-1'),
+            {'from_pdca_id': 'pdca-0', 'to_pdca_id': 'pdca-1', 'weight': 0.5},
+            ('pdca-0', 'pdca-1', 'REFERENCES', 1.0, {'source': 'bulk'}),
+        ])
+        assert (result['inserted'], result['replaced'], result['failed']) == (2, 1, 0)
+        successor = graph.get_successors('pdca-0')[0]
+        assert successor['weight'] == 0.5
+        assert graph.get_successors('pdca-0', 'REFERENCES')[0]['metadata'] == {'source': 'bulk'}
+        graph.close()
+
+
+def test_failed_rows_are_replayed():
+    """Bad rows are reported with their batch index; the rest of their chunk is kept."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'graph.db'))
+        rows = make_pdcas(10)
+        rows[3] = {'id': 'no-agent', 'agent_role': 'Testing', 'date': '2024-10-27', 'timestamp': 1}
+        rows[8] = make_pdca('pdca-8', 8, timestamp=None)
+        result = graph.add_pdca_nodes_bulk(iter(rows), chunk_size=4)
+        assert (result['inserted'], result['replaced'], result['failed']) == (8, 0, 2)
+        assert [(error['index'], error['id']) for error in result['errors']] == \
+            [(3, 'no-agent'), (8, 'pdca-8')]
+        assert 'NOT NULL' in result['errors'][0]['error']
+        assert _count(graph, 'pdcas') == 8
+        assert graph.get_pdca_node('pdca-2') and graph.get_pdca_node('pdca-9')
+
+        # Rows that cannot even be converted to parameters are per-row errors too
+        result = graph.add_relationships_bulk([('pdca-0', 'pdca-1'), ('pdca-1',),
+                                               ('pdca-1', 'pdca-2', 'PRECEDES', 1.0, None, 'extra'),
+                                               ('pdca-1', None), ('pdca-1', 'pdca-2')], chunk_size=2)
+        assert (result['inserted'], result['failed']) == (2, 3)
+        assert [error['index'] for error in result['errors']] == [1, 2, 3]
+        assert _count(graph, 'pdca_relationships') == 2
+
+        try:
+            graph.add_pdca_nodes_bulk(rows, chunk_size=0)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError for chunk_size=0")
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_insert_and_replace_counts()
+    test_failed_rows_are_replayed()
+    print("✓ Bulk ingestion tests passed")
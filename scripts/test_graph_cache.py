@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Read Result Cache
+Checks hits, invalidation by this instance's writes and by other
+connections, copy-on-read isolation, and the entry/memory caps.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from graph_fixtures import build_chain
+
+
+def _build_graph(db_path, **kwargs):
+    """A PRECEDES chain of ten PDCAs."""
+    return build_chain(db_path, 10, metadata=lambda i: {'link': i}, **kwargs)
+
+
+def test_cache_hits_and_write_invalidation():
+    """Repeated reads hit; a write through the graph invalidates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'cache.db'))
+        first = graph.get_successors('pdca-3')
+        assert graph.get_successors('pdca-3') == first
+        assert graph.get_breadcrumb_navigation('pdca-3') == graph.get_breadcrumb_navigation('pdca-3')
+        assert graph.get_pdca_node('pdca-3')['objective'] == 'Objective 3'
+        assert graph.get_pdca_node('pdca-3')['objective'] == 'Objective 3'
+        stats = graph.cache_stats()
+        assert stats['hits'] == 3 and stats['misses'] == 3
+
+        # Cached results are copies
+        first[0]['metadata']['link'] = 'changed'
+        assert graph.get_successors('pdca-3')[0]['metadata'] == {'link': 3}
+
+        graph.add_relationship('pdca-3', 'pdca-9')
+        assert len(graph.get_successors('pdca-3')) == 2
+        assert graph.cache_stats()['invalidations'] == 1
+        graph.close()
+
+
+def test_cache_invalidated_by_other_connection():
+    """Commits from another connection (e.g. the nightly indexer) invalidate too."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'cache.db')
+        graph = _build_graph(db_path, production=True)
+        assert len(graph.find_path('pdca-0', 'pdca-9')) == 10
+
+        other = sqlite3.connect(db_path)
+        other.execute("INSERT INTO pdca_relationships (from_pdca_id, to_pdca_id, relationship_type) "
+                      "VALUES ('pdca-0', 'pdca-9', 'PRECEDES')")
+        other.commit()
+        other.close()
+
+        assert len(graph.find_path('pdca-0', 'pdca-9')) == 2
+        graph.close()
+
+
+def test_cache_bounds():
+    """Entry and memory caps evict least recently used results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'cache.db'), cache_entries=3)
+        for i in range(10):
+            graph.get_pdca_node(f'pdca-{i}')
+        stats = graph.cache_stats()
+        assert stats['entries'] == 3 and stats['evictions'] == 7
+        graph.close()
+
+        graph = _build_graph(os.path.join(tmp, 'small.db'), cache_max_bytes=2000)
+        for i in range(10):
+            graph.get_pdca_node(f'pdca-{i}')
+        assert graph.cache_stats()['bytes'] <= 2000
+        graph.close()
+
+        graph = _build_graph(os.path.join(tmp, 'off.db'), cache_entries=0)
+        graph.get_pdca_node('pdca-1')
+        assert graph.cache_stats() == {}
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_cache_hits_and_write_invalidation()
+    test_cache_invalidated_by_other_connection()
+    test_cache_bounds()
+    print("✓ Graph cache tests passed")
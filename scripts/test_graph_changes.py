@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test Change Log
+Checks that inserts, replaces, updates and deletes of nodes and
+relationships are logged, watermark streaming, and compaction.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_fixtures import make_pdca
+
+
+def _log(changes):
+    return [(change['entity'], change['operation'], change['pdca_id'], change['to_pdca_id'])
+            for change in changes]
+
+
+def test_changes_are_logged():
+    """Every kind of write shows up once, in order, after the watermark."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'graph.db'))
+        assert graph.change_watermark() == 0
+        graph.add_pdca_nodes_bulk([make_pdca('pdca-1'), make_pdca('pdca-2')])
+        watermark = graph.change_watermark()
+        assert watermark == 2
+
+        graph.add_pdca_node(make_pdca('pdca-1', objective='Rewritten'))
+        graph.add_relationship('pdca-1', 'pdca-2')
+        graph.add_relationships_bulk([('pdca-1', 'pdca-2', 'PRECEDES', 0.5), ('pdca-2', 'pdca-1')])
+        # Raw SQL writes are logged too
+        graph.conn.execute("UPDATE pdcas SET verification_status = 'verified' WHERE id = 'pdca-2'")
+        graph.conn.execute("UPDATE pdcas SET id = 'pdca-3' WHERE id = 'pdca-1'")
+        graph.conn.execute("DELETE FROM pdca_relationships WHERE from_pdca_id = 'pdca-2'")
+        graph.conn.commit()
+
+        changes = list(graph.changes_since(watermark))
+        assert _log(changes) == [
+            ('node', 'replace', 'pdca-1', None),
+            ('edge', 'insert', 'pdca-1', 'pdca-2'),
+            ('edge', 'replace', 'pdca-1', 'pdca-2'),
+            ('edge', 'insert', 'pdca-2', 'pdca-1'),
+            ('node', 'update', 'pdca-2', None),
+            ('node', 'delete', 'pdca-1', None),
+            ('node', 'insert', 'pdca-3', None),
+            ('edge', 'delete', 'pdca-2', 'pdca-1'),
+        ]
+        assert [change['seq'] for change in changes] == list(range(watermark + 1, watermark + 9))
+        assert changes[1]['relationship_type'] == 'PRECEDES' and changes[0]['changed_at']
+
+        # Resuming from a checkpoint continues where a limited read stopped
+        checkpoint = {}
+        first = list(graph.changes_since(watermark, limit=3, checkpoint=checkpoint))
+        rest = list(graph.changes_since(checkpoint['after']))
+        assert first + rest == changes
+        assert list(graph.changes_since(watermark, entity='edge', columns=['seq', 'operation'],
+                                        row_format='tuple'))[0] == (watermark + 2, 'insert')
+        assert list(graph.changes_since(graph.change_watermark())) == []
+        graph.close()
+
+
+def test_compaction():
+    """Compacted watermarks are rejected and coalescing keeps the latest change per row."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'graph.db'))
+        graph.add_pdca_nodes_bulk([make_pdca('pdca-1'), make_pdca('pdca-2')])
+        for objective in ('a', 'b', 'c'):
+            graph.add_pdca_node(make_pdca('pdca-1', objective=objective))
+        graph.add_relationship('pdca-1', 'pdca-2')
+        latest = graph.change_watermark()
+
+        result = graph.compact_changes(through_seq=2, coalesce=True)
+        assert result == {'removed': 4, 'compacted_through': 2, 'remaining': 2}
+        assert _log(graph.changes_since(2)) == [('node', 'replace', 'pdca-1', None),
+                                                 ('edge', 'insert', 'pdca-1', 'pdca-2')]
+        try:
+            list(graph.changes_since(1))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError for a compacted watermark")
+
+        # Sequence numbers keep growing after the log is emptied
+        assert graph.compact_changes(older_than=3600)['removed'] == 0
+        assert graph.compact_changes(through_seq=latest)['remaining'] == 0
+        assert graph.change_watermark() == latest
+        graph.add_pdca_node(make_pdca('pdca-4'))
+        assert [change['seq'] for change in graph.changes_since(latest)] == [latest + 1]
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_changes_are_logged()
+    test_compaction()
+    print("✓ Change log tests passed")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test Connection Management
+Checks the per-thread read pool (one reused read-only connection per
+thread, closed when the thread ends or by close_all()) and the production
+profile of SQLiteGraph.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from graph_connections import ConnectionPool, production_pragmas, read_only_uri
+from graph_fixtures import build_chain
+
+
+def _in_thread(fn):
+    """Run ``fn`` on a new thread and return its result."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=fn()))
+    thread.start()
+    thread.join()
+    return result['value']
+
+
+def test_pool_reuses_one_connection_per_thread():
+    """Each thread keeps its own read-only connection until close_all()."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        graph = build_chain(db_path, 3)
+        pool = ConnectionPool(db_path, production_pragmas(mmap_size=0))
+
+        conn = pool.reader()
+        assert pool.reader() is conn and pool.size == 1
+        assert _in_thread(lambda: pool.reader().execute("SELECT COUNT(*) FROM pdcas").fetchone()[0]) == 3
+
+        # A finished thread's connection is closed and leaves the pool
+        finished = _in_thread(pool.reader)
+        assert finished is not conn and pool.size == 1
+        try:
+            finished.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            pass
+        else:
+            raise AssertionError("expected the finished thread's reader to be closed")
+
+        release, opened = threading.Event(), {}
+
+        def hold():
+            opened['conn'] = pool.reader()
+            release.wait(5)
+        thread = threading.Thread(target=hold)
+        thread.start()
+        while 'conn' not in opened:
+            thread.join(0.01)
+        other = opened['conn']
+        assert other is not conn and pool.size == 2
+
+        # Readers cannot write and see the writer's later commits
+        try:
+            conn.execute("DELETE FROM pdcas")
+        except sqlite3.OperationalError:
+            pass
+        else:
+            raise AssertionError("expected a read-only connection")
+        graph.add_relationship('pdca-2', 'pdca-0')
+        assert conn.execute("SELECT COUNT(*) FROM pdca_relationships").fetchone()[0] == 3
+
+        pool.close_all()
+        assert pool.size == 0
+        release.set()
+        thread.join()
+        for closed in (conn, other):
+            try:
+                closed.execute("SELECT 1")
+            except sqlite3.ProgrammingError:
+                pass
+            else:
+                raise AssertionError("expected close_all() to close every reader")
+        fresh = pool.reader()
+        assert fresh is not conn and pool.size == 1
+        pool.close_all()
+        graph.close()
+
+
+def test_production_profile():
+    """production=True enables WAL and serves reads from the pool."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_chain(os.path.join(tmp, 'graph.db'), 4, production=True)
+        assert graph.conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+        assert graph._read_conn() is not graph.conn
+        assert [row['id'] for row in graph.get_successors('pdca-1')] == ['pdca-2']
+        assert _in_thread(lambda: [row['id'] for row in graph.get_successors('pdca-2')]) == ['pdca-3']
+        assert graph._pool.size == 1
+        pool = graph._pool
+        graph.close()
+        assert pool.size == 0
+
+        # Without a pool every read uses the writer connection
+        graph = build_chain(os.path.join(tmp, 'plain.db'), 2)
+        assert graph._pool is None and graph._read_conn() is graph.conn
+        graph.close()
+
+        assert read_only_uri('/data/graph.db') == 'file:/data/graph.db?mode=ro'
+        assert read_only_uri('file:/data/graph.db?immutable=1') == 'file:/data/graph.db?immutable=1&mode=ro'
+
+
+if __name__ == "__main__":
+    test_pool_reuses_one_connection_per_thread()
+    test_production_profile()
+    print("✓ Connection management tests passed")
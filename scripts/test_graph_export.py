@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Graph Export
+Checks iter_nodes()/iter_edges() filters and resume cursors, and that the
+JSONL and columnar exporters resume from their checkpoints.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_export import checkpoint_path, export_columnar, export_jsonl, iter_columnar
+from graph_fixtures import chain_links, make_pdca, make_pdcas
+
+
+def _add_nodes(graph, start, stop):
+    """PDCAs one minute apart, alternating agents and verification status."""
+    graph.add_pdca_nodes_bulk(make_pdcas(
+        start, stop, id_format='pdca-{i:03d}',
+        agent_name=lambda i: 'BuilderAgent' if i % 2 else 'TesterAgent',
+        verification_status=lambda i: 'verified' if i % 3 == 0 else None))
+    graph.add_relationships_bulk(chain_links(
+        max(start - 1, 0), stop, id_format='pdca-{i:03d}',
+        relationship_type=lambda i: 'PRECEDES' if i % 2 else 'REFERENCES',
+        metadata=lambda i: {'i': i}))
+
+
+def test_iterators_filter_and_resume():
+    """Streams are ordered, filtered and resumable from any row's cursor."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'export.db'))
+        _add_nodes(graph, 0, 50)
+
+        progress = {}
+        ids = []
+        for row in graph.iter_nodes(batch_size=7, checkpoint=progress):
+            ids.append(row['id'])
+            if len(ids) == 20:
+                break
+        rest = [row[0] for row in graph.iter_nodes(after=progress['after'], columns=('id',),
+                                                   row_format='tuple')]
+        assert ids + rest == [f'pdca-{i:03d}' for i in range(50)]
+
+        builder = list(graph.iter_nodes(agent_name='BuilderAgent', verification_status='verified',
+                                        start_timestamp=1730023200 + 10 * 60))
+        assert [row['id'] for row in builder] == ['pdca-015', 'pdca-021', 'pdca-027', 'pdca-033',
+                                                  'pdca-039', 'pdca-045']
+
+        edges = list(graph.iter_edges(relationship_types=['PRECEDES'], row_format='record'))
+        assert len(edges) == 24 and all(edge.relationship_type == 'PRECEDES' for edge in edges)
+        assert edges[0].metadata == {'i': 1}
+        assert [edge.id for edge in edges] == sorted(edge.id for edge in edges)
+
+        # Node filters apply to both endpoints: alternating agents leave no edges
+        assert list(graph.iter_edges(agent_name='BuilderAgent')) == []
+        graph.close()
+
+
+def test_exports_resume_from_checkpoint():
+    """Re-runs append only new rows and drop a partial batch left by a crash."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'export.db'))
+        _add_nodes(graph, 0, 30)
+        jsonl_path = os.path.join(tmp, 'nodes.jsonl')
+        report = export_jsonl(graph, jsonl_path, batch_size=8)
+        assert report['rows'] == 30 and report['batches'] == 4
+
+        # Crash mid-batch: bytes after the checkpoint offset are discarded
+        with open(jsonl_path, 'a') as f:
+            f.write('{"id": "partial')
+        _add_nodes(graph, 30, 40)
+        report = export_jsonl(graph, jsonl_path, batch_size=8)
+        assert report['resumed'] and report['rows'] == 10 and report['total_rows'] == 40
+        with open(jsonl_path) as f:
+            rows = [json.loads(line) for line in f]
+        assert [row['id'] for row in rows] == [f'pdca-{i:03d}' for i in range(40)]
+
+        try:
+            export_jsonl(graph, jsonl_path, agent_name='TesterAgent')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError for changed filters")
+
+        columnar_path = os.path.join(tmp, 'edges.cols.gz')
+        export_columnar(graph, columnar_path, kind='edges', batch_size=16,
+                        columns=('from_pdca_id', 'to_pdca_id', 'metadata'))
+        _add_nodes(graph, 40, 45)
+        report = export_columnar(graph, columnar_path, kind='edges', batch_size=16,
+                                 columns=('from_pdca_id', 'to_pdca_id', 'metadata'))
+        assert report['rows'] == 5
+        groups = list(iter_columnar(columnar_path))
+        assert [len(group['from_pdca_id']) for group in groups] == [16, 16, 7, 5]
+        metadata = [value for group in groups for value in group['metadata']]
+        assert metadata == [{'i': i} for i in range(44)]
+        assert os.path.exists(checkpoint_path(columnar_path))
+        graph.close()
+
+
+def test_reexport_picks_up_late_and_replaced_nodes():
+    """Resume cursors follow write order, not timestamps."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'export.db'))
+        _add_nodes(graph, 0, 10)
+        path = os.path.join(tmp, 'nodes.jsonl')
+        assert export_jsonl(graph, path, batch_size=4)['rows'] == 10
+
+        # Indexed late but dated before everything exported so far
+        graph.add_pdca_node(make_pdca('late', -5))
+        # Rewritten in place of an exported node
+        graph.add_pdca_node(make_pdca('pdca-003', 3, objective='Rewritten'))
+        report = export_jsonl(graph, path, batch_size=4)
+        assert report['rows'] == 2 and report['total_rows'] == 12
+
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        assert [row['id'] for row in rows[10:]] == ['late', 'pdca-003']
+        latest = {row['id']: row for row in rows}
+        assert len(latest) == 11 and latest['pdca-003']['objective'] == 'Rewritten'
+        assert export_jsonl(graph, path)['rows'] == 0
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_iterators_filter_and_resume()
+    test_exports_resume_from_checkpoint()
+    test_reexport_picks_up_late_and_replaced_nodes()
+    print("✓ Graph export tests passed")
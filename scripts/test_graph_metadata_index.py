@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test Relationship Metadata Indexes
+Checks declaring indexes on an existing database, metadata predicates on
+traversals and edge scans, declared column types, index use, and dropping
+an index.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_fixtures import build_chain
+
+# Mixed numeric and numeric-looking text values of the 'rank' key
+RANKS = [3, '7', 12, 4.5, '12']
+
+
+def _build(db_path):
+    """PRECEDES chain pdca-0 .. pdca-5 with source/confidence metadata."""
+    graph = build_chain(db_path, 6, metadata=lambda i: {
+        'source': 'breadcrumb' if i % 2 == 0 else 'inferred', 'confidence': i / 10})
+    graph.add_relationship('pdca-0', 'pdca-3', 'PRECEDES', metadata={'source': 'manual'})
+    return graph
+
+
+def _ids(rows):
+    return sorted(row['id'] for row in rows)
+
+
+def test_predicates_with_and_without_index():
+    """Filters give the same answers through json_extract and generated columns."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        graph = _build(db_path)
+
+        for declared in (False, True):
+            if declared:
+                # Migrates the existing rows in place
+                assert graph.declare_metadata_index('source')
+                assert graph.declare_metadata_index('confidence', 'REAL')
+
+            assert _ids(graph.get_successors('pdca-0')) == ['pdca-1', 'pdca-3']
+            assert _ids(graph.get_successors('pdca-0', metadata_filter={'source': 'manual'})) == ['pdca-3']
+            assert _ids(graph.get_successors(
+                'pdca-0', metadata_filter={'source': ('in', ['breadcrumb', 'other'])})) == ['pdca-1']
+            assert _ids(graph.get_successors('pdca-0', metadata_filter={'confidence': None})) == ['pdca-3']
+            assert _ids(graph.get_predecessors(
+                'pdca-3', metadata_filter={'confidence': ('!=', None)})) == ['pdca-2']
+
+            neighbors = graph.get_neighbors_many(
+                ['pdca-1', 'pdca-2', 'pdca-3'],
+                metadata_filter={'confidence': ('>=', 0.2), 'source': ('not in', ['manual'])})
+            assert [_ids(neighbors[seed]) for seed in ('pdca-1', 'pdca-2', 'pdca-3')] == \
+                [[], ['pdca-3'], ['pdca-4']]
+
+            # The shortcut pdca-0 -> pdca-3 is the only path when inferred edges are excluded
+            path = graph.find_path('pdca-0', 'pdca-4', metadata_filter={'source': ('!=', 'inferred')})
+            assert path == []
+            path = graph.find_path('pdca-0', 'pdca-5', metadata_filter={'source': ('!=', 'manual')})
+            assert len(path) == 6
+
+            navigation = graph.get_breadcrumb_navigation(
+                'pdca-0', max_depth=3, metadata_filter={'source': 'breadcrumb'})
+            assert navigation['successor_count'] == 1
+
+            edges = list(graph.iter_edges(metadata_filter={'confidence': ('>', 0.15)}))
+            assert [(row['from_pdca_id'], row['to_pdca_id']) for row in edges] == \
+                [('pdca-2', 'pdca-3'), ('pdca-3', 'pdca-4'), ('pdca-4', 'pdca-5')]
+
+        try:
+            graph.get_successors('pdca-0', metadata_filter={'source; DROP': 'x'})
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError for an invalid key")
+        graph.close()
+
+
+def _rank_matches(graph, condition):
+    """Edges matching a 'rank' condition via a seed traversal and via an edge scan."""
+    metadata_filter = {'rank': condition}
+    neighbors = graph.get_neighbors_many([f'pdca-{i}' for i in range(len(RANKS))],
+                                         metadata_filter=metadata_filter)
+    traversal = sorted((seed, row['id']) for seed, rows in neighbors.items() for row in rows)
+    scan = sorted((row['from_pdca_id'], row['to_pdca_id'])
+                  for row in graph.iter_edges(metadata_filter=metadata_filter))
+    return traversal, scan
+
+
+def test_declared_types():
+    """Untyped columns compare like json_extract; typed ones agree on every path."""
+    conditions = [('<', 5), ('>', 5), ('>=', '7'), 3, ('in', [12, '7']), ('!=', None)]
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_chain(os.path.join(tmp, 'graph.db'), len(RANKS) + 1,
+                            metadata=lambda i: {'rank': RANKS[i]})
+        undeclared = [_rank_matches(graph, condition) for condition in conditions]
+        assert [pair[0] == pair[1] for pair in undeclared] == [True] * len(conditions)
+        assert undeclared[0][0] == [('pdca-0', 'pdca-1'), ('pdca-3', 'pdca-4')]
+
+        assert graph.declare_metadata_index('rank')
+        assert graph.metadata_indexes()[0]['value_type'] is None
+        assert [_rank_matches(graph, condition) for condition in conditions] == undeclared
+
+        # A TEXT column compares text, the same way on traversals and scans
+        assert graph.drop_metadata_index('rank')
+        assert graph.declare_metadata_index('rank', 'text')
+        for condition in conditions:
+            traversal, scan = _rank_matches(graph, condition)
+            assert traversal == scan
+        assert _rank_matches(graph, ('>', 5))[0] == [('pdca-1', 'pdca-2')]
+
+        for value_type in (None, 'INTEGER'):
+            try:
+                graph.declare_metadata_index('rank', value_type)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("expected ValueError for a conflicting type")
+        assert graph.declare_metadata_index('rank', 'TEXT')
+        graph.close()
+
+
+def test_keys_differing_in_case():
+    """'Source' and 'source' are separate keys with separate columns."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_chain(os.path.join(tmp, 'graph.db'), 3,
+                            metadata=lambda i: {'Source': 'manual', 'source': f'auto-{i}'})
+        assert graph.declare_metadata_index('source')
+        assert graph.declare_metadata_index('Source')
+        columns = {entry['key']: entry['column_name'] for entry in graph.metadata_indexes()}
+        assert columns['source'] == 'meta_source'
+        assert columns['Source'].lower() != 'meta_source'
+
+        assert len(list(graph.iter_edges(metadata_filter={'Source': 'manual'}))) == 2
+        assert list(graph.iter_edges(metadata_filter={'source': 'manual'})) == []
+        assert _ids(graph.get_successors('pdca-1', metadata_filter={'source': 'auto-1'})) == ['pdca-2']
+        graph.close()
+
+
+def test_index_registry_and_drop():
+    """Declared indexes survive reopening, serve edge scans and can be dropped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        graph = _build(db_path)
+        assert graph.declare_metadata_index('source')
+        graph.close()
+
+        graph = SQLiteGraph(db_path)
+        assert [entry['key'] for entry in graph.metadata_indexes()] == ['source']
+        graph.add_relationship('pdca-5', 'pdca-0', 'PRECEDES', metadata={'source': 'manual'})
+
+        sql, params = graph._metadata_predicate('pr', {'source': 'manual'}, indexed=True)
+        plan = " ".join(row[-1] for row in graph.conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT pr.id FROM pdca_relationships pr WHERE 1{sql}", params))
+        assert 'idx_pdca_relationships_meta_source' in plan
+        assert [(row['from_pdca_id'], row['to_pdca_id'])
+                for row in graph.iter_edges(metadata_filter={'source': 'manual'})] == \
+            [('pdca-0', 'pdca-3'), ('pdca-5', 'pdca-0')]
+
+        assert graph.drop_metadata_index('source') and not graph.drop_metadata_index('source')
+        assert graph.metadata_indexes() == []
+        assert _ids(graph.get_successors('pdca-5', metadata_filter={'source': 'manual'})) == ['pdca-0']
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_predicates_with_and_without_index()
+    test_declared_types()
+    test_keys_differing_in_case()
+    test_index_registry_and_drop()
+    print("✓ Metadata index tests passed")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test Graph Instrumentation
+Checks per-method counters, error counting, the slow-query log with query
+plans, the profiling hook, and that lookups stay on the endpoint indexes.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from graph_fixtures import build_chain
+
+
+def _build_graph(db_path, **kwargs):
+    """A PRECEDES chain of 20 PDCAs."""
+    return build_chain(db_path, 20, cache_entries=0, **kwargs)
+
+
+def test_metrics_counts_and_errors():
+    """Calls, rows and swallowed errors are counted per method."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'metrics.db'))
+        assert graph.get_metrics() == {}
+
+        events = []
+        graph.enable_instrumentation(profile_hook=events.append)
+        for i in range(5):
+            graph.get_successors(f'pdca-{i}')
+        graph.find_path('pdca-0', 'pdca-10')
+        graph.conn.execute("DROP TABLE pdca_node_degree")
+        assert graph.get_node_degree('pdca-1') == {'in_degree': 0, 'out_degree': 0}
+
+        methods = graph.get_metrics()['methods']
+        assert methods['get_successors']['calls'] == 5
+        assert methods['get_successors']['rows'] == 5
+        assert sum(methods['get_successors']['histogram'].values()) == 5
+        assert methods['find_path']['rows'] == 11
+        assert methods['shortest_path']['calls'] == 1  # nested call
+        assert methods['get_node_degree']['errors'] == 1
+        assert events[-1] == dict(events[-1], method='get_node_degree', error=True)
+        graph.close()
+
+
+def test_slow_query_log_and_plans():
+    """Slow calls keep their SQL and EXPLAIN QUERY PLAN output."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'metrics.db'), slow_query_ms=0)
+        graph.get_successors('pdca-3')
+        graph.get_predecessors('pdca-3')
+
+        entries = graph.get_metrics()['slow_queries']
+        assert [entry['method'] for entry in entries] == [
+            'add_pdca_nodes_bulk', 'add_relationships_bulk', 'get_successors', 'get_predecessors']
+        entries = entries[2:]
+        for entry, column in zip(entries, ('from', 'to')):
+            statement = entry['statements'][-1]
+            assert "'pdca-3'" in statement['sql']
+            plan = ' | '.join(statement['plan'])
+            assert f'idx_pdca_relationships_{column}' in plan, plan
+            assert 'idx_pdca_relationships_type' not in plan, plan
+
+        graph.disable_instrumentation()
+        graph.get_successors('pdca-3')
+        assert graph.get_metrics() == {}
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_metrics_counts_and_errors()
+    test_slow_query_log_and_plans()
+    print("✓ Graph metrics tests passed")
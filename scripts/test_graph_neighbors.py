@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test Batched Neighbor Expansion
+Checks get_neighbors_many() ordering by weight and recency, the per-seed
+limit, directions and type filters, and seeds without neighbors.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_fixtures import make_pdcas
+
+
+def _build(db_path):
+    """hub links to n0..n4 with distinct weights and link times; n5 links to hub."""
+    graph = SQLiteGraph(db_path)
+    graph.add_pdca_nodes_bulk(make_pdcas(6, id_format='n{i}') + make_pdcas(1, id_format='hub'))
+    weights = [0.2, 0.9, 0.5, 0.9, 0.1]
+    graph.add_relationships_bulk(('hub', f'n{i}', 'PRECEDES' if i < 4 else 'REFERENCES', weight)
+                                 for i, weight in enumerate(weights))
+    graph.add_relationships_bulk([('n5', 'hub'), ('hub', 'missing')])
+    # Link times: n2 newest, then n0, n4, n3, n1
+    for i, day in ((2, 5), (0, 4), (4, 3), (3, 2), (1, 1)):
+        graph.conn.execute("UPDATE pdca_relationships SET created_at = ? WHERE to_pdca_id = ?",
+                           (f'2024-11-0{day} 00:00:00', f'n{i}'))
+    graph.conn.commit()
+    graph.clear_cache()
+    return graph
+
+
+def _ids(rows):
+    return [row['id'] for row in rows]
+
+
+def test_order_and_limit():
+    """Each seed is ranked on its own and cut to limit_per_seed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build(os.path.join(tmp, 'graph.db'))
+
+        # Equal weights (n1, n3) fall back to the newer link; the dangling link is skipped
+        by_weight = graph.get_neighbors_many(['hub'])['hub']
+        assert _ids(by_weight) == ['n3', 'n1', 'n2', 'n0', 'n4']
+        assert [row['weight'] for row in by_weight] == [0.9, 0.9, 0.5, 0.2, 0.1]
+        by_recency = graph.get_neighbors_many(['hub'], order_by='recency')['hub']
+        assert _ids(by_recency) == ['n2', 'n0', 'n4', 'n3', 'n1']
+
+        limited = graph.get_neighbors_many(['hub', 'n5', 'n0', 'hub'], limit_per_seed=2)
+        assert list(limited) == ['hub', 'n5', 'n0']
+        assert _ids(limited['hub']) == ['n3', 'n1'] and _ids(limited['n5']) == ['hub']
+        assert limited['n0'] == []
+        assert _ids(graph.get_neighbors_many(['hub'], order_by='recency',
+                                             limit_per_seed=1)['hub']) == ['n2']
+        assert graph.get_neighbors_many([]) == {}
+
+        try:
+            graph.get_neighbors_many(['hub'], order_by='name')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError for an unknown order_by")
+        graph.close()
+
+
+def test_directions_and_types():
+    """Both directions are ranked together; type filters apply before the limit."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build(os.path.join(tmp, 'graph.db'))
+        rows = graph.get_neighbors_many(['hub'], direction='both',
+                                        columns=['id', 'direction', 'relationship_type'],
+                                        row_format='tuple')['hub']
+        assert rows[:3] == [('n5', 'in', 'PRECEDES'), ('n3', 'out', 'PRECEDES'),
+                            ('n1', 'out', 'PRECEDES')]
+        assert len(rows) == 6
+
+        predecessors = graph.get_neighbors_many(['n4', 'hub'], direction='in')
+        assert _ids(predecessors['n4']) == ['hub'] and _ids(predecessors['hub']) == ['n5']
+        references = graph.get_neighbors_many(['hub'], relationship_types=['REFERENCES'],
+                                              limit_per_seed=3)['hub']
+        assert _ids(references) == ['n4'] and references[0]['relationship_type'] == 'REFERENCES'
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_order_and_limit()
+    test_directions_and_types()
+    print("✓ Neighbor expansion tests passed")
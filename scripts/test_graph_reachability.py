@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test Reachability Index
+Checks the chain decomposition, lineage queries with and without the
+index, incremental maintenance against a rebuild, and staleness handling.
+"""
+
+import sys
+import os
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_reachability import decompose_chains, strongly_connected_components
+from graph_fixtures import BASE_TIMESTAMP, make_pdcas
+
+
+def _timeline(db_path, count=60, agents=3, seed=7):
+    """Interleaved agent timelines with occasional cross-links to recent PDCAs."""
+    rng = random.Random(seed)
+    graph = SQLiteGraph(db_path)
+    graph.add_pdca_nodes_bulk(make_pdcas(count, id_format='pdca-{i:03d}',
+                                         agent_name=lambda i: f'Agent{i % agents}'))
+    edges = []
+    last = {}
+    for i in range(count):
+        agent = rng.randrange(agents)
+        if agent in last:
+            edges.append((f'pdca-{last[agent]:03d}', f'pdca-{i:03d}'))
+        if i > 5 and rng.random() < 0.2:
+            edges.append((f'pdca-{rng.randrange(i - 5, i):03d}', f'pdca-{i:03d}'))
+        last[agent] = i
+    return graph, edges
+
+
+def _ids(rows):
+    return [row['id'] for row in rows]
+
+
+def _lineage(graph, pdca_ids):
+    """Everything the lineage queries return, for comparing index and walk."""
+    return ([_ids(graph.ancestors(pdca_id)) for pdca_id in pdca_ids],
+            [_ids(graph.descendants(pdca_id, limit=5)) for pdca_id in pdca_ids],
+            [graph.is_ancestor(a, b) for a in pdca_ids for b in pdca_ids],
+            _ids(graph.common_ancestors(pdca_ids[-2:])))
+
+
+def test_chain_decomposition():
+    """Interleaved timelines are covered by one chain each, even with cross-links."""
+    order = list(range(12))
+    predecessors = {i: [i - 3] for i in range(3, 12)}
+    # Cross-links that a greedy cover would take first
+    predecessors[4].append(3)
+    predecessors[7].append(6)
+    slots = decompose_chains(order, predecessors)
+    assert len({chain for chain, _ in slots.values()}) == 3
+    for node, (chain, position) in slots.items():
+        if position:
+            previous = next(other for other, slot in slots.items() if slot == (chain, position - 1))
+            assert previous in predecessors[node]
+
+    successors = {1: [2], 2: [3], 3: [1, 4]}
+    components = strongly_connected_components([1, 2, 3, 4], successors)
+    assert components[0] == [4] and sorted(components[1]) == [1, 2, 3]
+
+
+def test_lineage_queries():
+    """The index answers like the recursive walk and handles filters and limits."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, edges = _timeline(os.path.join(tmp, 'graph.db'))
+        graph.add_relationships_bulk(edges)
+        sample = ['pdca-000', 'pdca-013', 'pdca-031', 'pdca-047', 'pdca-058', 'pdca-059']
+        walked = _lineage(graph, sample)
+
+        assert graph.enable_reachability_index()
+        assert graph.reachability_indexes()[0]['current']
+        assert graph.reachability_indexes()[0]['chains'] <= 4
+        assert _lineage(graph, sample) == walked
+
+        ancestors = _ids(graph.ancestors('pdca-059'))
+        assert ancestors == sorted(ancestors, reverse=True)
+        since = graph.ancestors('pdca-059', start_timestamp=BASE_TIMESTAMP + 40 * 60, columns=['id'])
+        assert _ids(since) == [pdca_id for pdca_id in ancestors if pdca_id >= 'pdca-040']
+        assert graph.ancestors('pdca-059', limit=1, columns=['id'], row_format='tuple') == \
+            [(ancestors[0],)]
+
+        # The newest common ancestor comes first; a PDCA is not its own ancestor
+        common = _ids(graph.common_ancestors(['pdca-058', 'pdca-059']))
+        assert set(common) == set(_ids(graph.ancestors('pdca-058'))) & set(ancestors)
+        assert common == sorted(common, reverse=True)
+        assert 'pdca-000' not in _ids(graph.common_ancestors(['pdca-000', 'pdca-059']))
+        assert not graph.is_ancestor('pdca-059', 'pdca-000')
+        graph.close()
+
+
+def test_incremental_maintenance():
+    """Single and bulk writes keep the index equal to a rebuild."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        graph, edges = _timeline(db_path)
+        graph.add_relationships_bulk(edges[:20])
+        graph.enable_reachability_index()
+        for from_id, to_id in edges[20:40]:
+            graph.add_relationship(from_id, to_id)
+        graph.add_relationships_bulk(edges[40:])
+        # A cycle and a self-relationship
+        graph.add_relationship('pdca-050', 'pdca-045')
+        graph.add_relationship('pdca-030', 'pdca-030')
+        graph.close()
+
+        # Reopened instances maintain the index too
+        graph = SQLiteGraph(db_path)
+        graph.add_relationship('pdca-059', 'pdca-000')
+        assert graph.reachability_indexes()[0]['current']
+        sample = ['pdca-000', 'pdca-030', 'pdca-045', 'pdca-050', 'pdca-059']
+        incremental = _lineage(graph, sample)
+        # pdca-059 -> pdca-000 closes a cycle, so PDCAs on it reach themselves
+        assert graph.is_ancestor('pdca-059', 'pdca-059')
+        assert graph.rebuild_reachability_index()
+        assert _lineage(graph, sample) == incremental
+        assert graph.drop_reachability_index('PRECEDES')
+        assert _lineage(graph, sample) == incremental
+        graph.close()
+
+
+def test_staleness_and_drop():
+    """Writes behind SQLiteGraph's back switch queries to the walk until a rebuild."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, edges = _timeline(os.path.join(tmp, 'graph.db'), count=20)
+        graph.add_relationships_bulk(edges)
+        graph.enable_reachability_index()
+        parent = next(from_id for from_id, to_id in edges if to_id == 'pdca-019')
+        assert graph.is_ancestor(parent, 'pdca-019')
+
+        graph.conn.execute("DELETE FROM pdca_relationships WHERE to_pdca_id = 'pdca-019'")
+        graph.conn.commit()
+        assert not graph.reachability_indexes()[0]['current']
+        assert not graph.is_ancestor(parent, 'pdca-019')
+        assert graph.ancestors('pdca-019') == []
+
+        assert graph.rebuild_reachability_index('PRECEDES')
+        assert graph.reachability_indexes()[0]['current']
+        assert graph.ancestors('pdca-019') == []
+        assert not graph.rebuild_reachability_index('REFERENCES')
+
+        assert graph.drop_reachability_index('PRECEDES')
+        assert graph.reachability_indexes() == []
+        assert graph.add_relationship('pdca-018', 'pdca-019')
+        assert graph.is_ancestor('pdca-018', 'pdca-019')
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_chain_decomposition()
+    test_lineage_queries()
+    test_incremental_maintenance()
+    test_staleness_and_drop()
+    print("✓ Reachability index tests passed")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test Compact Row Formats
+Checks column projection, namedtuple records with lazy metadata, plain
+tuples, and that the default dict rows are unchanged.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_rows import PDCA_COLUMNS
+from graph_fixtures import make_pdcas
+
+
+def _build_graph(db_path):
+    """pdca-0 links to pdca-1..pdca-3."""
+    graph = SQLiteGraph(db_path)
+    graph.add_pdca_nodes_bulk(make_pdcas(4))
+    graph.add_relationships_bulk(('pdca-0', f'pdca-{i}', 'PRECEDES', float(i), {'link': i})
+                                 for i in range(1, 4))
+    return graph
+
+
+def test_projection_and_row_formats():
+    """Projected records, tuples and dicts carry the same values."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'rows.db'))
+        columns = ('id', 'timestamp', 'weight', 'metadata')
+
+        dicts = graph.get_successors('pdca-0', columns=columns)
+        records = graph.get_successors('pdca-0', columns=columns, row_format='record')
+        tuples = graph.get_successors('pdca-0', columns=columns, row_format='tuple')
+        assert [list(row) for row in dicts] == [list(columns)] * 3
+        assert len(records) == len(tuples) == 3
+
+        by_id = {row['id']: row for row in dicts}
+        for record, values in zip(records, tuples):
+            assert record.id == values[0]
+            assert record.weight == values[2] == by_id[record.id]['weight']
+            # Metadata stays JSON until the property is read
+            assert isinstance(values[3], str) and record.metadata_json == values[3]
+            assert record.metadata == by_id[record.id]['metadata']
+            assert not hasattr(record, '__dict__')
+
+        neighbors = graph.get_neighbors_many(['pdca-1'], direction='in',
+                                             columns=('id', 'direction'), row_format='tuple')
+        assert neighbors == {'pdca-1': [('pdca-0', 'in')]}
+        graph.close()
+
+
+def test_default_rows_and_errors():
+    """Default reads still return full dicts; bad arguments raise."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'rows.db'))
+        row = graph.get_predecessors('pdca-2')[0]
+        assert list(row) == list(PDCA_COLUMNS) + ['weight', 'metadata', 'relationship_created']
+        assert row['metadata'] == {'link': 2}
+
+        row = graph.get_neighbors_many(['pdca-0'])['pdca-0'][0]
+        assert row['relationship_type'] == 'PRECEDES' and row['direction'] == 'out'
+
+        for kwargs in ({'columns': ('id', 'nope')}, {'row_format': 'arrow'}):
+            try:
+                graph.get_successors('pdca-0', **kwargs)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"expected ValueError for {kwargs}")
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_projection_and_row_formats()
+    test_default_rows_and_errors()
+    print("✓ Row format tests passed")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Serving Snapshots
+Checks publishing, read-only serving from file and in-memory snapshots,
+hot reload in the background while a call holds the old snapshot, and
+pruning.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_serving import ServingGraph, publish_snapshot, read_pointer
+from graph_fixtures import chain_links, make_pdcas
+
+
+def _add_chain(graph, start, stop):
+    """PRECEDES chain pdca-start .. pdca-(stop - 1), linked to pdca-(start - 1)."""
+    graph.add_pdca_nodes_bulk(make_pdcas(start, stop))
+    graph.add_relationships_bulk(chain_links(max(start - 1, 0), stop))
+
+
+def test_hot_reload_keeps_inflight_snapshot():
+    """New calls see a new version; a pinned call keeps reading the old one."""
+    for in_memory in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            graph = SQLiteGraph(os.path.join(tmp, 'live.db'), production=True)
+            _add_chain(graph, 0, 5)
+            serving_dir = os.path.join(tmp, 'serving')
+            assert publish_snapshot(graph, serving_dir)['version'] == 1
+
+            serving = ServingGraph(serving_dir, in_memory=in_memory, reload_interval=0)
+            assert serving.get_successors('pdca-4') == []
+            assert serving.add_pdca_node({'id': 'x', 'agent_name': 'a', 'agent_role': 'r',
+                                          'date': 'd', 'timestamp': 0}) is False
+
+            # Hold the background load until the call that started it has returned
+            loading = threading.Event()
+            open_snapshot = serving._open
+            serving._open = lambda pointer: loading.wait(5) and open_snapshot(pointer)
+
+            with serving.acquire() as pinned:
+                serving.wait_for_reload(5)  # the check started by acquire() itself
+                _add_chain(graph, 5, 8)
+                publish_snapshot(graph, serving_dir)
+                assert serving.get_successors('pdca-4') == [] and serving.version == 1
+                loading.set()
+                serving.wait_for_reload(5)
+                # Writes to the live database are invisible until published
+                assert [row['id'] for row in serving.get_successors('pdca-4')] == ['pdca-5']
+                assert serving.version == 2
+                assert pinned.get_successors('pdca-4') == []
+                assert len(pinned.find_path('pdca-0', 'pdca-4')) == 5
+
+            assert len(serving.find_path('pdca-0', 'pdca-7')) == 8
+            serving.close()
+            graph.close()
+
+
+def test_publish_prunes_old_versions():
+    """Only the newest ``keep`` versions stay on disk; the pointer names the newest."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'live.db'))
+        _add_chain(graph, 0, 3)
+        serving_dir = os.path.join(tmp, 'serving')
+        for _ in range(4):
+            publish_snapshot(graph, serving_dir, keep=2)
+        files = sorted(name for name in os.listdir(serving_dir) if name.endswith('.db'))
+        assert files == ['pdca-snapshot-000003.db', 'pdca-snapshot-000004.db']
+        assert read_pointer(serving_dir)['file'] == 'pdca-snapshot-000004.db'
+
+        try:
+            ServingGraph(os.path.join(tmp, 'empty'))
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("expected FileNotFoundError without a snapshot")
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_hot_reload_keeps_inflight_snapshot()
+    test_publish_prunes_old_versions()
+    print("✓ Serving snapshot tests passed")
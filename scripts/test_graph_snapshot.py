@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test Graph Snapshot
+Checks that the CSR snapshot follows the database: appends are merged in
+place, replaced or deleted edges (also by other connections) trigger a
+rebuild, and a saved .npz snapshot is a valid warm start.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_snapshot import GraphSnapshot
+from graph_fixtures import build_chain, chain_links, make_pdcas
+
+
+def _counting_rebuilds(snapshot):
+    """Wrap snapshot._load_all() to count full rebuilds."""
+    calls = []
+    load_all = snapshot._load_all
+    snapshot._load_all = lambda graph: calls.append(1) or load_all(graph)
+    return calls
+
+
+def test_incremental_refresh():
+    """New nodes and edges are merged without a rebuild; no change is a no-op."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_chain(os.path.join(tmp, 'graph.db'), 5)
+        snapshot = graph.load_snapshot()
+        rebuilds = _counting_rebuilds(snapshot)
+        assert snapshot.successors('pdca-1') == ['pdca-2']
+        assert not snapshot.refresh(graph)
+
+        graph.add_pdca_nodes_bulk(make_pdcas(5, 8))
+        graph.add_relationships_bulk(chain_links(4, 8))
+        graph.add_relationship('pdca-0', 'pdca-7', 'REFERENCES', 0.5)
+        assert graph.load_snapshot() is snapshot and rebuilds == []
+        assert (snapshot.node_count, snapshot.edge_count) == (8, 8)
+        assert snapshot.successors('pdca-6') == ['pdca-7']
+        assert snapshot.neighbors('pdca-0', 'REFERENCES') == [('pdca-7', 0.5)]
+        assert snapshot.neighbors('pdca-0', None) == [('pdca-1', 1.0), ('pdca-7', 0.5)]
+        # Offsets of untouched types grow with the new nodes
+        assert snapshot.degree('pdca-7') == 2 and snapshot.predecessors('pdca-7') == ['pdca-6']
+        assert snapshot.k_hop(['pdca-5'], 2) == {'pdca-5': 0, 'pdca-6': 1, 'pdca-7': 2}
+        assert snapshot.shortest_path('pdca-0', 'pdca-7')['hops'] == 7
+        graph.close()
+
+
+def test_replace_and_external_delete_rebuild():
+    """Changed or removed edges, from this instance or another, force a rebuild."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        graph = build_chain(db_path, 5)
+        snapshot = graph.load_snapshot()
+        rebuilds = _counting_rebuilds(snapshot)
+
+        graph.add_relationship('pdca-1', 'pdca-2', 'PRECEDES', 3.0)
+        graph.load_snapshot()
+        assert len(rebuilds) == 1
+        assert snapshot.neighbors('pdca-1') == [('pdca-2', 3.0)]
+
+        other = SQLiteGraph(db_path)
+        other.conn.execute("DELETE FROM pdca_relationships WHERE from_pdca_id = 'pdca-3'")
+        other.conn.commit()
+        other.close()
+        graph.load_snapshot()
+        assert len(rebuilds) == 2
+        assert snapshot.successors('pdca-3') == [] and snapshot.edge_count == 3
+        graph.close()
+
+
+def test_save_and_load():
+    """A saved snapshot loads equal and is refreshed against the database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        path = os.path.join(tmp, 'snapshot.npz')
+        graph = build_chain(db_path, 6)
+        graph.add_relationship('pdca-0', 'pdca-5', 'REFERENCES', 0.25)
+        snapshot = graph.load_snapshot()
+        snapshot.save(path)
+
+        loaded = GraphSnapshot.load(path)
+        assert loaded.node_ids == snapshot.node_ids
+        assert loaded.edge_count == snapshot.edge_count == 6
+        for pdca_id in snapshot.node_ids:
+            assert loaded.neighbors(pdca_id, None) == snapshot.neighbors(pdca_id, None)
+            assert loaded.neighbors(pdca_id, None, 'in') == snapshot.neighbors(pdca_id, None, 'in')
+        graph.close()
+
+        # A new process starts from the file and picks up later writes
+        graph = SQLiteGraph(db_path)
+        graph.add_pdca_nodes_bulk(make_pdcas(6, 7))
+        graph.add_relationship('pdca-5', 'pdca-6')
+        warm = graph.load_snapshot(path)
+        assert warm.successors('pdca-5') == ['pdca-6'] and warm.edge_count == 7
+        assert warm.neighbors('pdca-0', 'REFERENCES') == [('pdca-5', 0.25)]
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_incremental_refresh()
+    test_replace_and_external_delete_rebuild()
+    test_save_and_load()
+    print("✓ Graph snapshot tests passed")
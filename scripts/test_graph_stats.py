@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test Graph Statistics
+Checks that the trigger-maintained counters (node count, per-type edge
+counts, per-node degrees) match a full recount after inserts, replaces,
+updates and deletes, and that rebuild_stats() restores drifted counters.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_fixtures import build_chain, make_pdca
+
+STATS_TABLES = {
+    'pdca_node_degree': "SELECT pdca_id, relationship_type, in_degree, out_degree "
+                        "FROM pdca_node_degree WHERE in_degree OR out_degree",
+    'pdca_node_connections': "SELECT pdca_id, connection_count FROM pdca_node_connections "
+                             "WHERE connection_count",
+    'pdca_edge_type_counts': "SELECT relationship_type, edge_count FROM pdca_edge_type_counts "
+                             "WHERE edge_count",
+    'pdca_graph_counters': "SELECT name, value FROM pdca_graph_counters",
+}
+
+
+def _stats(graph):
+    """Non-zero rows of every statistics table."""
+    return {table: sorted(tuple(row) for row in graph.conn.execute(sql))
+            for table, sql in STATS_TABLES.items()}
+
+
+def _recount(graph):
+    """Statistics recomputed from scratch by rebuild_stats()."""
+    assert graph.rebuild_stats()
+    return _stats(graph)
+
+
+def test_counters_match_recount():
+    """Every kind of write keeps the counters equal to a recount."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        graph = build_chain(db_path, 8)
+        graph.add_relationships_bulk([('pdca-0', 'pdca-5', 'REFERENCES'), ('pdca-0', 'pdca-6', None),
+                                      ('pdca-2', 'ghost', 'REFERENCES')])
+        # Replacing a node or an edge changes no counts
+        graph.add_pdca_node(make_pdca('pdca-3', 3, objective='Rewritten'))
+        graph.add_relationship('pdca-1', 'pdca-2', 'PRECEDES', 0.5)
+        graph.add_relationships_bulk([('pdca-0', 'pdca-5', 'REFERENCES', 2.0)] * 3)
+
+        # Raw SQL from another connection: update, delete an edge and a node
+        other = SQLiteGraph(db_path)
+        other.conn.execute("UPDATE pdca_relationships SET relationship_type = 'REFERENCES' "
+                           "WHERE from_pdca_id = 'pdca-4'")
+        other.conn.execute("DELETE FROM pdca_relationships WHERE from_pdca_id = 'pdca-6'")
+        other.conn.execute("DELETE FROM pdcas WHERE id = 'pdca-7'")
+        other.conn.commit()
+        other.close()
+
+        maintained = _stats(graph)
+        assert maintained == _recount(graph)
+        assert dict(maintained['pdca_graph_counters'])['node_count'] == 7
+        assert dict(maintained['pdca_edge_type_counts']) == {'PRECEDES': 5, 'REFERENCES': 3, '': 1}
+
+        stats = graph.get_graph_stats()
+        assert (stats['node_count'], stats['edge_count']) == (7, 9)
+        assert stats['most_connected_nodes'][0] == {'pdca_id': 'pdca-0', 'connection_count': 3}
+        assert graph.get_node_degree('pdca-5') == {'in_degree': 2, 'out_degree': 1}
+        assert graph.get_node_degree('pdca-5', 'REFERENCES') == {'in_degree': 2, 'out_degree': 0}
+        graph.close()
+
+
+def test_rebuild_repairs_drift():
+    """rebuild_stats() recomputes counters that were edited or lost."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = build_chain(os.path.join(tmp, 'graph.db'), 5)
+        expected = _stats(graph)
+        graph.conn.execute("UPDATE pdca_graph_counters SET value = 99")
+        graph.conn.execute("DELETE FROM pdca_node_degree WHERE pdca_id = 'pdca-2'")
+        graph.conn.execute("UPDATE pdca_edge_type_counts SET edge_count = 0")
+        graph.conn.commit()
+        assert _stats(graph) != expected
+
+        generation = graph.write_generation
+        assert _recount(graph) == expected
+        assert graph.write_generation == generation + 1
+        assert graph.get_graph_stats()['edge_count'] == 4
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_counters_match_recount()
+    test_rebuild_repairs_drift()
+    print("✓ Graph statistics tests passed")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test Subgraph Extraction
+Checks best-first ordering, deduplication across seeds, node and token
+budgets, and the induced relationships of SQLiteGraph.extract_subgraph().
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph, estimate_tokens
+from graph_algorithms import best_first_expand
+from graph_fixtures import BASE_TIMESTAMP, make_pdca
+
+DAY = 86400
+
+
+def _build(db_path):
+    """
+    root -> a -> a1, root -> b -> b1, a -> a2 (weak link), old -> root.
+
+    ``old`` is a month older than everything else.
+    """
+    graph = SQLiteGraph(db_path)
+    offsets = {'old': -30 * DAY, 'root': 0, 'a': 1, 'b': 2, 'a1': 3, 'a2': 4, 'b1': 5}
+    graph.add_pdca_nodes_bulk(
+        make_pdca(pdca_id, timestamp=BASE_TIMESTAMP + offset,
+                  objective='x' * (400 if pdca_id == 'b1' else 40))
+        for pdca_id, offset in offsets.items())
+    graph.add_relationships_bulk([
+        ('old', 'root'), ('root', 'a'), ('root', 'b'), ('a', 'a1'),
+        ('a', 'a2', 'PRECEDES', 0.1), ('b', 'b1'), ('a1', 'b1', 'REFERENCES')
+    ])
+    return graph
+
+
+def test_best_first_expand():
+    """Scores multiply along paths; cost and node budgets cut the weakest nodes."""
+    edges = {'s': [('x', 0.9), ('y', 0.5)], 'x': [('z', 0.9)], 'y': [('z', 1.0)], 't': [('x', 1.0)]}
+    expand = lambda nodes: {node: edges.get(node, []) for node in nodes}
+
+    result = best_first_expand(['s', 't', 's'], expand, max_hops=2)
+    assert [(node, round(score, 2), hops, via) for node, score, hops, via in result['nodes']] == \
+        [('s', 1.0, 0, None), ('t', 1.0, 0, None), ('x', 1.0, 1, 't'),
+         ('z', 0.9, 2, 'x'), ('y', 0.5, 1, 's')]
+    assert not result['truncated']
+
+    result = best_first_expand(['s'], expand, max_hops=1, node_budget=2)
+    assert [entry[0] for entry in result['nodes']] == ['s', 'x'] and result['truncated']
+
+    costs = {'s': 1, 'x': 5, 'y': 2, 'z': 1}
+    result = best_first_expand(['s'], expand, cost=costs.get, cost_budget=4)
+    assert [entry[0] for entry in result['nodes']] == ['s', 'y', 'z']
+    assert result['cost'] == 4 and result['truncated']
+
+
+def test_extract_subgraph():
+    """One call returns the deduplicated, budgeted neighborhood and its edges."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build(os.path.join(tmp, 'graph.db'))
+
+        subgraph = graph.extract_subgraph(['a1', 'b1', 'missing'], max_hops=2)
+        nodes = {row['id']: row for row in subgraph['nodes']}
+        assert [row['id'] for row in subgraph['nodes'][:2]] == ['a1', 'b1']
+        # a1 and b1 are linked, so each is found once as a seed
+        assert set(nodes) == {'a1', 'b1', 'a', 'b', 'root', 'a2'}
+        assert nodes['a']['hops'] == 1 and nodes['root']['hops'] == 2
+        assert nodes['a2']['via'] == 'a' and nodes['a2']['score'] < nodes['root']['score']
+        assert nodes['b1']['tokens'] == estimate_tokens('x' * 400) == 100
+        assert subgraph['tokens'] == sum(row['tokens'] for row in subgraph['nodes'])
+        assert sorted((edge['from_pdca_id'], edge['to_pdca_id']) for edge in subgraph['edges']) == \
+            [('a', 'a1'), ('a', 'a2'), ('a1', 'b1'), ('b', 'b1'), ('root', 'a'), ('root', 'b')]
+
+        # The weak and the month-old link lose against the strong recent ones
+        subgraph = graph.extract_subgraph(['a'], max_hops=2, node_budget=4,
+                                          relationship_types=['PRECEDES'])
+        assert [row['id'] for row in subgraph['nodes']] == ['a', 'a1', 'root', 'b']
+        assert subgraph['truncated']
+        subgraph = graph.extract_subgraph(['root'], max_hops=1, direction='in')
+        assert [row['id'] for row in subgraph['nodes']] == ['root', 'old']
+        assert subgraph['nodes'][1]['score'] < 0.1
+
+        # b1 (100 tokens) does not fit; the search keeps filling with cheaper nodes
+        subgraph = graph.extract_subgraph(['a1'], max_hops=3, token_budget=50,
+                                          relationship_types=['PRECEDES', 'REFERENCES'])
+        assert 'b1' not in {row['id'] for row in subgraph['nodes']}
+        assert subgraph['tokens'] <= 50 and len(subgraph['nodes']) == 5
+
+        subgraph = graph.extract_subgraph(['a1'], max_hops=1, relationship_types=['PRECEDES'])
+        assert [edge['relationship_type'] for edge in subgraph['edges']] == ['PRECEDES']
+        assert graph.extract_subgraph(['missing'])['nodes'] == []
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_best_first_expand()
+    test_extract_subgraph()
+    print("✓ Subgraph extraction tests passed")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test Graph Writer Service
+Checks group commits from many producer threads, per-write acknowledgements
+for rejected rows, the flush barrier, cancelled writes and failed batches,
+and writes over the Unix socket.
+"""
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from graph_writer_service import GraphWriterClient, GraphWriterService
+from graph_fixtures import make_pdca
+
+
+def _count(graph, table):
+    return graph.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_many_producers():
+    """Concurrent producers are acknowledged individually and share commits."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = SQLiteGraph(os.path.join(tmp, 'graph.db'), production=True)
+        service = GraphWriterService(graph, max_batch=64)
+        futures = []
+        futures_lock = threading.Lock()
+
+        def produce(producer):
+            mine = []
+            for i in range(50):
+                pdca_id = f'pdca-{producer}-{i:02d}'
+                mine.append(service.add_pdca_node(make_pdca(pdca_id, agent_name=f'Agent{producer}')))
+                if i:
+                    mine.append(service.add_relationship(f'pdca-{producer}-{i - 1:02d}', pdca_id))
+            with futures_lock:
+                futures.extend(mine)
+
+        producers = [threading.Thread(target=produce, args=(p,)) for p in range(8)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        assert service.flush()
+        assert all(future.done() and future.result() for future in futures)
+
+        stats = service.stats()
+        assert stats['written'] == len(futures) == 8 * 99
+        assert stats['batches'] < stats['written'] and stats['largest_batch'] <= 64
+        assert _count(graph, 'pdcas') == 400 and _count(graph, 'pdca_relationships') == 392
+        assert [row['id'] for row in graph.get_successors('pdca-3-10')] == ['pdca-3-11']
+        service.close()
+        graph.close()
+
+
+def test_rejected_rows_and_flush():
+    """A bad row fails alone, and flush() waits for everything queued before it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        # A long latency window puts all of these writes in one batch
+        service = GraphWriterService(db_path, max_latency=0.5)
+        good = service.add_pdca_node(make_pdca('pdca-1'))
+        bad = service.add_pdca_node({'id': 'pdca-2', 'agent_role': 'Testing'})
+        link = service.add_relationship('pdca-1', 'pdca-3', 'REFERENCES', 0.5, {'source': 'feedback'})
+        also_good = service.add_pdca_node(make_pdca('pdca-3'))
+        assert not good.done()
+        assert service.flush(durable=True)
+        assert good.result() and also_good.result() and link.result()
+        assert bad.result() is False
+
+        stats = service.stats()
+        assert (stats['written'], stats['rejected'], stats['batches']) == (3, 1, 1)
+        assert stats['flushes'] == 1
+        successor = service.graph.get_successors('pdca-1', 'REFERENCES')[0]
+        assert successor['id'] == 'pdca-3' and successor['metadata'] == {'source': 'feedback'}
+        service.close()
+
+        try:
+            service.add_pdca_node(make_pdca('pdca-4'))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("expected RuntimeError after close()")
+        graph = SQLiteGraph(db_path)
+        assert graph.get_pdca_node('pdca-2') is None and graph.get_pdca_node('pdca-3')
+        graph.close()
+
+
+def test_cancelled_writes_and_failed_batches():
+    """Cancelled futures drop their write; a failing batch does not stop the writer."""
+    with tempfile.TemporaryDirectory() as tmp:
+        service = GraphWriterService(os.path.join(tmp, 'graph.db'), max_latency=0.2)
+        cancelled = service.add_pdca_node(make_pdca('pdca-1'))
+        assert cancelled.cancel()
+        assert service.add_pdca_node(make_pdca('pdca-2')).result(timeout=2)
+        assert service.graph.get_pdca_node('pdca-1') is None
+        assert service.stats()['cancelled'] == 1
+
+        def broken(writes):
+            raise RuntimeError("writer bug")
+        service._commit = broken
+        failed = service.add_pdca_node(make_pdca('pdca-3'))
+        assert isinstance(failed.exception(timeout=2), RuntimeError)
+        del service._commit
+        assert service.add_pdca_node(make_pdca('pdca-4')).result(timeout=2)
+        assert service.flush(timeout=2)
+        service.close()
+
+
+def test_unix_socket():
+    """Clients in other processes get the same acknowledgements over the socket."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'graph.db')
+        socket_path = os.path.join(tmp, 'writer.sock')
+        service = GraphWriterService(db_path)
+        service.serve(socket_path)
+
+        clients = [GraphWriterClient(socket_path) for _ in range(3)]
+        futures = []
+        for c, client in enumerate(clients):
+            for i in range(20):
+                futures.append(client.add_pdca_node(make_pdca(f'pdca-{c}-{i:02d}')))
+            futures.append(client.add_relationship(f'pdca-{c}-00', f'pdca-{c}-01',
+                                                   metadata={'source': 'socket'}))
+        rejected = clients[0].add_pdca_node({'id': 'no-fields'})
+        assert clients[1].flush(durable=True)
+        assert all(future.result() for future in futures)
+        assert rejected.result() is False
+
+        # Unknown operations are answered with an error rather than dropped
+        assert clients[2]._request({'op': 'delete', 'pdca_id': 'pdca-0-00'}).result() is False
+        for client in clients:
+            client.close()
+
+        graph = service.graph
+        assert _count(graph, 'pdcas') == 60 and _count(graph, 'pdca_relationships') == 3
+        service.close()
+        assert not os.path.exists(socket_path)
+
+
+if __name__ == "__main__":
+    test_many_producers()
+    test_rejected_rows_and_flush()
+    test_cancelled_writes_and_failed_batches()
+    test_unix_socket()
+    print("✓ Graph writer service tests passed")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test Journal Indexer
+Builds a small journal tree and checks filename/content parsing, breadcrumb
+links, that re-runs only reprocess new or changed files, and that deleted
+files leave the graph.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from journal_indexer import JournalIndexer, parse_breadcrumbs, parse_filename
+
+IDS = [
+    '20241027-090000-SaveRestartAgent.ProcessOrchestration',
+    '20241027-100000-BuilderAgent.ComponentDevelopment',
+    '20241027-110000-TesterAgent.QualityAssurance',
+    '20241028-090000-RefinerAgent.ProcessOptimization'
+]
+
+
+def _write_journal(root):
+    """Four PDCAs, each linking back to its predecessor; every other one in a subdirectory."""
+    paths = []
+    for i, pdca_id in enumerate(IDS):
+        directory = os.path.join(root, 'sessions') if i % 2 else root
+        os.makedirs(directory, exist_ok=True)
+        previous = f"**Previous PDCA:** [{IDS[i - 1]}.pdca.md](../{IDS[i - 1]}.pdca.md)\n" if i else ""
+        path = os.path.join(directory, f"{pdca_id}.pdca.md")
+        with open(path, 'w') as f:
+            f.write(f"# PDCA\n\n**Branch:** dev/rag\n**CMM Level:** 3\n{previous}\n"
+                    f"## Objective\n\nObjective {i}\n\n## Plan\n")
+        paths.append(path)
+    return paths
+
+
+def test_parsing():
+    """Filename metadata, fallbacks and breadcrumb orientation."""
+    meta = parse_filename(IDS[1] + '.pdca.md', 0)
+    assert meta == {'id': IDS[1], 'agent_name': 'BuilderAgent', 'agent_role': 'ComponentDevelopment',
+                    'date': '2024-10-27', 'timestamp': 1730023200}
+    assert parse_filename('notes.pdca.md', 86400)['agent_name'] == 'Unknown'
+
+    content = (f"Previous: [{IDS[0]}.pdca.md]\n"
+               f"Next: [{IDS[2]}.pdca.md]\n"
+               f"See also {IDS[3]}.pdca.md\n")
+    links = {(a, b) for a, b, *_ in parse_breadcrumbs(IDS[1], content)}
+    assert links == {(IDS[0], IDS[1]), (IDS[1], IDS[2]), (IDS[1], IDS[3])}
+
+    # Each unmarked link on a line is oriented on its own
+    content = f"See [{IDS[0]}.pdca.md] and [{IDS[2]}.pdca.md]\n"
+    links = {(a, b) for a, b, *_ in parse_breadcrumbs(IDS[1], content)}
+    assert links == {(IDS[0], IDS[1]), (IDS[1], IDS[2])}
+
+    # Direction words must be whole words
+    content = (f"Feedback from [{IDS[2]}.pdca.md]\n"
+               f"Context: [{IDS[0]}.pdca.md]\n"
+               f"Background in [{IDS[3]}.pdca.md]\n")
+    links = {(a, b) for a, b, *_ in parse_breadcrumbs(IDS[1], content)}
+    assert links == {(IDS[0], IDS[1]), (IDS[1], IDS[2]), (IDS[1], IDS[3])}
+    content = f"Back to [{IDS[2]}.pdca.md]\n"
+    assert [(a, b) for a, b, *_ in parse_breadcrumbs(IDS[1], content)] == [(IDS[2], IDS[1])]
+
+
+def test_incremental_indexing():
+    """Unchanged files are skipped; edits and touches are told apart."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'journal')
+        paths = _write_journal(root)
+        graph = SQLiteGraph(os.path.join(tmp, 'journal.db'))
+        indexer = JournalIndexer(graph, root, workers=1)
+
+        report = indexer.run()
+        assert report['indexed'] == 4 and report['relationships'] == 3
+        node = graph.get_pdca_node(IDS[2])
+        assert (node['branch'], node['cmm_level'], node['objective']) == ('dev/rag', 3, 'Objective 2')
+        assert [p['id'] for p in graph.get_breadcrumb_navigation(IDS[3])['predecessors']] == IDS[2::-1]
+
+        report = indexer.run()
+        assert report['unchanged'] == 4 and report['parsed'] == 0
+
+        os.utime(paths[0], (1, 1))
+        with open(paths[2], 'w') as f:
+            f.write(f"**Previous PDCA:** [{IDS[0]}.pdca.md]\n")
+        report = indexer.run()
+        assert (report['parsed'], report['touched'], report['indexed']) == (2, 1, 1)
+        assert [p['id'] for p in graph.get_predecessors(IDS[2])] == [IDS[0]]
+        graph.close()
+
+
+def test_deleted_and_failed_files():
+    """Deleted files lose their node and links; moved files keep theirs; failures retry."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'journal')
+        paths = _write_journal(root)
+        graph = SQLiteGraph(os.path.join(tmp, 'journal.db'))
+        indexer = JournalIndexer(graph, root, workers=1)
+        indexer.run()
+
+        os.remove(paths[1])
+        shutil.move(paths[0], os.path.join(root, 'sessions'))
+        report = indexer.run()
+        assert (report['missing'], report['removed'], report['parsed']) == (2, 1, 1)
+        assert graph.get_pdca_node(IDS[1]) is None
+        assert graph.get_pdca_node(IDS[0]) is not None
+        assert graph.get_successors(IDS[0]) == [] and graph.get_predecessors(IDS[2]) == []
+        assert [p['id'] for p in graph.get_predecessors(IDS[3])] == [IDS[2]]
+        assert graph.get_graph_stats()['node_count'] == 3
+
+        # A file whose node cannot be written is not recorded, so it is retried
+        with open(os.path.join(root, 'notes.pdca.md'), 'w') as f:
+            f.write("## Objective\n\nNotes\n")
+        add_nodes = graph.add_pdca_nodes_bulk
+        graph.add_pdca_nodes_bulk = lambda pdcas: add_nodes(
+            dict(pdca, agent_name=None) if pdca['id'] == 'notes' else pdca for pdca in pdcas)
+        report = indexer.run()
+        assert report['failed'] == 1 and report['errors'][0]['path'].endswith('notes.pdca.md')
+        del graph.add_pdca_nodes_bulk
+        report = indexer.run()
+        assert (report['parsed'], report['indexed'], report['failed']) == (1, 1, 0)
+        assert graph.get_pdca_node('notes')['objective'] == 'Notes'
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_parsing()
+    test_incremental_indexing()
+    test_deleted_and_failed_files()
+    print("✓ Journal indexer tests passed")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test Date-Partitioned Graph
+Checks monthly routing, cross-partition relationships, pruned timelines
+under the attach limit, dropping / rebuilding a month, and nodes moving
+between months with their relationships.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from partitioned_graph import PartitionedGraph, partition_bounds
+from graph_fixtures import make_pdca
+
+OCT, NOV, DEC = (partition_bounds(name)[0] for name in ('2024-10', '2024-11', '2024-12'))
+
+
+def _pdca(pdca_id, timestamp):
+    agent_name = 'BuilderAgent' if pdca_id.endswith(('0', '2', '4')) else 'TesterAgent'
+    return make_pdca(pdca_id, timestamp=timestamp, agent_name=agent_name,
+                     objective=f'Objective {pdca_id}')
+
+
+def _build(directory, **kwargs):
+    """Five PDCAs per month for three months, chained across month boundaries."""
+    graph = PartitionedGraph(directory, **kwargs)
+    pdcas = [_pdca(f'{month}-{i}', start + i * 3600)
+             for month, start in (('oct', OCT), ('nov', NOV), ('dec', DEC)) for i in range(5)]
+    result = graph.add_pdca_nodes_bulk(pdcas)
+    assert result['inserted'] == 15 and result['failed'] == 0
+    chain = [(a['id'], b['id'], 'PRECEDES', 1.0, {'step': i})
+             for i, (a, b) in enumerate(zip(pdcas, pdcas[1:]))]
+    result = graph.add_relationships_bulk(chain + [('ghost', 'oct-0')])
+    assert result['inserted'] == 14 and result['failed'] == 1
+    return graph, pdcas
+
+
+def test_routing_and_pruned_timeline():
+    """Lookups cross month boundaries; timelines read only overlapping months."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, pdcas = _build(tmp, max_attached=2)
+        assert [p['name'] for p in graph.partitions()] == ['2024-10', '2024-11', '2024-12']
+        assert graph.get_pdca_node('nov-3')['timestamp'] == NOV + 3 * 3600
+
+        # oct-4 -> nov-0 is stored in October and indexed as cross-partition
+        assert [row['id'] for row in graph.get_successors('oct-4')] == ['nov-0']
+        assert graph.get_successors('oct-4')[0]['metadata'] == {'step': 4}
+        assert [row['id'] for row in graph.get_predecessors('nov-0')] == ['oct-4']
+        assert [row['id'] for row in graph.get_successors('nov-1')] == ['nov-2']
+        graph.close()
+
+        graph = PartitionedGraph(tmp, max_attached=2)
+        recent = graph.timeline(start_timestamp=DEC, descending=True, page_size=3)
+        assert [row['id'] for row in recent['pdcas']] == ['dec-4', 'dec-3', 'dec-2']
+        assert list(graph._attached) == ['2024-12']
+
+        # Paging through all months, two attached at a time
+        ids, cursor = [], None
+        while True:
+            page = graph.timeline(page_size=4, cursor=cursor)
+            ids += [row['id'] for row in page['pdcas']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert ids == [p['id'] for p in pdcas]
+        assert len(graph._attached) <= 2
+        assert graph.count() == 15
+        assert graph.count(start_timestamp=NOV, agent_name='BuilderAgent') == 6
+        graph.close()
+
+
+def test_drop_rebuild_and_move():
+    """Dropping and rebuilding a month are file swaps that keep routing consistent."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, pdcas = _build(tmp)
+        assert graph.drop_partition('2024-10') and not graph.drop_partition('2024-10')
+        assert not os.path.exists(os.path.join(tmp, 'pdcas-2024-10.db'))
+        assert graph.get_pdca_node('oct-1') is None
+        assert graph.get_predecessors('nov-0') == []
+        assert graph.count() == 10
+
+        november = [_pdca(f'nov-{i}', NOV + i * 3600) for i in range(3)] + [_pdca('late', DEC + 60)]
+        result = graph.rebuild_partition('2024-11', november, [
+            ('nov-0', 'nov-1'), ('nov-2', 'dec-0', 'PRECEDES', 0.5), ('dec-0', 'nov-0')])
+        assert result['nodes']['inserted'] == 3
+        assert [error['index'] for error in result['nodes']['errors']] == [3]
+        assert result['relationships']['inserted'] == 2
+        assert [error['index'] for error in result['relationships']['errors']] == [2]
+        assert graph.get_pdca_node('nov-4') is None
+        assert [row['id'] for row in graph.get_successors('nov-2')] == ['dec-0']
+        assert [row['id'] for row in graph.get_predecessors('dec-0')] == ['nov-2']
+
+        # A node re-indexed with a later timestamp moves to its new month
+        graph.add_pdca_nodes_bulk([_pdca('nov-1', DEC + 7200)])
+        assert graph.count(start_timestamp=NOV, end_timestamp=DEC) == 2
+        assert graph.get_pdca_node('nov-1')['timestamp'] == DEC + 7200
+        assert [row['id'] for row in graph.get_predecessors('nov-1')] == ['nov-0']
+        graph.close()
+
+
+def _cross_edges(graph, pdca_id):
+    return sorted(tuple(row) for row in graph.conn.execute("""
+        SELECT from_pdca_id, to_pdca_id, from_partition, to_partition FROM pdca_cross_edges
+        WHERE from_pdca_id = ? OR to_pdca_id = ?
+    """, (pdca_id, pdca_id)))
+
+
+def test_moved_node_keeps_relationships():
+    """A node moving to another month takes its outgoing relationships along."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, _ = _build(tmp)
+        graph.add_relationships_bulk([('nov-2', 'dec-1', 'REFERENCES', 0.3, {'k': 1}),
+                                      ('nov-2', 'oct-0', 'REFERENCES'),
+                                      ('dec-4', 'nov-2')])
+        before = graph.get_successors('nov-2')
+
+        result = graph.add_pdca_nodes_bulk([_pdca('nov-2', DEC + 30 * 60)])
+        assert result['replaced'] + result['inserted'] == 1
+        november = graph._partition('2024-11')
+        assert november.conn.execute("SELECT COUNT(*) FROM pdca_relationships "
+                                     "WHERE from_pdca_id = 'nov-2'").fetchone()[0] == 0
+
+        # Weight, metadata and link time survive the move
+        after = graph.get_successors('nov-2')
+        assert [row['id'] for row in after] == ['nov-3']
+        assert [(row['weight'], row['metadata'], row['relationship_created']) for row in after] == \
+            [(row['weight'], row['metadata'], row['relationship_created']) for row in before]
+        references = {row['id']: row for row in graph.get_successors('nov-2', 'REFERENCES')}
+        assert set(references) == {'dec-1', 'oct-0'}
+        assert (references['dec-1']['weight'], references['dec-1']['metadata']) == (0.3, {'k': 1})
+        assert [row['id'] for row in graph.get_predecessors('nov-3')] == ['nov-2']
+        assert [row['id'] for row in graph.get_predecessors('dec-1', 'REFERENCES')] == ['nov-2']
+        assert {row['id'] for row in graph.get_predecessors('nov-2')} == {'nov-1', 'dec-4'}
+
+        # Only links that now cross a month boundary are indexed as cross-partition
+        assert _cross_edges(graph, 'nov-2') == [
+            ('nov-1', 'nov-2', '2024-11', '2024-12'),
+            ('nov-2', 'nov-3', '2024-12', '2024-11'),
+            ('nov-2', 'oct-0', '2024-12', '2024-10')]
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_routing_and_pruned_timeline()
+    test_drop_rebuild_and_move()
+    test_moved_node_keeps_relationships()
+    print("✓ Partitioned graph tests passed")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test Temporal Query Tier (Tier 3)
+Checks timeline results and keyset pagination, and uses EXPLAIN QUERY PLAN
+to guarantee every timeline query is served by its composite index without
+a full scan or a sort.
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from temporal_index import TemporalIndex, day_range
+from graph_fixtures import BASE_TIMESTAMP, make_pdcas
+
+AGENTS = ['SaveRestartAgent', 'BuilderAgent', 'TesterAgent', 'RefinerAgent']
+ROLES = ['ProcessOrchestration', 'ComponentDevelopment', 'QualityAssurance']
+LOCAL_TIME = timezone(timedelta(hours=2))  # the agents' wall clock
+
+
+def _local_date(timestamp):
+    return datetime.fromtimestamp(timestamp, LOCAL_TIME).strftime('%Y-%m-%d')
+
+
+def _build_graph(db_path, count=500):
+    """Create a graph with one PDCA every 30 minutes, dated in local time."""
+    graph = SQLiteGraph(db_path)
+    graph.add_pdca_nodes_bulk(make_pdcas(
+        count, id_format='pdca-{i:05d}', spacing=1800,
+        agent_name=lambda i: AGENTS[i % len(AGENTS)],
+        agent_role=lambda i: ROLES[i % len(ROLES)],
+        date=lambda i: _local_date(BASE_TIMESTAMP + i * 1800)))
+    return graph
+
+
+def _assert_indexed(plan, index_name):
+    """The plan uses ``index_name`` and never scans the table or sorts."""
+    details = ' | '.join(plan)
+    assert index_name in details, details
+    assert 'USE TEMP B-TREE' not in details, details
+    assert 'SCAN p' not in plan, details  # bare table scan
+
+
+def test_timeline_query_plans():
+    """Every timeline query shape is served by its composite index."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'temporal.db'))
+        temporal = TemporalIndex(graph)
+
+        _assert_indexed(temporal.explain(start_timestamp=1, end_timestamp=2),
+                        'idx_pdcas_timestamp')
+        _assert_indexed(temporal.explain(cursor=[BASE_TIMESTAMP, 'pdca-00001']),
+                        'idx_pdcas_timestamp')
+        _assert_indexed(temporal.explain(descending=True), 'idx_pdcas_timestamp')
+        _assert_indexed(temporal.explain('agent_name', 'BuilderAgent', start_timestamp=1,
+                                         cursor=[BASE_TIMESTAMP, 'pdca-00001']),
+                        'idx_pdcas_agent_timestamp')
+        _assert_indexed(temporal.explain('agent_role', 'QualityAssurance', descending=True,
+                                         cursor=[BASE_TIMESTAMP, 'pdca-00001']),
+                        'idx_pdcas_role_timestamp')
+        _assert_indexed(temporal.explain('date', '2024-10-27',
+                                         cursor=[BASE_TIMESTAMP, 'pdca-00001']),
+                        'idx_pdcas_date_timestamp')
+        graph.close()
+
+
+def test_timeline_pagination():
+    """Keyset pages cover the range exactly once, in order."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'temporal.db'))
+        temporal = TemporalIndex(graph)
+
+        seen = []
+        cursor = None
+        while True:
+            page = temporal.agent_timeline('TesterAgent', page_size=17, cursor=cursor)
+            seen.extend(pdca['id'] for pdca in page['pdcas'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        expected = [f'pdca-{i:05d}' for i in range(500) if AGENTS[i % len(AGENTS)] == 'TesterAgent']
+        assert seen == expected
+
+        newest = temporal.role_timeline('ComponentDevelopment', page_size=3, descending=True)
+        assert [pdca['id'] for pdca in newest['pdcas']] == ['pdca-00499', 'pdca-00496', 'pdca-00493']
+        graph.close()
+
+
+def test_time_ranges_and_after_pdca():
+    """Range bounds, per-day views, 'after PDCA X' and counts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = _build_graph(os.path.join(tmp, 'temporal.db'))
+        temporal = TemporalIndex(graph)
+
+        start, end = day_range('2024-10-27')
+        day = temporal.timeline(start, end, page_size=1000)['pdcas']
+        assert len(day) == 28  # 10:00 to 23:30 UTC, every 30 minutes
+        assert temporal.count(start, end) == 28
+
+        # on_date() follows the date column (local), not the UTC day
+        dated = temporal.on_date('2024-10-27', page_size=10)
+        assert [pdca['id'] for pdca in dated['pdcas']] == [f'pdca-{i:05d}' for i in range(10)]
+        rest = temporal.on_date('2024-10-27', page_size=100, cursor=dated['next_cursor'])
+        assert [pdca['id'] for pdca in rest['pdcas']] == [f'pdca-{i:05d}' for i in range(10, 24)]
+        assert rest['next_cursor'] is None
+        assert {pdca['date'] for pdca in day[24:]} == {'2024-10-28'}
+        assert temporal.on_date('2024-10-01')['pdcas'] == []
+
+        after = temporal.after_pdca('pdca-00495', page_size=10)
+        assert [pdca['id'] for pdca in after['pdcas']] == [f'pdca-{i:05d}' for i in range(496, 500)]
+        assert after['next_cursor'] is None
+        assert temporal.after_pdca('missing')['pdcas'] == []
+
+        # The same bounds applied to a candidate set
+        candidates = ['pdca-00003', 'pdca-00010', 'pdca-00030', 'pdca-00495', 'pdca-00499', 'missing']
+        assert sorted(temporal.within(candidates, start, end)) == ['pdca-00003', 'pdca-00010']
+        assert sorted(temporal.within(candidates, after_pdca_id='pdca-00495')) == ['pdca-00499']
+        assert sorted(temporal.within(candidates, end_timestamp=end, after_pdca_id='pdca-00003')) == \
+            ['pdca-00010']
+        assert len(temporal.within(candidates, after_pdca_id='missing')) == 5
+        assert temporal.within(candidates)['pdca-00030']['agent_name'] == AGENTS[30 % len(AGENTS)]
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_timeline_query_plans()
+    test_timeline_pagination()
+    test_time_ranges_and_after_pdca()
+    print("✓ Temporal index tests passed")
@@ -2,33 +2,45 @@
 """
 Test Three-Tier RAG System with SQLite Graph
 Demonstrates the complete three-tier RAG system:
-1. ChromaDB - Vector similarity search
+1. Embedded vector store - Vector similarity search
 2. SQLite Graph - Breadcrumb navigation
 3. SQLite - Temporal queries
 """
 
 import sys
 import os
+import tempfile
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from sqlite_graph import SQLiteGraph
-import sqlite3
+from temporal_index import TemporalIndex
+from vector_store import LocalVectorStore
+from three_tier_retriever import ThreeTierRetriever
 import json
 from datetime import datetime
 
 def test_three_tier_rag():
-    """Test the complete three-tier RAG system."""
+    """Test the complete three-tier RAG system on a scratch database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _run_three_tier_rag(os.path.join(tmp, "pdca_timeline.db"))
+
+
+def _run_three_tier_rag(db_path):
+    """Load the sample PDCAs into ``db_path`` and query every tier."""
     print("Testing Three-Tier RAG System")
     print("=" * 50)
     
     # Initialize SQLite Graph (Tier 2)
     print("1. Initializing SQLite Graph (Tier 2)...")
-    graph = SQLiteGraph("pdca_timeline.db")
+    graph = SQLiteGraph(db_path)
     
-    # Initialize SQLite for temporal queries (Tier 3)
-    print("2. Initializing SQLite Temporal Database (Tier 3)...")
-    temporal_conn = sqlite3.connect("pdca_timeline.db")
-    temporal_conn.row_factory = sqlite3.Row
+    # Initialize indexed temporal queries on the same database (Tier 3)
+    print("2. Initializing SQLite Temporal Index (Tier 3)...")
+    temporal = TemporalIndex(graph)
+    
+    # Initialize embedded vector search on the same database (Tier 1)
+    print("   Initializing embedded vector store (Tier 1)...")
+    vectors = LocalVectorStore(graph)
     
     # Sample data for testing
     sample_pdcas = [
@@ -66,25 +78,10 @@ def test_three_tier_rag():
         }
     ]
     
-    # Add PDCAs to both graph and temporal database
+    # Graph and temporal tiers share the pdcas table
     print("3. Adding PDCAs to both tiers...")
     for pdca in sample_pdcas:
-        # Add to graph
         graph.add_pdca_node(pdca)
-        
-        # Add to temporal database
-        cursor = temporal_conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO pdcas (
-                id, agent_name, agent_role, date, timestamp,
-                session_id, branch, sprint, cmm_level, task_type,
-                objective, quality_score, verification_status, file_path
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            pdca['id'], pdca['agent_name'], pdca['agent_role'], pdca['date'],
-            pdca['timestamp'], '', '', '', 0, '', pdca['objective'], 0.0, '', ''
-        ))
-        temporal_conn.commit()
     
     # Add relationships to graph
     print("4. Adding relationships to graph...")
@@ -100,20 +97,25 @@ def test_three_tier_rag():
     for from_id, to_id in relationships:
         graph.add_relationship(from_id, to_id)
     
+    # Embed objectives as one chunk per PDCA
+    vectors.add_texts((f"{pdca['id']}#0", pdca['id'], pdca['objective']) for pdca in sample_pdcas)
+    
     print("✓ Data added to all tiers")
     
-    # Test Tier 1: ChromaDB (simulated)
+    # Test Tier 1: Embedded vector search
     print("\n" + "=" * 50)
-    print("TIER 1: ChromaDB Vector Search (Simulated)")
+    print("TIER 1: Embedded Vector Search")
     print("=" * 50)
     
-    # Simulate ChromaDB query
     query = "RAG system implementation and testing"
     print(f"Query: '{query}'")
-    print("Simulated ChromaDB results:")
-    print("  1. 20241027-100000-BuilderAgent.ComponentDevelopment (0.95)")
-    print("  2. 20241027-110000-TesterAgent.QualityAssurance (0.89)")
-    print("  3. 20241028-090000-RefinerAgent.ProcessOptimization (0.82)")
+    print("Vector results:")
+    for i, hit in enumerate(vectors.query_text(query, k=3, group_by_pdca=True)):
+        print(f"  {i+1}. {hit['pdca_id']} ({hit['score']:.2f})")
+    
+    print("Vector results for TesterAgent only (SQL pre-filter):")
+    for hit in vectors.query_text(query, k=3, agent_name='TesterAgent'):
+        print(f"  -> {hit['pdca_id']} ({hit['score']:.2f})")
     
     # Test Tier 2: SQLite Graph
     print("\n" + "=" * 50)
@@ -151,35 +153,17 @@ def test_three_tier_rag():
     
     # Query by date
     print("PDCAs from 2024-10-27:")
-    cursor = temporal_conn.cursor()
-    cursor.execute("""
-        SELECT agent_name, agent_role, objective 
-        FROM pdcas 
-        WHERE date = '2024-10-27'
-        ORDER BY timestamp
-    """)
-    for row in cursor.fetchall():
+    for row in temporal.on_date('2024-10-27')['pdcas']:
         print(f"  {row['agent_name']} ({row['agent_role']}): {row['objective']}")
     
     # Query by agent
     print(f"\nAll PDCAs by SaveRestartAgent:")
-    cursor.execute("""
-        SELECT date, objective 
-        FROM pdcas 
-        WHERE agent_name = 'SaveRestartAgent'
-        ORDER BY timestamp
-    """)
-    for row in cursor.fetchall():
+    for row in temporal.agent_timeline('SaveRestartAgent')['pdcas']:
         print(f"  {row['date']}: {row['objective']}")
     
     # Query timeline
     print(f"\nTimeline (all PDCAs):")
-    cursor.execute("""
-        SELECT agent_name, date, objective 
-        FROM pdcas 
-        ORDER BY timestamp
-    """)
-    for row in cursor.fetchall():
+    for row in temporal.timeline()['pdcas']:
         print(f"  {row['date']} - {row['agent_name']}: {row['objective']}")
     
     # Test integrated query (simulating real RAG usage)
@@ -188,24 +172,25 @@ def test_three_tier_rag():
     print("=" * 50)
     
     print("Scenario: User asks 'What happened after the RAG system was built?'")
-    print("\nStep 1: ChromaDB finds relevant PDCAs")
-    print("  -> 20241027-100000-BuilderAgent.ComponentDevelopment (RAG building)")
-    
-    print("\nStep 2: Graph navigation finds what happened next")
-    successors = graph.get_successors('20241027-100000-BuilderAgent.ComponentDevelopment')
-    for succ in successors:
-        print(f"  -> {succ['agent_name']}: {succ['objective']}")
-    
-    print("\nStep 3: Temporal query provides context")
-    cursor.execute("""
-        SELECT agent_name, date, objective 
-        FROM pdcas 
-        WHERE timestamp > 1730026800
-        ORDER BY timestamp
-    """)
-    print("  Timeline after RAG building:")
-    for row in cursor.fetchall():
-        print(f"    {row['date']} - {row['agent_name']}: {row['objective']}")
+    retriever = ThreeTierRetriever(graph, vectors)
+    response = retriever.retrieve("build RAG system components", k=5, vector_k=2,
+                                  hops=2, direction='out')
+    
+    print("\nFused results (vector -> graph -> temporal):")
+    for hit in response['results']:
+        print(f"  {hit['score']:.2f}  {hit['agent_name']}: {hit['objective']} "
+              f"(similarity {hit['similarity']:.2f}, hops {hit['graph_distance']})")
+    
+    print("\nSame question in timeline order, after the BuilderAgent PDCA:")
+    response = retriever.retrieve("build RAG system components", k=5, vector_k=2, hops=2,
+                                  after_pdca_id='20241027-100000-BuilderAgent.ComponentDevelopment',
+                                  order='timeline')
+    for hit in response['results']:
+        print(f"    {hit['date']} - {hit['agent_name']}: {hit['objective']}")
+    
+    print("\nStage latency (ms):")
+    for stage, elapsed in response['timings'].items():
+        print(f"  {stage}: {elapsed:.2f}")
     
     # Get final statistics
     print("\n" + "=" * 50)
@@ -218,15 +203,12 @@ def test_three_tier_rag():
     print(f"  Edges: {graph_stats['edge_count']}")
     print(f"  Density: {graph_stats['density']:.3f}")
     
-    cursor.execute("SELECT COUNT(*) as count FROM pdcas")
-    pdca_count = cursor.fetchone()['count']
-    print(f"Temporal Database: {pdca_count} PDCAs")
+    print(f"Temporal Index: {temporal.count()} PDCAs")
     
-    print(f"\nChromaDB: Simulated (would contain vector embeddings)")
+    print(f"Vector Store: {vectors.count()} embeddings")
     
     # Cleanup
     graph.close()
-    temporal_conn.close()
     
     print("\n✓ Three-tier RAG system test completed successfully!")
     print("✓ All tiers working correctly!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test Fused Three-Tier Retrieval
+Checks graph expansion, temporal filtering, fusion order, the timing
+breakdown and the budget cut-off of ThreeTierRetriever.
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlite_graph import SQLiteGraph
+from vector_store import LocalVectorStore
+from three_tier_retriever import ThreeTierRetriever
+from graph_fixtures import BASE_TIMESTAMP, chain_links, make_pdcas
+
+OBJECTIVES = [
+    'Design vector index schema',
+    'Build vector index ingestion',
+    'Test vector index recall',
+    'Tune sqlite page cache',
+    'Write release notes'
+]
+
+
+def _build(db_path):
+    """A PRECEDES chain of five PDCAs, one hour apart, with embedded objectives."""
+    graph = SQLiteGraph(db_path)
+    graph.add_pdca_nodes_bulk(make_pdcas(len(OBJECTIVES), spacing=3600,
+                                         objective=lambda i: OBJECTIVES[i]))
+    graph.add_relationships_bulk(chain_links(len(OBJECTIVES)))
+    vectors = LocalVectorStore(graph)
+    vectors.add_texts((f'pdca-{i}#0', f'pdca-{i}', objective) for i, objective in enumerate(OBJECTIVES))
+    return graph, ThreeTierRetriever(graph, vectors)
+
+
+def test_fused_ranking_and_expansion():
+    """Vector hits rank first; graph neighbors are added with their distance."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, retriever = _build(os.path.join(tmp, 'retriever.db'))
+        response = retriever.retrieve('test vector index recall', k=10, vector_k=1, hops=2)
+
+        results = response['results']
+        assert [hit['id'] for hit in results] == ['pdca-2', 'pdca-3', 'pdca-4']
+        assert [hit['graph_distance'] for hit in results] == [0, 1, 2]
+        assert results[1]['via'] == 'pdca-2'
+        # Expanded rows carry exactly the fields of vector-seeded rows
+        assert all(set(hit) == set(results[0]) for hit in results)
+        assert 'relationship_type' not in results[1] and 'direction' not in results[1]
+        assert set(response['timings']) == {'vector', 'graph', 'temporal', 'fusion', 'total'}
+        graph.close()
+
+
+def test_temporal_filters_and_timeline_order():
+    """Time-range and after-PDCA filters apply to expanded candidates too."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, retriever = _build(os.path.join(tmp, 'retriever.db'))
+        response = retriever.retrieve('vector index', k=10, vector_k=3, hops=3,
+                                      after_pdca_id='pdca-1',
+                                      end_timestamp=BASE_TIMESTAMP + 4 * 3600,
+                                      order='timeline')
+        assert [hit['id'] for hit in response['results']] == ['pdca-2', 'pdca-3']
+        graph.close()
+
+
+def test_budget_skips_graph_stage():
+    """With the total budget spent, graph is skipped and the other stages limited to k."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, retriever = _build(os.path.join(tmp, 'retriever.db'))
+        response = retriever.retrieve('test vector index recall', vector_k=1, hops=2)
+        assert response['skipped'] == [] and response['limited'] == []
+
+        retriever.budgets['total'] = 0.0
+        response = retriever.retrieve('test vector index recall', vector_k=1, hops=2)
+        assert response['skipped'] == ['graph']
+        assert response['limited'] == ['vector', 'temporal']
+        assert 'graph' not in response['timings']
+        assert [hit['id'] for hit in response['results']] == ['pdca-2']
+
+        # Vector hits are capped at k before any rows are fetched
+        fetched = []
+        within = retriever.temporal.within
+        retriever.temporal.within = lambda pdca_ids, *bounds: fetched.extend(pdca_ids) or \
+            within(pdca_ids, *bounds)
+        response = retriever.retrieve('vector index', k=2, vector_k=5)
+        assert len(response['results']) == 2 and len(fetched) == 2
+
+        # A graph stage that spends the budget leaves the temporal stage k candidates
+        def slow_graph(request, state):
+            retriever.graph_stage(request, state)
+            time.sleep(0.02)
+        retriever.budgets['total'] = 0.01
+        retriever.stages[1] = ('graph', slow_graph)
+        response = retriever.retrieve('test vector index recall', k=2, vector_k=1, hops=2)
+        assert response['limited'] == ['temporal']
+        assert [hit['id'] for hit in response['results']] == ['pdca-2', 'pdca-3']
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_fused_ranking_and_expansion()
+    test_temporal_filters_and_timeline_order()
+    test_budget_skips_graph_stage()
+    print("✓ Three-tier retriever tests passed")
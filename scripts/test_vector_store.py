@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test Embedded Vector Store (Tier 1)
+Checks top-k correctness against brute force, SQL pre-filters, batch
+queries, and reuse of the memory-mapped matrix file across instances.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from sqlite_graph import SQLiteGraph
+from vector_store import LocalVectorStore, HashingEmbedder
+from graph_fixtures import BASE_TIMESTAMP, make_pdcas
+
+DIM = 32
+
+
+def _build_store(db_path, count=300):
+    """Create PDCAs with two random-vector chunks each."""
+    graph = SQLiteGraph(db_path)
+    graph.add_pdca_nodes_bulk(make_pdcas(
+        count, id_format='pdca-{i:04d}',
+        agent_name=lambda i: 'BuilderAgent' if i % 2 else 'TesterAgent'))
+
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((count * 2, DIM)).astype(np.float32)
+    store = LocalVectorStore(graph, dim=DIM)
+    store.add_embeddings((f'pdca-{i // 2:04d}#{i % 2}', f'pdca-{i // 2:04d}', vectors[i], i % 2)
+                         for i in range(count * 2))
+    return graph, store, vectors
+
+
+def test_top_k_matches_brute_force():
+    """Top-k equals an exhaustive cosine ranking, alone and batched."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, store, vectors = _build_store(os.path.join(tmp, 'vectors.db'))
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = np.random.default_rng(1).standard_normal((5, DIM)).astype(np.float32)
+
+        batch = store.query_batch(queries, k=10)
+        for query, hits in zip(queries, batch):
+            expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:10]
+            assert [hit['chunk_id'] for hit in hits] == \
+                [f'pdca-{i // 2:04d}#{i % 2}' for i in expected]
+            single = store.query(query, k=10)
+            assert [hit['chunk_id'] for hit in single] == [hit['chunk_id'] for hit in hits]
+            assert np.allclose([hit['score'] for hit in single], [hit['score'] for hit in hits])
+        graph.close()
+
+
+def test_prefilters_and_grouping():
+    """Agent, time-range and training filters are applied before ranking."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, store, vectors = _build_store(os.path.join(tmp, 'vectors.db'))
+
+        hits = store.query(vectors[0], k=20, agent_name='BuilderAgent',
+                           start_timestamp=BASE_TIMESTAMP, end_timestamp=BASE_TIMESTAMP + 60 * 100)
+        assert len(hits) == 20
+        for hit in hits:
+            number = int(hit['pdca_id'].split('-')[1])
+            assert number % 2 == 1 and number < 100
+
+        grouped = store.query(vectors[0], k=10, group_by_pdca=True)
+        assert len({hit['pdca_id'] for hit in grouped}) == 10
+
+        assert store.query(vectors[0], k=5, trained_in_adapter=True) == []
+        assert store.mark_trained(['pdca-0003']) == 2
+        trained = store.query(vectors[6], k=5, trained_in_adapter=True)
+        assert [hit['chunk_id'] for hit in trained] == ['pdca-0003#0', 'pdca-0003#1']
+        graph.close()
+
+
+def test_matrix_file_reuse_and_refresh():
+    """A second instance maps the existing file; new embeddings are picked up."""
+    with tempfile.TemporaryDirectory() as tmp:
+        graph, store, vectors = _build_store(os.path.join(tmp, 'vectors.db'))
+        store.query(vectors[0], k=1)
+        with open(store.matrix_path + '.json') as f:
+            sidecar = json.load(f)
+        assert os.path.exists(os.path.join(tmp, sidecar['matrix']))
+
+        reopened = LocalVectorStore(graph, dim=DIM)
+        assert reopened.query(vectors[0], k=1)[0]['chunk_id'] == 'pdca-0000#0'
+        assert isinstance(reopened._matrix, np.memmap)
+
+        embedder = HashingEmbedder(DIM)
+        store.add_texts([('note#0', 'pdca-0001', 'RAG indexing pipeline')])
+        hit = reopened.query(embedder(['RAG indexing pipeline'])[0], k=1)[0]
+        assert hit['chunk_id'] == 'note#0' and abs(hit['score'] - 1.0) < 1e-5
+
+        # Deletes and re-embeddings change the signature even when MAX(rowid) stays
+        signature = reopened._signature()
+        graph.conn.execute("DELETE FROM pdca_embeddings WHERE chunk_id = 'pdca-0000#0'")
+        graph.conn.commit()
+        assert reopened._signature() != signature
+        assert reopened.query(vectors[0], k=1)[0]['chunk_id'] != 'pdca-0000#0'
+        signature = reopened._signature()
+        store.add_texts([('note#0', 'pdca-0001', 'temporal index paging')])
+        assert reopened._signature() != signature
+
+        # Only the current versioned files are kept next to the sidecar
+        fresh = LocalVectorStore(graph, dim=DIM)
+        fresh.query(vectors[1], k=1)
+        with open(store.matrix_path + '.json') as f:
+            sidecar = json.load(f)
+        assert sorted(name for name in os.listdir(tmp) if name.startswith('vectors.db.vectors')) == \
+            sorted(['vectors.db.vectors.f32.json', sidecar['matrix'], sidecar['rowids']])
+        assert fresh._map_matrix_file(fresh._signature())[0].shape == (len(fresh._rowids), DIM)
+        graph.close()
+
+
+if __name__ == "__main__":
+    test_top_k_matches_brute_force()
+    test_prefilters_and_grouping()
+    test_matrix_file_reuse_and_refresh()
+    print("✓ Vector store tests passed")
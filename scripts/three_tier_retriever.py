@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Fused Three-Tier Retrieval Pipeline
+
+ThreeTierRetriever answers an agent question by running three stages:
+
+1. vector   - top-k chunks from LocalVectorStore (SQL pre-filtered)
+2. graph    - multi-hop expansion of the best hits with get_neighbors_many()
+3. temporal - time-range / "after PDCA X" filtering and recency scoring
+
+It then fuses similarity, graph distance and recency into one ranked
+list. Every stage has a time budget and a result cap. The remaining
+request budget is checked before each stage: once it is spent, the
+optional graph stage is skipped and the vector and temporal stages run
+limited to the ``k`` candidates the answer needs. Each response carries a
+per-stage latency breakdown in milliseconds.
+
+Stages are plain callables ``stage(request, state)`` and can be replaced
+or extended through the ``stages`` argument.
+"""
+
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from graph_rows import PDCA_COLUMNS
+from temporal_index import TemporalIndex
+
+logger = logging.getLogger(__name__)
+
+# Fusion weights for the three signals (they need not sum to 1)
+DEFAULT_FUSION_WEIGHTS = {
+    'similarity': 0.6,
+    'graph': 0.25,
+    'recency': 0.15
+}
+
+# Per-stage time budgets in seconds; 'total' bounds the whole request
+DEFAULT_STAGE_BUDGETS = {
+    'vector': 0.050,
+    'graph': 0.050,
+    'temporal': 0.020,
+    'total': 0.150
+}
+
+# Recency halves every 7 days before the newest candidate
+DEFAULT_RECENCY_HALF_LIFE = 7 * 86400
+
+# Stages that may be skipped when the total budget is exhausted
+_OPTIONAL_STAGES = ('graph',)
+
+# Stages that run on k candidates only when the total budget is exhausted
+_LIMITED_STAGES = ('vector', 'temporal')
+
+
+class ThreeTierRetriever:
+    """
+    Request-path pipeline over the vector, graph and temporal tiers.
+
+    Example:
+        retriever = ThreeTierRetriever(graph, LocalVectorStore(graph))
+        response = retriever.retrieve("What happened after the RAG system was built?")
+        for hit in response['results']:
+            print(hit['id'], hit['score'])
+        print(response['timings'])
+    """
+
+    def __init__(self, graph, vector_store, weights: Optional[Dict[str, float]] = None,
+                 budgets: Optional[Dict[str, float]] = None,
+                 recency_half_life: float = DEFAULT_RECENCY_HALF_LIFE,
+                 stages: Optional[List[Tuple[str, Callable]]] = None,
+                 temporal: Optional[TemporalIndex] = None):
+        """
+        Initialize the retriever.
+
+        Args:
+            graph: SQLiteGraph (Tier 2, also holds the pdcas rows for Tier 3)
+            vector_store: LocalVectorStore on the same database (Tier 1)
+            weights: Overrides for DEFAULT_FUSION_WEIGHTS
+            budgets: Overrides for DEFAULT_STAGE_BUDGETS (seconds)
+            recency_half_life: Seconds after which the recency score halves
+            stages: Ordered (name, stage) pairs replacing the default
+                vector -> graph -> temporal pipeline
+            temporal: TemporalIndex over the graph's database (Tier 3;
+                default: a new one on ``graph``)
+        """
+        self.graph = graph
+        self.vector_store = vector_store
+        self.temporal = temporal or TemporalIndex(graph)
+        self.weights = dict(DEFAULT_FUSION_WEIGHTS, **(weights or {}))
+        self.budgets = dict(DEFAULT_STAGE_BUDGETS, **(budgets or {}))
+        self.recency_half_life = recency_half_life
+        self.stages = stages or [
+            ('vector', self.vector_stage),
+            ('graph', self.graph_stage),
+            ('temporal', self.temporal_stage)
+        ]
+
+    def retrieve(self, question: str, k: int = 10, vector_k: int = 20,
+                 min_similarity: float = 0.0, expand_top: int = 5, hops: int = 1,
+                 direction: str = 'out', relationship_types: Optional[List[str]] = None,
+                 relationship_metadata: Optional[Dict] = None,
+                 neighbors_per_seed: int = 5, max_candidates: int = 200,
+                 agent_name: Optional[str] = None,
+                 start_timestamp: Optional[int] = None,
+                 end_timestamp: Optional[int] = None,
+                 after_pdca_id: Optional[str] = None,
+                 order: str = 'score') -> Dict:
+        """
+        Run the pipeline for one question.
+
+        Args:
+            question: Natural-language query
+            k: Number of fused results to return
+            vector_k: PDCAs taken from the vector tier
+            min_similarity: Vector hits below this score are cut
+            expand_top: Only the best ``expand_top`` vector hits seed the graph stage
+            hops: Graph expansion depth
+            direction: 'out' (what happened next), 'in' or 'both'
+            relationship_types: Relationship types to follow (None for all)
+            relationship_metadata: Only follow relationships whose metadata
+                matches these predicates (see SQLiteGraph.get_neighbors_many())
+            neighbors_per_seed: Neighbors taken per expanded PDCA and hop
+            max_candidates: Graph expansion stops once this many candidates exist
+            agent_name: Restrict vector hits to one agent
+            start_timestamp: Drop candidates before this Unix timestamp
+            end_timestamp: Drop candidates at or after this Unix timestamp
+            after_pdca_id: Drop candidates not later than this PDCA
+            order: 'score' (fused score) or 'timeline' (oldest first)
+
+        Returns:
+            Dictionary with question, results (PDCA rows plus score,
+            similarity, graph_distance, recency and via), timings (ms per
+            stage plus total), and budget_exceeded, skipped and limited
+            stage names
+        """
+        request = {
+            'question': question, 'k': k, 'vector_k': vector_k,
+            'min_similarity': min_similarity, 'expand_top': expand_top, 'hops': hops,
+            'direction': direction, 'relationship_types': relationship_types,
+            'relationship_metadata': relationship_metadata,
+            'neighbors_per_seed': neighbors_per_seed, 'max_candidates': max_candidates,
+            'agent_name': agent_name, 'start_timestamp': start_timestamp,
+            'end_timestamp': end_timestamp, 'after_pdca_id': after_pdca_id
+        }
+        state = {'candidates': {}, 'budget_exceeded': [], 'skipped': [], 'limited': []}
+        timings = {}
+        started = time.perf_counter()
+        request_deadline = started + self.budgets['total']
+
+        for name, stage in self.stages:
+            stage_started = time.perf_counter()
+            if stage_started >= request_deadline:
+                if name in _OPTIONAL_STAGES:
+                    state['skipped'].append(name)
+                    continue
+                if name in _LIMITED_STAGES:
+                    state['limited'].append(name)
+            budget = self.budgets.get(name)
+            state['deadline'] = min(request_deadline, stage_started + budget) if budget else request_deadline
+            try:
+                stage(request, state)
+            except Exception as e:
+                logger.error("Retrieval stage %s failed: %s", name, e)
+            elapsed = time.perf_counter() - stage_started
+            timings[name] = elapsed * 1000
+            if budget is not None and elapsed > budget:
+                state['budget_exceeded'].append(name)
+
+        fusion_started = time.perf_counter()
+        results = self._fuse(state['candidates'], k, order)
+        timings['fusion'] = (time.perf_counter() - fusion_started) * 1000
+        timings['total'] = (time.perf_counter() - started) * 1000
+
+        logger.debug("Retrieved %d results in %.1f ms", len(results), timings['total'])
+        return {
+            'question': question,
+            'results': results,
+            'timings': timings,
+            'budget_exceeded': state['budget_exceeded'],
+            'skipped': state['skipped'],
+            'limited': state['limited']
+        }
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def vector_stage(self, request: Dict, state: Dict):
+        """Seed candidates with the best chunk per PDCA from the vector tier."""
+        vector_k = request['vector_k']
+        if 'vector' in state['limited']:
+            vector_k = min(vector_k, request['k'])
+        hits = self.vector_store.query_text(
+            request['question'], k=vector_k, group_by_pdca=True,
+            agent_name=request['agent_name'], start_timestamp=request['start_timestamp'],
+            end_timestamp=request['end_timestamp'])
+        for hit in hits:
+            if hit['score'] < request['min_similarity']:
+                break  # hits are ordered by score
+            state['candidates'][hit['pdca_id']] = {
+                'similarity': hit['score'],
+                'graph_distance': 0,
+                'via': hit['chunk_id']
+            }
+
+    def graph_stage(self, request: Dict, state: Dict):
+        """Expand the best vector hits hop by hop, one query per hop."""
+        candidates = state['candidates']
+        frontier = sorted(candidates, key=lambda pdca_id: -candidates[pdca_id]['similarity'])
+        frontier = frontier[:request['expand_top']]
+
+        for hop in range(1, request['hops'] + 1):
+            if not frontier or time.perf_counter() >= state['deadline']:
+                break
+            neighbors = self.graph.get_neighbors_many(
+                frontier, direction=request['direction'],
+                relationship_types=request['relationship_types'],
+                limit_per_seed=request['neighbors_per_seed'],
+                columns=PDCA_COLUMNS,
+                metadata_filter=request['relationship_metadata'])
+
+            next_frontier = []
+            for seed in frontier:
+                for neighbor in neighbors.get(seed, []):
+                    if len(candidates) >= request['max_candidates']:
+                        return
+                    if neighbor['id'] in candidates:
+                        continue
+                    # Inherit the seed's similarity; distance is penalized at fusion
+                    candidates[neighbor['id']] = {
+                        'similarity': candidates[seed]['similarity'],
+                        'graph_distance': hop,
+                        'via': seed,
+                        'row': neighbor
+                    }
+                    next_frontier.append(neighbor['id'])
+            frontier = next_frontier
+
+    def temporal_stage(self, request: Dict, state: Dict):
+        """Attach PDCA rows, apply time filters and score recency."""
+        candidates = state['candidates']
+        if 'temporal' in state['limited']:
+            # Out of budget: only the k best candidates get rows fetched
+            best = sorted(candidates, key=lambda pdca_id: (-self._partial_score(candidates[pdca_id]),
+                                                           pdca_id))
+            for pdca_id in best[request['k']:]:
+                del candidates[pdca_id]
+        # One query applies the window and the after-PDCA bound to every candidate
+        rows = self.temporal.within(list(candidates), request['start_timestamp'],
+                                    request['end_timestamp'], request['after_pdca_id'])
+        for pdca_id in list(candidates):
+            if pdca_id not in rows:
+                del candidates[pdca_id]
+            elif 'row' not in candidates[pdca_id]:
+                candidates[pdca_id]['row'] = rows[pdca_id]
+
+        timestamps = [c['row']['timestamp'] for c in candidates.values()
+                      if c['row'].get('timestamp') is not None]
+        newest = max(timestamps) if timestamps else None
+        for candidate in candidates.values():
+            timestamp = candidate['row'].get('timestamp')
+            if newest is None or timestamp is None:
+                candidate['recency'] = 0.0
+            else:
+                candidate['recency'] = 0.5 ** ((newest - timestamp) / self.recency_half_life)
+
+    # ------------------------------------------------------------------
+    # Fusion
+    # ------------------------------------------------------------------
+
+    def _partial_score(self, candidate: Dict) -> float:
+        """Fused score without the recency term."""
+        return (self.weights['similarity'] * candidate['similarity']
+                + self.weights['graph'] / (1 + candidate['graph_distance']))
+
+    def _fuse(self, candidates: Dict[str, Dict], k: int, order: str) -> List[Dict]:
+        """Combine the three signals into one ranked list of PDCA rows."""
+        if order not in ('score', 'timeline'):
+            raise ValueError(f"Unknown order: {order}")
+
+        results = []
+        for pdca_id, candidate in candidates.items():
+            if 'row' not in candidate:
+                continue  # temporal stage did not run
+            recency = candidate.get('recency', 0.0)
+            score = self._partial_score(candidate) + self.weights['recency'] * recency
+            result = dict(candidate['row'])
+            result.update({
+                'score': score,
+                'similarity': candidate['similarity'],
+                'graph_distance': candidate['graph_distance'],
+                'recency': recency,
+                'via': candidate['via']
+            })
+            results.append(result)
+
+        results.sort(key=lambda r: (-r['score'], r['id']))
+        results = results[:k]
+        if order == 'timeline':
+            results.sort(key=lambda r: (r.get('timestamp') or 0, r['id']))
+        return results
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Embedded Vector Store for PDCA Chunks (Tier 1)
+
+Offline replacement for the ChromaDB step of the three-tier RAG system.
+Embeddings live in the same SQLite database as the graph, as float32 BLOBs
+keyed by chunk ID, and are served from a memory-mapped NumPy matrix:
+
+- Vectors are L2-normalized on insert, so a dot product is the cosine
+  similarity.
+- Metadata pre-filters (agent, timestamp range, trained_in_adapter) run in
+  SQL and select matrix rows before any scoring.
+- Top-k uses one matrix-vector product plus argpartition; batch queries
+  score many query vectors with a single matrix multiply.
+
+No server and no network: any callable that maps a list of strings to an
+(n, dim) array can be used as the embedder (for example
+``SentenceTransformer('all-MiniLM-L6-v2').encode``). HashingEmbedder is a
+deterministic, dependency-free default for CI and laptops.
+"""
+
+import hashlib
+import json
+import os
+import re
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# all-MiniLM-L6-v2 dimension, so hashed and model embeddings are interchangeable
+DEFAULT_EMBEDDING_DIM = 384
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-words embedder using signed feature hashing.
+
+    Needs no model download; similarity reflects shared (stemmed-by-case)
+    tokens and adjacent token pairs. Suitable for tests and benchmarks.
+    """
+
+    def __init__(self, dim: int = DEFAULT_EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        return tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+                value = int.from_bytes(digest, 'little')
+                vectors[row, value % self.dim] += 1.0 if (value >> 63) & 1 else -1.0
+        return vectors
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class LocalVectorStore:
+    """
+    Vector tier stored next to SQLiteGraph in the same database.
+
+    Example:
+        store = LocalVectorStore(graph)
+        store.add_texts([(chunk_id, pdca_id, text), ...])
+        hits = store.query_text("RAG system testing", k=5, agent_name='TesterAgent')
+    """
+
+    def __init__(self, graph, dim: int = DEFAULT_EMBEDDING_DIM,
+                 embedder: Optional[Callable[[Sequence[str]], np.ndarray]] = None,
+                 matrix_path: Optional[str] = None):
+        """
+        Initialize the vector store.
+
+        Args:
+            graph: SQLiteGraph whose database stores the embeddings
+            dim: Embedding dimension
+            embedder: Callable mapping texts to an (n, dim) array
+                (default: HashingEmbedder)
+            matrix_path: Path prefix of the memory-mapped matrix files
+                (default: <db_path>.vectors.f32; in memory for ':memory:')
+        """
+        self.graph = graph
+        self.dim = dim
+        self.embedder = embedder or HashingEmbedder(dim)
+        if matrix_path is None and graph.db_path != ':memory:':
+            matrix_path = f"{graph.db_path}.vectors.f32"
+        self.matrix_path = matrix_path
+
+        self._matrix = None
+        self._rowids = None
+        self._matrix_signature = None
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create the embeddings table."""
+        with self.graph._write_lock:
+            cursor = self.graph.conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pdca_embeddings (
+                    chunk_id TEXT PRIMARY KEY,
+                    pdca_id TEXT NOT NULL,
+                    chunk_index INTEGER DEFAULT 0,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    trained_in_adapter INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_pdca_embeddings_pdca
+                ON pdca_embeddings(pdca_id)
+            """)
+            # Bumped whenever a stored vector is replaced or deleted, so matrix
+            # files can be reused across processes; inserts raise MAX(rowid)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pdca_embedding_state (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            for event in ('DELETE', 'UPDATE OF dim, vector'):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_pdca_embeddings_version_{event.split()[0].lower()}
+                    AFTER {event} ON pdca_embeddings
+                    BEGIN
+                        INSERT INTO pdca_embedding_state (name, value) VALUES ('version', 1)
+                        ON CONFLICT(name) DO UPDATE SET value = value + 1;
+                    END
+                """)
+            self.graph.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_embeddings(self, items: Iterable[Tuple[str, str, Sequence[float]]],
+                       chunk_size: int = 500) -> int:
+        """
+        Store embeddings in one transaction.
+
+        Args:
+            items: Iterable of (chunk_id, pdca_id, vector) or
+                (chunk_id, pdca_id, vector, chunk_index)
+            chunk_size: Rows per executemany() call
+
+        Returns:
+            Number of embeddings written
+        """
+        def rows():
+            for item in items:
+                chunk_id, pdca_id, vector = item[:3]
+                chunk_index = item[3] if len(item) > 3 else 0
+                vector = _normalize(np.asarray(vector, dtype=np.float32).reshape(-1))
+                if vector.shape[0] != self.dim:
+                    raise ValueError(f"Embedding for {chunk_id} has dimension "
+                                     f"{vector.shape[0]}, expected {self.dim}")
+                yield (chunk_id, pdca_id, chunk_index, self.dim, vector.tobytes())
+
+        written = 0
+        with self.graph._write_lock:
+            try:
+                cursor = self.graph.conn.cursor()
+                batch = []
+                for row in rows():
+                    batch.append(row)
+                    if len(batch) >= chunk_size:
+                        written += self._write_batch(cursor, batch)
+                        batch = []
+                if batch:
+                    written += self._write_batch(cursor, batch)
+                self.graph.conn.commit()
+                self.graph.write_generation += 1
+                logger.info("Stored %d embeddings", written)
+                return written
+
+            except Exception as e:
+                self.graph.conn.rollback()
+                logger.error("Error storing embeddings: %s", e)
+                return 0
+
+    @staticmethod
+    def _write_batch(cursor, batch: List[Tuple]) -> int:
+        # Replacing a chunk keeps its training marker
+        cursor.executemany("""
+            INSERT INTO pdca_embeddings (chunk_id, pdca_id, chunk_index, dim, vector)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(chunk_id) DO UPDATE SET
+                pdca_id = excluded.pdca_id,
+                chunk_index = excluded.chunk_index,
+                dim = excluded.dim,
+                vector = excluded.vector
+        """, batch)
+        return len(batch)
+
+    def add_texts(self, items: Iterable[Tuple[str, str, str]], batch_size: int = 256) -> int:
+        """
+        Embed and store text chunks.
+
+        Args:
+            items: Iterable of (chunk_id, pdca_id, text) or
+                (chunk_id, pdca_id, text, chunk_index)
+            batch_size: Texts per embedder call
+
+        Returns:
+            Number of embeddings written
+        """
+        def embedded():
+            batch = []
+            for item in items:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield from self._embed_batch(batch)
+                    batch = []
+            if batch:
+                yield from self._embed_batch(batch)
+
+        return self.add_embeddings(embedded())
+
+    def _embed_batch(self, batch: List[Tuple]):
+        vectors = self.embedder([item[2] for item in batch])
+        for item, vector in zip(batch, vectors):
+            yield (item[0], item[1], vector) + tuple(item[3:4])
+
+    def mark_trained(self, pdca_ids: Iterable[str], trained: bool = True) -> int:
+        """
+        Set trained_in_adapter for every chunk of the given PDCAs.
+
+        Returns:
+            Number of chunks updated
+        """
+        with self.graph._write_lock:
+            try:
+                cursor = self.graph.conn.cursor()
+                cursor.execute("""
+                    UPDATE pdca_embeddings SET trained_in_adapter = ?
+                    WHERE pdca_id IN (SELECT value FROM json_each(?))
+                """, (1 if trained else 0, json.dumps(list(pdca_ids))))
+                self.graph.conn.commit()
+                self.graph.write_generation += 1
+                return cursor.rowcount
+
+            except Exception as e:
+                self.graph.conn.rollback()
+                logger.error("Error marking chunks as trained: %s", e)
+                return 0
+
+    # ------------------------------------------------------------------
+    # Matrix
+    # ------------------------------------------------------------------
+
+    def _signature(self) -> List[int]:
+        """
+        Identifies the current embedding contents: [max rowid, version].
+
+        Both are index lookups, so checking for changes before every search
+        does not scan the table.
+        """
+        row = self.graph._read_conn().execute("""
+            SELECT (SELECT COALESCE(MAX(rowid), 0) FROM pdca_embeddings),
+                   (SELECT COALESCE(MAX(value), 0) FROM pdca_embedding_state
+                    WHERE name = 'version')
+        """).fetchone()
+        return list(row)
+
+    def _load_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (matrix, rowids), rebuilding the mapped file when embeddings changed.
+
+        Row i of the matrix is the vector of pdca_embeddings.rowid == rowids[i];
+        rowids are ascending so filters map to rows with searchsorted().
+        """
+        signature = self._signature()
+        if self._matrix is not None and signature == self._matrix_signature:
+            return self._matrix, self._rowids
+
+        # Another process may already have written a matching matrix file
+        if self._matrix is None and self.matrix_path:
+            mapped = self._map_matrix_file(signature)
+            if mapped is not None:
+                self._matrix, self._rowids = mapped
+                self._matrix_signature = signature
+                return self._matrix, self._rowids
+
+        cursor = self.graph._read_conn().execute(
+            "SELECT rowid, vector FROM pdca_embeddings WHERE dim = ? ORDER BY rowid", (self.dim,))
+        rowids = []
+        vectors = []
+        for rowid, blob in cursor:
+            rowids.append(rowid)
+            vectors.append(blob)
+        rowids = np.asarray(rowids, dtype=np.int64)
+        if vectors:
+            matrix = np.frombuffer(b''.join(vectors), dtype=np.float32).reshape(-1, self.dim)
+        else:
+            matrix = np.zeros((0, self.dim), dtype=np.float32)
+
+        if self.matrix_path and len(rowids):
+            matrix = self._write_matrix_file(matrix, rowids, signature)
+
+        self._matrix, self._rowids, self._matrix_signature = matrix, rowids, signature
+        logger.debug("Loaded embedding matrix with %d rows", len(rowids))
+        return self._matrix, self._rowids
+
+    def _map_matrix_file(self, signature: List[int]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Map the files named by the sidecar if they hold ``signature``, else None."""
+        directory = os.path.dirname(self.matrix_path)
+        try:
+            with open(self.matrix_path + '.json') as f:
+                sidecar = json.load(f)
+            if sidecar.get('signature') != signature or sidecar.get('dim') != self.dim:
+                return None
+            rowids = np.load(os.path.join(directory, sidecar['rowids']))
+            matrix = np.memmap(os.path.join(directory, sidecar['matrix']), dtype=np.float32,
+                               mode='r', shape=(len(rowids), self.dim))
+            return matrix, rowids
+        except (OSError, ValueError, KeyError) as e:
+            # No sidecar yet, or a newer writer pruned the files it named
+            logger.debug("Not reusing matrix file %s: %s", self.matrix_path, e)
+            return None
+
+    def _write_matrix_file(self, matrix: np.ndarray, rowids: np.ndarray,
+                           signature: List[int]) -> np.ndarray:
+        """
+        Write the matrix and rowids under names versioned by ``signature``,
+        then point the sidecar at them and map the matrix read-only.
+
+        Data files are never replaced in place and the sidecar is swapped
+        last, so a reader in another process always maps a matrix together
+        with its own rowids.
+        """
+        tag = '-'.join(str(value) for value in signature)
+        matrix_file = f"{self.matrix_path}.{tag}"
+        rowids_file = f"{matrix_file}.rowids.npy"
+        tmp_suffix = f".tmp-{os.getpid()}"
+        mapped = np.memmap(matrix_file + tmp_suffix, dtype=np.float32, mode='w+',
+                           shape=matrix.shape)
+        mapped[:] = matrix
+        mapped.flush()
+        del mapped
+        os.replace(matrix_file + tmp_suffix, matrix_file)
+        np.save(rowids_file + tmp_suffix + '.npy', rowids)
+        os.replace(rowids_file + tmp_suffix + '.npy', rowids_file)
+        with open(self.matrix_path + tmp_suffix, 'w') as f:
+            json.dump({'signature': signature, 'dim': self.dim,
+                       'matrix': os.path.basename(matrix_file),
+                       'rowids': os.path.basename(rowids_file)}, f)
+        os.replace(self.matrix_path + tmp_suffix, self.matrix_path + '.json')
+        self._prune_matrix_files(tag)
+        return np.memmap(matrix_file, dtype=np.float32, mode='r', shape=matrix.shape)
+
+    def _prune_matrix_files(self, tag: str):
+        """Remove data files of older signatures (and of the unversioned layout)."""
+        directory = os.path.dirname(self.matrix_path) or '.'
+        base = os.path.basename(self.matrix_path)
+        stale = re.compile(re.escape(base) + r'(\.\d+-\d+)?(\.rowids\.npy)?$')
+        for name in os.listdir(directory):
+            match = stale.match(name)
+            if match and match.group(1) != f'.{tag}':
+                try:
+                    # Processes that mapped the file keep their mapping
+                    os.remove(os.path.join(directory, name))
+                except OSError as e:
+                    logger.debug("Could not remove matrix file %s: %s", name, e)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _candidate_rows(self, rowids: np.ndarray, agent_name: Optional[str],
+                        start_timestamp: Optional[int], end_timestamp: Optional[int],
+                        trained_in_adapter: Optional[bool],
+                        pdca_ids: Optional[Iterable[str]]) -> Optional[np.ndarray]:
+        """
+        Resolve metadata filters in SQL to matrix row numbers.
+
+        Returns:
+            Array of matrix rows, or None when no filter is set (all rows)
+        """
+        conditions = []
+        params = []
+        join = ""
+        if agent_name is not None or start_timestamp is not None or end_timestamp is not None:
+            join = "JOIN pdcas p ON p.id = e.pdca_id"
+        if agent_name is not None:
+            conditions.append("p.agent_name = ?")
+            params.append(agent_name)
+        if start_timestamp is not None:
+            conditions.append("p.timestamp >= ?")
+            params.append(start_timestamp)
+        if end_timestamp is not None:
+            conditions.append("p.timestamp < ?")
+            params.append(end_timestamp)
+        if trained_in_adapter is not None:
+            conditions.append("e.trained_in_adapter = ?")
+            params.append(1 if trained_in_adapter else 0)
+        if pdca_ids is not None:
+            conditions.append("e.pdca_id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(pdca_ids)))
+        if not conditions:
+            return None
+
+        cursor = self.graph._read_conn().execute(
+            f"SELECT e.rowid FROM pdca_embeddings e {join} WHERE "
+            + " AND ".join(conditions) + " ORDER BY e.rowid", params)
+        selected = np.fromiter((row[0] for row in cursor), dtype=np.int64)
+        rows = np.searchsorted(rowids, selected)
+        # Drop rows added after the matrix was loaded
+        valid = (rows < len(rowids)) & (rowids[np.minimum(rows, len(rowids) - 1)] == selected)
+        return rows[valid] if len(rowids) else rows[:0]
+
+    def query(self, vector: Sequence[float], k: int = 10, **filters) -> List[Dict]:
+        """
+        Top-k cosine similarity search.
+
+        Args:
+            vector: Query embedding
+            k: Number of results
+            **filters: agent_name, start_timestamp, end_timestamp,
+                trained_in_adapter, pdca_ids, group_by_pdca (see query_batch)
+
+        Returns:
+            List of {'chunk_id', 'pdca_id', 'chunk_index', 'score'} ordered by score
+        """
+        return self.query_batch(np.asarray(vector, dtype=np.float32).reshape(1, -1),
+                                k, **filters)[0]
+
+    def query_text(self, text: str, k: int = 10, **filters) -> List[Dict]:
+        """Embed ``text`` and run query()."""
+        return self.query(self.embedder([text])[0], k, **filters)
+
+    def query_batch(self, vectors: np.ndarray, k: int = 10,
+                    agent_name: Optional[str] = None,
+                    start_timestamp: Optional[int] = None,
+                    end_timestamp: Optional[int] = None,
+                    trained_in_adapter: Optional[bool] = None,
+                    pdca_ids: Optional[Iterable[str]] = None,
+                    group_by_pdca: bool = False) -> List[List[Dict]]:
+        """
+        Top-k search for many query vectors with one matrix multiply.
+
+        Args:
+            vectors: (n, dim) query embeddings
+            k: Results per query
+            agent_name: Only chunks of this agent's PDCAs
+            start_timestamp: Only PDCAs at or after this Unix timestamp
+            end_timestamp: Only PDCAs before this Unix timestamp
+            trained_in_adapter: Only chunks with this training marker
+            pdca_ids: Only chunks of these PDCAs
+            group_by_pdca: Return the best chunk per PDCA instead of raw chunks
+
+        Returns:
+            One result list per query vector
+        """
+        queries = _normalize(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        matrix, rowids = self._load_matrix()
+        rows = self._candidate_rows(rowids, agent_name, start_timestamp, end_timestamp,
+                                    trained_in_adapter, pdca_ids)
+        candidates = matrix if rows is None else matrix[rows]
+        if len(candidates) == 0 or k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        scores = queries @ candidates.T  # (n_queries, n_candidates)
+        # Over-fetch when grouping so k distinct PDCAs survive deduplication
+        fetch = min(len(candidates), k * 4 if group_by_pdca else k)
+        top = np.argpartition(-scores, fetch - 1, axis=1)[:, :fetch]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        candidate_rowids = rowids if rows is None else rowids[rows]
+        needed = np.unique(candidate_rowids[top.ravel()])
+        chunks = self._chunk_info(needed)
+
+        results = []
+        for query_rows, query_scores in zip(top, top_scores):
+            hits = []
+            seen = set()
+            for row, score in zip(query_rows, query_scores):
+                info = chunks.get(int(candidate_rowids[row]))
+                if info is None:
+                    continue
+                if group_by_pdca:
+                    if info['pdca_id'] in seen:
+                        continue
+                    seen.add(info['pdca_id'])
+                hits.append(dict(info, score=float(score)))
+                if len(hits) >= k:
+                    break
+            results.append(hits)
+        return results
+
+    def _chunk_info(self, rowids: np.ndarray) -> Dict[int, Dict]:
+        """Fetch chunk metadata for matrix hits in one query."""
+        cursor = self.graph._read_conn().execute("""
+            SELECT rowid, chunk_id, pdca_id, chunk_index FROM pdca_embeddings
+            WHERE rowid IN (SELECT value FROM json_each(?))
+        """, (json.dumps(rowids.tolist()),))
+        return {row[0]: {'chunk_id': row[1], 'pdca_id': row[2], 'chunk_index': row[3]}
+                for row in cursor}
+
+    def count(self) -> int:
+        """Number of stored embeddings."""
+        return self.graph._read_conn().execute("SELECT COUNT(*) FROM pdca_embeddings").fetchone()[0]